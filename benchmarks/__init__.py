@@ -0,0 +1,4 @@
+"""
+PDFusion 벤치마크
+합성 교재 코퍼스를 만들어 파이프라인 단계별 성능을 측정 (외부 파일/네트워크 불필요)
+"""
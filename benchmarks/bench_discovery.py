@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+파일 탐색 규모 벤치마크
+깊게 중첩되고 zip과 한글/영문 이름이 섞인 대규모 폴더 트리(기본 10만 개 파일)를 만들어
+FileDiscovery, LevelConfig.get_files_for_level, BookTypeDetector.detect_from_directory의
+탐색(walk) 시간, 파일당 분류 시간, 규칙 묶음별 정규식 비용을 측정
+
+사용 예:
+    python benchmarks/bench_discovery.py --files 100000 --work-dir /tmp/discovery_tree
+    (--work-dir를 지정하면 같은 설정의 트리는 다시 만들지 않고 재사용)
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import random
+import re
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.bench_pipeline import environment_info  # noqa: E402
+from benchmarks.corpus import make_pdf  # noqa: E402
+from pdfusion.book_type_detector import BookTypeDetector  # noqa: E402
+from pdfusion.file_discovery import FileDiscovery  # noqa: E402
+from pdfusion.level_config import LevelConfig  # noqa: E402
+
+# 트리 설정을 기록해 재사용 여부를 판단하는 파일
+MANIFEST_NAME = "tree_manifest.json"
+
+# 중첩 폴더 이름 (한글/영문 혼합)
+NEST_NAMES = ["2023 자료", "2024 Archive", "Season {n}", "학기 {n}", "반 {n}", "Class {n}", "백업", "shared",
+              "Teacher {n}", "교재 원본"]
+CATEGORIES_EN = ["Word List", "Word Test", "Translation Sheet", "Unscramble Sheet", "Unit Test", "Grammar Sheet"]
+CATEGORIES_KO = ["단어 목록", "단어 시험", "해석 연습", "문장 배열"]
+# PDF가 아닌 파일 (walk 비용에만 영향)
+NOISE_FILES = ["수업 계획 {n}.hwp", "cover_{n}.jpg", "audio track {n}.mp3", "notes {n}.txt"]
+
+
+def build_tree(root: Path, files: int, depth: int, seed: int) -> Dict:
+    """
+    대규모 합성 트리 생성 (PDF는 1페이지짜리 같은 내용을 복사, 내용 감지 단계까지 동작하도록)
+
+    Args:
+        root: 트리 루트 (기존 내용 삭제)
+        files: 만들 파일 수 (대략)
+        depth: 책 폴더 위의 중첩 폴더 수
+        seed: 난수 시드
+
+    Returns:
+        {'files', 'pdfs', 'zips', 'dirs', 'books': [책 폴더 상대 경로...], 'build_s'}
+    """
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    shutil.rmtree(root, ignore_errors=True)
+    root.mkdir(parents=True)
+
+    sample_pdf = root / ".sample.pdf"
+    make_pdf(sample_pdf, [["Unit 1 Word List", "sample page"]])
+    pdf_bytes = sample_pdf.read_bytes()
+    sample_pdf.unlink()
+    zip_buffer = io.BytesIO()
+    with zipfile.ZipFile(zip_buffer, 'w') as archive:
+        archive.writestr("Word List/Word List Unit 01.pdf", pdf_bytes)
+    zip_bytes = zip_buffer.getvalue()
+
+    counts = {"files": 0, "pdfs": 0, "zips": 0, "dirs": 0}
+    books: List[str] = []
+    created_dirs = set()
+
+    def write(path: Path, data: bytes):
+        if path.parent not in created_dirs:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            created_dirs.add(path.parent)
+        path.write_bytes(data)
+        counts["files"] += 1
+
+    index = 0
+    while counts["files"] < files:
+        nest = [rng.choice(NEST_NAMES).format(n=rng.randint(1, 9)) for _ in range(depth)]
+        kind = index % 3
+        if kind == 0:
+            title = f"Bricks Listening {rng.choice([60, 80, 100])} Level {rng.randint(1, 6)}"
+        elif kind == 1:
+            title = f"Bricks Reading {rng.choice([50, 70, 85, 120])} Level {rng.randint(1, 6)}"
+        else:
+            # 이름으로 타입을 알 수 없는 책 (하위 폴더/파일 이름, 내용 감지 단계까지 진행)
+            title = f"교재 {index:05d} 레벨 {rng.randint(1, 6)}"
+        book_dir = root.joinpath(*nest, f"{title} #{index}")
+        books.append(str(book_dir.relative_to(root)))
+        korean = kind == 2 or rng.random() < 0.3
+        categories = CATEGORIES_KO if korean and rng.random() < 0.5 else CATEGORIES_EN[:rng.randint(2, 6)]
+        units = rng.randint(8, 24)
+        for category in categories:
+            category_dir = book_dir / "prac book" / category
+            weekly = rng.random() < 0.3
+            for unit in range(1, units + 1):
+                target = category_dir / f"Week {(unit + 3) // 4:02d}" if weekly else category_dir
+                write(target / f"{category} Unit {unit:02d}.pdf", pdf_bytes)
+                counts["pdfs"] += 1
+            write(category_dir / (f"{category} 정답.pdf" if korean else f"{category} Answer Key.pdf"), pdf_bytes)
+            counts["pdfs"] += 1
+            write(book_dir / f"{category}.zip", zip_bytes)
+            counts["zips"] += 1
+        for start in range(1, units + 1, 4):
+            write(book_dir / "prac book" / "Review Test" / f"Units {start:02d}-{start + 3:02d} Review Test.pdf",
+                  pdf_bytes)
+            counts["pdfs"] += 1
+        for noise in rng.sample(NOISE_FILES, 2):
+            write(book_dir / "etc" / noise.format(n=rng.randint(1, 99)), b"x")
+        index += 1
+
+    counts["dirs"] = len(created_dirs)
+    return dict(counts, books=books, build_s=round(time.perf_counter() - started, 3))
+
+
+def load_or_build_tree(work_dir: Path, files: int, depth: int, seed: int) -> Tuple[Path, Dict]:
+    """같은 설정으로 만든 트리가 있으면 재사용"""
+    root = work_dir / "tree"
+    manifest_path = work_dir / MANIFEST_NAME
+    params = {"files": files, "depth": depth, "seed": seed}
+    if manifest_path.exists() and root.exists():
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get("params") == params:
+            return root, manifest["tree"]
+    tree = build_tree(root, files, depth, seed)
+    work_dir.mkdir(parents=True, exist_ok=True)
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump({"params": params, "tree": tree}, f, ensure_ascii=False)
+    return root, tree
+
+
+def _timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+def bench_walk(root: Path) -> Dict:
+    """트리 전체 탐색 시간 (os.walk 기준선과 FileDiscovery.find_all_pdfs의 rglob)"""
+    def os_walk_pdfs():
+        return [os.path.join(dirpath, name) for dirpath, _, names in os.walk(root)
+                for name in names if name.lower().endswith(".pdf")]
+
+    raw, raw_s = _timed(os_walk_pdfs)
+    pdfs, rglob_s = _timed(FileDiscovery().find_all_pdfs, root)
+    return {
+        "pdfs": len(pdfs),
+        "os_walk_s": round(raw_s, 4),
+        "find_all_pdfs_s": round(rglob_s, 4),
+        "find_all_pdfs_us_per_file": round(rglob_s / max(len(pdfs), 1) * 1e6, 2),
+        "rglob_overhead": round(rglob_s / raw_s, 2) if raw_s else None,
+        "os_walk_matches": len(raw),
+    }
+
+
+def bench_books(root: Path, books: List[str]) -> Dict:
+    """
+    책 폴더별로 설정 단계와 같은 순서로 실행한 시간 (탐색 → 분류 세부 단계 → 레벨 필터 → 타입 감지)
+    """
+    discovery = FileDiscovery()
+    level_config = LevelConfig()
+    detector = BookTypeDetector()
+    totals = {"walk": 0.0, "filter_excluded": 0.0, "review_tests": 0.0, "split_main": 0.0,
+              "categorize": 0.0, "discover": 0.0, "get_files_for_level": 0.0, "detect_from_directory": 0.0}
+    files = 0
+    missing_required = 0
+    detected = {"LC": 0, "RC": 0, None: 0}
+    for relative in books:
+        book_dir = root / relative
+        all_pdfs, elapsed = _timed(discovery.find_all_pdfs, book_dir)
+        totals["walk"] += elapsed
+        files += len(all_pdfs)
+        filtered, elapsed = _timed(discovery.filter_excluded_files, all_pdfs)
+        totals["filter_excluded"] += elapsed
+        review_tests, elapsed = _timed(discovery.find_review_tests, filtered)
+        totals["review_tests"] += elapsed
+        main_pdfs, elapsed = _timed(lambda: [p for p in filtered if p not in review_tests])
+        totals["split_main"] += elapsed
+        _, elapsed = _timed(discovery.categorize_files, main_pdfs)
+        totals["categorize"] += elapsed
+        _, elapsed = _timed(discovery.discover, book_dir)
+        totals["discover"] += elapsed
+
+        book_type, elapsed = _timed(detector.detect_from_directory, book_dir)
+        totals["detect_from_directory"] += elapsed
+        detected[book_type] = detected.get(book_type, 0) + 1
+        level = level_config.detect_level(book_dir) or "Level 1"
+        selected, elapsed = _timed(level_config.get_files_for_level, level, main_pdfs, book_type or "RC", book_dir)
+        totals["get_files_for_level"] += elapsed
+        if selected is None:
+            missing_required += 1
+
+    per_file = {name: round(seconds / max(files, 1) * 1e6, 2) for name, seconds in totals.items()}
+    return {
+        "books": len(books),
+        "files": files,
+        "total_s": {name: round(seconds, 4) for name, seconds in totals.items()},
+        "us_per_file": per_file,
+        "detected_types": {str(key): value for key, value in detected.items()},
+        "missing_required": missing_required,
+    }
+
+
+def rule_sets() -> Dict[str, List[str]]:
+    """측정할 정규식 규칙 묶음 (각 모듈의 패턴 정의를 그대로 사용)"""
+    discovery = FileDiscovery()
+    return {
+        "exclude": discovery.exclude_patterns,
+        "review_test": discovery.review_test_patterns,
+        "file_type": [p for patterns in FileDiscovery.FILE_TYPE_PATTERNS.values() for p in patterns],
+        "unit_number": FileDiscovery.UNIT_NUMBER_PATTERNS,
+        "level": LevelConfig.LEVEL_PATTERNS,
+        "book_number": LevelConfig.BOOK_NUMBER_PATTERNS,
+        "lc_rc": BookTypeDetector.LC_PATTERNS + BookTypeDetector.RC_PATTERNS,
+    }
+
+
+def bench_rules(paths: List[str]) -> Dict:
+    """
+    규칙 묶음별 정규식 비용 (모든 경로에 모든 패턴을 적용한 최악의 경우)
+    모듈과 같은 re.search(문자열 패턴) 호출과 미리 컴파일한 패턴을 비교
+    """
+    results = {}
+    for name, patterns in rule_sets().items():
+        started = time.perf_counter()
+        matched = 0
+        for path in paths:
+            if any([re.search(pattern, path, re.IGNORECASE) for pattern in patterns]):
+                matched += 1
+        search_s = time.perf_counter() - started
+
+        compiled = [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+        started = time.perf_counter()
+        for path in paths:
+            for pattern in compiled:
+                pattern.search(path)
+        compiled_s = time.perf_counter() - started
+
+        results[name] = {
+            "patterns": len(patterns),
+            "us_per_file": round(search_s / max(len(paths), 1) * 1e6, 3),
+            "us_per_file_compiled": round(compiled_s / max(len(paths), 1) * 1e6, 3),
+            "ns_per_pattern_match": round(search_s / max(len(paths) * len(patterns), 1) * 1e9, 1),
+            "match_rate": round(matched / max(len(paths), 1), 4),
+        }
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="PDFusion 파일 탐색 규모 벤치마크")
+    parser.add_argument("--files", type=int, default=100_000, help="트리의 파일 수 (기본값: 100000)")
+    parser.add_argument("--depth", type=int, default=4, help="책 폴더 위 중첩 폴더 수 (기본값: 4)")
+    parser.add_argument("--seed", type=int, default=0, help="트리 난수 시드")
+    parser.add_argument("--books", type=int, default=None,
+                        help="책별 측정에 사용할 책 수 (기본값: 전체)")
+    parser.add_argument("--work-dir", default=None,
+                        help="트리를 만들 폴더 (지정하면 재사용, 기본값: 임시 폴더)")
+    parser.add_argument("--output", default=None,
+                        help="결과 JSON 경로 (기본값: benchmarks/results/discovery_<시각>.json)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    # 모듈의 로그 메시지 생성/화면 출력 비용은 측정에 포함하되 터미널에는 출력하지 않음
+    # (타입을 감지할 수 없는 책과 필수 파일이 없는 책은 의도한 것이라 경고가 많이 나옴)
+    logging.basicConfig(level=logging.CRITICAL)
+
+    work_dir = Path(args.work_dir or tempfile.mkdtemp(prefix="pdfusion_discovery_")).resolve()
+    try:
+        print(f"트리 준비 중: 파일 {args.files:,}개, 중첩 {args.depth}단계")
+        root, tree = load_or_build_tree(work_dir, args.files, args.depth, args.seed)
+        print(f"  파일 {tree['files']:,}개 (PDF {tree['pdfs']:,}, zip {tree['zips']:,}), "
+              f"폴더 {tree['dirs']:,}개, 책 {len(tree['books']):,}권")
+        books = tree["books"][:args.books] if args.books else tree["books"]
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            walk = bench_walk(root)
+            per_book = bench_books(root, books)
+            paths = [str(p).lower() for p in root.rglob("*.pdf")]
+            rules = bench_rules(paths)
+    finally:
+        if args.work_dir is None:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    results = {
+        "benchmark": "discovery",
+        "generated_at": datetime.now().isoformat(timespec='seconds'),
+        "environment": environment_info(),
+        "tree": {key: value for key, value in tree.items() if key != "books"},
+        "options": {"files": args.files, "depth": args.depth, "seed": args.seed, "books": len(books)},
+        "walk": walk,
+        "per_book": per_book,
+        "rules": rules,
+    }
+    output = Path(args.output) if args.output else (
+        ROOT / "benchmarks" / "results" / f"discovery_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+
+    print(f"\n[탐색] PDF {walk['pdfs']:,}개: os.walk {walk['os_walk_s']:.3f}s, "
+          f"find_all_pdfs {walk['find_all_pdfs_s']:.3f}s (x{walk['rglob_overhead']})")
+    print(f"\n[책별] {per_book['books']:,}권, 파일 {per_book['files']:,}개")
+    print(f"{'단계':<24} {'전체(s)':>10} {'파일당(us)':>12}")
+    for name, seconds in per_book["total_s"].items():
+        print(f"{name:<24} {seconds:>10.3f} {per_book['us_per_file'][name]:>12.2f}")
+    print(f"\n[정규식 규칙] 경로 {len(paths):,}개")
+    print(f"{'규칙':<14} {'패턴':>6} {'파일당(us)':>12} {'컴파일(us)':>12} {'일치율':>8}")
+    for name, rule in rules.items():
+        print(f"{name:<14} {rule['patterns']:>6} {rule['us_per_file']:>12.3f} "
+              f"{rule['us_per_file_compiled']:>12.3f} {rule['match_rate']:>8.1%}")
+    print(f"\n결과 저장: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+로그 오버헤드 벤치마크
+파일마다 로그를 남기는 경로(파일 분류, 레벨 필터링, 경로 기반 LC/RC·레벨 감지, 유닛 병합)를
+로그 모드별(debug, info, quiet, off)로 실행해 시간을 재고, 로그를 끈 경우(off) 대비 추가 시간을 보고
+--ref로 다른 git 리비전을 지정하면 같은 입력으로 그 리비전도 측정해 전/후를 비교
+
+사용 예:
+    python benchmarks/bench_logging.py
+    python benchmarks/bench_logging.py --ref HEAD~1 --files 5000
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# 로그 모드 -> 기본 로그 수준 (quiet는 WARNING, off는 로그 기록 자체를 끈 기준선)
+MODES = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "quiet": logging.WARNING,
+    "off": logging.CRITICAL + 1,
+}
+
+# 파일명에 쓰는 카테고리 (마지막 두 개는 타입 패턴에 걸리지 않아 파일명 카테고리로 분류됨)
+CATEGORIES = ["Word List", "Word Test", "Translation Sheet", "Unscramble Sheet", "Unit Test",
+              "Grammar Sheet", "Phonics Card", "Story Book"]
+
+WORKLOADS = ["categorize", "level_filter", "detect_type", "detect_level", "unit_merge"]
+
+
+def synthetic_files(count: int) -> List[Path]:
+    """책/레벨/카테고리/유닛 구조의 가상 파일 경로 (디스크에 만들지 않음)"""
+    files = []
+    for index in range(count):
+        book = index % 7
+        category = CATEGORIES[index % len(CATEGORIES)]
+        unit = index // len(CATEGORIES) % 40 + 1
+        files.append(Path(f"/books/Bricks Phonics {50 + book * 10}/prac book/{category}/"
+                          f"{category} Unit{unit:02d}.pdf"))
+    return files
+
+
+def build_merge_book(work_dir: Path, units: int, pages_per_unit: int) -> Dict:
+    """유닛 병합용 통합 PDF(카테고리당 하나)와 병합 설정 생성"""
+    from benchmarks.corpus import make_pdf
+
+    categories = {}
+    for category in CATEGORIES[:3]:
+        path = work_dir / f"{category}.pdf"
+        make_pdf(path, [[f"{category} {page}"] for page in range(units * pages_per_unit)])
+        categories[category] = {"pdf_path": str(path), "unit_page_lengths": [pages_per_unit] * units}
+    return {"total_units": units, "categories": categories, "merge_order": list(categories),
+            "review_tests": []}
+
+
+def workload_runners(files: List[Path], work_dir: Path, units: int) -> Dict[str, Callable[[], None]]:
+    """측정할 작업 (작업 이름 -> 한 번 실행하는 함수)"""
+    from pdfusion.book_type_detector import BookTypeDetector
+    from pdfusion.file_discovery import FileDiscovery
+    from pdfusion.level_config import LevelConfig
+    from pdfusion.merger import PDFMerger
+
+    discovery = FileDiscovery()
+    level_config = LevelConfig()
+    detector = BookTypeDetector()
+    merge_config = build_merge_book(work_dir, units, pages_per_unit=2)
+    merger = PDFMerger(output_dir=str(work_dir / "out"))
+
+    def categorize():
+        discovery.categorize_files(files)
+
+    def level_filter():
+        level_config.get_files_for_level("Level 1", files, book_type="RC", book_path=Path("Bricks Reading 60"),
+                                         skip_required_check=True)
+
+    def detect_type():
+        for path in files:
+            detector.detect_from_path(path)
+
+    def detect_level():
+        for path in files:
+            level_config.detect_level(path)
+
+    def unit_merge():
+        for unit_number in range(1, units + 1):
+            merger.merge_unit_pdf(unit_number, merge_config)
+
+    return {"categorize": categorize, "level_filter": level_filter, "detect_type": detect_type,
+            "detect_level": detect_level, "unit_merge": unit_merge}
+
+
+def measure(files: int, units: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    현재 import 경로의 pdfusion으로 작업별·모드별 최소 시간(ms) 측정
+    (로그는 /dev/null 핸들러로, print는 버려서 출력 비용도 포함)
+    """
+    work_dir = Path(tempfile.mkdtemp(prefix="pdfusion_bench_logging_"))
+    sink = open(os.devnull, "w", encoding="utf-8")
+    root = logging.getLogger()
+    handler = logging.StreamHandler(sink)
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s:%(name)s:%(message)s"))
+    root.handlers[:] = [handler]
+    try:
+        runners = workload_runners(synthetic_files(files), work_dir, units)
+        results = {}
+        for workload in WORKLOADS:
+            results[workload] = {}
+            for mode, level in MODES.items():
+                root.setLevel(level)
+                samples = []
+                with contextlib.redirect_stdout(io.StringIO()) as captured:
+                    runners[workload]()  # 준비 실행 (캐시 준비)
+                    for _ in range(repeat):
+                        captured.seek(0)
+                        captured.truncate()
+                        started = time.perf_counter()
+                        runners[workload]()
+                        samples.append(time.perf_counter() - started)
+                results[workload][mode] = round(min(samples) * 1000, 3)
+        return results
+    finally:
+        root.handlers[:] = []
+        sink.close()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def measure_ref(ref: str, files: int, units: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    """git 리비전 ref를 임시 worktree로 꺼내 같은 측정을 하위 프로세스에서 실행"""
+    worktree = Path(tempfile.mkdtemp(prefix="pdfusion_ref_"))
+    subprocess.run(["git", "worktree", "add", "--detach", "-q", str(worktree), ref], cwd=ROOT, check=True)
+    try:
+        # 측정 코드와 코퍼스 생성기는 현재 트리 것을 쓰고 pdfusion만 ref 것을 쓰도록 함
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(worktree), str(ROOT)]))
+        result = subprocess.run(
+            [sys.executable, str(Path(__file__).resolve()), "--measure-only",
+             "--files", str(files), "--units", str(units), "--repeat", str(repeat)],
+            cwd=worktree, env=env, capture_output=True, text=True, check=True)
+        return json.loads(result.stdout.strip().splitlines()[-1])
+    finally:
+        subprocess.run(["git", "worktree", "remove", "--force", str(worktree)], cwd=ROOT, check=False)
+
+
+def overheads(results: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    """모드별 로그를 끈 경우(off) 대비 추가 시간 (ms)"""
+    return {workload: {mode: round(times[mode] - times["off"], 3) for mode in MODES if mode != "off"}
+            for workload, times in results.items()}
+
+
+def print_table(title: str, results: Dict[str, Dict[str, float]]):
+    print(f"\n[{title}] 작업별 최소 시간 (ms, 괄호는 off 대비 추가 시간)")
+    print(f"{'작업':<14}" + "".join(f"{mode:>20}" for mode in MODES))
+    for workload, times in results.items():
+        cells = []
+        for mode in MODES:
+            extra = times[mode] - times["off"]
+            cells.append(f"{times[mode]:>10.2f} ({extra:+7.2f})" if mode != "off" else f"{times[mode]:>20.2f}")
+        print(f"{workload:<14}" + "".join(f"{cell:>20}" for cell in cells))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="PDFusion 로그 오버헤드 벤치마크")
+    parser.add_argument("--files", type=int, default=2000, help="가상 파일 수 (기본값: 2000)")
+    parser.add_argument("--units", type=int, default=20, help="유닛 병합 작업의 유닛 수 (기본값: 20)")
+    parser.add_argument("--repeat", type=int, default=5, help="모드별 반복 횟수, 최소값 사용 (기본값: 5)")
+    parser.add_argument("--ref", default=None,
+                        help="비교할 git 리비전 (예: HEAD~1). 지정하면 그 리비전도 측정해 전/후 비교")
+    parser.add_argument("--measure-only", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--output", default=None,
+                        help="결과 JSON 경로 (기본값: benchmarks/results/logging_<시각>.json)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.measure_only:
+        # --ref 하위 프로세스: PYTHONPATH 순서대로 ref의 pdfusion을 import
+        print(json.dumps(measure(args.files, args.units, args.repeat)))
+        return 0
+
+    sys.path.insert(0, str(ROOT))
+    current = measure(args.files, args.units, args.repeat)
+    results = {
+        "benchmark": "logging",
+        "generated_at": datetime.now().isoformat(timespec='seconds'),
+        "options": {"files": args.files, "units": args.units, "repeat": args.repeat, "ref": args.ref},
+        "current": current,
+        "current_overhead_ms": overheads(current),
+    }
+    print_table("현재 트리", current)
+
+    if args.ref:
+        before = measure_ref(args.ref, args.files, args.units, args.repeat)
+        results["ref"] = before
+        results["ref_overhead_ms"] = overheads(before)
+        print_table(f"기준 리비전 {args.ref}", before)
+        print(f"\n[전/후] 작업별 시간 비율 (현재 / {args.ref}, 1보다 작으면 빨라짐)")
+        print(f"{'작업':<14}" + "".join(f"{mode:>10}" for mode in MODES))
+        for workload in WORKLOADS:
+            ratios = [current[workload][mode] / before[workload][mode] if before[workload][mode] else 0
+                      for mode in MODES]
+            print(f"{workload:<14}" + "".join(f"{ratio:>10.2f}" for ratio in ratios))
+        results["ratio"] = {workload: {mode: round(current[workload][mode] / before[workload][mode], 3)
+                                       for mode in MODES if before[workload][mode]}
+                            for workload in WORKLOADS}
+
+    output = Path(args.output) if args.output else (
+        ROOT / "benchmarks" / "results" / f"logging_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
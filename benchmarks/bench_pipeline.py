@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+파이프라인 벤치마크
+합성 코퍼스(benchmarks/corpus.py)로 설정 단계(압축 해제 → 타입/레벨 감지 → 파일 탐색 → 유닛 감지)와
+병합 단계(검증 → 유닛 병합 → 전체 합본)를 규모별로 실행하고, 전체 시간과 단계별 시간을 JSON으로 저장
+
+사용 예:
+    python benchmarks/bench_pipeline.py --scales small medium --repeat 3
+"""
+
+import argparse
+import builtins
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.corpus import SCALES, generate_corpus  # noqa: E402
+
+# 보고서에 요약할 단계 (계측 단계 이름 -> 보고서 이름)
+SUMMARY_STAGES = {
+    "zip_extraction": "extraction",
+    "discovery": "discovery",
+    "type_detection": "type_detection",
+    "level_detection": "level_detection",
+    "unit_detection": "unit_detection",
+    "validation": "validation",
+    "merge": "merge",
+    "unit_merge": "unit_merge",
+    "all_units": "all_units",
+    "write": "write",
+}
+
+
+def auto_answer(root_dir: Path) -> Callable[[str], str]:
+    """
+    설정 단계의 질문에 응답하는 input() 대체 함수
+    (최상위 폴더 질문에는 코퍼스 경로, 나머지는 모두 기본값)
+    """
+    def answer(prompt: str = "") -> str:
+        if "최상위 폴더" in prompt:
+            return str(root_dir)
+        return ""
+    return answer
+
+
+def clear_caches():
+    """반복 실행 간 프로세스 캐시와 계측값 초기화 (매 실행을 같은 조건에서 시작)"""
+    from pdfusion.image_optimizer import clear_image_cache
+    from pdfusion.metrics import get_metrics
+    from pdfusion.page_count import clear_page_count_cache
+    from pdfusion.source_cache import get_source_cache
+    from pdfusion.unit_detection import clear_unit_scan_cache
+
+    get_source_cache().clear()
+    clear_page_count_cache()
+    clear_unit_scan_cache()
+    clear_image_cache()
+    get_metrics().clear()
+
+
+def run_pipeline(corpus_dir: Path, work_dir: Path, output_profile: Optional[str] = None,
+                 fused: bool = False) -> Dict:
+    """
+    코퍼스 사본으로 파이프라인 전체를 한 번 실행
+
+    Args:
+        corpus_dir: 생성한 코퍼스 (압축 해제로 바뀌지 않도록 사본을 만들어 실행)
+        work_dir: 작업 폴더 (output/은 이 아래에 생성)
+        output_profile: 출력 프로파일 (None이면 기본값)
+        fused: 융합 병합 사용
+
+    Returns:
+        {'config_s', 'merge_s', 'end_to_end_s', 'books', 'succeeded', 'stages'}
+    """
+    import main_v5
+    from pdfusion.config_v5 import ConfigManagerV5
+    from pdfusion.metrics import get_metrics
+    from pdfusion.output_optimizer import DEFAULT_OUTPUT_PROFILE
+
+    shutil.rmtree(work_dir, ignore_errors=True)
+    root_dir = work_dir / "root"
+    shutil.copytree(corpus_dir, root_dir)
+    clear_caches()
+
+    previous_cwd = os.getcwd()
+    original_input = builtins.input
+    os.chdir(work_dir)
+    builtins.input = auto_answer(root_dir)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            configs = ConfigManagerV5(fused=fused).get_user_input()
+            config_done = time.perf_counter()
+            succeeded = 0
+            for book_title, book_config in configs.items():
+                # 책 사이 결과 재사용이 없도록 출력 저장소는 끔
+                if main_v5.process_book(book_title, book_config, output_profile or DEFAULT_OUTPUT_PROFILE,
+                                        use_store=False):
+                    succeeded += 1
+            finished = time.perf_counter()
+    finally:
+        builtins.input = original_input
+        os.chdir(previous_cwd)
+
+    return {
+        "config_s": config_done - started,
+        "merge_s": finished - config_done,
+        "end_to_end_s": finished - started,
+        "books": len(configs),
+        "succeeded": succeeded,
+        "stages": get_metrics().snapshot(),
+    }
+
+
+def _summarize(values: List[float]) -> Dict[str, float]:
+    return {
+        "min": round(min(values), 6),
+        "median": round(statistics.median(values), 6),
+        "max": round(max(values), 6),
+    }
+
+
+def bench_scale(scale: str, work_root: Path, repeat: int, books: Optional[int], units: Optional[int],
+                seed: int, fused: bool) -> Dict:
+    """
+    한 규모에 대해 코퍼스를 만들고 repeat번 실행한 결과 요약
+
+    Returns:
+        {'books', 'units', 'pages', 'runs', 'end_to_end_s', 'config_s', 'merge_s',
+        'pages_per_s', 'stages': {보고서 이름: {wall_s, cpu_s, count, pages, bytes_read, bytes_written}}}
+    """
+    corpus_dir = work_root / scale / "corpus"
+    corpus = generate_corpus(corpus_dir, scale, books, units, seed)
+    runs = []
+    for index in range(repeat):
+        run = run_pipeline(corpus_dir, work_root / scale / "run", fused=fused)
+        if run["succeeded"] != run["books"]:
+            print(f"  [경고] {scale} {index + 1}회차: {run['books']}권 중 {run['succeeded']}권만 성공")
+        runs.append(run)
+        print(f"  {scale} {index + 1}/{repeat}: {run['end_to_end_s']:.3f}s "
+              f"(설정 {run['config_s']:.3f}s, 병합 {run['merge_s']:.3f}s)")
+
+    stages = {}
+    for stage_name, report_name in SUMMARY_STAGES.items():
+        samples = [run["stages"][stage_name] for run in runs if stage_name in run["stages"]]
+        if not samples:
+            continue
+        stages[report_name] = {
+            "wall_s": _summarize([s["wall_s"] for s in samples]),
+            "cpu_s": _summarize([s["cpu_s"] for s in samples]),
+            "count": samples[0]["count"],
+            "pages": samples[0]["pages"],
+            "bytes_read": samples[0]["bytes_read"],
+            "bytes_written": samples[0]["bytes_written"],
+        }
+
+    end_to_end = _summarize([run["end_to_end_s"] for run in runs])
+    return {
+        "books": len(corpus["books"]),
+        "units": corpus["books"][0]["units"] if corpus["books"] else 0,
+        "pages": corpus["pages"],
+        "runs": repeat,
+        "succeeded": min(run["succeeded"] for run in runs),
+        "end_to_end_s": end_to_end,
+        "config_s": _summarize([run["config_s"] for run in runs]),
+        "merge_s": _summarize([run["merge_s"] for run in runs]),
+        "pages_per_s": round(corpus["pages"] / end_to_end["median"], 1) if end_to_end["median"] else None,
+        "stages": stages,
+    }
+
+
+def environment_info() -> Dict:
+    """결과 비교용 실행 환경 정보"""
+    try:
+        from pypdf import __version__ as pdf_library_version
+        pdf_library = "pypdf"
+    except ImportError:
+        from PyPDF2 import __version__ as pdf_library_version
+        pdf_library = "PyPDF2"
+    return {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "pdf_library": f"{pdf_library} {pdf_library_version}",
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="PDFusion 파이프라인 벤치마크 (합성 코퍼스)")
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=["small", "medium"],
+                        help="실행할 규모 (기본값: small medium)")
+    parser.add_argument("--repeat", type=int, default=3, help="규모별 반복 횟수 (기본값: 3)")
+    parser.add_argument("--books", type=int, default=None, help="책 수 (기본값: 규모별 설정)")
+    parser.add_argument("--units", type=int, default=None, help="책당 유닛 수 (기본값: 규모별 설정)")
+    parser.add_argument("--seed", type=int, default=0, help="코퍼스 난수 시드")
+    parser.add_argument("--fused", action="store_true", help="융합 병합으로 실행")
+    parser.add_argument("--work-dir", default=None,
+                        help="코퍼스와 출력 작업 폴더 (기본값: 임시 폴더, 끝나면 삭제)")
+    parser.add_argument("--output", default=None,
+                        help="결과 JSON 경로 (기본값: benchmarks/results/pipeline_<시각>.json)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    # 단계별 로그는 측정에 방해되므로 경고 이상만 출력
+    logging.basicConfig(level=logging.WARNING)
+
+    work_root = Path(args.work_dir or tempfile.mkdtemp(prefix="pdfusion_bench_")).resolve()
+    results = {
+        "benchmark": "pipeline",
+        "generated_at": datetime.now().isoformat(timespec='seconds'),
+        "environment": environment_info(),
+        "options": {"repeat": args.repeat, "seed": args.seed, "fused": args.fused,
+                    "books": args.books, "units": args.units},
+        "scales": {},
+    }
+    try:
+        for scale in args.scales:
+            print(f"[{scale}] 코퍼스 생성 및 실행")
+            results["scales"][scale] = bench_scale(scale, work_root, args.repeat, args.books, args.units,
+                                                   args.seed, args.fused)
+    finally:
+        if args.work_dir is None:
+            shutil.rmtree(work_root, ignore_errors=True)
+
+    output = Path(args.output) if args.output else (
+        ROOT / "benchmarks" / "results" / f"pipeline_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+
+    print(f"\n{'규모':<8} {'책':>4} {'페이지':>8} {'전체(s)':>10} {'페이지/s':>10}")
+    for scale, result in results["scales"].items():
+        print(f"{scale:<8} {result['books']:>4} {result['pages']:>8} "
+              f"{result['end_to_end_s']['median']:>10.3f} {result['pages_per_s'] or 0:>10.1f}")
+    print(f"\n결과 저장: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
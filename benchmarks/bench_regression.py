@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+성능 회귀 검사
+고정된 합성 코퍼스에서 핵심 단계(유닛 감지, 파일 탐색, 유닛 병합, 전체 합본)를 반복 측정해
+머신 프로파일별 기준값과 비교하고, 통계적으로 유의한 속도 저하나 메모리 증가가 기준을 넘으면 0이 아닌 값으로 종료
+
+사용 예:
+    python benchmarks/bench_regression.py --update-baseline   # 기준값 저장 (변경 전 코드에서)
+    python benchmarks/bench_regression.py                     # 비교 (변경 후 코드에서)
+
+종료 코드: 0 통과, 1 회귀 발견, 2 비교할 기준값 없음/코퍼스 불일치
+"""
+
+import argparse
+import builtins
+import contextlib
+import io
+import json
+import logging
+import math
+import os
+import platform
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.bench_pipeline import auto_answer, clear_caches, environment_info  # noqa: E402
+from benchmarks.corpus import generate_corpus  # noqa: E402
+
+BASELINE_DIR = ROOT / "benchmarks" / "baselines"
+
+# 회귀 검사용 고정 코퍼스 (바꾸면 기존 기준값과 비교할 수 없음)
+REGRESSION_CORPUS = {"scale": "small", "books": 2, "units": 8, "seed": 0}
+
+# 기본 판정 기준
+DEFAULT_REPEAT = 10
+DEFAULT_WARMUP = 1
+DEFAULT_TIME_THRESHOLD = 0.10
+DEFAULT_MEMORY_THRESHOLD = 0.10
+# 측정값 하나의 최소 시간 (짧은 단계는 여러 번 실행해 평균)과 최대 실행 횟수
+MIN_SAMPLE_SECONDS = 0.2
+MAX_LOOPS = 100
+# 이보다 작은 메모리 증가는 측정 잡음으로 보고 무시
+MIN_MEMORY_GROWTH = 256 * 1024
+
+# 양측 95% 신뢰구간용 t 분포 임계값 (자유도 -> 값, 표에 없는 자유도는 바로 아래 값 사용)
+T_CRITICAL_95 = {1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306,
+                 9: 2.262, 10: 2.228, 12: 2.179, 15: 2.131, 20: 2.086, 30: 2.042, 60: 2.000, 120: 1.980}
+
+
+def t_critical(df: int) -> float:
+    """자유도 df의 95% t 임계값"""
+    if df <= 0:
+        return float("inf")
+    if df > max(T_CRITICAL_95):
+        return 1.96
+    return T_CRITICAL_95[max(key for key in T_CRITICAL_95 if key <= df)]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """
+    반복 측정값 요약 (평균의 95% 신뢰구간 포함)
+
+    Returns:
+        {'n', 'mean', 'stdev', 'median', 'min', 'ci_low', 'ci_high'}
+    """
+    n = len(samples)
+    mean = statistics.fmean(samples)
+    stdev = statistics.stdev(samples) if n > 1 else 0.0
+    half_width = t_critical(n - 1) * stdev / math.sqrt(n) if n > 1 else 0.0
+    return {
+        "n": n,
+        "mean": round(mean, 6),
+        "stdev": round(stdev, 6),
+        "median": round(statistics.median(samples), 6),
+        "min": round(min(samples), 6),
+        "ci_low": round(mean - half_width, 6),
+        "ci_high": round(mean + half_width, 6),
+    }
+
+
+def machine_profile() -> str:
+    """기준값 파일 이름으로 쓸 머신 프로파일 (OS, 아키텍처, CPU 수, Python 버전)"""
+    name = (f"{platform.system()}-{platform.machine()}-{os.cpu_count()}cpu-"
+            f"py{sys.version_info.major}.{sys.version_info.minor}")
+    return re.sub(r'[^\w.-]+', '_', name).lower()
+
+
+@contextlib.contextmanager
+def answering(root_dir: Path):
+    """with 블록 동안 질문에는 기본값으로 응답하고 화면 출력은 버림"""
+    original_input = builtins.input
+    builtins.input = auto_answer(root_dir)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        builtins.input = original_input
+
+
+class RegressionSuite:
+    """고정 코퍼스 준비와 단계별 측정 함수"""
+
+    def __init__(self, work_dir: Path):
+        self.work_dir = work_dir
+        self.root_dir = work_dir / "root"
+        self.output_dir = work_dir / "output"
+        self.configs: Dict[str, Dict] = {}
+        self.book_dirs: List[Path] = []
+        self.combined_pdfs: List[Path] = []
+
+    def prepare(self):
+        """코퍼스 생성 후 설정 단계를 기본 응답으로 한 번 실행해 병합 설정을 얻음 (측정하지 않음)"""
+        from pdfusion.config_v5 import ConfigManagerV5
+
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+        corpus = generate_corpus(self.root_dir, REGRESSION_CORPUS["scale"], REGRESSION_CORPUS["books"],
+                                 REGRESSION_CORPUS["units"], REGRESSION_CORPUS["seed"])
+        with answering(self.root_dir):
+            self.configs = ConfigManagerV5(prefetch=False).get_user_input()
+
+        for book in corpus["books"]:
+            book_dir = self.root_dir / book["title"]
+            self.book_dirs.append(book_dir)
+            for truth in book["categories"].values():
+                if truth["combined"]:
+                    self.combined_pdfs.extend(book_dir.rglob(truth["files"][0]))
+        if not self.configs or not self.combined_pdfs:
+            raise RuntimeError("회귀 검사용 코퍼스 준비 실패 (설정 또는 통합 파일 없음)")
+
+        # 전체 합본 측정에 필요한 유닛 파일
+        with answering(self.root_dir):
+            self.run_merge_all_units()
+
+    def run_unit_detection(self):
+        from pdfusion.config_v5 import ConfigManagerV5
+
+        manager = ConfigManagerV5(prefetch=False)
+        for pdf_path in self.combined_pdfs:
+            if not manager._extract_unit_page_lengths(pdf_path):
+                raise RuntimeError(f"유닛 감지 실패: {pdf_path}")
+
+    def run_discovery(self):
+        from pdfusion.file_discovery import FileDiscovery
+
+        discovery = FileDiscovery()
+        for book_dir in self.book_dirs:
+            discovery.discover(book_dir)
+
+    def _merger(self, book_title: str):
+        from pdfusion.merger import PDFMerger
+
+        return PDFMerger(output_dir=str(self.output_dir / book_title))
+
+    def run_merge_all_units(self):
+        for book_title, config in self.configs.items():
+            merge_config = {
+                "total_units": config["total_units"],
+                "categories": config["categories"],
+                "merge_order": config["merge_order"],
+                "review_tests": config.get("review_tests", []),
+            }
+            if not self._merger(book_title).merge_all_units(merge_config):
+                raise RuntimeError(f"유닛 병합 실패: {book_title}")
+
+    def run_merge_all_units_to_one(self):
+        for book_title, config in self.configs.items():
+            self._merger(book_title).merge_all_units_to_one(config["total_units"])
+
+    def stages(self) -> Dict[str, Callable[[], None]]:
+        """단계 이름 -> 측정할 함수 (보고서와 기준값의 키)"""
+        return {
+            "unit_detection": self.run_unit_detection,
+            "discovery": self.run_discovery,
+            "merge_all_units": self.run_merge_all_units,
+            "merge_all_units_to_one": self.run_merge_all_units_to_one,
+        }
+
+
+def _timed_call(func: Callable[[], None]) -> float:
+    """캐시를 비운 뒤 한 번 실행한 시간 (캐시 초기화는 측정에서 제외)"""
+    clear_caches()
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def measure(func: Callable[[], None], repeat: int, warmup: int, root_dir: Path) -> Dict:
+    """
+    함수 하나를 반복 측정 (매 실행 전 캐시 초기화, 시간 측정 후 tracemalloc으로 한 번 더 실행해 힙 최대값 측정)
+
+    실행 한 번이 MIN_SAMPLE_SECONDS보다 짧으면 여러 번 실행한 평균을 측정값 하나로 사용
+    (짧은 단계의 타이머 잡음이 신뢰구간을 좁게 왜곡하지 않도록)
+
+    Returns:
+        {'samples': [1회 실행 시간(초)...], 'loops': 측정값당 실행 횟수, 'time': summarize 결과,
+        'peak_alloc_bytes': int}
+    """
+    samples = []
+    with answering(root_dir):
+        elapsed = max(_timed_call(func) for _ in range(max(warmup, 1)))
+        loops = min(MAX_LOOPS, max(1, math.ceil(MIN_SAMPLE_SECONDS / elapsed))) if elapsed > 0 else MAX_LOOPS
+        for _ in range(repeat):
+            samples.append(sum(_timed_call(func) for _ in range(loops)) / loops)
+
+        clear_caches()
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return {"samples": [round(s, 6) for s in samples], "loops": loops, "time": summarize(samples),
+            "peak_alloc_bytes": peak}
+
+
+def compare_stage(baseline: Dict, current: Dict, time_threshold: float, memory_threshold: float) -> Dict:
+    """
+    단계 하나의 기준값 대비 변화
+
+    속도 저하는 현재 평균의 신뢰구간 하한이 기준값 신뢰구간 상한보다 클 때(구간이 겹치지 않을 때)만
+    유의하다고 보고, 평균 증가율이 time_threshold를 넘으면 회귀로 판정
+
+    Returns:
+        {'time_change', 'significant', 'memory_change', 'status'}
+    """
+    base_time, cur_time = baseline["time"], current["time"]
+    time_change = cur_time["mean"] / base_time["mean"] - 1 if base_time["mean"] else 0.0
+    significant = cur_time["ci_low"] > base_time["ci_high"] or cur_time["ci_high"] < base_time["ci_low"]
+
+    base_peak, cur_peak = baseline["peak_alloc_bytes"], current["peak_alloc_bytes"]
+    memory_change = cur_peak / base_peak - 1 if base_peak else 0.0
+
+    status = "ok"
+    if significant and time_change < 0:
+        status = "faster"
+    elif significant and time_change > time_threshold:
+        status = "slower"
+    if memory_change > memory_threshold and cur_peak - base_peak > MIN_MEMORY_GROWTH:
+        status = "memory" if status != "slower" else "slower+memory"
+    return {
+        "time_change": round(time_change, 4),
+        "significant": significant,
+        "memory_change": round(memory_change, 4),
+        "status": status,
+    }
+
+
+def _format_time(summary: Dict) -> str:
+    half_width = (summary["ci_high"] - summary["ci_low"]) / 2
+    return f"{summary['mean'] * 1000:8.1f}±{half_width * 1000:5.1f}ms"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="PDFusion 성능 회귀 검사")
+    parser.add_argument("--update-baseline", action="store_true", help="측정 결과를 기준값으로 저장")
+    parser.add_argument("--profile", default=None, help="머신 프로파일 이름 (기본값: 자동)")
+    parser.add_argument("--baseline-dir", default=str(BASELINE_DIR), help="기준값 폴더")
+    parser.add_argument("--stages", nargs="+", default=None, help="측정할 단계 (기본값: 전체)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="단계별 반복 횟수")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP, help="버리는 준비 실행 횟수")
+    parser.add_argument("--time-threshold", type=float, default=DEFAULT_TIME_THRESHOLD,
+                        help="회귀로 볼 평균 시간 증가율 (기본값: 0.10)")
+    parser.add_argument("--memory-threshold", type=float, default=DEFAULT_MEMORY_THRESHOLD,
+                        help="회귀로 볼 힙 최대값 증가율 (기본값: 0.10)")
+    parser.add_argument("--output", default=None, help="비교 결과 JSON 경로")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    if args.repeat < 2:
+        print("[오류] 신뢰구간을 계산하려면 --repeat는 2 이상이어야 합니다.")
+        return 2
+
+    profile = args.profile or machine_profile()
+    baseline_path = Path(args.baseline_dir) / f"{profile}.json"
+    baseline: Optional[Dict] = None
+    if not args.update_baseline:
+        if not baseline_path.exists():
+            print(f"[오류] 기준값이 없습니다: {baseline_path}")
+            print("       변경 전 코드에서 --update-baseline으로 먼저 저장하세요.")
+            return 2
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get("corpus") != REGRESSION_CORPUS:
+            print(f"[오류] 기준값의 코퍼스 구성이 다릅니다: {baseline.get('corpus')}")
+            return 2
+
+    work_dir = Path(tempfile.mkdtemp(prefix="pdfusion_regression_"))
+    previous_cwd = os.getcwd()
+    results: Dict[str, Dict] = {}
+    try:
+        os.chdir(work_dir)
+        suite = RegressionSuite(work_dir / "bench")
+        suite.prepare()
+        stages = suite.stages()
+        names = args.stages or list(stages)
+        unknown = [name for name in names if name not in stages]
+        if unknown:
+            print(f"[오류] 알 수 없는 단계: {', '.join(unknown)} (가능: {', '.join(stages)})")
+            return 2
+        for name in names:
+            print(f"측정 중: {name} ({args.repeat}회)")
+            results[name] = measure(stages[name], args.repeat, args.warmup, suite.root_dir)
+    finally:
+        os.chdir(previous_cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.update_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "profile": profile,
+                "generated_at": datetime.now().isoformat(timespec='seconds'),
+                "environment": environment_info(),
+                "corpus": REGRESSION_CORPUS,
+                "stages": results,
+            }, f, ensure_ascii=False, indent=2)
+        for name, result in results.items():
+            print(f"  {name:<24} {_format_time(result['time'])}  힙 {result['peak_alloc_bytes'] / 1024:,.0f}KB")
+        print(f"\n기준값 저장: {baseline_path}")
+        return 0
+
+    comparisons = {}
+    regressions = []
+    print(f"\n{'단계':<24} {'기준값':>18} {'현재':>18} {'시간':>8} {'힙':>8}  판정")
+    for name, current in results.items():
+        base = baseline["stages"].get(name)
+        if base is None:
+            print(f"{name:<24} (기준값 없음)")
+            continue
+        comparison = compare_stage(base, current, args.time_threshold, args.memory_threshold)
+        comparisons[name] = dict(comparison, baseline=base, current=current)
+        if comparison["status"] not in ("ok", "faster"):
+            regressions.append(name)
+        print(f"{name:<24} {_format_time(base['time']):>18} {_format_time(current['time']):>18} "
+              f"{comparison['time_change']:>+8.1%} {comparison['memory_change']:>+8.1%}  "
+              f"{comparison['status']}{'' if comparison['significant'] else ' (유의하지 않음)'}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"profile": profile, "baseline": str(baseline_path), "environment": environment_info(),
+                       "thresholds": {"time": args.time_threshold, "memory": args.memory_threshold},
+                       "stages": comparisons, "regressions": regressions}, f, ensure_ascii=False, indent=2)
+
+    if regressions:
+        print(f"\n[실패] 성능 회귀: {', '.join(regressions)}")
+        return 1
+    print("\n[통과] 기준값 대비 유의한 성능 회귀 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
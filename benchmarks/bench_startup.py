@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+시작 시간 벤치마크
+짧은 작업을 cron 등으로 많이 띄울 때 드는 시작 비용을 측정
+빈 인터프리터(python -c pass) 대비 추가 시간의 중앙값을 시나리오별로 재고, 목표를 넘기면 종료 코드 1을 반환
+
+사용 예:
+    python benchmarks/bench_startup.py --repeat 20
+    python benchmarks/bench_startup.py --target-ms 150
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# 빈 인터프리터 대비 허용하는 추가 시작 시간 (ms, --help 경로 기준)
+STARTUP_TARGET_MS = 150.0
+
+# 시나리오 이름 -> python 인자 (lean=True면 pypdf를 읽지 않아야 하는 경로)
+SCENARIOS = {
+    "interpreter": {"argv": ["-c", "pass"], "lean": True},
+    "cli_help": {"argv": [str(ROOT / "main_v5.py"), "--help"], "lean": True},
+    "import_package": {"argv": ["-c", "import pdfusion"], "lean": True},
+    "import_config_v5": {"argv": ["-c", "import pdfusion.config_v5"], "lean": True},
+    "import_merger": {"argv": ["-c", "import pdfusion.merger"], "lean": False},
+}
+
+# 목표와 비교하는 시나리오
+TARGET_SCENARIO = "cli_help"
+
+
+def time_command(argv: List[str], repeat: int, warmup: int) -> List[float]:
+    """
+    python 하위 프로세스를 repeat번 실행하며 경과 시간(초) 측정
+
+    Args:
+        argv: python 실행 인자
+        repeat: 측정 횟수
+        warmup: 측정 전에 버리는 실행 횟수 (디스크 캐시 준비)
+
+    Returns:
+        측정값 목록
+    """
+    command = [sys.executable] + argv
+    samples = []
+    for index in range(warmup + repeat):
+        started = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        elapsed = time.perf_counter() - started
+        if index >= warmup:
+            samples.append(elapsed)
+    return samples
+
+
+def loaded_heavy_modules(argv: List[str]) -> List[str]:
+    """
+    시나리오 실행 후 sys.modules에 남은 무거운 모듈 목록 (pypdf/PyPDF2와 병합 모듈)
+    -c 시나리오만 확인 가능 (스크립트 시나리오는 빈 목록)
+    """
+    if argv[0] != "-c":
+        return []
+    probe = (argv[1] + "\nimport sys, json\n"
+             "heavy = ('pypdf', 'PyPDF2', 'pdfusion.merger', 'pdfusion.fused_merge')\n"
+             "print(json.dumps(sorted(name for name in sys.modules if name in heavy)))")
+    result = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def help_loads_pypdf() -> bool:
+    """main_v5.py --help 실행이 pypdf/PyPDF2를 import하는지 (-X importtime 출력으로 확인)"""
+    result = subprocess.run([sys.executable, "-X", "importtime", str(ROOT / "main_v5.py"), "--help"],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    return any(line.rstrip().endswith(("| pypdf", "| PyPDF2")) for line in result.stderr.splitlines())
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="PDFusion 시작 시간 벤치마크")
+    parser.add_argument("--repeat", type=int, default=15, help="시나리오별 측정 횟수 (기본값: 15)")
+    parser.add_argument("--warmup", type=int, default=2, help="측정 전 버리는 실행 횟수 (기본값: 2)")
+    parser.add_argument("--target-ms", type=float, default=STARTUP_TARGET_MS,
+                        help=f"{TARGET_SCENARIO}의 빈 인터프리터 대비 추가 시간 목표 (ms, 기본값: %(default)s)")
+    parser.add_argument("--output", default=None,
+                        help="결과 JSON 경로 (기본값: benchmarks/results/startup_<시각>.json)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    scenarios: Dict[str, Dict] = {}
+    for name, scenario in SCENARIOS.items():
+        samples = time_command(scenario["argv"], args.repeat, args.warmup)
+        scenarios[name] = {
+            "median_ms": round(statistics.median(samples) * 1000, 2),
+            "min_ms": round(min(samples) * 1000, 2),
+            "max_ms": round(max(samples) * 1000, 2),
+            "lean": scenario["lean"],
+            "heavy_modules": loaded_heavy_modules(scenario["argv"]),
+        }
+
+    baseline_ms = scenarios["interpreter"]["median_ms"]
+    for result in scenarios.values():
+        result["overhead_ms"] = round(result["median_ms"] - baseline_ms, 2)
+
+    # lean 경로인데 무거운 모듈을 읽으면 시간과 무관하게 실패
+    leaks = {name: result["heavy_modules"] for name, result in scenarios.items()
+             if result["lean"] and result["heavy_modules"]}
+    if help_loads_pypdf():
+        leaks[TARGET_SCENARIO] = ["pypdf"]
+
+    overhead_ms = scenarios[TARGET_SCENARIO]["overhead_ms"]
+    passed = overhead_ms <= args.target_ms and not leaks
+
+    results = {
+        "benchmark": "startup",
+        "generated_at": datetime.now().isoformat(timespec='seconds'),
+        "environment": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+        },
+        "options": {"repeat": args.repeat, "warmup": args.warmup, "target_ms": args.target_ms},
+        "scenarios": scenarios,
+        "target_scenario": TARGET_SCENARIO,
+        "leaks": leaks,
+        "passed": passed,
+    }
+
+    output = Path(args.output) if args.output else (
+        ROOT / "benchmarks" / "results" / f"startup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+
+    print(f"{'시나리오':<18} {'중앙값(ms)':>11} {'추가(ms)':>10}  무거운 모듈")
+    for name, result in scenarios.items():
+        heavy = ", ".join(result["heavy_modules"]) or "-"
+        print(f"{name:<18} {result['median_ms']:>11.1f} {result['overhead_ms']:>10.1f}  {heavy}")
+    for name, modules in leaks.items():
+        print(f"[실패] {name}: 가벼운 경로에서 {', '.join(modules)} import")
+    verdict = "통과" if passed else "실패"
+    print(f"\n{TARGET_SCENARIO} 추가 시간 {overhead_ms:.1f}ms (목표 {args.target_ms:.0f}ms 이하): {verdict}")
+    print(f"결과 저장: {output}")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
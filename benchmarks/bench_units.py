@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+유닛 감지 정확도/속도 벤치마크
+정답(unit_page_lengths)이 있는 코퍼스(생성한 통합 PDF + 선택적으로 로컬 실제 파일)에서
+유닛 감지 방식별로 초당 페이지 수와 유닛 경계 정밀도/재현율을 함께 보고
+
+사용 예:
+    python benchmarks/bench_units.py --files 30
+    python benchmarks/bench_units.py --labels my_labels.json   # 실제 파일 추가
+
+--labels 파일 형식 (경로는 라벨 파일 기준 상대 경로 가능):
+    [{"path": "books/Word List.pdf", "unit_page_lengths": [4, 3, 5], "toc": true}, ...]
+"""
+
+import argparse
+import builtins
+import contextlib
+import io
+import json
+import logging
+import random
+import re
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.bench_pipeline import clear_caches, environment_info  # noqa: E402
+from benchmarks.corpus import BookSpec, make_combined_pdf  # noqa: E402
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # PyPDF2 호환
+    from PyPDF2 import PdfReader
+
+# PDF 리터럴 문자열 (괄호 안, 이스케이프 포함)
+PDF_LITERAL = re.compile(rb'\((?:\\.|[^\\)])*\)')
+
+
+class LabelledPDF:
+    """정답이 있는 통합 파일 하나"""
+
+    def __init__(self, path: Path, unit_page_lengths: List[int], toc: bool = False, source: str = "generated"):
+        """
+        Args:
+            path: PDF 경로
+            unit_page_lengths: 유닛별 페이지 길이 (목차 제외)
+            toc: 첫 페이지가 목차 (목차는 어느 유닛에도 속하지 않음)
+            source: 'generated' 또는 'local'
+        """
+        self.path = path
+        self.unit_page_lengths = unit_page_lengths
+        self.toc = toc
+        self.source = source
+
+    @property
+    def start_page(self) -> int:
+        return 1 if self.toc else 0
+
+
+def unit_starts(start_page: int, lengths: List[int]) -> List[int]:
+    """유닛별 페이지 길이를 유닛 시작 페이지 번호(절대 위치)로 변환"""
+    starts = []
+    page = start_page
+    for length in lengths:
+        starts.append(page)
+        page += length
+    return starts
+
+
+def generate_labelled(directory: Path, count: int, seed: int) -> List[LabelledPDF]:
+    """
+    헤더 표기, 목차, 표지, 본문 속 유닛 언급, 유닛 수/길이를 바꿔 가며 통합 파일 생성
+    """
+    rng = random.Random(seed)
+    labelled = []
+    for index in range(count):
+        units = rng.randint(4, 20)
+        lengths = [rng.randint(1, 6) for _ in range(units)]
+        spec = BookSpec(
+            title=f"Labelled {index:03d}",
+            units=units,
+            lines_per_page=10,
+            toc=index % 4 == 1,
+            cover=index % 4 == 3,
+            header_style=index,
+            cross_references=index % 5 == 4,
+        )
+        path = directory / f"labelled_{index:03d}.pdf"
+        label = make_combined_pdf(spec, "Word List", lengths, path)
+        labelled.append(LabelledPDF(path, label["unit_page_lengths"], label["toc"]))
+    return labelled
+
+
+def load_labels(labels_path: Path) -> List[LabelledPDF]:
+    """로컬 실제 파일의 정답 읽기"""
+    with open(labels_path, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+    labelled = []
+    for entry in entries:
+        path = Path(entry["path"])
+        if not path.is_absolute():
+            path = labels_path.parent / path
+        labelled.append(LabelledPDF(path, list(entry["unit_page_lengths"]), bool(entry.get("toc")), "local"))
+    return labelled
+
+
+@contextlib.contextmanager
+def answering_toc(exclude_toc: bool, asked: List[str]):
+    """설정 단계 질문 응답 (목차 제외 질문에는 정답대로, 나머지는 기본값), 물어본 질문은 asked에 기록"""
+    original_input = builtins.input
+
+    def answer(prompt: str = "") -> str:
+        asked.append(prompt)
+        if "목차" in prompt:
+            return "y" if exclude_toc else "n"
+        return ""
+
+    builtins.input = answer
+    try:
+        yield
+    finally:
+        builtins.input = original_input
+
+
+# ---------------------------------------------------------------------------
+# 감지 방식: (PDF, 정답) -> (시작 페이지, 유닛별 페이지 길이)
+# 정답은 목차 제외 여부를 사용자 응답처럼 흉내 내는 데만 사용
+# ---------------------------------------------------------------------------
+
+def backend_config_v5(item: LabelledPDF) -> Tuple[int, List[int]]:
+    """설정 단계와 같은 경로 (ConfigManagerV5._extract_unit_page_lengths, 사전 계산 없이)"""
+    from pdfusion.config_v5 import ConfigManagerV5
+
+    asked: List[str] = []
+    with answering_toc(item.toc, asked):
+        lengths = ConfigManagerV5(prefetch=False)._extract_unit_page_lengths(item.path)
+    excluded = item.toc and any("목차" in prompt for prompt in asked)
+    return (1 if excluded else 0), lengths
+
+
+def backend_scan(item: LabelledPDF) -> Tuple[int, List[int]]:
+    """unit_detection.scan_page_units 직접 호출 (샌드박스/계측/질문 없이)"""
+    from pdfusion.unit_detection import scan_page_units, unit_page_lengths_from_scan
+
+    scan = scan_page_units(item.path)
+    start_page = 1 if scan["first_page_is_toc"] and item.toc else 0
+    return start_page, unit_page_lengths_from_scan(scan["page_units"], start_page)
+
+
+def backend_legacy(item: LabelledPDF) -> Tuple[int, List[int]]:
+    """이전 버전 config.auto_detect_unit_pages (목차 제외 없음, Unit 1이 여러 번이면 첫 번째 사용)"""
+    from pdfusion.config import auto_detect_unit_pages
+
+    unit_pages = auto_detect_unit_pages(str(item.path), len(item.unit_page_lengths), ask=False)
+    groups = sorted(unit_pages.values(), key=min)
+    if not groups:
+        return 0, []
+    return min(groups[0]), [len(pages) for pages in groups]
+
+
+def probe_page_text(page) -> str:
+    """
+    레이아웃 분석 없이 내용 스트림의 리터럴 문자열만 모은 페이지 텍스트
+    (단순 글꼴 인코딩에서만 정확, CID/사용자 정의 인코딩 글꼴은 텍스트를 얻지 못함)
+    """
+    contents = page.get_contents()
+    if contents is None:
+        return ""
+    data = contents.get_data()
+    return " ".join(match[1:-1].decode("latin-1") for match in PDF_LITERAL.findall(data))
+
+
+def backend_content_probe(item: LabelledPDF) -> Tuple[int, List[int]]:
+    """빠른 후보: extract_text 대신 내용 스트림 문자열에서 유닛 헤더 탐색"""
+    from pdfusion.unit_detection import is_toc_page, page_unit_number, unit_page_lengths_from_scan
+
+    reader = PdfReader(str(item.path))
+    page_units = []
+    first_page_is_toc = False
+    for i, page in enumerate(reader.pages):
+        text = probe_page_text(page)
+        if i == 0:
+            first_page_is_toc = is_toc_page(text)
+        page_units.append(page_unit_number(text))
+    start_page = 1 if first_page_is_toc and item.toc else 0
+    return start_page, unit_page_lengths_from_scan(page_units, start_page)
+
+
+def backend_uniform(item: LabelledPDF) -> Tuple[int, List[int]]:
+    """기준선: 유닛 수만 알고 페이지를 균등 분할 (감지 없이 얻을 수 있는 정확도)"""
+    reader = PdfReader(str(item.path))
+    units = len(item.unit_page_lengths)
+    total = len(reader.pages) - item.start_page
+    lengths = [total // units] * units
+    lengths[-1] += total % units
+    return item.start_page, lengths
+
+
+BACKENDS: Dict[str, Callable[[LabelledPDF], Tuple[int, List[int]]]] = {
+    "config_v5": backend_config_v5,
+    "scan_page_units": backend_scan,
+    "legacy_auto_detect": backend_legacy,
+    "content_probe": backend_content_probe,
+    "uniform_split": backend_uniform,
+}
+
+
+def page_count(path: Path) -> int:
+    return len(PdfReader(str(path)).pages)
+
+
+def run_backend(name: str, items: List[LabelledPDF], pages: Dict[Path, int], repeat: int) -> Dict:
+    """
+    감지 방식 하나를 모든 파일에 실행 (반복 시 가장 빠른 실행 시간 사용, 캐시는 매번 초기화)
+
+    Returns:
+        {'pages_per_s', 'seconds', 'precision', 'recall', 'exact', 'files', 'errors', 'mismatches'}
+    """
+    backend = BACKENDS[name]
+    best = None
+    results: Dict[Path, Optional[Tuple[int, List[int]]]] = {}
+    errors = 0
+    for _ in range(repeat):
+        clear_caches()
+        errors = 0
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for item in items:
+                try:
+                    results[item.path] = backend(item)
+                except Exception:
+                    results[item.path] = None
+                    errors += 1
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    true_positive = predicted = expected = exact = 0
+    mismatches = []
+    for item in items:
+        truth = set(unit_starts(item.start_page, item.unit_page_lengths))
+        result = results[item.path]
+        found = set(unit_starts(*result)) if result else set()
+        true_positive += len(truth & found)
+        predicted += len(found)
+        expected += len(truth)
+        if result and result[0] == item.start_page and result[1] == item.unit_page_lengths:
+            exact += 1
+        elif len(mismatches) < 5:
+            mismatches.append({"file": item.path.name, "expected": item.unit_page_lengths,
+                               "detected": result[1] if result else None})
+
+    total_pages = sum(pages[item.path] for item in items)
+    return {
+        "seconds": round(best, 4),
+        "pages_per_s": round(total_pages / best, 1) if best else None,
+        "precision": round(true_positive / predicted, 4) if predicted else 0.0,
+        "recall": round(true_positive / expected, 4) if expected else 0.0,
+        "exact": exact,
+        "files": len(items),
+        "errors": errors,
+        "mismatches": mismatches,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="PDFusion 유닛 감지 정확도/속도 벤치마크")
+    parser.add_argument("--files", type=int, default=20, help="생성할 통합 파일 수 (기본값: 20)")
+    parser.add_argument("--seed", type=int, default=0, help="코퍼스 난수 시드")
+    parser.add_argument("--labels", default=None, help="로컬 실제 파일의 정답 JSON")
+    parser.add_argument("--backends", nargs="+", choices=list(BACKENDS), default=list(BACKENDS),
+                        help="실행할 감지 방식 (기본값: 전체)")
+    parser.add_argument("--repeat", type=int, default=1, help="방식별 반복 횟수 (가장 빠른 실행 사용)")
+    parser.add_argument("--output", default=None,
+                        help="결과 JSON 경로 (기본값: benchmarks/results/units_<시각>.json)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.CRITICAL)
+
+    work_dir = Path(tempfile.mkdtemp(prefix="pdfusion_units_"))
+    try:
+        items = generate_labelled(work_dir, args.files, args.seed)
+        if args.labels:
+            items.extend(load_labels(Path(args.labels).resolve()))
+        pages = {item.path: page_count(item.path) for item in items}
+        print(f"정답 코퍼스: 파일 {len(items)}개, {sum(pages.values()):,}페이지, "
+              f"유닛 {sum(len(item.unit_page_lengths) for item in items):,}개")
+
+        sources = sorted({item.source for item in items})
+        results: Dict[str, Dict] = {}
+        for name in args.backends:
+            results[name] = {"all": run_backend(name, items, pages, args.repeat)}
+            if len(sources) > 1:
+                for source in sources:
+                    subset = [item for item in items if item.source == source]
+                    results[name][source] = run_backend(name, subset, pages, args.repeat)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    output = Path(args.output) if args.output else (
+        ROOT / "benchmarks" / "results" / f"units_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            "benchmark": "unit_detection",
+            "generated_at": datetime.now().isoformat(timespec='seconds'),
+            "environment": environment_info(),
+            "options": {"files": args.files, "seed": args.seed, "labels": args.labels, "repeat": args.repeat},
+            "backends": results,
+        }, f, ensure_ascii=False, indent=2)
+
+    print(f"\n{'방식':<20} {'페이지/s':>10} {'정밀도':>8} {'재현율':>8} {'정확 일치':>10}")
+    for name, result in results.items():
+        row = result["all"]
+        print(f"{name:<20} {row['pages_per_s'] or 0:>10.1f} {row['precision']:>8.1%} {row['recall']:>8.1%} "
+              f"{row['exact']:>5}/{row['files']:<4}")
+    print(f"\n결과 저장: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,324 @@
+"""
+합성 교재 코퍼스 생성기
+실제 입력과 같은 모양(최상위 zip → 책 폴더 → prac book, 유닛별/통합 파일, "Unit N" 헤더, 목차,
+Review Test, 내부 zip, 정답 파일)의 책을 오프라인으로 만들고, 유닛 경계 정답을 함께 반환
+"""
+
+import json
+import random
+import shutil
+import zipfile
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+# 규모별 기본값: 책 수, 유닛 수, 유닛당 페이지 수, 페이지당 본문 줄 수
+SCALES = {
+    "small": {"books": 2, "units": 4, "pages_per_unit": 3, "lines_per_page": 8},
+    "medium": {"books": 6, "units": 8, "pages_per_unit": 6, "lines_per_page": 16},
+    "large": {"books": 12, "units": 16, "pages_per_unit": 10, "lines_per_page": 24},
+}
+
+LC_CATEGORIES = ["Word List", "Word Test"]
+# 책 번호 80~99 규칙의 RC 카테고리
+RC_CATEGORIES = ["Word List", "Word Test", "Translation Sheet", "Unscramble Sheet", "Unit Test"]
+
+# 유닛 헤더 표기 변형 (PDF 텍스트 추출 결과에서 흔히 보이는 형태)
+HEADER_STYLES = ["Unit {n}", "UNIT {n:02d}", "Unit.{n}", "U nit {n}", "Unit - {n}"]
+
+# 정답 정보 파일명 (코퍼스 루트)
+TRUTH_NAME = "corpus_truth.json"
+
+
+def _pdf_string(text: str) -> bytes:
+    """PDF 리터럴 문자열 (ASCII만 사용)"""
+    escaped = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    return escaped.encode("ascii", "replace")
+
+
+def make_pdf(path: Union[str, Path], pages: List[List[str]], compress: bool = True):
+    """
+    텍스트 페이지로 된 최소 PDF 생성
+
+    Args:
+        path: 저장 경로
+        pages: 페이지별 텍스트 줄 목록
+        compress: 내용 스트림 Flate 압축 여부
+    """
+    objects: List[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    font_id = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    pages_id = add(b"")
+    page_ids = []
+    for lines in pages:
+        ops = [b"BT /F1 18 Tf 60 740 Td 22 TL"]
+        for line in lines:
+            ops.append(b"(" + _pdf_string(line) + b") Tj T*")
+        ops.append(b"ET")
+        content = b"\n".join(ops)
+        if compress:
+            data = zlib.compress(content)
+            content_id = add(b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(data) + data + b"\nendstream")
+        else:
+            content_id = add(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+        page_ids.append(add(b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+                            b"/Resources << /Font << /F1 %d 0 R >> >> >>" % (pages_id, content_id, font_id)))
+    objects[pages_id - 1] = (b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % p for p in page_ids)
+                             + b"] /Count %d >>" % len(page_ids))
+    catalog_id = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog_id, xref)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(bytes(out))
+
+
+class BookSpec:
+    """합성 책 한 권의 구성"""
+
+    def __init__(self, title: str, book_type: str = "LC", units: int = 4, pages_per_unit: int = 3,
+                 lines_per_page: int = 8, combined: Optional[List[str]] = None, toc: bool = False,
+                 cover: bool = False, review_span: int = 4, nested_zips: bool = False,
+                 answers: bool = True, korean_names: bool = False, header_style: int = 0,
+                 cross_references: bool = False, seed: int = 0):
+        """
+        Args:
+            title: 책 제목 (LC/RC와 레벨 감지를 위해 'Listening'/'Reading', 'Level N' 포함 권장)
+            book_type: 'LC' 또는 'RC' (카테고리 구성 결정)
+            units: 유닛 수
+            pages_per_unit: 유닛당 평균 페이지 수 (유닛마다 ±1 변동)
+            lines_per_page: 페이지당 본문 줄 수 (텍스트 추출 비용)
+            combined: 한 파일에 모든 유닛을 담을 카테고리 (나머지는 유닛별 파일)
+            toc: 통합 파일 첫 페이지에 목차 추가
+            cover: 통합 파일 첫 유닛 앞에 헤더 없는 표지 추가
+            review_span: Review Test 하나가 다루는 유닛 수 (0이면 Review Test 없음)
+            nested_zips: 카테고리 폴더를 책 폴더 안의 zip으로 묶음
+            answers: 정답 파일(제외 대상) 추가
+            korean_names: 한글 폴더/파일명 추가
+            header_style: HEADER_STYLES 시작 번호 (유닛마다 순환)
+            cross_references: 본문에 다른 유닛을 언급하는 줄 추가 (헤더 오탐 검사용)
+            seed: 페이지 수 변동용 난수 시드
+        """
+        self.title = title
+        self.book_type = book_type
+        self.units = units
+        self.pages_per_unit = pages_per_unit
+        self.lines_per_page = lines_per_page
+        categories = LC_CATEGORIES if book_type == "LC" else RC_CATEGORIES
+        self.categories = list(categories)
+        self.combined = [c for c in (combined if combined is not None else categories[:1]) if c in categories]
+        self.toc = toc
+        self.cover = cover
+        self.review_span = review_span
+        self.nested_zips = nested_zips
+        self.answers = answers
+        self.korean_names = korean_names
+        self.header_style = header_style
+        self.cross_references = cross_references
+        self.seed = seed
+
+
+def _unit_pages(spec: BookSpec, category: str, unit: int, length: int) -> List[List[str]]:
+    """유닛 하나의 페이지 (첫 페이지에 유닛 헤더, 이후 페이지는 본문만)"""
+    style = HEADER_STYLES[(spec.header_style + unit) % len(HEADER_STYLES)]
+    pages = []
+    for page in range(length):
+        lines = [style.format(n=unit) + f" {category}"] if page == 0 else []
+        for line in range(spec.lines_per_page):
+            lines.append(f"{category} {unit}-{page}-{line} vocabulary practice sentence number {line}")
+        if spec.cross_references and page == length - 1 and unit < spec.units:
+            # 헤더가 아닌 본문 속 유닛 언급 (헤더 없는 페이지에서 오탐을 일으키는 경우)
+            lines.append(f"Preview the words of Unit {unit + 1}")
+        pages.append(lines)
+    return pages
+
+
+def make_combined_pdf(spec: BookSpec, category: str, lengths: List[int], path: Union[str, Path]) -> Dict:
+    """
+    모든 유닛을 담은 통합 파일 생성
+
+    Args:
+        spec: 책 구성 (목차, 표지, 헤더 표기 등)
+        category: 카테고리 이름 (페이지 본문에 사용)
+        lengths: 유닛별 본문 페이지 수
+        path: 저장 경로
+
+    Returns:
+        정답 정보 {'unit_page_lengths', 'toc', 'cover', 'pages'}
+        (unit_page_lengths는 목차를 제외한 길이, 헤더 없는 표지는 첫 유닛에 포함)
+    """
+    pages = []
+    if spec.toc:
+        pages.append(["Contents"] + [f"Unit {u} ........ {u * 10}" for u in range(1, len(lengths) + 1)])
+    if spec.cover:
+        pages.append([f"{spec.title}", f"{category}", "Student Book"])
+    for unit, length in enumerate(lengths, 1):
+        pages.extend(_unit_pages(spec, category, unit, length))
+    make_pdf(path, pages)
+    unit_lengths = list(lengths)
+    if spec.cover:
+        unit_lengths[0] += 1
+    return {"unit_page_lengths": unit_lengths, "toc": spec.toc, "cover": spec.cover, "pages": len(pages)}
+
+
+def generate_book(spec: BookSpec, root: Union[str, Path], stage_dir: Union[str, Path]) -> Dict:
+    """
+    책 한 권을 만들고 root/<title>.zip으로 압축
+
+    Args:
+        spec: 책 구성
+        root: zip을 둘 최상위 폴더 (파이프라인 입력)
+        stage_dir: 압축 전 파일을 만들 작업 폴더
+
+    Returns:
+        정답 정보 {'title', 'book_type', 'units', 'pages', 'categories': {이름: {'combined', 'files',
+        'unit_page_lengths', 'toc', 'cover'}}, 'review_tests': [{'file', 'start_unit', 'end_unit', 'pages'}]}
+    """
+    rng = random.Random(spec.seed)
+    root, stage_dir = Path(root), Path(stage_dir)
+    book_dir = stage_dir / spec.title
+    shutil.rmtree(book_dir, ignore_errors=True)
+    prac_dir = book_dir / "prac book"
+    lengths = [max(1, spec.pages_per_unit + rng.randint(-1, 1)) for _ in range(spec.units)]
+    truth = {"title": spec.title, "book_type": spec.book_type, "units": spec.units,
+             "pages": 0, "categories": {}, "review_tests": []}
+
+    for category in spec.categories:
+        category_dir = prac_dir / category
+        if category in spec.combined:
+            file_name = f"{category}.pdf"
+            label = make_combined_pdf(spec, category, lengths, category_dir / file_name)
+            truth["categories"][category] = dict(label, combined=True, files=[file_name])
+            truth["pages"] += label["pages"]
+        else:
+            files = []
+            for unit, length in enumerate(lengths, 1):
+                file_name = f"{category} Unit {unit:02d}.pdf"
+                make_pdf(category_dir / file_name, _unit_pages(spec, category, unit, length))
+                files.append(file_name)
+            truth["categories"][category] = {"combined": False, "files": files,
+                                             "unit_page_lengths": list(lengths), "toc": False, "cover": False}
+            truth["pages"] += sum(lengths)
+        if spec.answers:
+            answer_name = f"{category} 정답.pdf" if spec.korean_names else f"{category} Answer.pdf"
+            make_pdf(category_dir / answer_name, [["Answer key", category]])
+
+    if spec.review_span:
+        for start in range(1, spec.units + 1, spec.review_span):
+            end = min(start + spec.review_span - 1, spec.units)
+            file_name = f"Units {start:02d}-{end:02d} Review Test.pdf"
+            make_pdf(prac_dir / "Review Test" / file_name,
+                     [[f"Review Test Units {start}-{end}", f"question {q}"] for q in range(2)])
+            truth["review_tests"].append({"file": file_name, "start_unit": start, "end_unit": end, "pages": 2})
+            truth["pages"] += 2
+
+    if spec.korean_names:
+        make_pdf(book_dir / "부록" / "학습 안내.pdf", [["Guide"]])
+
+    if spec.nested_zips:
+        # 카테고리 폴더를 책 폴더 안의 zip으로 묶음 (설정 단계의 내부 압축 해제 대상)
+        for category in spec.categories:
+            category_dir = prac_dir / category
+            with zipfile.ZipFile(book_dir / f"{category}.zip", 'w', zipfile.ZIP_DEFLATED) as inner:
+                for path in sorted(category_dir.rglob("*")):
+                    inner.write(path, path.relative_to(prac_dir))
+            shutil.rmtree(category_dir)
+
+    root.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(root / f"{spec.title}.zip", 'w', zipfile.ZIP_DEFLATED) as archive:
+        for path in sorted(book_dir.rglob("*")):
+            archive.write(path, path.relative_to(stage_dir))
+    return truth
+
+
+def corpus_specs(scale: str = "small", books: Optional[int] = None, units: Optional[int] = None,
+                 seed: int = 0) -> List[BookSpec]:
+    """
+    규모에 맞는 책 구성 목록 (LC/RC, 통합/유닛별, 목차, 내부 zip 등을 책마다 돌아가며 적용)
+
+    Args:
+        scale: SCALES의 이름
+        books: 책 수 (None이면 규모 기본값)
+        units: 책당 유닛 수 (None이면 규모 기본값)
+        seed: 난수 시드
+    """
+    preset = SCALES[scale]
+    books = preset["books"] if books is None else books
+    units = preset["units"] if units is None else units
+    specs = []
+    for index in range(books):
+        book_type = "LC" if index % 2 == 0 else "RC"
+        kind = "Listening" if book_type == "LC" else "Reading"
+        categories = LC_CATEGORIES if book_type == "LC" else RC_CATEGORIES
+        specs.append(BookSpec(
+            title=f"Bricks {kind} {80 + index} Level {index % 3 + 1}",
+            book_type=book_type,
+            units=units,
+            pages_per_unit=preset["pages_per_unit"],
+            lines_per_page=preset["lines_per_page"],
+            # 통합 파일 카테고리 수를 책마다 바꿈 (0개, 1개, 2개 ...)
+            combined=categories[:index % 3],
+            toc=index % 4 == 1,
+            cover=index % 4 == 3,
+            review_span=4 if index % 5 != 4 else 0,
+            nested_zips=index % 3 == 2,
+            answers=True,
+            korean_names=index % 2 == 1,
+            header_style=index,
+            seed=seed + index,
+        ))
+    return specs
+
+
+def generate_corpus(root: Union[str, Path], scale: str = "small", books: Optional[int] = None,
+                    units: Optional[int] = None, seed: int = 0) -> Dict:
+    """
+    코퍼스 생성 (root 아래 책별 zip과 정답 정보 파일)
+
+    Args:
+        root: 코퍼스 폴더 (기존 내용은 삭제)
+        scale: SCALES의 이름
+        books: 책 수 (None이면 규모 기본값)
+        units: 책당 유닛 수 (None이면 규모 기본값)
+        seed: 난수 시드
+
+    Returns:
+        {'scale', 'books': [책별 정답 정보], 'pages': 총 페이지 수}
+    """
+    root = Path(root)
+    shutil.rmtree(root, ignore_errors=True)
+    stage_dir = root.parent / f".{root.name}_stage"
+    shutil.rmtree(stage_dir, ignore_errors=True)
+    truths = [generate_book(spec, root, stage_dir) for spec in corpus_specs(scale, books, units, seed)]
+    shutil.rmtree(stage_dir, ignore_errors=True)
+    corpus = {"scale": scale, "books": truths, "pages": sum(t["pages"] for t in truths)}
+    with open(root.parent / f"{root.name}_{TRUTH_NAME}", 'w', encoding='utf-8') as f:
+        json.dump(corpus, f, ensure_ascii=False, indent=2)
+    return corpus
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="합성 교재 코퍼스 생성")
+    parser.add_argument("root", help="코퍼스 폴더 (기존 내용 삭제)")
+    parser.add_argument("--scale", choices=list(SCALES), default="small")
+    parser.add_argument("--books", type=int, default=None)
+    parser.add_argument("--units", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    result = generate_corpus(args.root, args.scale, args.books, args.units, args.seed)
+    print(f"{len(result['books'])}권, {result['pages']:,}페이지 생성: {args.root}")
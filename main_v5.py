@@ -5,57 +5,265 @@ PDFusion - PDF 자동 병합 프로그램 (ver_5)
 """
 
 import sys
+import argparse
+from datetime import datetime
 from pathlib import Path
 
 # 프로젝트 루트를 Python 경로에 추가
 sys.path.insert(0, str(Path(__file__).parent))
 
-from pdfusion.config_v5 import ConfigManagerV5
-from pdfusion.merger import PDFMerger
+# 시작 시에는 인자 처리에 필요한 가벼운 모듈만 import
+# (pypdf를 쓰는 설정/병합 모듈은 실제로 쓰는 곳에서 import하므로 --help 등은 pypdf를 읽지 않고 끝남)
+from pdfusion.events import configure_events
+from pdfusion.log_config import DEFAULT_LEVEL, SUBSYSTEMS, configure_logging
+from pdfusion.output_profiles import DEFAULT_OUTPUT_PROFILE, IMAGE_PROFILES, OUTPUT_PROFILES
+from pdfusion.output_store import DEFAULT_MAX_STORE_MB, STORE_DIR_NAME, OutputStore, configure_output_store
+from pdfusion.profiling import DEFAULT_TOP_N, configure_profiling
+from pdfusion.sandbox import (DEFAULT_CPU_SECONDS, DEFAULT_MEMORY_MB, DEFAULT_TIMEOUT, configure_sandbox,
+                              get_quarantine)
+from pdfusion.source_cache import DEFAULT_MEMORY_BUDGET, configure_source_cache
+
+
+def process_book(book_title: str, book_config: dict, output_profile: str = DEFAULT_OUTPUT_PROFILE,
+                 image_profile=None, use_store: bool = True, resume: bool = False,
+                 skip_toc: bool = False, output_root: str = "output") -> bool:
+    """책 하나 병합 (검증 → 유닛 병합 → 전체 합본, 결과는 output_root/<책>에 저장)"""
+    from pdfusion.fused_merge import FusedMergeEngine
+    from pdfusion.merger import PDFMerger
+
+    print(f"\n{'='*60}")
+    print(f"[책: {book_title}] 병합 시작")
+    if book_config.get('book_type'):
+        print(f"책 타입: {book_config['book_type']}")
+    if book_config.get('level'):
+        print(f"레벨: {book_config['level']}")
+    print(f"{'='*60}")
+
+    output_dir = str(Path(output_root) / book_title)
+    # 모든 책이 output/.store를 공유하므로 같은 입력의 유닛은 한 번만 병합됨
+    output_store = OutputStore(Path(output_root) / STORE_DIR_NAME) if use_store else None
+    merger = PDFMerger(output_dir=output_dir, output_profile=output_profile, image_profile=image_profile,
+                       output_store=output_store, resume=resume,
+                       config_metrics=book_config.get("config_metrics"))
+
+    # 병합용 config dict 생성
+    merge_config = {
+        "total_units": book_config["total_units"],
+        "categories": book_config["categories"],
+        "merge_order": book_config["merge_order"],
+        "review_tests": book_config.get("review_tests", [])
+    }
+
+    # PDF 파일 검증
+    if not merger.validate_pdf_files(merge_config):
+        print(f"\n[실패] {book_title} PDF 파일 검증에 실패했습니다. 오류를 수정 후 다시 시도하세요.")
+        return False
+
+    # 융합 병합: 설정 단계에서 유닛 감지를 미룬 카테고리가 있으면 감지와 분배를 한 번에
+    if any(info.get("detect_units") for info in merge_config["categories"].values()):
+        engine = FusedMergeEngine(merger, skip_toc=skip_toc)
+        if engine.run(merge_config):
+            print(f"\n[완료] {book_title} 모든 유닛 PDF 병합이 성공적으로 완료되었습니다.")
+            merger.merge_all_units_to_one(engine.total_units)
+            return True
+        print(f"\n[실패] {book_title} 병합 과정에서 오류가 발생했습니다. 로그를 확인하세요.")
+        return False
+
+    # 병합 실행
+    if merger.merge_all_units(merge_config):
+        print(f"\n[완료] {book_title} 모든 유닛 PDF 병합이 성공적으로 완료되었습니다.")
+        # 전체 합본 PDF 자동 생성
+        merger.merge_all_units_to_one(merge_config["total_units"])
+        return True
+
+    print(f"\n[실패] {book_title} 병합 과정에서 오류가 발생했습니다. 로그를 확인하세요.")
+    return False
+
+
+def save_pipeline_metrics(jobs) -> Path:
+    """
+    실행 전체 계측 결과 저장 (설정 단계와 이 프로세스에서 실행된 병합 단계, 책별 소요 시간)
+    병렬 작업 프로세스의 단계별 결과는 책별 merge_report_*.json에 있음
+    """
+    from pdfusion.metrics import cache_snapshot, get_metrics, write_metrics_report
+
+    metrics = get_metrics()
+    report = {
+        "stages": metrics.snapshot(),
+        "books": {
+            job.name: {
+                "wall_s": job.actual_cost,
+                "success": bool(job.result),
+                "error": job.error,
+                "stages": metrics.snapshot(scope=job.name),
+            }
+            for job in jobs
+        },
+        "caches": cache_snapshot(),
+    }
+    path = Path("output") / f"pipeline_metrics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_metrics_report(path, report)
+    return path
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="PDFusion - 유닛별 PDF 자동 병합 도구 (ver_5)")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="동시에 병합할 책 수 (기본값: 1, 순서대로 처리). --serve에서는 동시에 실행할 작업 수")
+    parser.add_argument("--memory-limit", type=int, default=None, metavar="MB",
+                        help="동시 병합 중인 책들의 추정 메모리 합 상한 (MB)")
+    parser.add_argument("--threads", action="store_true",
+                        help="프로세스 대신 스레드 풀로 병렬 처리")
+    parser.add_argument("--source-cache-mb", type=int, default=DEFAULT_MEMORY_BUDGET // (1024 * 1024), metavar="MB",
+                        help="책들이 공유하는 원본 PDF reader 캐시의 메모리 예산 (MB, 기본값: %(default)s)")
+    parser.add_argument("--output-profile", choices=list(OUTPUT_PROFILES), default=DEFAULT_OUTPUT_PROFILE,
+                        help="출력 저장 방식: fast(기본), compact(객체 스트림+압축, 가장 작음), "
+                             "archival(압축+고전 xref)")
+    parser.add_argument("--image-profile", choices=list(IMAGE_PROFILES), default=None,
+                        help="고해상도 이미지 다운샘플링: print(300dpi), tablet(150dpi) (기본값: 사용 안 함, Pillow 필요)")
+    parser.add_argument("--image-dpi", type=int, default=None, metavar="DPI",
+                        help="이미지 프로필의 목표 dpi 대신 사용할 값")
+    parser.add_argument("--image-quality", type=int, default=None, metavar="Q",
+                        help="이미지 프로필의 JPEG 품질(1~95) 대신 사용할 값")
+    parser.add_argument("--no-store", action="store_true",
+                        help="출력 저장소(output/.store)를 쓰지 않고 모든 유닛을 다시 병합")
+    parser.add_argument("--store-max-mb", type=int, default=DEFAULT_MAX_STORE_MB, metavar="MB",
+                        help="출력 저장소 크기 상한, 넘으면 가장 오래 쓰이지 않은 결과부터 삭제 "
+                             "(MB, 0이면 제한 없음, 기본값: %(default)s)")
+    parser.add_argument("--store-prune", action="store_true",
+                        help="병합하지 않고 출력 저장소만 --store-max-mb 이하로 정리한 뒤 종료 (0이면 모두 삭제)")
+    parser.add_argument("--resume", action="store_true",
+                        help="중단된 이전 실행 이어하기 (입력이 같고 출력이 온전한 유닛은 건너뜀)")
+    parser.add_argument("--sandbox", action="store_true",
+                        help="페이지 수/유닛 스캔을 자원 제한이 걸린 자식 프로세스에서 실행하고 제한을 넘긴 PDF는 격리")
+    parser.add_argument("--sandbox-timeout", type=float, default=DEFAULT_TIMEOUT, metavar="SEC",
+                        help="격리 실행 작업 하나의 경과 시간 제한 (초, 기본값: %(default)s)")
+    parser.add_argument("--sandbox-cpu", type=int, default=DEFAULT_CPU_SECONDS, metavar="SEC",
+                        help="격리 실행 작업 하나의 CPU 시간 제한 (초, 기본값: %(default)s)")
+    parser.add_argument("--sandbox-memory-mb", type=int, default=DEFAULT_MEMORY_MB, metavar="MB",
+                        help="격리 실행 작업 하나의 메모리(주소 공간) 제한 (MB, 기본값: %(default)s)")
+    parser.add_argument("--fused", action="store_true",
+                        help="통합 파일을 한 번만 읽으며 유닛 감지와 분배를 동시에 수행 (설정 단계의 유닛 스캔 생략)")
+    parser.add_argument("--fused-skip-toc", action="store_true",
+                        help="융합 병합에서 통합 파일의 첫 페이지가 목차로 감지되면 제외 (질문하지 않음)")
+    parser.add_argument("--memory-budget", type=int, default=None, metavar="MB",
+                        help="병합 프로세스 하나의 메모리 예산 (MB). 넘으면 캐시를 비우고 융합 병합의 유닛 writer를 "
+                             "임시 파일로 내보내며, 여러 책을 병합할 때는 새 책의 시작을 미룸")
+    parser.add_argument("--track-heap", action="store_true",
+                        help="유닛/책별 최대 Python 힙도 기록 (tracemalloc 사용, 느려짐)")
+    parser.add_argument("--profile", default=None, metavar="STAGES",
+                        help="cProfile/tracemalloc으로 측정할 단계 (쉼표로 구분, 예: merge,unit_detection,discovery,"
+                             "zip_extraction 또는 all, 환경 변수 PDFUSION_PROFILE로도 지정 가능). "
+                             "결과는 output/<책>/profiles에 저장")
+    parser.add_argument("--profile-top", type=int, default=DEFAULT_TOP_N, metavar="N",
+                        help="프로파일 요약과 메모리 할당 목록에 남길 상위 항목 수 (기본값: %(default)s)")
+    parser.add_argument("--events", default=None, metavar="PATH",
+                        help="진행 이벤트(단계 시작/종료, 유닛 완료, 처리량, 캐시 적중)를 JSONL로 기록할 파일 "
+                             "(환경 변수 PDFUSION_EVENTS로도 지정 가능, 병렬 작업 프로세스도 같은 파일에 기록)")
+    parser.add_argument("--serve", action="store_true",
+                        help="상주 서비스 모드: 질문 대신 로컬 HTTP/Unix 소켓 API로 병합 작업(책 경로와 질문 답 JSON)을 "
+                             "받아 처리하고, 원본 reader/페이지 수/유닛 스캔 결과를 작업 사이에 유지")
+    parser.add_argument("--host", default=None,
+                        help="--serve의 TCP 주소 (기본값: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=None,
+                        help="--serve의 TCP 포트 (기본값: 8765)")
+    parser.add_argument("--socket", default=None, metavar="PATH",
+                        help="--serve를 TCP 대신 Unix 소켓으로 열기")
+    parser.add_argument("--queue-size", type=int, default=None, metavar="N",
+                        help="--serve에서 대기할 수 있는 작업 수, 넘으면 503 (기본값: 16)")
+    parser.add_argument("--quiet", action="store_true",
+                        help="조용한 모드: 경고 이상과 단계별 진행 요약 줄만 출력 (파일별 상세 로그 생략)")
+    parser.add_argument("--log-level", default=DEFAULT_LEVEL, metavar="LEVEL",
+                        help="기본 로그 수준 (DEBUG, INFO, WARNING, ERROR, 기본값: %(default)s)")
+    parser.add_argument("--log-levels", default=None, metavar="SPEC",
+                        help="하위 시스템별 로그 수준 (예: merge=debug,discovery=warning). "
+                             f"하위 시스템: {', '.join(SUBSYSTEMS)} (로거 이름도 사용 가능)")
+    return parser.parse_args(argv)
+
 
 if __name__ == "__main__":
-    import logging
-    from pathlib import Path
-    
-    logging.basicConfig(level=logging.INFO)
+    args = parse_args()
+
+    from pdfusion.config_v5 import ConfigManagerV5
+    from pdfusion.memory import configure_memory
+    from pdfusion.scheduler import BatchScheduler, ScheduledJob, estimate_book_cost
+
+    try:
+        configure_logging(level=args.log_level, levels=args.log_levels, quiet=args.quiet)
+    except ValueError as e:
+        sys.exit(f"[오류] 로그 설정: {e}")
     print("\n" + "="*60)
     print("PDFusion - 유닛별 PDF 자동 병합 도구 (ver_5)")
     print("="*60)
     print("[확인] config_v5.py 사용 중\n")
 
-    config_manager = ConfigManagerV5()
+    configure_source_cache(args.source_cache_mb * 1024 * 1024)
+    try:
+        configure_output_store(args.store_max_mb)
+    except ValueError as e:
+        sys.exit(f"[오류] 저장소 설정: {e}")
+    if args.store_prune:
+        store = OutputStore(Path("output") / STORE_DIR_NAME)
+        removed, remaining = store.prune()
+        print(f"[정리] 출력 저장소에서 {removed}개 삭제, 남은 크기 {remaining / (1024 * 1024):.1f}MB")
+        sys.exit(0)
+    if args.events:
+        configure_events(args.events)
+    if args.sandbox:
+        configure_sandbox(True, timeout=args.sandbox_timeout, cpu_seconds=args.sandbox_cpu,
+                          memory_mb=args.sandbox_memory_mb)
+
+    if args.memory_budget is not None or args.track_heap:
+        configure_memory(budget_mb=args.memory_budget, track_heap=args.track_heap or None)
+    if args.profile is not None:
+        configure_profiling(args.profile, top_n=args.profile_top, output_root="output")
+
+    image_profile = args.image_profile
+    if args.image_dpi or args.image_quality:
+        image_profile = dict(IMAGE_PROFILES[args.image_profile or "print"])
+        if args.image_dpi:
+            image_profile["target_dpi"] = args.image_dpi
+        if args.image_quality:
+            image_profile["quality"] = args.image_quality
+
+    if args.serve:
+        from pdfusion.service import DEFAULT_HOST, DEFAULT_PORT, DEFAULT_QUEUE_SIZE, MergeService, serve
+
+        service = MergeService(
+            process_book, workers=args.jobs, queue_size=args.queue_size or DEFAULT_QUEUE_SIZE,
+            defaults={"fused": args.fused, "skip_toc": args.fused_skip_toc, "output_profile": args.output_profile,
+                      "image_profile": image_profile, "use_store": not args.no_store, "resume": args.resume})
+        serve(service, host=args.host or DEFAULT_HOST,
+              port=args.port if args.port is not None else DEFAULT_PORT, socket_path=args.socket)
+        sys.exit(0)
+
+    config_manager = ConfigManagerV5(fused=args.fused)
     configs = config_manager.get_user_input()
 
-    # 여러 책을 처리하는 경우
+    quarantined = get_quarantine().entries()
+    if quarantined:
+        print(f"\n[경고] 제한을 넘겨 격리된 PDF {len(quarantined)}개 (해당 파일은 건너뜀):")
+        for pdf_path, reason in sorted(quarantined.items()):
+            print(f"  - {pdf_path}: {reason}")
+
+    # 여러 책을 처리하는 경우 - 예상 비용이 큰 책부터 배분
+    jobs = []
     for book_title, book_config in configs.items():
-        print(f"\n{'='*60}")
-        print(f"[책: {book_title}] 병합 시작")
-        if book_config.get('book_type'):
-            print(f"책 타입: {book_config['book_type']}")
-        if book_config.get('level'):
-            print(f"레벨: {book_config['level']}")
-        print(f"{'='*60}")
-        
-        output_dir = str(Path("output") / book_title)
-        merger = PDFMerger(output_dir=output_dir)
-
-        # 병합용 config dict 생성
-        merge_config = {
-            "total_units": book_config["total_units"],
-            "categories": book_config["categories"],
-            "merge_order": book_config["merge_order"],
-            "review_tests": book_config.get("review_tests", [])
-        }
-
-        # PDF 파일 검증
-        if not merger.validate_pdf_files(merge_config):
-            print(f"\n[실패] {book_title} PDF 파일 검증에 실패했습니다. 오류를 수정 후 다시 시도하세요.")
-            continue
-
-        # 병합 실행
-        if merger.merge_all_units(merge_config):
-            print(f"\n[완료] {book_title} 모든 유닛 PDF 병합이 성공적으로 완료되었습니다.")
-            # 전체 합본 PDF 자동 생성
-            merger.merge_all_units_to_one(merge_config["total_units"])
-        else:
-            print(f"\n[실패] {book_title} 병합 과정에서 오류가 발생했습니다. 로그를 확인하세요.")
+        estimate = estimate_book_cost(book_config)
+        job_args = (book_title, book_config, args.output_profile, image_profile, not args.no_store,
+                    args.resume, args.fused_skip_toc)
+        jobs.append(ScheduledJob(book_title, process_book, job_args,
+                                 estimated_cost=estimate["cost"],
+                                 estimated_memory=estimate["memory"],
+                                 page_cost=estimate["page_cost"], parse_cost=estimate["parse_cost"]))
+
+    scheduler = BatchScheduler(
+        max_workers=args.jobs,
+        memory_limit=args.memory_limit * 1024 * 1024 if args.memory_limit else None,
+        use_processes=not args.threads,
+        calibration_path=str(Path("output") / ".scheduler_calibration.json"),
+    )
+    scheduler.run(jobs)
+    if jobs:
+        print(f"\n📊 단계별 계측 결과: {save_pipeline_metrics(jobs)}")
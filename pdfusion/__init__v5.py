@@ -6,15 +6,35 @@ __version__ = "3.0.0"
 __author__ = "Uijin"
 __email__ = ".com"
 
-from .merger import PDFMerger
-from .config_v5 import ConfigManagerV5
+import importlib
+
+# 공개 이름 -> 정의된 모듈 (pypdf를 가져오는 무거운 모듈은 처음 사용할 때 불러옴, PEP 562)
+_LAZY_ATTRS = {
+    "PDFMerger": ".merger",
+    "ConfigManagerV5": ".config_v5",
+}
 
 __all__ = ["PDFMerger", "ConfigManagerV5"]
 
 
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __package__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
 def main():
     import logging
     from pathlib import Path
+    from .config_v5 import ConfigManagerV5
+    from .merger import PDFMerger
     logging.basicConfig(level=logging.INFO)
     print("\nPDFusion - 유닛별 PDF 자동 병합 도구 (ver_5)\n")
 
@@ -7,7 +7,9 @@ import re
 import logging
 from pathlib import Path
 from typing import Optional, Dict
-from pypdf import PdfReader
+
+from .events import BOOK_TYPE_DETECTED, emit
+from .sources import open_reader
 
 logger = logging.getLogger(__name__)
 
@@ -36,9 +38,17 @@ class BookTypeDetector:
         r'[_\s]RC[_\s]',
     ]
     
-    def __init__(self):
+    # PDF 내용 감지에 사용할 디렉토리 내 파일 수
+    CONTENT_SNIFF_FILES = 3
+    
+    def __init__(self, prefetcher=None):
+        """
+        Args:
+            prefetcher: PDF 내용 감지 결과를 미리 계산해 두는 Prefetcher (선택)
+        """
         self.lc_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.LC_PATTERNS]
         self.rc_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.RC_PATTERNS]
+        self.prefetcher = prefetcher
     
     def detect_from_path(self, path: Path) -> Optional[str]:
         """
@@ -51,40 +61,35 @@ class BookTypeDetector:
             'LC', 'RC', 또는 None
         """
         path_str = str(path).lower()
-        logger.debug(f"[DEBUG] 경로에서 LC/RC 감지 시도: {path}")
-        logger.debug(f"[DEBUG] 경로 문자열 (소문자): {path_str}")
+        # 파일마다 불리므로 DEBUG가 꺼져 있으면 패턴별 상세 로그를 만들지 않음
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("[DEBUG] 경로에서 LC/RC 감지 시도: %s", path)
+            logger.debug("[DEBUG] 경로 문자열 (소문자): %s", path_str)
         
         # 간단한 규칙: Listening → LC, Reading → RC
         if 'listening' in path_str:
-            logger.info(f"[DEBUG] ✅ LC 감지 성공! (Listening 발견: {path})")
-            print(f"[DEBUG] LC 감지: {path.name} (Listening 포함)")
+            logger.info("[DEBUG] ✅ LC 감지 성공! (Listening 발견: %s)", path)
             return 'LC'
         
         if 'reading' in path_str:
-            logger.info(f"[DEBUG] ✅ RC 감지 성공! (Reading 발견: {path})")
-            print(f"[DEBUG] RC 감지: {path.name} (Reading 포함)")
+            logger.info("[DEBUG] ✅ RC 감지 성공! (Reading 발견: %s)", path)
             return 'RC'
         
         # 기존 패턴도 확인 (백업)
-        logger.debug(f"[DEBUG] 기존 LC 패턴 {len(self.lc_patterns)}개 확인 중...")
-        for idx, pattern in enumerate(self.lc_patterns):
-            match = pattern.search(path_str)
-            logger.debug(f"[DEBUG]   패턴 {idx+1}: {pattern.pattern} -> 매칭: {bool(match)}")
-            if match:
-                logger.info(f"[DEBUG] ✅ LC 감지 성공! (경로: {path}, 패턴: {pattern.pattern})")
-                print(f"[DEBUG] LC 감지: {path.name} (패턴: {pattern.pattern})")
-                return 'LC'
-        
-        logger.debug(f"[DEBUG] RC 패턴 {len(self.rc_patterns)}개 확인 중...")
-        for idx, pattern in enumerate(self.rc_patterns):
-            match = pattern.search(path_str)
-            logger.debug(f"[DEBUG]   패턴 {idx+1}: {pattern.pattern} -> 매칭: {bool(match)}")
-            if match:
-                logger.info(f"[DEBUG] ✅ RC 감지 성공! (경로: {path}, 패턴: {pattern.pattern})")
-                print(f"[DEBUG] RC 감지: {path.name} (패턴: {pattern.pattern})")
-                return 'RC'
-        
-        logger.debug(f"[DEBUG] ❌ LC/RC 감지 실패: {path}")
+        for book_type, patterns in (('LC', self.lc_patterns), ('RC', self.rc_patterns)):
+            if debug:
+                logger.debug("[DEBUG] %s 패턴 %s개 확인 중...", book_type, len(patterns))
+            for idx, pattern in enumerate(patterns):
+                match = pattern.search(path_str)
+                if debug:
+                    logger.debug("[DEBUG]   패턴 %s: %s -> 매칭: %s", idx + 1, pattern.pattern, bool(match))
+                if match:
+                    logger.info("[DEBUG] ✅ %s 감지 성공! (경로: %s, 패턴: %s)", book_type, path, pattern.pattern)
+                    return book_type
+        
+        if debug:
+            logger.debug("[DEBUG] ❌ LC/RC 감지 실패: %s", path)
         return None
     
     def detect_from_pdf_content(self, pdf_path: Path, max_pages: int = 3) -> Optional[str]:
@@ -98,8 +103,28 @@ class BookTypeDetector:
         Returns:
             'LC', 'RC', 또는 None
         """
+        if self.prefetcher is not None:
+            return self.prefetcher.result('content_type', (str(pdf_path), max_pages),
+                                          self._sniff_pdf_content, pdf_path, max_pages)
+        return self._sniff_pdf_content(pdf_path, max_pages)
+    
+    def prefetch_directory(self, directory: Path):
+        """
+        디렉토리 분석 5단계(PDF 내용 감지)에 쓰일 파일들을 백그라운드에서 미리 분석
+        
+        Args:
+            directory: 분석할 디렉토리 경로
+        """
+        if self.prefetcher is None:
+            return
+        for pdf_file in list(directory.rglob("*.pdf"))[:self.CONTENT_SNIFF_FILES]:
+            self.prefetcher.submit('content_type', (str(pdf_file), 3),
+                                   self._sniff_pdf_content, pdf_file, 3)
+    
+    def _sniff_pdf_content(self, pdf_path: Path, max_pages: int) -> Optional[str]:
+        """PDF 처음 몇 페이지의 텍스트에서 LC/RC 패턴 검색"""
         try:
-            reader = PdfReader(str(pdf_path))
+            reader = open_reader(pdf_path)
             pages_to_check = min(max_pages, len(reader.pages))
             
             for i in range(pages_to_check):
@@ -109,19 +134,19 @@ class BookTypeDetector:
                 # LC 패턴 확인
                 for pattern in self.lc_patterns:
                     if pattern.search(text_lower):
-                        logger.debug(f"LC 감지 (PDF 내용, 페이지 {i+1}): {pdf_path}")
+                        logger.debug("LC 감지 (PDF 내용, 페이지 %s): %s", i + 1, pdf_path)
                         return 'LC'
                 
                 # RC 패턴 확인
                 for pattern in self.rc_patterns:
                     if pattern.search(text_lower):
-                        logger.debug(f"RC 감지 (PDF 내용, 페이지 {i+1}): {pdf_path}")
+                        logger.debug("RC 감지 (PDF 내용, 페이지 %s): %s", i + 1, pdf_path)
                         return 'RC'
             
             return None
             
         except Exception as e:
-            logger.warning(f"PDF 내용 분석 실패 ({pdf_path}): {e}")
+            logger.warning("PDF 내용 분석 실패 (%s): %s", pdf_path, e)
             return None
     
     def detect_from_directory(self, directory: Path) -> Optional[str]:
@@ -134,71 +159,70 @@ class BookTypeDetector:
         Returns:
             'LC', 'RC', 또는 None
         """
-        logger.debug(f"[DEBUG] 디렉토리 분석 시작: {directory}")
+        logger.debug("[DEBUG] 디렉토리 분석 시작: %s", directory)
         
         # 1. 디렉토리명에서 감지
-        logger.debug(f"[DEBUG] [1단계] 디렉토리명에서 감지 시도")
+        logger.debug("[DEBUG] [1단계] 디렉토리명에서 감지 시도")
         book_type = self.detect_from_path(directory)
         if book_type:
-            logger.info(f"[DEBUG] ✅ 디렉토리명에서 {book_type} 감지 성공")
+            logger.info("[DEBUG] ✅ 디렉토리명에서 %s 감지 성공", book_type)
             return book_type
         
         # 2. 하위 디렉토리명에서 감지
-        logger.debug(f"[DEBUG] [2단계] 하위 디렉토리명에서 감지 시도")
+        logger.debug("[DEBUG] [2단계] 하위 디렉토리명에서 감지 시도")
         subdirs = [d for d in directory.iterdir() if d.is_dir()]
-        logger.debug(f"[DEBUG] 하위 디렉토리 {len(subdirs)}개 발견")
+        logger.debug("[DEBUG] 하위 디렉토리 %s개 발견", len(subdirs))
         for idx, subdir in enumerate(subdirs, 1):
-            logger.debug(f"[DEBUG]   하위 디렉토리 {idx}/{len(subdirs)}: {subdir.name}")
+            logger.debug("[DEBUG]   하위 디렉토리 %s/%s: %s", idx, len(subdirs), subdir.name)
             book_type = self.detect_from_path(subdir)
             if book_type:
-                logger.info(f"[DEBUG] ✅ 하위 디렉토리명에서 {book_type} 감지 성공: {subdir.name}")
+                logger.info("[DEBUG] ✅ 하위 디렉토리명에서 %s 감지 성공: %s", book_type, subdir.name)
                 return book_type
         
         # 3. PDF 파일명에서 감지
-        logger.debug(f"[DEBUG] [3단계] PDF 파일명에서 감지 시도")
+        logger.debug("[DEBUG] [3단계] PDF 파일명에서 감지 시도")
         pdf_files = list(directory.rglob("*.pdf"))
-        logger.debug(f"[DEBUG] PDF 파일 {len(pdf_files)}개 발견, 처음 10개 확인")
+        logger.debug("[DEBUG] PDF 파일 %s개 발견, 처음 10개 확인", len(pdf_files))
         for idx, pdf_file in enumerate(pdf_files[:10], 1):
-            logger.debug(f"[DEBUG]   PDF 파일 {idx}/10: {pdf_file.name}")
+            logger.debug("[DEBUG]   PDF 파일 %s/10: %s", idx, pdf_file.name)
             book_type = self.detect_from_path(pdf_file)
             if book_type:
-                logger.info(f"[DEBUG] ✅ PDF 파일명에서 {book_type} 감지 성공: {pdf_file.name}")
+                logger.info("[DEBUG] ✅ PDF 파일명에서 %s 감지 성공: %s", book_type, pdf_file.name)
                 return book_type
         
         # 4. 파일 타입 기반 감지 (새로운 방법)
         # Translation Sheet나 Unscramble Sheet가 있으면 RC, 없으면 LC
-        logger.debug(f"[DEBUG] [4단계] 파일 타입 기반 감지 시도")
+        logger.debug("[DEBUG] [4단계] 파일 타입 기반 감지 시도")
         has_translation = any('translation' in f.name.lower() and 'sheet' in f.name.lower() for f in pdf_files)
         has_unscramble = any('unscramble' in f.name.lower() and 'sheet' in f.name.lower() for f in pdf_files)
         has_word_test = any('word' in f.name.lower() and 'test' in f.name.lower() for f in pdf_files)
         has_word_list = any('word' in f.name.lower() and 'list' in f.name.lower() for f in pdf_files)
         
-        logger.debug(f"[DEBUG] 파일 타입 분석:")
-        logger.debug(f"[DEBUG]   Translation Sheet: {has_translation}")
-        logger.debug(f"[DEBUG]   Unscramble Sheet: {has_unscramble}")
-        logger.debug(f"[DEBUG]   Word Test: {has_word_test}")
-        logger.debug(f"[DEBUG]   Word List: {has_word_list}")
+        logger.debug("[DEBUG] 파일 타입 분석:")
+        logger.debug("[DEBUG]   Translation Sheet: %s", has_translation)
+        logger.debug("[DEBUG]   Unscramble Sheet: %s", has_unscramble)
+        logger.debug("[DEBUG]   Word Test: %s", has_word_test)
+        logger.debug("[DEBUG]   Word List: %s", has_word_list)
         
         if has_translation or has_unscramble:
-            logger.info(f"[DEBUG] ✅ 파일 타입 기반으로 RC 감지 성공 (Translation/Unscramble Sheet 존재)")
-            print(f"[DEBUG] RC 감지: Translation Sheet 또는 Unscramble Sheet 파일 발견")
+            logger.info("[DEBUG] ✅ 파일 타입 기반으로 RC 감지 성공 (Translation/Unscramble Sheet 존재)")
             return 'RC'
         elif has_word_test or has_word_list:
-            logger.info(f"[DEBUG] ✅ 파일 타입 기반으로 LC 감지 성공 (Word Test/List만 존재)")
-            print(f"[DEBUG] LC 감지: Word Test/List만 발견 (Translation/Unscramble Sheet 없음)")
+            logger.info("[DEBUG] ✅ 파일 타입 기반으로 LC 감지 성공 (Word Test/List만 존재)")
             return 'LC'
         
         # 5. PDF 내용에서 감지 (처음 몇 개만)
-        logger.debug(f"[DEBUG] [5단계] PDF 내용에서 감지 시도")
-        logger.debug(f"[DEBUG] PDF 내용 분석: 처음 3개 파일 확인")
-        for idx, pdf_file in enumerate(pdf_files[:3], 1):
-            logger.debug(f"[DEBUG]   PDF 내용 분석 {idx}/3: {pdf_file.name}")
+        logger.debug("[DEBUG] [5단계] PDF 내용에서 감지 시도")
+        sniff_files = pdf_files[:self.CONTENT_SNIFF_FILES]
+        logger.debug("[DEBUG] PDF 내용 분석: 처음 %s개 파일 확인", self.CONTENT_SNIFF_FILES)
+        for idx, pdf_file in enumerate(sniff_files, 1):
+            logger.debug("[DEBUG]   PDF 내용 분석 %s/%s: %s", idx, len(sniff_files), pdf_file.name)
             book_type = self.detect_from_pdf_content(pdf_file)
             if book_type:
-                logger.info(f"[DEBUG] ✅ PDF 내용에서 {book_type} 감지 성공: {pdf_file.name}")
+                logger.info("[DEBUG] ✅ PDF 내용에서 %s 감지 성공: %s", book_type, pdf_file.name)
                 return book_type
         
-        logger.warning(f"[DEBUG] ❌ 모든 방법으로 LC/RC를 감지할 수 없음: {directory}")
+        logger.warning("[DEBUG] ❌ 모든 방법으로 LC/RC를 감지할 수 없음: %s", directory)
         return None
     
     def detect(self, path: Path) -> Dict[str, Optional[str]]:
@@ -211,33 +235,37 @@ class BookTypeDetector:
         Returns:
             {'type': 'LC'|'RC'|None, 'method': 'path'|'content'|'directory'|None}
         """
-        path = Path(path)
-        logger.info(f"[DEBUG] ===== LC/RC 감지 시작 =====")
-        logger.info(f"[DEBUG] 대상 경로: {path}")
-        logger.info(f"[DEBUG] 경로 타입: {'디렉토리' if path.is_dir() else '파일'}")
+        result = self._detect(Path(path))
+        emit(BOOK_TYPE_DETECTED, path=str(path), book_type=result['type'], method=result['method'])
+        return result
+    
+    def _detect(self, path: Path) -> Dict[str, Optional[str]]:
+        logger.info("[DEBUG] ===== LC/RC 감지 시작 =====")
+        logger.info("[DEBUG] 대상 경로: %s", path)
+        logger.info("[DEBUG] 경로 타입: %s", '디렉토리' if path.is_dir() else '파일')
         
         # 1. 경로에서 감지
-        logger.info(f"[DEBUG] [방법 1] 경로에서 직접 감지 시도")
+        logger.info("[DEBUG] [방법 1] 경로에서 직접 감지 시도")
         book_type = self.detect_from_path(path)
         if book_type:
-            logger.info(f"[DEBUG] ✅ [방법 1] 성공! 타입: {book_type}, 방법: path")
+            logger.info("[DEBUG] ✅ [방법 1] 성공! 타입: %s, 방법: path", book_type)
             return {'type': book_type, 'method': 'path'}
         
         # 2. 디렉토리인 경우 디렉토리 분석
         if path.is_dir():
-            logger.info(f"[DEBUG] [방법 2] 디렉토리 분석 시도")
+            logger.info("[DEBUG] [방법 2] 디렉토리 분석 시도")
             book_type = self.detect_from_directory(path)
             if book_type:
-                logger.info(f"[DEBUG] ✅ [방법 2] 성공! 타입: {book_type}, 방법: directory")
+                logger.info("[DEBUG] ✅ [방법 2] 성공! 타입: %s, 방법: directory", book_type)
                 return {'type': book_type, 'method': 'directory'}
         
         # 3. PDF 파일인 경우 내용 분석
         if path.suffix.lower() == '.pdf':
-            logger.info(f"[DEBUG] [방법 3] PDF 내용 분석 시도")
+            logger.info("[DEBUG] [방법 3] PDF 내용 분석 시도")
             book_type = self.detect_from_pdf_content(path)
             if book_type:
-                logger.info(f"[DEBUG] ✅ [방법 3] 성공! 타입: {book_type}, 방법: content")
+                logger.info("[DEBUG] ✅ [방법 3] 성공! 타입: %s, 방법: content", book_type)
                 return {'type': book_type, 'method': 'content'}
         
-        logger.warning(f"[DEBUG] ❌ 모든 방법 실패. LC/RC를 감지할 수 없습니다.")
+        logger.warning("[DEBUG] ❌ 모든 방법 실패. LC/RC를 감지할 수 없습니다.")
         return {'type': None, 'method': None}
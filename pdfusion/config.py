@@ -13,6 +13,59 @@ from glob import glob
 logger = logging.getLogger(__name__)
 
 
+def auto_detect_unit_pages(pdf_path, total_units, ask: bool = True) -> Dict[int, list]:
+    """
+    카테고리 PDF에서 유닛별 페이지 인덱스 자동 분석
+
+    Args:
+        pdf_path: 카테고리 PDF 경로
+        total_units: 전체 유닛 수 (감지된 유닛이 적으면 경고)
+        ask: Unit 1이 여러 번 감지되면 실제 시작 페이지를 사용자에게 물어봄 (False면 첫 번째 사용)
+
+    Returns:
+        유닛 번호 -> 페이지 인덱스 리스트
+    """
+    from pypdf import PdfReader
+    reader = PdfReader(pdf_path)
+    unit_pages = {}
+    unit1_indices = []
+    current_unit = 1
+    for i, page in enumerate(reader.pages):
+        text = page.extract_text() or ""
+        m = re.search(r"[Uu]nit[\s]*([0-9]{1,2})", text)
+        if m:
+            detected_unit = int(m.group(1))
+            if detected_unit == 1:
+                unit1_indices.append(i)
+            current_unit = detected_unit
+        if current_unit not in unit_pages:
+            unit_pages[current_unit] = []
+        unit_pages[current_unit].append(i)
+    # Unit 1이 여러 번 감지된 경우, 실제 시작 인덱스 선택
+    if len(unit1_indices) > 1:
+        if ask:
+            # 선택할 인덱스를 보여줘야 하므로 질문할 때는 로그 수준과 관계없이 출력
+            print(f"[안내] {os.path.basename(pdf_path)}에서 Unit 1이 여러 번 감지되었습니다: {unit1_indices}")
+        else:
+            logger.debug("%s에서 Unit 1이 여러 번 감지됨: %s", os.path.basename(pdf_path), unit1_indices)
+        idx = input(f"실제 Unit 1의 시작 페이지 인덱스를 선택하세요 (기본: {unit1_indices[0]}): ").strip() if ask else ""
+        try:
+            start_idx = int(idx) if idx else unit1_indices[0]
+        except Exception:
+            start_idx = unit1_indices[0]
+        # start_idx 이전 페이지는 모두 무시
+        filtered_unit_pages = {}
+        for u, pages in unit_pages.items():
+            filtered = [p for p in pages if p >= start_idx]
+            if filtered:
+                filtered_unit_pages[u] = filtered
+        unit_pages = filtered_unit_pages
+    logger.debug("%s 유닛별 페이지 인덱스: %s", os.path.basename(pdf_path), unit_pages)
+    if len(unit_pages) < total_units:
+        print(f"[경고] {os.path.basename(pdf_path)}에서 감지된 유닛 수가 전체 유닛 수보다 적습니다.")
+    return unit_pages
+
+
 class ConfigManager:
     """설정 관리 클래스"""
 
@@ -49,23 +102,19 @@ class ConfigManager:
             except ValueError:
                 print("올바른 숫자를 입력해주세요.")
 
-        logger.debug(f"전체 유닛 수: {total_units}")
+        logger.debug("전체 유닛 수: %s", total_units)
 
         # 2. 카테고리 PDF 자동 탐색 및 카테고리명 추출
         book_prefix = book_title + "_"
         pdf_files = sorted(glob(os.path.join(pdf_dir, f"{book_prefix}*.pdf")))
-        print(f"\n[디버그] 자동 탐색된 PDF 파일 목록:")
-        for f in pdf_files:
-            print(" -", os.path.basename(f))
+        logger.debug("자동 탐색된 PDF 파일 목록: %s", [os.path.basename(f) for f in pdf_files])
         categories = {}
         for f in pdf_files:
             fname = os.path.basename(f)
             # 책이름_카테고리명.pdf 에서 카테고리명 추출
             cat = fname[len(book_prefix):-4] if fname.lower().endswith('.pdf') else fname[len(book_prefix):]
             categories[cat] = {"pdf_path": f}
-        print(f"\n[디버그] 추출된 카테고리명:")
-        for cat in categories:
-            print(" -", cat)
+        logger.debug("추출된 카테고리명: %s", list(categories))
 
         # 3. 병합 순서 입력
         print(f"\n[안내] Review Test 카테고리는 병합 순서에 넣지 않아도 자동으로 마지막 유닛에 붙습니다.")
@@ -81,45 +130,9 @@ class ConfigManager:
                     continue
                 break
             print("병합 순서를 입력해주세요.")
-        logger.debug(f"병합 순서: {merge_order}")
+        logger.debug("병합 순서: %s", merge_order)
 
         # 4. 각 카테고리 PDF에서 유닛별 페이지 인덱스 자동 분석
-        def auto_detect_unit_pages(pdf_path, total_units):
-            from pypdf import PdfReader
-            reader = PdfReader(pdf_path)
-            unit_pages = {}
-            unit1_indices = []
-            current_unit = 1
-            for i, page in enumerate(reader.pages):
-                text = page.extract_text() or ""
-                m = re.search(r"[Uu]nit[\s]*([0-9]{1,2})", text)
-                if m:
-                    detected_unit = int(m.group(1))
-                    if detected_unit == 1:
-                        unit1_indices.append(i)
-                    current_unit = detected_unit
-                if current_unit not in unit_pages:
-                    unit_pages[current_unit] = []
-                unit_pages[current_unit].append(i)
-            # Unit 1이 여러 번 감지된 경우, 실제 시작 인덱스 선택
-            if len(unit1_indices) > 1:
-                print(f"[디버그] {os.path.basename(pdf_path)}에서 Unit 1이 여러 번 감지되었습니다: {unit1_indices}")
-                idx = input(f"실제 Unit 1의 시작 페이지 인덱스를 선택하세요 (기본: {unit1_indices[0]}): ").strip()
-                try:
-                    start_idx = int(idx) if idx else unit1_indices[0]
-                except Exception:
-                    start_idx = unit1_indices[0]
-                # start_idx 이전 페이지는 모두 무시
-                filtered_unit_pages = {}
-                for u, pages in unit_pages.items():
-                    filtered = [p for p in pages if p >= start_idx]
-                    if filtered:
-                        filtered_unit_pages[u] = filtered
-                unit_pages = filtered_unit_pages
-            print(f"[디버그] {os.path.basename(pdf_path)} 유닛별 페이지 인덱스:", unit_pages)
-            if len(unit_pages) < total_units:
-                print(f"[경고] {os.path.basename(pdf_path)}에서 감지된 유닛 수가 전체 유닛 수보다 적습니다.")
-            return unit_pages
         # 각 카테고리별로 자동 분석
         for cat, info in categories.items():
             info["unit_pages_auto"] = auto_detect_unit_pages(info["pdf_path"], total_units)
@@ -130,9 +143,7 @@ class ConfigManager:
         if not review_test_files:
             print("[안내] Review Test PDF가 탐지되지 않았습니다. Review Test 없이 병합을 진행합니다.")
         else:
-            print(f"\n[디버그] 자동 탐색된 Review Test PDF:")
-            for f in review_test_files:
-                print(" -", os.path.basename(f))
+            logger.debug("자동 탐색된 Review Test PDF: %s", [os.path.basename(f) for f in review_test_files])
             for f in review_test_files:
                 fname = os.path.basename(f)
                 # 예: Units 01-04 또는 Units 05-08 등에서 범위 추출
@@ -143,7 +154,8 @@ class ConfigManager:
                         "units": list(range(start, end+1)),
                         "pdf_path": f
                     })
-            print(f"\n[디버그] Review Test 자동 분석 결과:")
+            # 바로 아래에서 적용 여부를 묻기 때문에 분석 결과는 로그 수준과 관계없이 출력
+            print(f"\n[안내] Review Test 자동 분석 결과:")
             for r in review_tests:
                 print(f" - 파일: {os.path.basename(r['pdf_path'])} → 마지막 유닛: {max(r['units'])}")
             # 사용자에게 자동 분석 결과 확인
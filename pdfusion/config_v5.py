@@ -5,15 +5,19 @@
 
 import os
 import logging
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from pathlib import Path
 import re
-from pypdf import PdfReader
 
+from .events import UNITS_DETECTED, emit
 from .extractor import ZipExtractor
+from .metrics import get_metrics
 from .book_type_detector import BookTypeDetector
 from .level_config import LevelConfig
 from .file_discovery import FileDiscovery
+from .page_count import get_page_count_guarded
+from .prefetch import Prefetcher
+from .unit_detection import scan_page_units_guarded, unit_page_lengths_from_scan
 
 logger = logging.getLogger(__name__)
 
@@ -21,12 +25,66 @@ logger = logging.getLogger(__name__)
 class ConfigManagerV5:
     """설정 관리 클래스 (ver_5)"""
     
-    def __init__(self):
-        self.extractor = ZipExtractor()
-        self.book_type_detector = BookTypeDetector()
+    # LC/RC의 경우 각 파일 타입이 유닛별 파일로 구성됨
+    # LC: Word List, Word Test (각각 유닛별 파일)
+    # RC: Word List, Word Test, Translation Sheet, Unscramble Sheet, Unit Test (각각 유닛별 파일)
+    UNIT_BASED_CATEGORIES = ['Word List', 'Word Test', 'Translation Sheet', 'Unscramble Sheet', 'Unit Test']
+    
+    def __init__(self, prefetch: bool = True, fused: bool = False, answers: Optional[Dict[str, Any]] = None,
+                 reuse_extracted: bool = False):
+        """
+        Args:
+            prefetch: 사용자 입력을 기다리는 동안 페이지 수/유닛 스캔/타입 감지를 백그라운드에서 미리 실행
+            fused: 통합 파일의 유닛 감지를 병합 단계로 미룸 (FusedMergeEngine이 한 번의 순회로 감지와 분배,
+                목차 제외 여부는 질문 대신 병합 옵션으로 지정)
+            answers: 질문 키 -> 답 (주면 input()을 쓰지 않고 이 값으로 답함, 없는 키는 Enter와 같은 기본값).
+                값이 dict면 책 이름/카테고리/파일 이름별 답이고 '*'는 나머지 전부 (예: {"level": {"Book1": "Level 2"}})
+            reuse_extracted: 같은 zip을 이미 해제한 폴더가 있으면 다시 해제하지 않음 (상주 서비스에서 캐시 유지)
+        """
+        self.fused = fused
+        self.answers = answers
+        # answers로 답한 질문 기록 (키, 범위, 답)
+        self.decisions: List[Dict[str, Any]] = []
+        # 단계별 계측 (사용자 입력을 기다리는 시간은 제외하고 작업 구간만 측정)
+        self.metrics = get_metrics()
+        self._current_book: Optional[str] = None
+        self.prefetcher = Prefetcher(enabled=prefetch)
+        self.extractor = ZipExtractor(reuse_existing=reuse_extracted)
+        self.book_type_detector = BookTypeDetector(prefetcher=self.prefetcher)
         self.level_config = LevelConfig()
         self.file_discovery = FileDiscovery()
     
+    def _prompt(self, key: str, message: str, *scopes: str) -> str:
+        """
+        질문 하나에 대한 답 (answers가 없으면 input())
+
+        Args:
+            key: 질문 키 (예: 'books', 'level', 'toc_exclude')
+            message: 질문 문구
+            *scopes: answers의 값이 dict일 때 찾을 이름 (앞에서부터, 마지막으로 현재 책 이름과 '*')
+
+        Returns:
+            답 문자열 (answers에 없으면 빈 문자열, 즉 Enter)
+        """
+        if self.answers is None:
+            return input(message)
+        value = self.answers.get(key)
+        if isinstance(value, dict):
+            names = [name for name in (*scopes, self._current_book, "*") if name is not None]
+            value = next((value[name] for name in names if name in value), None)
+        if value is None:
+            answer = ""
+        elif isinstance(value, bool):
+            answer = "y" if value else "n"
+        elif isinstance(value, (list, tuple)):
+            answer = ",".join(str(item) for item in value)
+        else:
+            answer = str(value)
+        print(f"{message}{answer}")
+        self.decisions.append({"key": key, "scope": scopes[0] if scopes else self._current_book,
+                               "answer": answer})
+        return answer
+    
     def get_user_input(self) -> Dict:
         """사용자로부터 병합 설정 입력 받기 (ver_5)"""
         logger.info("="*60)
@@ -38,10 +96,13 @@ class ConfigManagerV5:
         
         # 0. 최상위 폴더 입력
         while True:
-            root_dir = input("최상위 폴더 경로를 입력하세요: ").strip()
+            root_dir = self._prompt("root_dir", "최상위 폴더 경로를 입력하세요: ").strip()
             if os.path.isdir(root_dir):
                 break
             print("폴더 경로가 올바르지 않습니다.")
+            if self.answers is not None:
+                # 같은 답이 반복되므로 다시 묻지 않음
+                raise ValueError(f"최상위 폴더 경로가 올바르지 않습니다: {root_dir}")
         
         root_path = Path(root_dir)
         
@@ -67,7 +128,7 @@ class ConfigManagerV5:
             print("  - 선택 해제: 번호 입력 (예: 1,3,5 또는 1-5)")
             print("  - 건너뛰기: 'n' 또는 'skip' (압축 해제를 건너뛰면 프로그램이 종료됩니다)")
             
-            extract_choice = input("압축 해제 옵션을 선택하세요: ").strip()
+            extract_choice = self._prompt("extract", "압축 해제 옵션을 선택하세요: ").strip()
             
             selected_zips = []
             
@@ -125,16 +186,16 @@ class ConfigManagerV5:
             for idx, zip_file in enumerate(selected_zips, 1):
                 print(f"  {idx}. {zip_file.name}")
             
-            remove_after = input("\n압축 해제 후 원본 zip 파일을 삭제하시겠습니까? (y/n, 기본값: n): ").strip().lower() == 'y'
+            remove_after = self._prompt("remove_zip", "\n압축 해제 후 원본 zip 파일을 삭제하시겠습니까? (y/n, 기본값: n): ").strip().lower() == 'y'
             
             extracted_dirs = []
             for zip_file in selected_zips:
-                extracted_dir = self.extractor.extract_zip(zip_file, remove_after_extract=remove_after)
+                extracted_dir = self._extract_zip(zip_file, remove_after)
                 if extracted_dir:
                     extracted_dirs.append(extracted_dir)
                     # 압축 해제된 폴더 이름 저장 (zip 파일명에서 .zip 제거)
                     extracted_folder_names.add(extracted_dir.name)
-                    logger.debug(f"[DEBUG] 압축 해제된 폴더 추가: {extracted_dir.name}")
+                    logger.debug("[DEBUG] 압축 해제된 폴더 추가: %s", extracted_dir.name)
             
             print(f"✅ {len(extracted_dirs)}개 압축 파일 해제 완료")
             
@@ -158,7 +219,7 @@ class ConfigManagerV5:
             if folder_path.exists() and folder_path.is_dir():
                 book_folders.append(folder_name)
         
-        logger.info(f"[DEBUG] 압축 해제된 폴더만 표시: {len(book_folders)}개")
+        logger.info("[DEBUG] 압축 해제된 폴더만 표시: %s개", len(book_folders))
         print(f"압축 해제된 폴더 {len(book_folders)}개 발견:")
         
         if not book_folders:
@@ -169,7 +230,7 @@ class ConfigManagerV5:
         for idx, folder in enumerate(book_folders, 1):
             print(f"  {idx}. {folder}")
         
-        selected = input("병합할 책의 번호(또는 이름)를 입력하세요 (여러 개 선택 시 쉼표로 구분, Enter 시 전체 선택): ").strip()
+        selected = self._prompt("books", "병합할 책의 번호(또는 이름)를 입력하세요 (여러 개 선택 시 쉼표로 구분, Enter 시 전체 선택): ").strip()
         if selected:
             selected_indices_or_names = [s.strip() for s in selected.split(',') if s.strip()]
             selected_folders = []
@@ -185,6 +246,10 @@ class ConfigManagerV5:
             if selected_folders:
                 book_folders = selected_folders
         
+        # 선택된 모든 책의 PDF 내용 기반 타입 감지를 미리 시작 (앞 책의 질문에 답하는 동안 진행)
+        for book_title in book_folders:
+            self.book_type_detector.prefetch_directory(root_path / book_title)
+        
         # 3. 각 책별 처리
         configs = {}
         for book_title in book_folders:
@@ -193,86 +258,89 @@ class ConfigManagerV5:
             print(f"{'='*60}")
             
             book_path = root_path / book_title
+            self._current_book = book_title
             
             # 3-1. LC/RC 감지
             print(f"\n[3-1단계] LC/RC 감지")
-            logger.info(f"[DEBUG] ===== [{book_title}] LC/RC 감지 시작 =====")
-            logger.info(f"[DEBUG] 책 경로: {book_path}")
-            detection_result = self.book_type_detector.detect(book_path)
+            logger.info("[DEBUG] ===== [%s] LC/RC 감지 시작 =====", book_title)
+            logger.info("[DEBUG] 책 경로: %s", book_path)
+            with self.metrics.stage("type_detection", scope=book_title):
+                detection_result = self.book_type_detector.detect(book_path)
             book_type = detection_result['type']
             
-            logger.info(f"[DEBUG] 감지 결과: {detection_result}")
+            logger.info("[DEBUG] 감지 결과: %s", detection_result)
             if book_type:
                 print(f"✅ 책 타입 감지: {book_type} (방법: {detection_result['method']})")
-                logger.info(f"[DEBUG] ✅ 책 타입 감지 성공: {book_type} (방법: {detection_result['method']})")
+                logger.info("[DEBUG] ✅ 책 타입 감지 성공: %s (방법: %s)", book_type, detection_result['method'])
             else:
                 print("⚠️  책 타입을 자동으로 감지할 수 없습니다.")
-                logger.warning(f"[DEBUG] ⚠️  책 타입 자동 감지 실패")
+                logger.warning("[DEBUG] ⚠️  책 타입 자동 감지 실패")
                 try:
-                    manual_type = input("수동으로 입력하세요 (LC/RC, Enter=건너뛰기): ").strip().upper()
+                    manual_type = self._prompt("book_type", "수동으로 입력하세요 (LC/RC, Enter=건너뛰기): ").strip().upper()
                     if manual_type in ['LC', 'RC']:
                         book_type = manual_type
                         print(f"✅ 책 타입 설정: {book_type}")
-                        logger.info(f"[DEBUG] ✅ 수동 입력으로 책 타입 설정: {book_type}")
+                        logger.info("[DEBUG] ✅ 수동 입력으로 책 타입 설정: %s", book_type)
                     else:
                         print("⚠️  책 타입을 건너뜁니다.")
-                        logger.warning(f"[DEBUG] ⚠️  책 타입 없이 진행")
+                        logger.warning("[DEBUG] ⚠️  책 타입 없이 진행")
                 except (KeyboardInterrupt, EOFError) as e:
                     print("\n⚠️  입력이 중단되었습니다. 책 타입을 건너뜁니다.")
-                    logger.warning(f"[DEBUG] 입력 중단: {e}")
+                    logger.warning("[DEBUG] 입력 중단: %s", e)
                     book_type = None
                 except Exception as e:
                     print(f"\n⚠️  입력 오류 발생: {e}. 책 타입을 건너뜁니다.")
-                    logger.error(f"[DEBUG] 입력 오류: {e}")
+                    logger.error("[DEBUG] 입력 오류: %s", e)
                     book_type = None
             
             # 3-2. 레벨 감지
             print(f"\n[3-2단계] 레벨 감지")
-            logger.info(f"[DEBUG] ===== [{book_title}] 레벨 감지 시작 =====")
-            detected_level = self.level_config.detect_level(book_path)
+            logger.info("[DEBUG] ===== [%s] 레벨 감지 시작 =====", book_title)
+            with self.metrics.stage("level_detection", scope=book_title):
+                detected_level = self.level_config.detect_level(book_path)
             
-            logger.info(f"[DEBUG] 레벨 감지 결과: {detected_level}")
+            logger.info("[DEBUG] 레벨 감지 결과: %s", detected_level)
             if detected_level:
                 print(f"✅ 레벨 감지: {detected_level}")
                 level = detected_level
-                logger.info(f"[DEBUG] ✅ 레벨 감지 성공: {level}")
+                logger.info("[DEBUG] ✅ 레벨 감지 성공: %s", level)
             else:
                 print("⚠️  레벨을 자동으로 감지할 수 없습니다.")
-                logger.warning(f"[DEBUG] ⚠️  레벨 자동 감지 실패")
+                logger.warning("[DEBUG] ⚠️  레벨 자동 감지 실패")
                 print(f"사용 가능한 레벨: {', '.join(self.level_config.get_all_levels())}")
                 try:
-                    manual_level = input("레벨을 입력하세요 (예: Level 1, Enter=기본 규칙 사용): ").strip()
+                    manual_level = self._prompt("level", "레벨을 입력하세요 (예: Level 1, Enter=기본 규칙 사용): ").strip()
                     if manual_level and self.level_config.has_level(manual_level):
                         level = manual_level
-                        logger.info(f"[DEBUG] ✅ 수동 입력으로 레벨 설정: {level}")
+                        logger.info("[DEBUG] ✅ 수동 입력으로 레벨 설정: %s", level)
                     else:
                         level = None
                         print("⚠️  기본 규칙을 사용합니다.")
-                        logger.warning(f"[DEBUG] ⚠️  레벨 없이 진행 (기본 규칙 사용)")
+                        logger.warning("[DEBUG] ⚠️  레벨 없이 진행 (기본 규칙 사용)")
                 except (KeyboardInterrupt, EOFError) as e:
                     print("\n⚠️  입력이 중단되었습니다. 기본 규칙을 사용합니다.")
-                    logger.warning(f"[DEBUG] 입력 중단: {e}")
+                    logger.warning("[DEBUG] 입력 중단: %s", e)
                     level = None
                 except Exception as e:
                     print(f"\n⚠️  입력 오류 발생: {e}. 기본 규칙을 사용합니다.")
-                    logger.error(f"[DEBUG] 입력 오류: {e}")
+                    logger.error("[DEBUG] 입력 오류: %s", e)
                     level = None
             
             # 3-2.5. 내부 압축 파일 처리 (LC/RC 감지 후)
             if book_type:
                 print(f"\n[3-2.5단계] 내부 압축 파일 처리")
-                logger.info(f"[DEBUG] ===== [{book_title}] 내부 압축 파일 처리 시작 =====")
-                logger.info(f"[DEBUG] 책 타입: {book_type}, 탐색 경로: {book_path}")
+                logger.info("[DEBUG] ===== [%s] 내부 압축 파일 처리 시작 =====", book_title)
+                logger.info("[DEBUG] 책 타입: %s, 탐색 경로: %s", book_type, book_path)
                 
                 # 폴더 내부의 zip 파일 찾기
                 internal_zips = self.extractor.find_zip_files(str(book_path))
-                logger.info(f"[DEBUG] 내부 zip 파일 {len(internal_zips)}개 발견")
+                logger.info("[DEBUG] 내부 zip 파일 %s개 발견", len(internal_zips))
                 
                 if internal_zips:
                     # LC/RC에 따라 필요한 zip 파일만 필터링
                     # LevelConfig의 중앙화된 메서드 사용 (DRY 원칙)
                     target_patterns = self.level_config.get_zip_patterns(book_type, book_path)
-                    logger.info(f"[DEBUG] 내부 zip 필터링용 패턴: {len(target_patterns)}개 (책 타입: {book_type})")
+                    logger.info("[DEBUG] 내부 zip 필터링용 패턴: %s개 (책 타입: %s)", len(target_patterns), book_type)
                     
                     if target_patterns:
                         filtered_zips = []
@@ -280,11 +348,11 @@ class ConfigManagerV5:
                             zip_name_lower = zip_file.name.lower()
                             # _Eng가 포함된 zip 파일 제외
                             if '_eng' in zip_name_lower:
-                                logger.debug(f"[DEBUG]   _Eng zip 파일 제외: {zip_file.name}")
+                                logger.debug("[DEBUG]   _Eng zip 파일 제외: %s", zip_file.name)
                                 continue
                             if any(pattern in zip_name_lower for pattern in target_patterns):
                                 filtered_zips.append(zip_file)
-                                logger.debug(f"[DEBUG]   대상 zip 파일: {zip_file.name}")
+                                logger.debug("[DEBUG]   대상 zip 파일: %s", zip_file.name)
                         
                         if filtered_zips:
                             print(f"내부 압축 파일 {len(filtered_zips)}개 발견 (자동 압축 해제):")
@@ -293,37 +361,38 @@ class ConfigManagerV5:
                             
                             # 자동으로 압축 해제
                             for zip_file in filtered_zips:
-                                extracted_dir = self.extractor.extract_zip(zip_file, remove_after_extract=False)
+                                extracted_dir = self._extract_zip(zip_file, False, scope=book_title)
                                 if extracted_dir:
-                                    logger.info(f"[DEBUG]   ✅ 내부 zip 압축 해제 완료: {zip_file.name} -> {extracted_dir}")
+                                    logger.info("[DEBUG]   ✅ 내부 zip 압축 해제 완료: %s -> %s", zip_file.name, extracted_dir)
                                     print(f"  ✅ {zip_file.name} 압축 해제 완료")
                         else:
-                            logger.warning(f"[DEBUG]   ⚠️  대상 zip 파일 없음")
-                            logger.info(f"[DEBUG]   모든 zip 파일 목록: {[z.name for z in internal_zips]}")
-                            logger.info(f"[DEBUG]   찾는 패턴: {target_patterns}")
+                            logger.warning("[DEBUG]   ⚠️  대상 zip 파일 없음")
+                            logger.info("[DEBUG]   모든 zip 파일 목록: %s", [z.name for z in internal_zips])
+                            logger.info("[DEBUG]   찾는 패턴: %s", target_patterns)
                             print(f"⚠️  대상 압축 파일을 찾을 수 없습니다.")
                             print(f"   발견된 zip 파일: {len(internal_zips)}개")
                             for z in internal_zips:
                                 print(f"     - {z.name}")
                     else:
-                        logger.info(f"[DEBUG]   책 타입이 없어 내부 zip 파일 처리 건너뜀")
+                        logger.info("[DEBUG]   책 타입이 없어 내부 zip 파일 처리 건너뜀")
             
             # 3-3. 파일 탐색 및 분류
             print(f"\n[3-3단계] 파일 탐색 및 분류")
-            logger.info(f"[DEBUG] ===== [{book_title}] 파일 탐색 및 분류 시작 =====")
-            logger.info(f"[DEBUG] 탐색 경로: {book_path}")
-            discovery_result = self.file_discovery.discover(book_path)
+            logger.info("[DEBUG] ===== [%s] 파일 탐색 및 분류 시작 =====", book_title)
+            logger.info("[DEBUG] 탐색 경로: %s", book_path)
+            with self.metrics.stage("discovery", scope=book_title):
+                discovery_result = self.file_discovery.discover(book_path)
             
             all_pdfs = discovery_result['all']
             main_pdfs = discovery_result['main']
             review_tests = discovery_result['review_tests']
             categories = discovery_result['categories']
             
-            logger.info(f"[DEBUG] 탐색 결과:")
-            logger.info(f"[DEBUG]   총 PDF 파일: {len(all_pdfs)}개")
-            logger.info(f"[DEBUG]   메인 파일: {len(main_pdfs)}개")
-            logger.info(f"[DEBUG]   Review Test: {len(review_tests)}개")
-            logger.info(f"[DEBUG]   카테고리: {len(categories)}개")
+            logger.info("[DEBUG] 탐색 결과:")
+            logger.info("[DEBUG]   총 PDF 파일: %s개", len(all_pdfs))
+            logger.info("[DEBUG]   메인 파일: %s개", len(main_pdfs))
+            logger.info("[DEBUG]   Review Test: %s개", len(review_tests))
+            logger.info("[DEBUG]   카테고리: %s개", len(categories))
             
             print(f"📄 총 PDF 파일: {len(all_pdfs)}개")
             print(f"📄 메인 파일: {len(main_pdfs)}개")
@@ -332,22 +401,22 @@ class ConfigManagerV5:
             
             # 카테고리별 상세 정보 출력
             for cat_name, files in categories.items():
-                logger.info(f"[DEBUG]   카테고리 '{cat_name}': {len(files)}개 파일")
+                logger.info("[DEBUG]   카테고리 '%s': %s개 파일", cat_name, len(files))
             
             # 레벨별 필터링 적용 (LC/RC가 감지된 경우에만)
-            logger.info(f"[DEBUG] ===== 레벨별 필터링 적용 여부 확인 =====")
-            logger.info(f"[DEBUG] 레벨: {level}, 책 타입: {book_type}")
+            logger.info("[DEBUG] ===== 레벨별 필터링 적용 여부 확인 =====")
+            logger.info("[DEBUG] 레벨: %s, 책 타입: %s", level, book_type)
             
             if level and book_type:
                 print(f"\n[레벨별 필터링 적용: {level}, 타입: {book_type}]")
-                logger.info(f"[DEBUG] ✅ 필터링 조건 충족 - 필터링 실행")
-                logger.info(f"[DEBUG] 필터링 전 파일 수: {len(main_pdfs)}개")
+                logger.info("[DEBUG] ✅ 필터링 조건 충족 - 필터링 실행")
+                logger.info("[DEBUG] 필터링 전 파일 수: %s개", len(main_pdfs))
                 filtered_pdfs = self.level_config.get_files_for_level(level, main_pdfs, book_type, book_path)
                 
                 # 필수 파일 누락으로 None이 반환된 경우 - 사용자에게 선택권 제공
                 if filtered_pdfs is None:
                     print(f"\n⚠️  [경고] 필수 파일이 누락되었습니다!")
-                    logger.warning(f"[DEBUG] 필수 파일 누락 - 사용자 선택 필요")
+                    logger.warning("[DEBUG] 필수 파일 누락 - 사용자 선택 필요")
                     
                     # 필수 검증 없이 필터링만 수행
                     filtered_pdfs = self.level_config.get_files_for_level(level, main_pdfs, book_type, book_path, skip_required_check=True)
@@ -389,19 +458,19 @@ class ConfigManagerV5:
                             print(f"    2. 병합 중단")
                             
                             try:
-                                choice = input("  선택 (1/2, 기본값: 1): ").strip()
+                                choice = self._prompt("missing_files", "  선택 (1/2, 기본값: 1): ").strip()
                             except (KeyboardInterrupt, EOFError) as e:
                                 print("\n⚠️  입력이 중단되었습니다. 계속 진행합니다.")
-                                logger.warning(f"[DEBUG] 입력 중단: {e}. 계속 진행.")
+                                logger.warning("[DEBUG] 입력 중단: %s. 계속 진행.", e)
                                 choice = '1'
                             except Exception as e:
                                 print(f"\n⚠️  입력 오류 발생: {e}. 계속 진행합니다.")
-                                logger.error(f"[DEBUG] 입력 오류: {e}. 계속 진행.")
+                                logger.error("[DEBUG] 입력 오류: %s. 계속 진행.", e)
                                 choice = '1'
                             
                             if choice == '2':
                                 print(f"\n❌ [중단] 사용자 요청으로 병합을 중단합니다.")
-                                logger.info(f"[DEBUG] 사용자 요청으로 병합 중단")
+                                logger.info("[DEBUG] 사용자 요청으로 병합 중단")
                                 configs[book_title] = {
                                     "book_title": book_title,
                                     "total_units": 0,
@@ -414,11 +483,11 @@ class ConfigManagerV5:
                                 continue  # 다음 책으로 넘어감
                             else:
                                 print(f"    ✅ 누락된 파일 없이 계속 진행합니다.")
-                                logger.info(f"[DEBUG] 사용자 선택: 누락된 파일 없이 계속 진행")
+                                logger.info("[DEBUG] 사용자 선택: 누락된 파일 없이 계속 진행")
                 
                 if filtered_pdfs is None or not filtered_pdfs:
                     print(f"\n❌ [오류] 필터링된 파일이 없어 병합을 진행할 수 없습니다.")
-                    logger.error(f"[DEBUG] ❌ 필터링된 파일 없음으로 병합 중단")
+                    logger.error("[DEBUG] ❌ 필터링된 파일 없음으로 병합 중단")
                     configs[book_title] = {
                         "book_title": book_title,
                         "total_units": 0,
@@ -431,38 +500,41 @@ class ConfigManagerV5:
                     continue  # 다음 책으로 넘어감
                 
                 print(f"필터링 결과: {len(filtered_pdfs)}/{len(main_pdfs)}개 파일")
-                logger.info(f"[DEBUG] 필터링 후 파일 수: {len(filtered_pdfs)}개")
+                logger.info("[DEBUG] 필터링 후 파일 수: %s개", len(filtered_pdfs))
                 
                 # 필터링된 파일로 카테고리 재구성
-                logger.info(f"[DEBUG] 필터링된 파일로 카테고리 재구성 중...")
+                logger.info("[DEBUG] 필터링된 파일로 카테고리 재구성 중...")
                 categories = self.file_discovery.categorize_files(filtered_pdfs)
-                logger.info(f"[DEBUG] 재구성 완료: {len(categories)}개 카테고리")
+                logger.info("[DEBUG] 재구성 완료: %s개 카테고리", len(categories))
             elif level:
                 print(f"\n⚠️  레벨은 감지되었지만 책 타입(LC/RC)이 없어 필터링을 건너뜁니다.")
-                logger.warning(f"[DEBUG] ⚠️  레벨만 있고 책 타입 없음 - 필터링 건너뜀")
+                logger.warning("[DEBUG] ⚠️  레벨만 있고 책 타입 없음 - 필터링 건너뜀")
             elif book_type:
                 print(f"\n⚠️  책 타입은 감지되었지만 레벨이 없어 필터링을 건너뜁니다.")
-                logger.warning(f"[DEBUG] ⚠️  책 타입만 있고 레벨 없음 - 필터링 건너뜀")
+                logger.warning("[DEBUG] ⚠️  책 타입만 있고 레벨 없음 - 필터링 건너뜀")
             else:
-                logger.warning(f"[DEBUG] ⚠️  레벨과 책 타입 모두 없음 - 필터링 건너뜀")
+                logger.warning("[DEBUG] ⚠️  레벨과 책 타입 모두 없음 - 필터링 건너뜀")
+            
+            # 이후 단계의 질문과 무관한 페이지 수/유닛 스캔을 백그라운드에서 미리 시작
+            self._start_prefetch(categories, review_tests)
             
             # 3-3.5. Unit Test 특별 처리 (파일 목록 확인 전에)
             if 'Unit Test' in categories:
                 print(f"\n[3-3.5단계] Unit Test 파일 처리")
-                logger.info(f"[DEBUG] ===== Unit Test 특별 처리 시작 =====")
+                logger.info("[DEBUG] ===== Unit Test 특별 처리 시작 =====")
                 files = categories['Unit Test']
                 
                 # _Eng 폴더의 파일 제외 (원본 폴더만 사용)
                 files = [f for f in files if '_Eng' not in str(f) and '\\Unit Test_Eng\\' not in str(f)]
-                logger.info(f"[DEBUG]   _Eng 폴더 제외 후 파일 수: {len(files)}개")
+                logger.info("[DEBUG]   _Eng 폴더 제외 후 파일 수: %s개", len(files))
                 
                 all_files = [f for f in files if 'all' in f.name.lower() and 'answer' not in f.name.lower()]
                 unit_files = [f for f in files if 'all' not in f.name.lower() and 'answer' not in f.name.lower()]
                 
-                logger.info(f"[DEBUG]   Unit Test 파일 분석:")
-                logger.info(f"[DEBUG]     전체 파일: {len(files)}개")
-                logger.info(f"[DEBUG]     ALL 파일: {len(all_files)}개")
-                logger.info(f"[DEBUG]     개별 Unit 파일: {len(unit_files)}개")
+                logger.info("[DEBUG]   Unit Test 파일 분석:")
+                logger.info("[DEBUG]     전체 파일: %s개", len(files))
+                logger.info("[DEBUG]     ALL 파일: %s개", len(all_files))
+                logger.info("[DEBUG]     개별 Unit 파일: %s개", len(unit_files))
                 
                 if all_files and unit_files:
                     # ALL 파일과 개별 파일이 모두 있는 경우 - 사용자 선택
@@ -488,14 +560,14 @@ class ConfigManagerV5:
                     print(f"    2. 개별 Unit 파일 사용 (유닛별 파일로 처리)")
                     
                     try:
-                        choice = input("  선택 (1/2, 기본값: 2): ").strip()
+                        choice = self._prompt("unit_test_files", "  선택 (1/2, 기본값: 2): ").strip()
                     except (KeyboardInterrupt, EOFError) as e:
                         print("\n⚠️  입력이 중단되었습니다. 개별 Unit 파일을 사용합니다.")
-                        logger.warning(f"[DEBUG] 입력 중단: {e}. 개별 Unit 파일 사용.")
+                        logger.warning("[DEBUG] 입력 중단: %s. 개별 Unit 파일 사용.", e)
                         choice = '2'
                     except Exception as e:
                         print(f"\n⚠️  입력 오류 발생: {e}. 개별 Unit 파일을 사용합니다.")
-                        logger.error(f"[DEBUG] 입력 오류: {e}. 개별 Unit 파일 사용.")
+                        logger.error("[DEBUG] 입력 오류: %s. 개별 Unit 파일 사용.", e)
                         choice = '2'
                     
                     if choice == '1':
@@ -507,7 +579,7 @@ class ConfigManagerV5:
                             if base_name not in unique_all_files:
                                 unique_all_files[base_name] = f
                         categories['Unit Test'] = list(unique_all_files.values())
-                        logger.info(f"[DEBUG]   사용자 선택: ALL 파일 사용 ({len(categories['Unit Test'])}개)")
+                        logger.info("[DEBUG]   사용자 선택: ALL 파일 사용 (%s개)", len(categories['Unit Test']))
                         print(f"    ✅ ALL 파일 {len(categories['Unit Test'])}개 선택됨")
                     else:
                         # 개별 Unit 파일 사용 (유닛별 파일로 처리)
@@ -516,7 +588,7 @@ class ConfigManagerV5:
                         for unit_num in sorted(unique_unit_files.keys()):
                             selected_unit_files.append(unique_unit_files[unit_num][0])
                         categories['Unit Test'] = selected_unit_files
-                        logger.info(f"[DEBUG]   사용자 선택: 개별 Unit 파일 사용 ({len(categories['Unit Test'])}개)")
+                        logger.info("[DEBUG]   사용자 선택: 개별 Unit 파일 사용 (%s개)", len(categories['Unit Test']))
                         print(f"    ✅ 개별 Unit 파일 {len(categories['Unit Test'])}개 선택됨")
                 elif all_files:
                     # ALL 파일만 있는 경우 - 중복 제거
@@ -526,7 +598,7 @@ class ConfigManagerV5:
                         if base_name not in unique_all_files:
                             unique_all_files[base_name] = f
                     categories['Unit Test'] = list(unique_all_files.values())
-                    logger.info(f"[DEBUG]   ALL 파일만 있음: {len(categories['Unit Test'])}개 (중복 제거 후)")
+                    logger.info("[DEBUG]   ALL 파일만 있음: %s개 (중복 제거 후)", len(categories['Unit Test']))
                 elif unit_files:
                     # 개별 Unit 파일만 있는 경우 - 중복 제거
                     unique_unit_files = {}
@@ -536,15 +608,15 @@ class ConfigManagerV5:
                             if unit_num not in unique_unit_files:
                                 unique_unit_files[unit_num] = f
                     categories['Unit Test'] = [unique_unit_files[k] for k in sorted(unique_unit_files.keys())]
-                    logger.info(f"[DEBUG]   개별 Unit 파일만 있음: {len(categories['Unit Test'])}개 (중복 제거 후)")
+                    logger.info("[DEBUG]   개별 Unit 파일만 있음: %s개 (중복 제거 후)", len(categories['Unit Test']))
                 else:
-                    logger.warning(f"[DEBUG]   ⚠️  Unit Test 파일이 없어 카테고리 제거")
+                    logger.warning("[DEBUG]   ⚠️  Unit Test 파일이 없어 카테고리 제거")
                     del categories['Unit Test']
             
             # 3-3.6. Word Test 파일 처리 (A/B 타입 선택)
             if 'Word Test' in categories:
                 print(f"\n[3-3.6단계] Word Test 파일 처리")
-                logger.info(f"[DEBUG] ===== Word Test 파일 처리 시작 =====")
+                logger.info("[DEBUG] ===== Word Test 파일 처리 시작 =====")
                 files = categories['Word Test']
                 
                 # A 타입과 B 타입 파일 분리
@@ -564,10 +636,10 @@ class ConfigManagerV5:
                 files_a = [f for f in files if is_test_a(f)]
                 files_b = [f for f in files if is_test_b(f)]
                 
-                logger.info(f"[DEBUG]   Word Test 파일 분석:")
-                logger.info(f"[DEBUG]     전체 파일: {len(files)}개")
-                logger.info(f"[DEBUG]     A 타입: {len(files_a)}개")
-                logger.info(f"[DEBUG]     B 타입: {len(files_b)}개")
+                logger.info("[DEBUG]   Word Test 파일 분석:")
+                logger.info("[DEBUG]     전체 파일: %s개", len(files))
+                logger.info("[DEBUG]     A 타입: %s개", len(files_a))
+                logger.info("[DEBUG]     B 타입: %s개", len(files_b))
                 
                 if files_a and files_b:
                     # A와 B가 둘 다 존재하는 경우 - 사용자 선택
@@ -585,34 +657,34 @@ class ConfigManagerV5:
                     print(f"    3. 둘 다 사용 (기본값)")
                     
                     try:
-                        choice = input("  선택 (1/2/3, 기본값: 3): ").strip()
+                        choice = self._prompt("word_test", "  선택 (1/2/3, 기본값: 3): ").strip()
                     except (KeyboardInterrupt, EOFError) as e:
                         print("\n⚠️  입력이 중단되었습니다. 둘 다 사용합니다.")
-                        logger.warning(f"[DEBUG] 입력 중단: {e}. 둘 다 사용.")
+                        logger.warning("[DEBUG] 입력 중단: %s. 둘 다 사용.", e)
                         choice = '3'
                     except Exception as e:
                         print(f"\n⚠️  입력 오류 발생: {e}. 둘 다 사용합니다.")
-                        logger.error(f"[DEBUG] 입력 오류: {e}. 둘 다 사용.")
+                        logger.error("[DEBUG] 입력 오류: %s. 둘 다 사용.", e)
                         choice = '3'
                     
                     if choice == '1':
                         # Test A만 사용
                         categories['Word Test'] = files_a
-                        logger.info(f"[DEBUG]   사용자 선택: Test A만 사용 ({len(files_a)}개)")
+                        logger.info("[DEBUG]   사용자 선택: Test A만 사용 (%s개)", len(files_a))
                         print(f"    ✅ Test A {len(files_a)}개 선택됨")
                     elif choice == '2':
                         # Test B만 사용
                         categories['Word Test'] = files_b
-                        logger.info(f"[DEBUG]   사용자 선택: Test B만 사용 ({len(files_b)}개)")
+                        logger.info("[DEBUG]   사용자 선택: Test B만 사용 (%s개)", len(files_b))
                         print(f"    ✅ Test B {len(files_b)}개 선택됨")
                     else:
                         # 둘 다 사용 (기본값)
                         categories['Word Test'] = files  # 원본 그대로
-                        logger.info(f"[DEBUG]   사용자 선택: 둘 다 사용 ({len(files)}개)")
+                        logger.info("[DEBUG]   사용자 선택: 둘 다 사용 (%s개)", len(files))
                         print(f"    ✅ 둘 다 사용 ({len(files)}개)")
                 else:
                     # A, B가 섞여있지 않으면 그냥 통과
-                    logger.info(f"[DEBUG]   A/B 타입이 섞여있지 않음 - 그대로 사용 ({len(files)}개)")
+                    logger.info("[DEBUG]   A/B 타입이 섞여있지 않음 - 그대로 사용 (%s개)", len(files))
             
             # 3-4. 파일 목록 확인 및 수정
             print(f"\n[3-4단계] 파일 목록 확인")
@@ -623,100 +695,52 @@ class ConfigManagerV5:
                     print(f"    {idx}. {file_path.relative_to(book_path)}")
             
             # 사용자 확인
-            yn = input("\n이대로 병합할까요? (y/n, 기본값: y): ").strip().lower()
+            yn = self._prompt("confirm_files", "\n이대로 병합할까요? (y/n, 기본값: y): ").strip().lower()
             if yn == 'n':
                 # 파일 제외/포함 로직 (기존과 유사)
                 print("파일 제외/포함 기능은 추후 구현 예정입니다.")
             
             # 3-5. 유닛 정보 추출 (LC/RC에 따라 처리)
             print(f"\n[3-5단계] 유닛 정보 추출")
-            logger.info(f"[DEBUG] ===== 유닛 정보 추출 시작 =====")
+            logger.info("[DEBUG] ===== 유닛 정보 추출 시작 =====")
             unit_page_lengths_dict = {}
-            
-            # LC/RC의 경우 각 파일 타입이 유닛별 파일로 구성됨
-            # LC: Word List, Word Test (각각 유닛별 파일)
-            # RC: Word List, Word Test, Translation Sheet, Unscramble Sheet, Unit Test (각각 유닛별 파일)
-            unit_based_categories = ['Word List', 'Word Test', 'Translation Sheet', 'Unscramble Sheet', 'Unit Test']
-            logger.debug(f"[DEBUG] 유닛별 파일 카테고리: {unit_based_categories}")
+            logger.debug("[DEBUG] 유닛별 파일 카테고리: %s", self.UNIT_BASED_CATEGORIES)
             
             for cat_name, files in categories.items():
-                logger.info(f"[DEBUG] 카테고리 처리: {cat_name} ({len(files)}개 파일)")
+                logger.info("[DEBUG] 카테고리 처리: %s (%s개 파일)", cat_name, len(files))
                 if not files:
-                    logger.warning(f"[DEBUG]   ⚠️  파일이 없어 건너뜀")
+                    logger.warning("[DEBUG]   ⚠️  파일이 없어 건너뜀")
                     continue
                 
                 # 유닛별 파일인지 확인 (파일이 여러 개이고, 파일명에 유닛 번호가 있는 경우)
                 # (Unit Test는 이미 [3-3.5단계]에서 처리되었으므로 여기서는 건너뜀)
-                is_unit_based = False
-                has_letter_suffix = False  # 함수 스코프에서 초기화
-                if len(files) > 1:
-                    # 파일명에 유닛 번호가 있는지 확인
-                    unit_numbers = [self._extract_unit_number(f) for f in files]
-                    has_unit_numbers = any(unit_num > 0 for unit_num in unit_numbers)
-                    
-                    # 파일명에 "A", "B" 같은 알파벳 접미사가 있는지 확인 (예: Word List A, Word List B)
-                    # 파일명 끝에 단일 알파벳이 있는지 확인
-                    # 패턴: 공백/언더스코어 + 단일 알파벳 + 끝 (또는 확장자)
-                    def has_letter_suffix_pattern(file_path: Path) -> bool:
-                        name = file_path.stem  # 확장자 제외
-                        # 파일명 끝에 " A", " B", "_A", "_B" 같은 패턴이 있는지 확인
-                        # 예: "Word Test A" -> " A" 매칭, "Word Test" -> 매칭 안 됨
-                        return bool(re.search(r'[_\s]([A-Z])$', name, re.IGNORECASE))
-                    
-                    has_letter_suffix = any(has_letter_suffix_pattern(f) for f in files)
-                    
-                    logger.debug(f"[DEBUG]   파일 수: {len(files)}, 유닛 번호 존재: {has_unit_numbers}, 유닛 번호: {unit_numbers}")
-                    logger.debug(f"[DEBUG]   알파벳 접미사 존재: {has_letter_suffix}")
-                    logger.debug(f"[DEBUG]   카테고리명이 유닛별 카테고리 목록에 있는지: {cat_name in unit_based_categories}")
-                    
-                    # 유닛 번호가 있고, 알파벳 접미사가 없으면 유닛별 파일로 판단
-                    # 알파벳 접미사가 있으면 사용자 선택 후 통합 파일로 처리 (각 파일이 여러 유닛 포함)
-                    if has_letter_suffix:
-                        # 알파벳 접미사(A, B 등)가 있으면 사용자에게 선택 질문
-                        # 선택 질문은 아래 통합 파일 처리 부분에서 진행
-                        is_unit_based = False
-                        logger.debug(f"[DEBUG]   알파벳 접미사 감지됨 (A, B 등) - 사용자 선택 필요")
-                    elif has_unit_numbers:
-                        # 유닛 번호가 있으면 유닛별 파일로 판단
-                        is_unit_based = True
-                        logger.debug(f"[DEBUG]   ✅ 유닛별 파일로 판단됨 (유닛 번호 있음)")
-                    elif cat_name in unit_based_categories:
-                        # 카테고리명이 유닛별 카테고리이면 유닛별 파일로 판단
-                        is_unit_based = True
-                        logger.debug(f"[DEBUG]   ✅ 유닛별 파일로 판단됨 (카테고리명 기준)")
-                    else:
-                        # 그 외는 통합 파일로 판단
-                        is_unit_based = False
-                        logger.debug(f"[DEBUG]   ❌ 통합 파일로 판단됨")
-                else:
-                    logger.debug(f"[DEBUG]   파일이 1개뿐이므로 통합 파일로 판단")
+                is_unit_based, has_letter_suffix = self._classify_category_files(cat_name, files)
                 
                 if is_unit_based:
                     # 유닛별 파일인 경우
                     print(f"  [{cat_name}] 유닛별 파일로 처리 ({len(files)}개 파일)")
-                    logger.info(f"[DEBUG]   유닛별 파일 처리 시작")
+                    logger.info("[DEBUG]   유닛별 파일 처리 시작")
                     unit_page_lengths = []
                     pdf_paths = []
                     
                     # 유닛 번호 순서대로 정렬
                     sorted_files = sorted(files, key=lambda p: self._extract_unit_number(p))
-                    logger.debug(f"[DEBUG]   정렬된 파일 순서:")
+                    logger.debug("[DEBUG]   정렬된 파일 순서:")
                     for f in sorted_files:
-                        logger.debug(f"[DEBUG]     Unit {self._extract_unit_number(f)}: {f.name}")
+                        logger.debug("[DEBUG]     Unit %s: %s", self._extract_unit_number(f), f.name)
                     
                     for file_path in sorted_files:
                         unit_num = self._extract_unit_number(file_path)
-                        logger.debug(f"[DEBUG]   파일 처리: Unit {unit_num} - {file_path.name}")
+                        logger.debug("[DEBUG]   파일 처리: Unit %s - %s", unit_num, file_path.name)
                         try:
-                            reader = PdfReader(str(file_path))
-                            page_count = len(reader.pages)
+                            page_count = self._get_page_count(file_path)
                             unit_page_lengths.append(page_count)
                             pdf_paths.append(str(file_path))
-                            logger.info(f"[DEBUG]     ✅ Unit {unit_num}: {page_count}페이지")
+                            logger.info("[DEBUG]     ✅ Unit %s: %s페이지", unit_num, page_count)
                             print(f"    Unit {unit_num}: {page_count}페이지")
                         except Exception as e:
-                            logger.error(f"[DEBUG]     ❌ PDF 읽기 실패: {e}")
-                            logger.warning(f"PDF 읽기 실패 ({file_path}): {e}")
+                            logger.error("[DEBUG]     ❌ PDF 읽기 실패: %s", e)
+                            logger.warning("PDF 읽기 실패 (%s): %s", file_path, e)
                             unit_page_lengths.append(0)
                             pdf_paths.append(str(file_path))
                     
@@ -725,7 +749,7 @@ class ConfigManagerV5:
                         "unit_page_lengths": unit_page_lengths
                     }
                     unit_page_lengths_dict[cat_name] = unit_page_lengths
-                    logger.info(f"[DEBUG]   ✅ 완료: {len(unit_page_lengths)}개 유닛, 총 {sum(unit_page_lengths)}페이지")
+                    logger.info("[DEBUG]   ✅ 완료: %s개 유닛, 총 %s페이지", len(unit_page_lengths), sum(unit_page_lengths))
                 else:
                     # 통합 파일인 경우 (한 파일에 여러 유닛 포함)
                     # has_letter_suffix가 True인 경우도 여기서 처리 (A, B 등)
@@ -745,42 +769,44 @@ class ConfigManagerV5:
                         print(f"    {len(files) + 1}. 모두 사용 (전체 병합)")
                         
                         try:
-                            choice_input = input(f"\n  사용할 파일을 선택하세요 (번호 입력, 기본값: {len(files) + 1} 모두 사용): ").strip()
+                            choice_input = self._prompt(
+                                "file_choice", f"\n  사용할 파일을 선택하세요 (번호 입력, 기본값: {len(files) + 1} 모두 사용): ",
+                                cat_name).strip()
                         except (KeyboardInterrupt, EOFError) as e:
                             print("\n⚠️  입력이 중단되었습니다. 모든 파일을 사용합니다.")
-                            logger.warning(f"[DEBUG] 입력 중단: {e}. 모든 파일 사용.")
+                            logger.warning("[DEBUG] 입력 중단: %s. 모든 파일 사용.", e)
                             choice_input = str(len(files) + 1)
                         except Exception as e:
                             print(f"\n⚠️  입력 오류 발생: {e}. 모든 파일을 사용합니다.")
-                            logger.error(f"[DEBUG] 입력 오류: {e}. 모든 파일 사용.")
+                            logger.error("[DEBUG] 입력 오류: %s. 모든 파일 사용.", e)
                             choice_input = str(len(files) + 1)
                         
                         selected_files = []
                         if not choice_input:
                             # 기본값: 모두 사용
                             selected_files = sorted_files
-                            logger.info(f"[DEBUG] 사용자 선택: 모두 사용 ({len(selected_files)}개 파일)")
+                            logger.info("[DEBUG] 사용자 선택: 모두 사용 (%s개 파일)", len(selected_files))
                         else:
                             try:
                                 choice = int(choice_input)
                                 if 1 <= choice <= len(files):
                                     selected_files = [sorted_files[choice - 1]]
-                                    logger.info(f"[DEBUG] 사용자 선택: {sorted_files[choice - 1].name}")
+                                    logger.info("[DEBUG] 사용자 선택: %s", sorted_files[choice - 1].name)
                                 elif choice == len(files) + 1:
                                     selected_files = sorted_files
-                                    logger.info(f"[DEBUG] 사용자 선택: 모두 사용 ({len(selected_files)}개 파일)")
+                                    logger.info("[DEBUG] 사용자 선택: 모두 사용 (%s개 파일)", len(selected_files))
                                 else:
                                     print(f"    ⚠️  잘못된 번호입니다. 모든 파일을 사용합니다.")
-                                    logger.warning(f"[DEBUG] 잘못된 번호: {choice}. 모든 파일 사용.")
+                                    logger.warning("[DEBUG] 잘못된 번호: %s. 모든 파일 사용.", choice)
                                     selected_files = sorted_files
                             except ValueError:
                                 print(f"    ⚠️  잘못된 입력입니다. 모든 파일을 사용합니다.")
-                                logger.warning(f"[DEBUG] 잘못된 입력: {choice_input}. 모든 파일 사용.")
+                                logger.warning("[DEBUG] 잘못된 입력: %s. 모든 파일 사용.", choice_input)
                                 selected_files = sorted_files
                         
                         if not selected_files:
                             print(f"    ⚠️  [{cat_name}] 건너뜀 (선택된 파일 없음)")
-                            logger.info(f"[DEBUG]   사용자 요청으로 [{cat_name}] 건너뜀")
+                            logger.info("[DEBUG]   사용자 요청으로 [%s] 건너뜀", cat_name)
                             continue
                         
                         # 선택된 파일들을 통합 파일로 처리
@@ -788,24 +814,24 @@ class ConfigManagerV5:
                         if len(selected_files) == 1:
                             # 파일이 1개만 선택된 경우
                             file_path = selected_files[0]
-                            logger.debug(f"[DEBUG]   단일 파일 처리: {file_path.name}")
+                            logger.debug("[DEBUG]   단일 파일 처리: %s", file_path.name)
                             unit_page_lengths = self._extract_unit_page_lengths(file_path)
                             categories[cat_name] = {
                                 "pdf_path": str(file_path),
                                 "unit_page_lengths": unit_page_lengths
                             }
                             unit_page_lengths_dict[cat_name] = unit_page_lengths
-                            logger.info(f"[DEBUG]     ✅ 유닛 수: {len(unit_page_lengths)}, 페이지: {unit_page_lengths}")
-                            print(f"    ✅ 유닛 수: {len(unit_page_lengths)}, 페이지: {unit_page_lengths}")
+                            logger.info("[DEBUG]     ✅ 유닛 수: %s, 페이지: %s", len(unit_page_lengths), unit_page_lengths)
+                            print(f"    ✅ {self._describe_units(unit_page_lengths)}")
                         else:
                             # 여러 파일이 선택된 경우 - 각 파일을 통합 파일로 처리하고 합침
-                            logger.info(f"[DEBUG]   여러 파일 통합 처리 시작: {len(selected_files)}개 파일")
+                            logger.info("[DEBUG]   여러 파일 통합 처리 시작: %s개 파일", len(selected_files))
                             all_unit_page_lengths = []
                             file_unit_info = []
                             current_unit_index = 0
                             
                             for file_path in sorted(selected_files, key=lambda p: p.name):
-                                logger.debug(f"[DEBUG]     파일 처리: {file_path.name}")
+                                logger.debug("[DEBUG]     파일 처리: %s", file_path.name)
                                 unit_page_lengths = self._extract_unit_page_lengths(file_path)
                                 unit_count = len(unit_page_lengths)
                                 
@@ -818,7 +844,7 @@ class ConfigManagerV5:
                                 
                                 all_unit_page_lengths.extend(unit_page_lengths)
                                 current_unit_index += unit_count
-                                logger.info(f"[DEBUG]       ✅ {file_path.name}: {unit_count}개 유닛, {sum(unit_page_lengths)}페이지")
+                                logger.info("[DEBUG]       ✅ %s: %s개 유닛, %s페이지", file_path.name, unit_count, sum(unit_page_lengths))
                             
                             categories[cat_name] = {
                                 "pdf_path": str(selected_files[0]),  # 첫 번째 파일 경로 (참조용)
@@ -828,8 +854,11 @@ class ConfigManagerV5:
                                 "is_multi_file_combined": True
                             }
                             unit_page_lengths_dict[cat_name] = all_unit_page_lengths
-                            logger.info(f"[DEBUG]     ✅ 통합 완료: 총 {len(all_unit_page_lengths)}개 유닛, {sum(all_unit_page_lengths)}페이지")
-                            print(f"    ✅ 통합 완료: 총 {len(all_unit_page_lengths)}개 유닛, {sum(all_unit_page_lengths)}페이지")
+                            logger.info("[DEBUG]     ✅ 통합 완료: 총 %s개 유닛, %s페이지", len(all_unit_page_lengths), sum(all_unit_page_lengths))
+                            if self.fused:
+                                print(f"    ✅ {self._describe_units(all_unit_page_lengths)}")
+                            else:
+                                print(f"    ✅ 통합 완료: 총 {len(all_unit_page_lengths)}개 유닛, {sum(all_unit_page_lengths)}페이지")
                     
                     elif len(files) == 1:
                         # 파일이 1개인 경우 - 사용자 확인
@@ -838,30 +867,30 @@ class ConfigManagerV5:
                         print(f"    이 파일을 통합 파일로 처리하시겠습니까? (한 파일에 여러 유닛이 포함된 경우)")
                         
                         try:
-                            confirm = input("  처리할까요? (y/n, 기본값: y): ").strip().lower()
+                            confirm = self._prompt("combined_file", "  처리할까요? (y/n, 기본값: y): ", cat_name).strip().lower()
                         except (KeyboardInterrupt, EOFError) as e:
                             print("\n⚠️  입력이 중단되었습니다. 통합 파일로 처리합니다.")
-                            logger.warning(f"[DEBUG] 입력 중단: {e}. 통합 파일로 처리.")
+                            logger.warning("[DEBUG] 입력 중단: %s. 통합 파일로 처리.", e)
                             confirm = 'y'
                         except Exception as e:
                             print(f"\n⚠️  입력 오류 발생: {e}. 통합 파일로 처리합니다.")
-                            logger.error(f"[DEBUG] 입력 오류: {e}. 통합 파일로 처리.")
+                            logger.error("[DEBUG] 입력 오류: %s. 통합 파일로 처리.", e)
                             confirm = 'y'
                         
                         if confirm == 'n':
                             print(f"    ⚠️  [{cat_name}] 건너뜀")
-                            logger.info(f"[DEBUG]   사용자 요청으로 [{cat_name}] 건너뜀")
+                            logger.info("[DEBUG]   사용자 요청으로 [%s] 건너뜀", cat_name)
                             continue  # 이 카테고리 건너뛰기
                         
-                        logger.debug(f"[DEBUG]   파일 처리: {file_path.name}")
+                        logger.debug("[DEBUG]   파일 처리: %s", file_path.name)
                         unit_page_lengths = self._extract_unit_page_lengths(file_path)
                         categories[cat_name] = {
                             "pdf_path": str(file_path),
                             "unit_page_lengths": unit_page_lengths
                         }
                         unit_page_lengths_dict[cat_name] = unit_page_lengths
-                        logger.info(f"[DEBUG]     ✅ 유닛 수: {len(unit_page_lengths)}, 페이지: {unit_page_lengths}")
-                        print(f"    ✅ 유닛 수: {len(unit_page_lengths)}, 페이지: {unit_page_lengths}")
+                        logger.info("[DEBUG]     ✅ 유닛 수: %s, 페이지: %s", len(unit_page_lengths), unit_page_lengths)
+                        print(f"    ✅ {self._describe_units(unit_page_lengths)}")
                     else:
                         # 파일이 여러 개인 경우 (예: Word List A, Word List B)
                         # 사용자에게 선택권 제공
@@ -872,73 +901,75 @@ class ConfigManagerV5:
                         print(f"    {len(files) + 1}. 모두 사용 (전체 병합)")
                         
                         try:
-                            choice_input = input(f"\n  사용할 파일을 선택하세요 (번호 입력, 기본값: {len(files) + 1} 모두 사용): ").strip()
+                            choice_input = self._prompt(
+                                "file_choice", f"\n  사용할 파일을 선택하세요 (번호 입력, 기본값: {len(files) + 1} 모두 사용): ",
+                                cat_name).strip()
                         except (KeyboardInterrupt, EOFError) as e:
                             print("\n⚠️  입력이 중단되었습니다. 모든 파일을 사용합니다.")
-                            logger.warning(f"[DEBUG] 입력 중단: {e}. 모든 파일 사용.")
+                            logger.warning("[DEBUG] 입력 중단: %s. 모든 파일 사용.", e)
                             choice_input = str(len(files) + 1)
                         except Exception as e:
                             print(f"\n⚠️  입력 오류 발생: {e}. 모든 파일을 사용합니다.")
-                            logger.error(f"[DEBUG] 입력 오류: {e}. 모든 파일 사용.")
+                            logger.error("[DEBUG] 입력 오류: %s. 모든 파일 사용.", e)
                             choice_input = str(len(files) + 1)
                         
                         selected_files = []
                         if not choice_input:
                             # 기본값: 모두 사용
                             selected_files = sorted_files
-                            logger.info(f"[DEBUG] 사용자 선택: 모두 사용 ({len(selected_files)}개 파일)")
+                            logger.info("[DEBUG] 사용자 선택: 모두 사용 (%s개 파일)", len(selected_files))
                         else:
                             try:
                                 choice = int(choice_input)
                                 if 1 <= choice <= len(files):
                                     selected_files = [sorted_files[choice - 1]]
-                                    logger.info(f"[DEBUG] 사용자 선택: {selected_files[0].name}")
+                                    logger.info("[DEBUG] 사용자 선택: %s", selected_files[0].name)
                                 elif choice == len(files) + 1:
                                     selected_files = sorted_files
-                                    logger.info(f"[DEBUG] 사용자 선택: 모두 사용 ({len(selected_files)}개 파일)")
+                                    logger.info("[DEBUG] 사용자 선택: 모두 사용 (%s개 파일)", len(selected_files))
                                 else:
                                     print(f"⚠️  잘못된 번호입니다. 모든 파일을 사용합니다.")
-                                    logger.warning(f"[DEBUG] 잘못된 번호 입력: {choice}. 모든 파일 사용.")
+                                    logger.warning("[DEBUG] 잘못된 번호 입력: %s. 모든 파일 사용.", choice)
                                     selected_files = sorted_files
                             except ValueError:
                                 # 파일명으로 검색
                                 matching_files = [f for f in sorted_files if choice_input.lower() in f.name.lower()]
                                 if matching_files:
                                     selected_files = matching_files
-                                    logger.info(f"[DEBUG] 사용자 선택 (파일명 검색): {[f.name for f in selected_files]}")
+                                    logger.info("[DEBUG] 사용자 선택 (파일명 검색): %s", [f.name for f in selected_files])
                                 else:
                                     print(f"⚠️  일치하는 파일이 없습니다. 모든 파일을 사용합니다.")
-                                    logger.warning(f"[DEBUG] 일치하는 파일 없음: {choice_input}. 모든 파일 사용.")
+                                    logger.warning("[DEBUG] 일치하는 파일 없음: %s. 모든 파일 사용.", choice_input)
                                     selected_files = sorted_files
                         
                         if len(selected_files) == 1:
                             # 파일이 1개 선택된 경우
                             file_path = selected_files[0]
-                            logger.debug(f"[DEBUG]   선택된 파일 처리: {file_path.name}")
+                            logger.debug("[DEBUG]   선택된 파일 처리: %s", file_path.name)
                             unit_page_lengths = self._extract_unit_page_lengths(file_path)
                             categories[cat_name] = {
                                 "pdf_path": str(file_path),
                                 "unit_page_lengths": unit_page_lengths
                             }
                             unit_page_lengths_dict[cat_name] = unit_page_lengths
-                            logger.info(f"[DEBUG]     ✅ 유닛 수: {len(unit_page_lengths)}, 페이지: {unit_page_lengths}")
+                            logger.info("[DEBUG]     ✅ 유닛 수: %s, 페이지: %s", len(unit_page_lengths), unit_page_lengths)
                             print(f"    ✅ 선택된 파일: {file_path.name}")
-                            print(f"    유닛 수: {len(unit_page_lengths)}, 페이지: {unit_page_lengths}")
+                            print(f"    {self._describe_units(unit_page_lengths)}")
                         else:
                             # 여러 파일 선택된 경우 (모두 사용)
-                            logger.info(f"[DEBUG]   여러 통합 파일 처리: 각 파일에서 유닛 추출 후 합침")
+                            logger.info("[DEBUG]   여러 통합 파일 처리: 각 파일에서 유닛 추출 후 합침")
                             all_unit_page_lengths = []
                             file_unit_info = []  # 각 파일의 정보: (파일경로, 시작유닛인덱스, 유닛수)
                             
-                            logger.debug(f"[DEBUG]   정렬된 파일 순서:")
+                            logger.debug("[DEBUG]   정렬된 파일 순서:")
                             for f in selected_files:
-                                logger.debug(f"[DEBUG]     {f.name}")
+                                logger.debug("[DEBUG]     %s", f.name)
                             
                             start_unit_index = 0
                             for file_path in selected_files:
-                                logger.debug(f"[DEBUG]   파일 처리: {file_path.name}")
+                                logger.debug("[DEBUG]   파일 처리: %s", file_path.name)
                                 unit_page_lengths = self._extract_unit_page_lengths(file_path)
-                                if unit_page_lengths:
+                                if unit_page_lengths or self.fused:
                                     file_unit_info.append({
                                         "pdf_path": str(file_path),
                                         "start_unit_index": start_unit_index,
@@ -947,10 +978,10 @@ class ConfigManagerV5:
                                     })
                                     all_unit_page_lengths.extend(unit_page_lengths)
                                     start_unit_index += len(unit_page_lengths)
-                                    logger.info(f"[DEBUG]     ✅ {file_path.name}: {len(unit_page_lengths)}개 유닛 추가 (시작 인덱스: {file_unit_info[-1]['start_unit_index']}), 페이지: {unit_page_lengths}")
-                                    print(f"    {file_path.name}: {len(unit_page_lengths)}개 유닛, 페이지: {unit_page_lengths}")
+                                    logger.info("[DEBUG]     ✅ %s: %s개 유닛 추가 (시작 인덱스: %s), 페이지: %s", file_path.name, len(unit_page_lengths), file_unit_info[-1]['start_unit_index'], unit_page_lengths)
+                                    print(f"    {file_path.name}: {self._describe_units(unit_page_lengths)}")
                                 else:
-                                    logger.warning(f"[DEBUG]     ⚠️  {file_path.name}: 유닛 추출 실패")
+                                    logger.warning("[DEBUG]     ⚠️  %s: 유닛 추출 실패", file_path.name)
                             
                             # 여러 파일의 유닛을 합쳤으므로, 각 유닛이 어느 파일의 어느 위치에 있는지 추적
                             categories[cat_name] = {
@@ -959,29 +990,33 @@ class ConfigManagerV5:
                                 "is_multi_file_combined": True  # 여러 파일을 합쳤다는 플래그
                             }
                             unit_page_lengths_dict[cat_name] = all_unit_page_lengths
-                            logger.info(f"[DEBUG]   ✅ 완료: 총 {len(all_unit_page_lengths)}개 유닛 (여러 파일 합침), 총 {sum(all_unit_page_lengths)}페이지")
-                            print(f"    총 유닛 수: {len(all_unit_page_lengths)}, 총 페이지: {sum(all_unit_page_lengths)}")
+                            logger.info("[DEBUG]   ✅ 완료: 총 %s개 유닛 (여러 파일 합침), 총 %s페이지", len(all_unit_page_lengths), sum(all_unit_page_lengths))
+                            if not self.fused:
+                                print(f"    총 유닛 수: {len(all_unit_page_lengths)}, 총 페이지: {sum(all_unit_page_lengths)}")
+            
+            if self.fused:
+                self._defer_unit_detection(categories, unit_page_lengths_dict)
             
             # 유닛 수 확인
-            logger.info(f"[DEBUG] ===== 유닛 수 확인 =====")
+            logger.info("[DEBUG] ===== 유닛 수 확인 =====")
             unit_counts = [len(upl) for upl in unit_page_lengths_dict.values()]
-            logger.info(f"[DEBUG] 카테고리별 유닛 수: {unit_counts}")
-            logger.info(f"[DEBUG] 카테고리별 상세 정보:")
+            logger.info("[DEBUG] 카테고리별 유닛 수: %s", unit_counts)
+            logger.info("[DEBUG] 카테고리별 상세 정보:")
             for cat_name, upl in unit_page_lengths_dict.items():
-                logger.info(f"[DEBUG]   {cat_name}: {len(upl)}개 유닛, 페이지: {upl}")
+                logger.info("[DEBUG]   %s: %s개 유닛, 페이지: %s", cat_name, len(upl), upl)
             
             if len(set(unit_counts)) != 1:
                 print(f"⚠️  경고: 카테고리별 유닛 수가 일치하지 않습니다: {unit_counts}")
-                logger.warning(f"[DEBUG] ⚠️  카테고리별 유닛 수 불일치: {unit_counts}")
+                logger.warning("[DEBUG] ⚠️  카테고리별 유닛 수 불일치: %s", unit_counts)
                 max_units = max(unit_counts) if unit_counts else 0
                 print(f"최대 유닛 수({max_units})를 사용합니다.")
-                logger.info(f"[DEBUG] 최대 유닛 수 사용: {max_units}")
+                logger.info("[DEBUG] 최대 유닛 수 사용: %s", max_units)
                 total_units = max_units
             else:
                 total_units = unit_counts[0] if unit_counts else 0
-                logger.info(f"[DEBUG] ✅ 모든 카테고리 유닛 수 일치: {total_units}")
+                logger.info("[DEBUG] ✅ 모든 카테고리 유닛 수 일치: %s", total_units)
             
-            logger.info(f"[DEBUG] 최종 총 유닛 수: {total_units}")
+            logger.info("[DEBUG] 최종 총 유닛 수: %s", total_units)
             
             # 3-6. 병합 순서 설정
             print(f"\n[3-6단계] 병합 순서 설정")
@@ -990,7 +1025,7 @@ class ConfigManagerV5:
             for idx, cat in enumerate(category_list, 1):
                 print(f"  {idx}. {cat}")
             
-            order_input = input("병합 순서를 번호로 입력하세요 (예: 1,2,3 또는 Enter=자동순서): ").strip()
+            order_input = self._prompt("merge_order", "병합 순서를 번호로 입력하세요 (예: 1,2,3 또는 Enter=자동순서): ").strip()
             if order_input:
                 try:
                     order_numbers = [int(x.strip()) for x in order_input.split(',') if x.strip()]
@@ -1019,8 +1054,7 @@ class ConfigManagerV5:
                     start_unit = end_unit = total_units  # 기본값: 마지막 유닛
                 
                 try:
-                    reader = PdfReader(str(review_path))
-                    total_pages = len(reader.pages)
+                    total_pages = self._get_page_count(review_path)
                     review_tests_config.append({
                         "cat_name": review_path.stem,
                         "pdf_path": str(review_path),
@@ -1029,7 +1063,7 @@ class ConfigManagerV5:
                         "end_unit": end_unit
                     })
                 except Exception as e:
-                    logger.warning(f"Review Test 파일 읽기 실패 ({review_path}): {e}")
+                    logger.warning("Review Test 파일 읽기 실패 (%s): %s", review_path, e)
             
             # 설정 저장
             configs[book_title] = {
@@ -1039,13 +1073,124 @@ class ConfigManagerV5:
                 "total_units": total_units,
                 "categories": categories,
                 "merge_order": merge_order,
-                "review_tests": review_tests_config
+                "review_tests": review_tests_config,
+                # 설정 단계 계측 (병합 보고서 JSON에 함께 기록)
+                "config_metrics": self.metrics.snapshot(scope=book_title)
             }
             
             print(f"\n✅ [{book_title}] 설정 완료")
         
+        self.prefetcher.shutdown()
         return configs
     
+    def _classify_category_files(self, cat_name: str, files: List[Path]) -> Tuple[bool, bool]:
+        """
+        카테고리 파일 구성 판단
+        
+        Args:
+            cat_name: 카테고리 이름
+            files: 카테고리에 속한 파일 리스트
+            
+        Returns:
+            (유닛별 파일 여부, 알파벳 접미사(A, B 등) 존재 여부)
+        """
+        if len(files) <= 1:
+            logger.debug("[DEBUG]   파일이 1개뿐이므로 통합 파일로 판단")
+            return False, False
+        
+        # 파일명에 유닛 번호가 있는지 확인
+        unit_numbers = [self._extract_unit_number(f) for f in files]
+        has_unit_numbers = any(unit_num > 0 for unit_num in unit_numbers)
+        
+        # 파일명에 "A", "B" 같은 알파벳 접미사가 있는지 확인 (예: Word List A, Word List B)
+        # 파일명 끝에 " A", " B", "_A", "_B" 같은 패턴이 있는지 확인
+        # 예: "Word Test A" -> " A" 매칭, "Word Test" -> 매칭 안 됨
+        has_letter_suffix = any(re.search(r'[_\s]([A-Z])$', f.stem, re.IGNORECASE) for f in files)
+        
+        logger.debug("[DEBUG]   파일 수: %s, 유닛 번호 존재: %s, 유닛 번호: %s", len(files), has_unit_numbers, unit_numbers)
+        logger.debug("[DEBUG]   알파벳 접미사 존재: %s", has_letter_suffix)
+        logger.debug("[DEBUG]   카테고리명이 유닛별 카테고리 목록에 있는지: %s", cat_name in self.UNIT_BASED_CATEGORIES)
+        
+        # 유닛 번호가 있고, 알파벳 접미사가 없으면 유닛별 파일로 판단
+        # 알파벳 접미사가 있으면 사용자 선택 후 통합 파일로 처리 (각 파일이 여러 유닛 포함)
+        if has_letter_suffix:
+            logger.debug("[DEBUG]   알파벳 접미사 감지됨 (A, B 등) - 사용자 선택 필요")
+            return False, True
+        if has_unit_numbers:
+            logger.debug("[DEBUG]   ✅ 유닛별 파일로 판단됨 (유닛 번호 있음)")
+            return True, False
+        if cat_name in self.UNIT_BASED_CATEGORIES:
+            logger.debug("[DEBUG]   ✅ 유닛별 파일로 판단됨 (카테고리명 기준)")
+            return True, False
+        logger.debug("[DEBUG]   ❌ 통합 파일로 판단됨")
+        return False, False
+    
+    def _describe_units(self, unit_page_lengths: List[int]) -> str:
+        """유닛 추출 결과 안내 문구 (융합 병합이면 병합 단계에서 감지)"""
+        if self.fused:
+            return "유닛 경계는 병합 단계에서 감지 (융합 병합)"
+        return f"유닛 수: {len(unit_page_lengths)}, 페이지: {unit_page_lengths}"
+    
+    def _defer_unit_detection(self, categories: Dict, unit_page_lengths_dict: Dict):
+        """
+        융합 병합: 통합 파일 카테고리를 병합 단계에서 감지하도록 표시하고 유닛 수 확인에서 제외
+        (유닛별 파일 카테고리는 그대로 유지)
+        """
+        for cat_name, info in categories.items():
+            if "pdf_paths" in info and not info.get("is_multi_file_combined"):
+                continue
+            if info.get("is_multi_file_combined"):
+                info["pdf_paths"] = [f["pdf_path"] for f in info.get("file_unit_info", [])]
+            info["detect_units"] = True
+            unit_page_lengths_dict.pop(cat_name, None)
+            logger.info("[DEBUG] 융합 병합 - [%s] 유닛 감지를 병합 단계로 미룸", cat_name)
+    
+    def _start_prefetch(self, categories: Dict[str, List[Path]], review_tests: List[Path]):
+        """
+        사용자 답변과 무관한 작업을 백그라운드에서 시작
+        (모든 후보 파일의 페이지 수, 통합 파일 후보의 유닛 텍스트 스캔)
+        """
+        if not self.prefetcher.enabled:
+            return
+        
+        # 페이지 수는 가벼우므로 먼저 제출
+        for files in categories.values():
+            for file_path in files:
+                self.prefetcher.submit('page_count', str(file_path), get_page_count_guarded, file_path)
+        for review_path in review_tests:
+            self.prefetcher.submit('page_count', str(review_path), get_page_count_guarded, review_path)
+        
+        # 통합 파일로 처리될 가능성이 있는 파일만 텍스트 스캔
+        scan_targets = []
+        for cat_name, files in categories.items():
+            is_unit_based, _ = self._classify_category_files(cat_name, files)
+            if not is_unit_based:
+                scan_targets.extend(files)
+            elif cat_name == 'Unit Test':
+                # ALL 파일 선택 시 통합 파일로 처리됨
+                scan_targets.extend(f for f in files if 'all' in f.name.lower())
+        if self.fused:
+            # 융합 병합에서는 병합 단계에서 페이지를 분배하면서 감지
+            scan_targets = []
+        for file_path in scan_targets:
+            self.prefetcher.submit('unit_scan', str(file_path), scan_page_units_guarded, file_path)
+        
+        logger.info("[DEBUG] 백그라운드 사전 계산 시작: 페이지 수 %s개, 유닛 스캔 %s개",
+                    sum(len(f) for f in categories.values()) + len(review_tests), len(scan_targets))
+    
+    def _get_page_count(self, pdf_path: Path) -> int:
+        """PDF 페이지 수 (미리 계산된 결과가 있으면 사용)"""
+        return self.prefetcher.result('page_count', str(pdf_path), get_page_count_guarded, pdf_path)
+    
+    def _extract_zip(self, zip_file: Path, remove_after: bool, scope: Optional[str] = None) -> Optional[Path]:
+        """압축 해제 (읽은 zip 크기와 쓴 바이트를 계측)"""
+        with self.metrics.stage("zip_extraction", scope=scope, label=zip_file.name) as sample:
+            archive_size = zip_file.stat().st_size if zip_file.exists() else 0
+            written_before = self.extractor.bytes_written
+            extracted_dir = self.extractor.extract_zip(zip_file, remove_after_extract=remove_after)
+            sample.add(bytes_read=archive_size, bytes_written=self.extractor.bytes_written - written_before)
+        return extracted_dir
+    
     def _extract_unit_number(self, path: Path) -> int:
         """파일 경로에서 유닛 번호 추출"""
         match = re.search(r"unit[ _-]?(\d{1,2})", str(path), re.IGNORECASE)
@@ -1055,79 +1200,38 @@ class ConfigManagerV5:
     
     def _extract_unit_page_lengths(self, pdf_path: Path) -> List[int]:
         """PDF에서 유닛별 페이지 길이 추출 (기존 로직 재사용)"""
+        if self.fused:
+            # 융합 병합: 유닛 경계는 FusedMergeEngine이 병합하면서 감지
+            return []
         # 기존 config.py의 extract_unit_page_lengths 로직 재사용
-        unit_pattern = re.compile(r'u\s*n\s*i\s*t\s*[\.:∙-]?\s*(\d{1,2})', re.IGNORECASE)
-        
-        def normalize_text(text):
-            """PDF 텍스트 정규화"""
-            text = text.replace('\n', ' ')
-            text = re.sub(r'\s+', ' ', text)
-            text = text.strip()
-            text = re.sub(r'U\s+n\s*i\s+t', 'Unit', text, flags=re.IGNORECASE)
-            text = re.sub(r'U\s+nit', 'Unit', text, flags=re.IGNORECASE)
-            text = re.sub(r'Un\s+it', 'Unit', text, flags=re.IGNORECASE)
-            text = re.sub(r'Uni\s+t', 'Unit', text, flags=re.IGNORECASE)
-            return text
-        
-        def is_toc_page(text):
-            """목차 페이지인지 확인"""
-            toc_keywords = ['목차', 'contents', 'table of contents', 'index']
-            text_lower = text.lower()
-            if any(keyword in text_lower for keyword in toc_keywords):
-                return True
-            unit_matches = re.findall(r'unit\s*\d{1,2}', text_lower)
-            if len(set(unit_matches)) >= 3:
-                return True
-            return False
-        
+        # 텍스트 스캔은 사용자 입력과 무관하므로 미리 계산된 결과를 사용
         try:
-            reader = PdfReader(str(pdf_path))
+            with self.metrics.stage("unit_detection", scope=self._current_book, label=pdf_path.name) as sample:
+                scan = self.prefetcher.result('unit_scan', str(pdf_path), scan_page_units_guarded, pdf_path)
+                sample.add(bytes_read=pdf_path.stat().st_size, pages=scan["page_count"])
+            if scan["page_count"] == 0:
+                logger.error("PDF 읽기 실패 (%s): 페이지가 없습니다", pdf_path)
+                return []
             
             # 목차 페이지 감지
-            first_page_text = reader.pages[0].extract_text() or ""
-            is_toc = is_toc_page(first_page_text)
-            
-            if is_toc:
+            if scan["first_page_is_toc"]:
                 print(f"[안내] 카테고리: {pdf_path.name}")
                 print(f"[안내] 첫 번째 페이지가 목차로 감지되었습니다.")
-                confirm = input("목차 페이지를 제외하시겠습니까? (y/n, 기본값: n): ").strip().lower()
+                confirm = self._prompt("toc_exclude", "목차 페이지를 제외하시겠습니까? (y/n, 기본값: n): ", pdf_path.name).strip().lower()
                 start_page = 1 if confirm == 'y' else 0
             else:
                 start_page = 0
             
-            unit_indices = []
-            unit_numbers = []
-            last_unit_num = None
-            first_unit_found = False
-            
-            for i, page in enumerate(reader.pages[start_page:], start_page):
-                raw_text = page.extract_text() or ""
-                
-                if not raw_text.strip():
-                    continue
-                
-                text = normalize_text(raw_text)
-                found = unit_pattern.search(text)
-                
-                if found:
-                    unit_num = int(found.group(1))
-                    if not first_unit_found and i == start_page + 1 and len(unit_indices) == 0:
-                        unit_indices.append(start_page)
-                        unit_numbers.append(unit_num)
-                        last_unit_num = unit_num
-                        first_unit_found = True
-                    elif unit_num != last_unit_num:
-                        unit_indices.append(i)
-                        unit_numbers.append(unit_num)
-                        last_unit_num = unit_num
+            unit_page_lengths = unit_page_lengths_from_scan(scan["page_units"], start_page)
             
-            if not unit_indices:
+            if not unit_page_lengths:
                 print(f"[안내] {pdf_path.name}에서 유닛이 감지되지 않았습니다.")
-                manual_input = input("유닛 수를 직접 입력하시겠습니까? (y/n, 기본값: n): ").strip().lower()
+                manual_input = self._prompt("manual_units", "유닛 수를 직접 입력하시겠습니까? (y/n, 기본값: n): ",
+                                            pdf_path.name).strip().lower()
                 if manual_input == 'y':
                     try:
-                        unit_count = int(input("유닛 수를 입력하세요: "))
-                        total_pages = len(reader.pages) - start_page
+                        unit_count = int(self._prompt("unit_count", "유닛 수를 입력하세요: ", pdf_path.name))
+                        total_pages = scan["page_count"] - start_page
                         pages_per_unit = total_pages // unit_count
                         unit_page_lengths = [pages_per_unit] * unit_count
                         remainder = total_pages % unit_count
@@ -1136,12 +1240,12 @@ class ConfigManagerV5:
                         return unit_page_lengths
                     except ValueError:
                         print("올바른 숫자를 입력해주세요.")
-                return [len(reader.pages) - start_page]
+                return [scan["page_count"] - start_page]
             
-            unit_indices.append(len(reader.pages))
-            unit_page_lengths = [unit_indices[i+1] - unit_indices[i] for i in range(len(unit_indices)-1)]
+            emit(UNITS_DETECTED, scope=self._current_book, pdf_path=str(pdf_path), units=len(unit_page_lengths),
+                 pages=scan["page_count"], unit_page_lengths=unit_page_lengths)
             return unit_page_lengths
             
         except Exception as e:
-            logger.error(f"PDF 읽기 실패 ({pdf_path}): {e}")
+            logger.error("PDF 읽기 실패 (%s): %s", pdf_path, e)
             return []
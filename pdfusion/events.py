@@ -0,0 +1,177 @@
+"""
+이벤트 스트림 모듈
+병합 파이프라인의 진행 상황(단계 시작/종료, 유닛 완료, 처리량, 캐시 적중)을 구조화된 이벤트로 발행
+감독 프로세스나 대시보드가 JSONL 파일을 tail 하거나 콜백으로 받아 실시간 처리량을 확인할 수 있음
+
+이벤트 형식 (한 줄에 JSON 객체 하나):
+    {"ts": 1700000000.123, "event": "stage_end", "pid": 1234, "stage": "unit_merge", "scope": "Book1",
+     "label": "Unit01", "wall_s": 0.12, "pages": 24, "pages_per_s": 200.0, ...}
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# 발행하는 이벤트 이름
+STAGE_START = "stage_start"
+STAGE_END = "stage_end"
+UNIT_DONE = "unit_done"
+ARCHIVE_EXTRACTED = "archive_extracted"
+DISCOVERY_DONE = "discovery_done"
+BOOK_TYPE_DETECTED = "book_type_detected"
+UNITS_DETECTED = "units_detected"
+CACHE_STATS = "cache_stats"
+JOB_QUEUED = "job_queued"
+JOB_STARTED = "job_started"
+JOB_DONE = "job_done"
+
+Sink = Callable[[Dict], None]
+
+
+class JsonlFileSink:
+    """
+    이벤트를 JSONL 파일에 한 줄씩 추가하는 싱크
+    (O_APPEND로 한 번에 쓰므로 병렬 작업 프로세스가 같은 파일에 써도 줄이 섞이지 않음)
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Args:
+            path: 이벤트 파일 경로 (없으면 생성, 있으면 이어 씀)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(str(self.path), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Dict):
+        line = (json.dumps(event, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+        with self._lock:
+            if self._fd is not None:
+                os.write(self._fd, line)
+
+    def close(self):
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+
+class CallbackSink:
+    """이벤트를 함수로 전달하는 싱크 (events를 주면 해당 이벤트만 전달)"""
+
+    def __init__(self, callback: Sink, events: Optional[Iterable[str]] = None):
+        """
+        Args:
+            callback: 이벤트 dict를 받는 함수
+            events: 전달할 이벤트 이름 목록 (None이면 전부)
+        """
+        self.callback = callback
+        self.events = frozenset(events) if events is not None else None
+
+    def __call__(self, event: Dict):
+        if self.events is None or event["event"] in self.events:
+            self.callback(event)
+
+
+class EventBus:
+    """
+    이벤트 발행/구독 (스레드 안전)
+    구독한 싱크가 없으면 emit()은 이벤트를 만들지 않고 바로 반환
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sinks: List[Sink] = []
+
+    @property
+    def enabled(self) -> bool:
+        """구독한 싱크가 있는지 (이벤트 내용을 만드는 비용이 큰 호출부에서 먼저 확인)"""
+        return bool(self._sinks)
+
+    def subscribe(self, sink: Sink) -> Sink:
+        """싱크 등록 (등록한 싱크를 그대로 반환)"""
+        with self._lock:
+            self._sinks = self._sinks + [sink]
+        return sink
+
+    def unsubscribe(self, sink: Sink):
+        """싱크 해제 (close()가 있으면 호출)"""
+        with self._lock:
+            self._sinks = [s for s in self._sinks if s is not sink]
+        close = getattr(sink, "close", None)
+        if close is not None:
+            close()
+
+    def emit(self, event: str, **fields):
+        """
+        이벤트 발행
+
+        Args:
+            event: 이벤트 이름 (예: 'unit_done')
+            **fields: 이벤트 내용
+        """
+        sinks = self._sinks
+        if not sinks:
+            return
+        record = {"ts": round(time.time(), 6), "event": event, "pid": os.getpid()}
+        record.update(fields)
+        for sink in sinks:
+            try:
+                sink(record)
+            except Exception as e:
+                # 모니터링 실패가 병합 결과에 영향을 주지 않도록 함
+                logger.warning("이벤트 싱크 오류 (%s): %s", event, e)
+
+
+def rate(amount: Union[int, float], seconds: float) -> Optional[float]:
+    """초당 처리량 (시간이 0이면 None)"""
+    return round(amount / seconds, 3) if seconds > 0 else None
+
+
+_bus = EventBus()
+_file_sink: Optional[JsonlFileSink] = None
+_file_sink_lock = threading.Lock()
+
+
+def get_event_bus() -> EventBus:
+    """프로세스 전체 공유 이벤트 버스"""
+    return _bus
+
+
+def emit(event: str, **fields):
+    """공유 이벤트 버스로 이벤트 발행 (get_event_bus().emit)"""
+    _bus.emit(event, **fields)
+
+
+def configure_events(path: Optional[Union[str, Path]]):
+    """
+    JSONL 이벤트 파일 설정
+
+    Args:
+        path: 이벤트 파일 경로 (None이면 파일 싱크 해제)
+    """
+    global _file_sink
+    with _file_sink_lock:
+        if _file_sink is not None:
+            _bus.unsubscribe(_file_sink)
+            _file_sink = None
+        if path:
+            _file_sink = _bus.subscribe(JsonlFileSink(path))
+
+
+def events_settings() -> Dict:
+    """현재 설정 (configure_events 인자 형태, 병렬 작업 프로세스에 전달)"""
+    with _file_sink_lock:
+        return {"path": str(_file_sink.path) if _file_sink is not None else None}
+
+
+# 환경 변수로 지정한 이벤트 파일
+if os.environ.get("PDFUSION_EVENTS"):
+    configure_events(os.environ["PDFUSION_EVENTS"])
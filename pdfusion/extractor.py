@@ -3,26 +3,39 @@
 zip 파일 자동 감지 및 압축 해제 기능 제공
 """
 
+import json
 import os
 import zipfile
 import logging
 from pathlib import Path
 from typing import List, Optional
 import shutil
+import time
+
+from .events import ARCHIVE_EXTRACTED, emit, rate
+from .source_cache import release_sources_under
 
 logger = logging.getLogger(__name__)
 
+# 압축 해제한 zip의 크기/수정 시각을 기록하는 파일 (reuse_existing에서 다시 해제할지 판단)
+EXTRACT_MARKER_NAME = ".pdfusion_extracted.json"
+
 
 class ZipExtractor:
     """압축 파일 추출 클래스"""
     
-    def __init__(self, extract_to: Optional[str] = None):
+    def __init__(self, extract_to: Optional[str] = None, reuse_existing: bool = False):
         """
         Args:
             extract_to: 압축 해제할 디렉토리 (None이면 원본과 같은 위치)
+            reuse_existing: 같은 zip(크기/수정 시각)을 이미 해제한 폴더가 있으면 다시 해제하지 않음
+                (파일을 새로 쓰지 않으므로 캐시된 reader, 페이지 수, 유닛 스캔 결과가 그대로 유효함)
         """
         self.extract_to = extract_to
+        self.reuse_existing = reuse_existing
         self.extracted_paths = []
+        # 압축 해제로 쓴 총 바이트 (계측용)
+        self.bytes_written = 0
         
     def find_zip_files(self, directory: str) -> List[Path]:
         """
@@ -37,9 +50,9 @@ class ZipExtractor:
         directory_path = Path(directory)
         zip_files = list(directory_path.rglob("*.zip"))
         
-        logger.info(f"디렉토리 '{directory}'에서 {len(zip_files)}개의 zip 파일 발견")
+        logger.info("디렉토리 '%s'에서 %s개의 zip 파일 발견", directory, len(zip_files))
         for zip_file in zip_files:
-            logger.debug(f"  - {zip_file}")
+            logger.debug("  - %s", zip_file)
             
         return zip_files
     
@@ -57,7 +70,7 @@ class ZipExtractor:
             압축 해제된 디렉토리 경로 (실패시 None)
         """
         if not zip_path.exists():
-            logger.error(f"zip 파일을 찾을 수 없음: {zip_path}")
+            logger.error("zip 파일을 찾을 수 없음: %s", zip_path)
             return None
         
         if extract_dir is None:
@@ -69,13 +82,23 @@ class ZipExtractor:
             folder_name = zip_path.stem.strip()
             extract_dir = Path(extract_dir) / folder_name
         
+        marker = self._archive_marker(zip_path)
+        if self.reuse_existing and self._read_marker(extract_dir) == marker:
+            logger.info("이미 압축 해제됨, 재사용: %s", extract_dir)
+            return extract_dir
+        
         try:
-            logger.info(f"압축 해제 중: {zip_path.name} -> {extract_dir}")
-            logger.debug(f"[DEBUG] 폴더명 (공백 제거 후): '{folder_name}'")
+            started = time.perf_counter()
+            written_before = self.bytes_written
+            files_extracted = 0
+            logger.info("압축 해제 중: %s -> %s", zip_path.name, extract_dir)
+            logger.debug("[DEBUG] 폴더명 (공백 제거 후): '%s'", folder_name)
             
             # 기존 디렉토리가 있으면 삭제
             if extract_dir.exists():
-                logger.warning(f"기존 디렉토리 삭제: {extract_dir}")
+                logger.warning("기존 디렉토리 삭제: %s", extract_dir)
+                # 이전에 읽은 PDF의 캐시된 reader와 메모리 매핑 해제 (Windows에서는 매핑된 파일을 삭제할 수 없음)
+                release_sources_under(extract_dir)
                 shutil.rmtree(extract_dir)
             
             extract_dir.mkdir(parents=True, exist_ok=True)
@@ -83,9 +106,9 @@ class ZipExtractor:
             # zip 파일 압축 해제 (경로 정규화 포함)
             with zipfile.ZipFile(zip_path, 'r') as zip_ref:
                 # zip 내부 파일 목록 확인
-                logger.debug(f"[DEBUG] zip 내부 파일 목록:")
+                logger.debug("[DEBUG] zip 내부 파일 목록:")
                 for member in zip_ref.namelist()[:5]:  # 처음 5개만 로그
-                    logger.debug(f"[DEBUG]   - {member}")
+                    logger.debug("[DEBUG]   - %s", member)
                 
                 # 안전한 압축 해제: 각 파일을 개별적으로 처리하여 경로 문제 해결
                 for member_info in zip_ref.infolist():
@@ -105,7 +128,7 @@ class ZipExtractor:
                     # 디렉토리인 경우
                     if member_name.endswith('/') or member_info.is_dir():
                         target_path.mkdir(parents=True, exist_ok=True)
-                        logger.debug(f"[DEBUG] 디렉토리 생성: {target_path}")
+                        logger.debug("[DEBUG] 디렉토리 생성: %s", target_path)
                     else:
                         # 파일인 경우
                         # 부모 디렉토리 생성
@@ -115,33 +138,54 @@ class ZipExtractor:
                         try:
                             with zip_ref.open(member_info) as source:
                                 with open(target_path, 'wb') as target:
-                                    target.write(source.read())
-                            logger.debug(f"[DEBUG] 파일 추출: {member_name} -> {target_path}")
+                                    self.bytes_written += target.write(source.read())
+                            files_extracted += 1
+                            logger.debug("[DEBUG] 파일 추출: %s -> %s", member_name, target_path)
                         except Exception as e:
-                            logger.warning(f"[DEBUG] 파일 추출 실패 ({member_name}): {e}")
+                            logger.warning("[DEBUG] 파일 추출 실패 (%s): %s", member_name, e)
                             # 실패한 경우 원본 경로로 시도
                             try:
                                 target_path_alt = extract_dir / member_name.replace('\\', os.sep).replace('/', os.sep)
                                 target_path_alt.parent.mkdir(parents=True, exist_ok=True)
                                 with zip_ref.open(member_info) as source:
                                     with open(target_path_alt, 'wb') as target:
-                                        target.write(source.read())
-                                logger.debug(f"[DEBUG] 대체 경로로 추출 성공: {target_path_alt}")
+                                        self.bytes_written += target.write(source.read())
+                                files_extracted += 1
+                                logger.debug("[DEBUG] 대체 경로로 추출 성공: %s", target_path_alt)
                             except Exception as e2:
-                                logger.error(f"[DEBUG] 대체 경로로도 추출 실패: {e2}")
+                                logger.error("[DEBUG] 대체 경로로도 추출 실패: %s", e2)
             
-            logger.info(f"압축 해제 완료: {extract_dir}")
+            logger.info("압축 해제 완료: %s", extract_dir)
             self.extracted_paths.append(extract_dir)
+            if self.reuse_existing:
+                with open(extract_dir / EXTRACT_MARKER_NAME, 'w', encoding='utf-8') as f:
+                    json.dump(marker, f)
+            elapsed = time.perf_counter() - started
+            bytes_written = self.bytes_written - written_before
+            emit(ARCHIVE_EXTRACTED, archive=str(zip_path), target=str(extract_dir), files=files_extracted,
+                 bytes_written=bytes_written, wall_s=round(elapsed, 6),
+                 write_bytes_per_s=rate(bytes_written, elapsed))
             
             # 압축 해제 후 원본 삭제
             if remove_after_extract:
                 zip_path.unlink()
-                logger.info(f"원본 zip 파일 삭제: {zip_path}")
+                logger.info("원본 zip 파일 삭제: %s", zip_path)
             
             return extract_dir
             
         except Exception as e:
-            logger.error(f"압축 해제 실패 ({zip_path}): {e}")
+            logger.error("압축 해제 실패 (%s): %s", zip_path, e)
+            return None
+    
+    def _archive_marker(self, zip_path: Path) -> dict:
+        stat = zip_path.stat()
+        return {"archive": zip_path.name, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    
+    def _read_marker(self, extract_dir: Path) -> Optional[dict]:
+        try:
+            with open(extract_dir / EXTRACT_MARKER_NAME, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
             return None
     
     def extract_all_zips(self, directory: str, remove_after_extract: bool = False) -> List[Path]:
@@ -163,7 +207,7 @@ class ZipExtractor:
             if extracted_dir:
                 extracted_dirs.append(extracted_dir)
         
-        logger.info(f"총 {len(extracted_dirs)}개의 zip 파일 압축 해제 완료")
+        logger.info("총 %s개의 zip 파일 압축 해제 완료", len(extracted_dirs))
         return extracted_dirs
     
     def cleanup_extracted(self):
@@ -171,7 +215,8 @@ class ZipExtractor:
         for path in self.extracted_paths:
             if path.exists():
                 try:
+                    release_sources_under(path)
                     shutil.rmtree(path)
-                    logger.info(f"정리 완료: {path}")
+                    logger.info("정리 완료: %s", path)
                 except Exception as e:
-                    logger.warning(f"정리 실패 ({path}): {e}")
+                    logger.warning("정리 실패 (%s): %s", path, e)
@@ -8,12 +8,31 @@ from pathlib import Path
 from typing import List, Dict, Optional, Set
 import re
 
+from .events import DISCOVERY_DONE, emit
+from .log_config import ProgressLine
+
 logger = logging.getLogger(__name__)
 
 
 class FileDiscovery:
     """자동 파일 탐색 클래스"""
     
+    # 파일 타입 패턴 정의
+    FILE_TYPE_PATTERNS = {
+        'Word List': [r'word\s*list', r'wordlist'],
+        'Word Test': [r'word\s*test', r'wordtest'],
+        'Translation Sheet': [r'translation\s*sheet', r'translationsheet'],
+        'Unscramble Sheet': [r'unscramble\s*sheet', r'unscramblesheet'],
+        'Unit Test': [r'unit\s*test', r'unittest'],
+    }
+    
+    # 파일 경로에서 유닛 번호를 찾는 패턴 (순서대로 시도)
+    UNIT_NUMBER_PATTERNS = [
+        r'unit[ _-]?(\d{1,2})',
+        r'u[ _-]?(\d{1,2})',
+        r'_u(\d{1,2})',
+    ]
+    
     def __init__(self):
         # 제외할 파일 패턴
         self.exclude_patterns = [
@@ -44,7 +63,7 @@ class FileDiscovery:
         else:
             pdf_files = list(directory.glob("*.pdf"))
         
-        logger.info(f"디렉토리 '{directory}'에서 {len(pdf_files)}개의 PDF 파일 발견")
+        logger.info("디렉토리 '%s'에서 %s개의 PDF 파일 발견", directory, len(pdf_files))
         return pdf_files
     
     def filter_excluded_files(self, pdf_files: List[Path]) -> List[Path]:
@@ -65,14 +84,14 @@ class FileDiscovery:
             excluded = False
             for pattern in self.exclude_patterns:
                 if re.search(pattern, file_str, re.IGNORECASE):
-                    logger.debug(f"제외됨: {pdf_file}")
+                    logger.debug("제외됨: %s", pdf_file)
                     excluded = True
                     break
             
             if not excluded:
                 filtered.append(pdf_file)
         
-        logger.info(f"제외 필터링: {len(filtered)}/{len(pdf_files)}개 파일 남음")
+        logger.info("제외 필터링: %s/%s개 파일 남음", len(filtered), len(pdf_files))
         return filtered
     
     def find_review_tests(self, pdf_files: List[Path]) -> List[Path]:
@@ -93,10 +112,10 @@ class FileDiscovery:
             for pattern in self.review_test_patterns:
                 if re.search(pattern, file_str, re.IGNORECASE):
                     review_tests.append(pdf_file)
-                    logger.debug(f"Review Test 발견: {pdf_file}")
+                    logger.debug("Review Test 발견: %s", pdf_file)
                     break
         
-        logger.info(f"Review Test 파일 {len(review_tests)}개 발견")
+        logger.info("Review Test 파일 %s개 발견", len(review_tests))
         return review_tests
     
     def categorize_files(self, pdf_files: List[Path]) -> Dict[str, List[Path]]:
@@ -111,26 +130,13 @@ class FileDiscovery:
             카테고리별 파일 딕셔너리 (각 카테고리는 유닛 순서대로 정렬된 파일 리스트)
         """
         categories = {}
-        
-        # 파일 타입 패턴 정의
-        file_type_patterns = {
-            'Word List': [r'word\s*list', r'wordlist'],
-            'Word Test': [r'word\s*test', r'wordtest'],
-            'Translation Sheet': [r'translation\s*sheet', r'translationsheet'],
-            'Unscramble Sheet': [r'unscramble\s*sheet', r'unscramblesheet'],
-            'Unit Test': [r'unit\s*test', r'unittest'],
-        }
+        file_type_patterns = self.FILE_TYPE_PATTERNS
         
         # 유닛 번호 추출 함수
         def extract_unit_number(path: Path) -> int:
             """파일 경로에서 유닛 번호 추출"""
             # 다양한 패턴 시도
-            patterns = [
-                r'unit[ _-]?(\d{1,2})',
-                r'u[ _-]?(\d{1,2})',
-                r'_u(\d{1,2})',
-            ]
-            for pattern in patterns:
+            for pattern in self.UNIT_NUMBER_PATTERNS:
                 match = re.search(pattern, str(path), re.IGNORECASE)
                 if match:
                     return int(match.group(1))
@@ -152,11 +158,16 @@ class FileDiscovery:
                         return file_type
             return None
         
-        logger.debug(f"[DEBUG] ===== 파일 분류 시작 =====")
-        logger.debug(f"[DEBUG] 분류할 파일 수: {len(pdf_files)}개")
+        # 파일마다 도는 루프이므로 DEBUG가 꺼져 있으면 파일별 상세 로그를 만들지 않고 진행 줄 하나로 요약
+        debug = logger.isEnabledFor(logging.DEBUG)
+        progress = ProgressLine("파일 분류", total=len(pdf_files))
+        if debug:
+            logger.debug("[DEBUG] ===== 파일 분류 시작 =====")
+            logger.debug("[DEBUG] 분류할 파일 수: %s개", len(pdf_files))
         
         for idx, pdf_file in enumerate(pdf_files, 1):
-            logger.debug(f"[DEBUG] 파일 {idx}/{len(pdf_files)}: {pdf_file.name}")
+            if debug:
+                logger.debug("[DEBUG] 파일 %s/%s: %s", idx, len(pdf_files), pdf_file.name)
             
             # Review Test는 별도 처리
             is_review_test = any(
@@ -164,49 +175,44 @@ class FileDiscovery:
                 for pattern in self.review_test_patterns
             )
             if is_review_test:
-                logger.debug(f"[DEBUG]   Review Test로 분류되어 제외됨")
+                if debug:
+                    logger.debug("[DEBUG]   Review Test로 분류되어 제외됨")
+                progress.add("Review Test")
                 continue
             
-            # 파일 타입 추출
+            # 파일 타입 추출 (파일 타입을 찾을 수 없으면 파일명을 카테고리로 사용)
             file_type = extract_file_type(pdf_file)
-            logger.debug(f"[DEBUG]   파일 타입 추출 결과: {file_type}")
-            
-            # 유닛 번호 추출
-            unit_num = extract_unit_number(pdf_file)
-            logger.debug(f"[DEBUG]   유닛 번호 추출 결과: {unit_num}")
-            
-            if file_type:
-                # 파일 타입별로 그룹화
-                if file_type not in categories:
-                    categories[file_type] = []
-                    logger.debug(f"[DEBUG]   새 카테고리 생성: {file_type}")
-                categories[file_type].append(pdf_file)
-                logger.debug(f"[DEBUG]   ✅ {file_type} 카테고리에 추가됨 (Unit {unit_num})")
-            else:
-                # 파일 타입을 찾을 수 없으면 파일명을 카테고리로 사용
-                category_name = self._normalize_category_name(pdf_file.stem)
-                if category_name not in categories:
-                    categories[category_name] = []
-                    logger.debug(f"[DEBUG]   새 카테고리 생성: {category_name}")
-                categories[category_name].append(pdf_file)
-                logger.debug(f"[DEBUG]   ✅ {category_name} 카테고리에 추가됨 (Unit {unit_num})")
+            category_name = file_type or self._normalize_category_name(pdf_file.stem)
+            if category_name not in categories:
+                categories[category_name] = []
+                if debug:
+                    logger.debug("[DEBUG]   새 카테고리 생성: %s", category_name)
+            categories[category_name].append(pdf_file)
+            progress.add(category_name)
+            if debug:
+                unit_num = extract_unit_number(pdf_file)
+                logger.debug("[DEBUG]   파일 타입 추출 결과: %s", file_type)
+                logger.debug("[DEBUG]   유닛 번호 추출 결과: %s", unit_num)
+                logger.debug("[DEBUG]   ✅ %s 카테고리에 추가됨 (Unit %s)", category_name, unit_num)
         
         # 각 카테고리 내에서 유닛 번호 순서대로 정렬
-        logger.debug(f"[DEBUG] 카테고리별 유닛 번호 순서대로 정렬 중...")
+        if debug:
+            logger.debug("[DEBUG] 카테고리별 유닛 번호 순서대로 정렬 중...")
         for category_name in categories:
-            before_sort = [extract_unit_number(f) for f in categories[category_name]]
+            if debug:
+                before_sort = [extract_unit_number(f) for f in categories[category_name]]
             categories[category_name].sort(key=lambda p: extract_unit_number(p))
-            after_sort = [extract_unit_number(f) for f in categories[category_name]]
-            logger.debug(f"[DEBUG]   {category_name}: 정렬 전 {before_sort} -> 정렬 후 {after_sort}")
-        
-        logger.info(f"[DEBUG] 파일 분류 완료: {len(categories)}개 카테고리")
+            if debug:
+                after_sort = [extract_unit_number(f) for f in categories[category_name]]
+                logger.debug("[DEBUG]   %s: 정렬 전 %s -> 정렬 후 %s", category_name, before_sort, after_sort)
+
+        progress.finish()
+        logger.info("[DEBUG] 파일 분류 완료: %s개 카테고리", len(categories))
         for cat, files in categories.items():
-            logger.info(f"[DEBUG]   카테고리 '{cat}': {len(files)}개 파일")
-            # 각 파일의 유닛 번호도 로그에 출력
-            for f in files:
-                unit_num = extract_unit_number(f)
-                logger.debug(f"[DEBUG]     - {f.name} -> Unit {unit_num}")
-                print(f"[DEBUG]     {cat}: {f.name} -> Unit {unit_num}")
+            logger.info("[DEBUG]   카테고리 '%s': %s개 파일", cat, len(files))
+            if debug:
+                for f in files:
+                    logger.debug("[DEBUG]     - %s -> Unit %s", f.name, extract_unit_number(f))
         
         return categories
     
@@ -241,6 +247,8 @@ class FileDiscovery:
         
         # 카테고리별 분류
         categories = self.categorize_files(main_pdfs)
+        emit(DISCOVERY_DONE, directory=str(directory), files=len(all_pdfs), review_tests=len(review_tests),
+             categories={name: len(files) for name, files in categories.items()})
         
         return {
             'all': all_pdfs,
@@ -0,0 +1,408 @@
+"""
+융합 병합 모듈
+통합 카테고리 PDF를 한 번만 훑으면서 페이지마다 유닛 헤더를 감지하고, 바로 해당 유닛의 writer로 보냄
+(설정 단계의 텍스트 스캔과 병합 단계의 페이지 추출을 한 번의 순회로 합침)
+"""
+
+import gc
+import logging
+import traceback
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .events import UNIT_DONE, UNITS_DETECTED, emit
+from .journal import temp_path_for
+from .output_store import OutputStore
+from .unit_detection import is_toc_page, page_unit_number
+
+try:
+    from pypdf import PdfReader, PdfWriter
+except ImportError:
+    from PyPDF2 import PdfReader, PdfWriter
+
+logger = logging.getLogger(__name__)
+
+
+class UnitRouter:
+    """
+    페이지 순서대로 유닛 헤더를 받아 각 페이지가 속한 유닛 번호를 결정
+
+    unit_page_lengths_from_scan과 같은 규칙:
+    - 헤더의 유닛 번호가 바뀔 때마다 다음 유닛 (헤더 없는 페이지는 앞 유닛에 포함)
+    - 첫 헤더 앞 페이지는 한 페이지(표지)뿐이면 첫 유닛에 포함, 두 페이지 이상이면 어느 유닛에도 넣지 않음
+    다른 점: 헤더가 하나도 없으면 unit_page_lengths_from_scan은 빈 리스트(감지 실패)지만 여기서는 파일 전체가
+    한 유닛 (설정 단계에서 감지 실패 후 유닛 수 입력 질문에 기본값으로 답한 것과 같은 결과)
+    """
+
+    def __init__(self, first_unit: int = 1):
+        """
+        Args:
+            first_unit: 이 파일의 첫 유닛 번호 (여러 파일을 이어 붙이는 경우 앞 파일들의 유닛 수 + 1)
+        """
+        self.first_unit = first_unit
+        self.segments = 0
+        # 첫 헤더 앞 페이지 수
+        self.leading_pages = 0
+        self._last_header = None
+
+    def route(self, header: Optional[int]) -> Optional[int]:
+        """
+        Args:
+            header: 페이지에서 감지한 유닛 번호 (없으면 None)
+
+        Returns:
+            이 페이지를 넣을 유닛 번호 (첫 헤더 앞 페이지는 None, 첫 헤더가 나온 뒤 includes_leading으로 판단)
+        """
+        if header is not None and header != self._last_header:
+            self.segments += 1
+            self._last_header = header
+        if self.segments == 0:
+            self.leading_pages += 1
+            return None
+        return self.first_unit + self.segments - 1
+
+    @property
+    def includes_leading(self) -> bool:
+        """첫 헤더 앞 페이지를 첫 유닛에 넣는지 (표지 한 페이지만 포함)"""
+        return self.leading_pages == 1
+
+    @property
+    def unit_count(self) -> int:
+        """이 파일에서 감지된 유닛 수 (헤더가 없으면 파일 전체가 한 유닛)"""
+        return max(self.segments, 1)
+
+
+class FusedMergeEngine:
+    """통합 카테고리는 감지와 동시에 분배하고, 나머지 카테고리는 구간으로 잘라 유닛별 writer에 추가"""
+
+    def __init__(self, merger, skip_toc: bool = False):
+        """
+        Args:
+            merger: 출력 저장/통계/보고서에 사용할 PDFMerger
+            skip_toc: 통합 파일의 첫 페이지가 목차로 감지되면 제외 (설정 단계의 질문 대신 사용)
+        """
+        self.merger = merger
+        self.skip_toc = skip_toc
+        self.total_units = 0
+        # 유닛 번호 -> [writer, 추가된 페이지 수, 메모리 예산 초과로 내보낸 임시 파일 목록,
+        #              추가한 구간 목록 (표시 이름, PDF 경로, 시작, 끝) - 병합 계획 키용]
+        self._writers: Dict[int, List] = {}
+        # 구간을 추출하지 못한 카테고리가 있는 유닛 (저널/저장소에 기록하지 않음)
+        self._incomplete_units = set()
+        self._last_flushed_unit: Optional[int] = None
+
+    def _writer_for(self, unit_number: int) -> List:
+        entry = self._writers.get(unit_number)
+        if entry is None:
+            entry = [PdfWriter(), 0, [], []]
+            self._writers[unit_number] = entry
+        return entry
+
+    def _check_memory(self, where: str):
+        """메모리 예산 초과 시 캐시 정리, 그래도 넘으면 유닛 writer들을 임시 파일로 내보냄"""
+        if self.merger.check_memory_budget(where):
+            self._spill_writers()
+
+    def _spill_writers(self):
+        """
+        모든 유닛 writer의 페이지를 임시 파일로 저장하고 writer를 비움
+        (통합 파일을 분배하는 동안 모든 유닛의 페이지가 메모리에 있으므로, 저장할 때 다시 읽어 합침)
+        """
+        spilled = 0
+        for unit_number, entry in self._writers.items():
+            if len(entry[0].pages) == 0:
+                continue
+            spill_path = self._spill_path(unit_number, len(entry[2]))
+            with open(spill_path, 'wb') as f:
+                entry[0].write(f)
+            entry[0] = PdfWriter()
+            entry[2].append(spill_path)
+            spilled += 1
+        gc.collect()
+        if spilled:
+            message = f"유닛 writer {spilled}개를 임시 파일로 내보냄"
+            logger.warning(message)
+            self.merger.merge_log.append(f"메모리: {message}")
+
+    def _spill_path(self, unit_number: int, index: int) -> Path:
+        # 중단되면 다음 실행의 remove_stale_temp_files가 지우도록 임시 파일 이름 사용 (pid 포함)
+        return temp_path_for(self.merger.output_dir / f"Unit{unit_number:02d}.spill{index}.pdf")
+
+    def _restore_spilled(self, unit_number: int, writer, spill_paths: List[Path]):
+        """내보낸 임시 파일과 남은 페이지를 순서대로 새 writer에 합쳐 반환"""
+        if len(writer.pages):
+            spill_path = self._spill_path(unit_number, len(spill_paths))
+            with open(spill_path, 'wb') as f:
+                writer.write(f)
+            spill_paths.append(spill_path)
+        restored = PdfWriter()
+        for spill_path in spill_paths:
+            reader = PdfReader(str(spill_path))
+            self.merger.append_page_range(restored, reader, 0, len(reader.pages))
+        return restored
+
+    def _route_pages(self, category: str, pdf_paths: List[str]) -> int:
+        """
+        통합 파일들을 순서대로 훑으며 페이지를 유닛별 writer로 분배
+
+        Returns:
+            감지된 유닛 수 (여러 파일이면 합계)
+        """
+        next_unit = 1
+        for pdf_path in pdf_paths:
+            router = UnitRouter(first_unit=next_unit)
+            with self.merger.source_cache.reader(pdf_path) as reader:
+                # 같은 유닛으로 가는 연속 페이지는 모아서 한 번에 추가 (페이지별 add_page보다 빠름)
+                run_unit, run_start, first_page = None, 0, 0
+                for i, page in enumerate(reader.pages):
+                    raw_text = page.extract_text() or ""
+                    if i == 0 and self.skip_toc and is_toc_page(raw_text):
+                        logger.info("  - %s: 목차 페이지 제외 (%s)", category, pdf_path)
+                        first_page = 1
+                        continue
+                    unit_number = router.route(page_unit_number(raw_text))
+                    if unit_number is None:
+                        continue
+                    if run_unit is None:
+                        # 첫 헤더: 앞 페이지가 표지 한 장이면 첫 유닛에 포함
+                        run_unit, run_start = unit_number, first_page if router.includes_leading else i
+                    elif unit_number != run_unit:
+                        self._flush_run(reader, run_unit, run_start, i, category, pdf_path)
+                        run_unit, run_start = unit_number, i
+                if run_unit is None:
+                    # 헤더가 없으면 파일 전체가 한 유닛
+                    logger.warning("%s: 유닛 헤더가 없어 파일 전체를 Unit%02d로 병합 (%s)",
+                                   category, router.first_unit, pdf_path)
+                    run_unit, run_start = router.first_unit, first_page
+                elif router.leading_pages > 1:
+                    logger.warning("%s: 첫 유닛 헤더 앞 %s페이지 제외 (%s)", category, router.leading_pages, pdf_path)
+                self._flush_run(reader, run_unit, run_start, len(reader.pages), category, pdf_path)
+            self._check_memory(category)
+            logger.info("  - %s: %s개 유닛 감지 (%s)", category, router.unit_count, pdf_path)
+            emit(UNITS_DETECTED, scope=self.merger.metrics_scope, pdf_path=str(pdf_path), category=category,
+                 units=router.unit_count, first_unit=router.first_unit)
+            next_unit += router.unit_count
+        return next_unit - 1
+
+    def _flush_run(self, reader, unit_number: int, start: int, end: int, category: str, pdf_path: str):
+        """reader의 [start, end) 페이지를 유닛 writer에 추가"""
+        if end <= start:
+            return
+        entry = self._writer_for(unit_number)
+        self.merger.append_page_range(entry[0], reader, start, end)
+        entry[1] += end - start
+        entry[3].append((category, str(pdf_path), start, end))
+        if unit_number != self._last_flushed_unit:
+            # 유닛이 바뀔 때마다 확인 (긴 통합 파일을 분배하는 중에도 예산을 지키도록)
+            self._last_flushed_unit = unit_number
+            self._check_memory(f"Unit{unit_number:02d}")
+
+    def _append_ranges(self, category: str, info: Dict) -> int:
+        """
+        유닛 경계가 이미 정해진 카테고리를 유닛별 구간으로 추가
+
+        Returns:
+            이 카테고리의 유닛 수
+        """
+        unit_count = len(info.get("unit_page_lengths", []))
+        for unit_number in range(1, unit_count + 1):
+            unit_range = self.merger.extract_unit_range(info, unit_number)
+            if not unit_range or unit_range[2] <= unit_range[1]:
+                self._warn_missing(unit_number, category)
+                continue
+            pdf_path, start, end = unit_range
+            entry = self._writer_for(unit_number)
+            with self.merger.source_cache.reader(pdf_path) as reader:
+                self.merger.append_page_range(entry[0], reader, start, end)
+            entry[1] += end - start
+            entry[3].append((category, str(pdf_path), start, end))
+            self._check_memory(f"{category} Unit{unit_number:02d}")
+        return unit_count
+
+    def _page_total(self) -> int:
+        """유닛 writer들에 지금까지 추가된 페이지 수"""
+        return sum(entry[1] for entry in self._writers.values())
+
+    def _warn_missing(self, unit_number: int, category: str):
+        self._incomplete_units.add(unit_number)
+        warning_msg = f"Unit{unit_number:02d}에서 {category} 추출 실패"
+        logger.warning(warning_msg)
+        self.merger.merge_log.append(f"경고: {warning_msg}")
+
+    def run(self, config: Dict) -> bool:
+        """
+        모든 유닛 병합 (병합 순서대로 카테고리를 한 번씩 처리한 뒤 유닛별로 저장)
+
+        Args:
+            config: merge_all_units와 같은 형식, 감지할 카테고리는 'detect_units': True와
+                'pdf_path' 또는 'pdf_paths'를 가짐
+
+        Returns:
+            모든 유닛 저장 성공 여부 (감지 결과를 포함한 유닛 수는 self.total_units)
+        """
+        merger = self.merger
+        logger.info("=" * 60)
+        logger.info("PDF 융합 병합 시작 (유닛 감지와 분배를 한 번에)")
+        logger.info("=" * 60)
+
+        if not merger.validate_pdf_files(config):
+            logger.error("PDF 파일 검증 실패 - 병합 작업 중단")
+            print("\n병합 작업을 중단합니다. 위의 오류를 해결한 후 다시 시도해주세요.")
+            return False
+
+        with merger.stage("merge"):
+            success_count = self._merge(config)
+        if success_count is None:
+            return False
+
+        print(f"\n{'=' * 60}")
+        print(f"병합 작업 완료!")
+        print(f"{'=' * 60}")
+        print(f"✅ 성공: {success_count}/{self.total_units} 유닛")
+        print(f"📄 총 병합된 페이지: {merger.stats['total_pages_merged']:,}페이지")
+        print(f"📁 생성된 파일: {merger.stats['total_files_processed']}개")
+        print(f"{'=' * 60}")
+        merger.save_merge_log()
+        return success_count == self.total_units
+
+    def _merge(self, config: Dict) -> Optional[int]:
+        """
+        카테고리 분배 후 유닛별 저장
+
+        Returns:
+            저장에 성공한 유닛 수 (분배 중 오류가 나면 None)
+        """
+        merger = self.merger
+        # 카테고리를 병합 순서대로 한 번씩 처리하므로 유닛 안의 페이지 순서는 merge_unit_pdf와 같음
+        unit_counts = {}
+        for category in config["merge_order"]:
+            info = config["categories"].get(category)
+            if info is None:
+                warning_msg = f"카테고리 '{category}'를 찾을 수 없음"
+                logger.warning(warning_msg)
+                merger.merge_log.append(f"경고: {warning_msg}")
+                merger.stats["warnings"] += 1
+                continue
+            try:
+                with merger.stage("fused_distribution", label=category) as sample:
+                    pages_before = self._page_total()
+                    if info.get("detect_units"):
+                        unit_counts[category] = self._route_pages(category, info.get("pdf_paths") or [info["pdf_path"]])
+                    else:
+                        unit_counts[category] = self._append_ranges(category, info)
+                    sample.add(pages=self._page_total() - pages_before)
+            except Exception as e:
+                error_msg = f"{category} 유닛 분배 실패: {e}"
+                logger.error(error_msg)
+                logger.debug("상세 오류: %s", traceback.format_exc())
+                merger.merge_log.append(f"오류: {error_msg}")
+                merger.stats["errors"] += 1
+                return None
+
+        total_units = max([config["total_units"]] + list(unit_counts.values()))
+        self.total_units = total_units
+        if len(set(unit_counts.values())) > 1:
+            logger.warning("카테고리별 유닛 수 불일치: %s - 최대 유닛 수(%s) 사용", unit_counts, total_units)
+        for category, unit_count in unit_counts.items():
+            for unit_number in range(unit_count + 1, total_units + 1):
+                self._warn_missing(unit_number, category)
+
+        print(f"\n총 {total_units}개 유닛 병합을 시작합니다... (융합 병합)")
+        success_count = 0
+        for unit_number in range(1, total_units + 1):
+            with merger.measure_output("unit_merge", f"Unit{unit_number:02d}"):
+                saved = self._save_unit(unit_number, config)
+            if saved:
+                success_count += 1
+            emit(UNIT_DONE, scope=merger.metrics_scope, unit=unit_number, success=saved,
+                 done=unit_number, total=total_units, succeeded=success_count)
+        self._writers = {}
+        self._incomplete_units = set()
+        return success_count
+
+    def _save_unit(self, unit_number: int, config: Dict) -> bool:
+        """유닛 writer에 Review Test를 붙여 저장 (임시 파일로 내보낸 페이지가 있으면 먼저 합침)"""
+        writer, total_pages, spill_paths, parts = self._writers.pop(unit_number, None) or (PdfWriter(), 0, [], [])
+        try:
+            if spill_paths:
+                writer = self._restore_spilled(unit_number, writer, spill_paths)
+            return self._write_unit(unit_number, writer, total_pages, parts, config)
+        finally:
+            for spill_path in spill_paths:
+                if spill_path.exists():
+                    spill_path.unlink()
+
+    def _write_unit(self, unit_number: int, writer, total_pages: int, parts: List[Tuple[str, str, int, int]],
+                    config: Dict) -> bool:
+        """
+        유닛 저장 (merge_unit_pdf와 같이 이어하기/출력 저장소로 기존 결과를 재사용하고, 새 결과는 저널/저장소에 등록)
+
+        Args:
+            parts: 분배하면서 writer에 추가한 구간 (표시 이름, PDF 경로, 시작, 끝)
+        """
+        merger = self.merger
+        unit_name = f"Unit{unit_number:02d}"
+        output_path = merger.output_dir / f"{unit_name}.pdf"
+        parts = list(parts)
+        complete = unit_number not in self._incomplete_units
+
+        review_parts = []
+        for review in config.get("review_tests", []):
+            # 구간을 알 수 없는 Review Test(end_unit 0)는 감지된 마지막 유닛 뒤에 병합
+            if unit_number == (review.get("end_unit", 1) or self.total_units):
+                try:
+                    review_pages = merger.source_cache.page_count(review["pdf_path"])
+                    review_parts.append(("Review Test", str(review["pdf_path"]), 0, review_pages))
+                except Exception as e:
+                    warning_msg = f"{unit_name}에서 Review Test 전체 추가 실패: {e}"
+                    logger.warning(warning_msg)
+                    merger.merge_log.append(f"경고: {warning_msg}")
+                    complete = False
+        parts.extend(review_parts)
+
+        # 이전 실행에서 완성됐거나 저장소에 같은 병합 계획의 결과가 있으면 저장하지 않음
+        # (구간이 같으면 2단계 병합의 결과와 같은 계획 키이므로 서로의 결과도 재사용)
+        plan_key = None
+        if complete and parts:
+            plan_key = OutputStore.plan_key(merger._merge_plan(parts))
+            if merger._reuse_existing_output(plan_key, output_path):
+                reused_pages = sum(end - start for _, _, start, end in parts)
+                logger.info("♻️ %s.pdf 기존 결과 재사용 (%s페이지)", unit_name, reused_pages)
+                merger.stats["total_pages_merged"] += reused_pages
+                merger.stats["total_files_processed"] += 1
+                return True
+
+        for _, pdf_path, start, end in review_parts:
+            try:
+                with merger.source_cache.reader(pdf_path) as reader:
+                    merger.append_page_range(writer, reader, start, end)
+                total_pages += end - start
+            except Exception as e:
+                warning_msg = f"{unit_name}에서 Review Test 전체 추가 실패: {e}"
+                logger.warning(warning_msg)
+                merger.merge_log.append(f"경고: {warning_msg}")
+                plan_key = None
+
+        if total_pages == 0:
+            error_msg = f"{unit_name}: 추가된 페이지가 없음"
+            logger.error(error_msg)
+            merger.merge_log.append(f"오류: {error_msg}")
+            merger.stats["errors"] += 1
+            return False
+
+        try:
+            merger.write_output(writer, output_path)
+            if plan_key is not None:
+                merger._record_output(plan_key, output_path)
+        except Exception as e:
+            error_msg = f"{unit_name}.pdf 저장 실패: {str(e)}"
+            logger.error(error_msg)
+            logger.debug("상세 오류: %s", traceback.format_exc())
+            merger.merge_log.append(f"오류: {error_msg}")
+            merger.stats["errors"] += 1
+            return False
+
+        logger.info("✅ %s.pdf 저장 완료 (%s페이지)", unit_name, total_pages)
+        merger.stats["total_pages_merged"] += total_pages
+        merger.stats["total_files_processed"] += 1
+        return True
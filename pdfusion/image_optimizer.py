@@ -0,0 +1,430 @@
+"""
+이미지 최적화 모듈
+병합 결과 PDF의 고해상도 이미지(예: 600dpi 스캔)를 목표 dpi로 다운샘플링하고 다시 인코딩
+(Pillow가 설치되어 있지 않으면 아무 작업도 하지 않음)
+"""
+
+import atexit
+import hashlib
+import io
+import logging
+import math
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple, Union
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    Image = None
+    PIL_AVAILABLE = False
+
+# PyPDF2 버전 호환성 처리 (merger.py와 동일)
+try:
+    from pypdf.generic import ArrayObject, ContentStream, NameObject, NumberObject
+except ImportError:
+    from PyPDF2.generic import ArrayObject, ContentStream, NameObject, NumberObject
+
+# 이미지 프로필은 CLI가 pypdf/Pillow 없이 쓸 수 있도록 output_profiles에 정의 (기존 import 경로 유지)
+from .output_profiles import IMAGE_PROFILES
+
+logger = logging.getLogger(__name__)
+
+# 목표 dpi보다 이 비율 이상 높을 때만 다운샘플링 (약간 높은 이미지를 다시 인코딩하며 화질만 잃는 것 방지)
+DOWNSAMPLE_THRESHOLD = 1.2
+# 이보다 작은 이미지(픽셀 수)는 처리하지 않음
+MIN_IMAGE_PIXELS = 256 * 256
+# 이미지 결과 캐시 상한 (바이트)
+IMAGE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+# 폼 XObject 안의 폼을 따라 들어가는 깊이 상한 (넘으면 그 안의 이미지는 표시 크기를 모르는 것으로 처리)
+MAX_FORM_DEPTH = 8
+
+_IDENTITY = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+# 색공간 이름 -> Pillow 모드
+_COLOR_MODES = {"/DeviceGray": "L", "/DeviceRGB": "RGB"}
+_ICC_MODES = {1: "L", 3: "RGB"}
+
+# 이미지 해시 기반 결과 캐시 (키 -> (데이터, 필터, 폭, 높이) 또는 최적화 이득이 없으면 None)
+_image_cache: "OrderedDict[Tuple, Optional[Tuple[bytes, str, int, int]]]" = OrderedDict()
+_image_cache_bytes = 0
+_image_cache_stats = {"hits": 0, "misses": 0}
+_image_cache_lock = threading.Lock()
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+# 풀을 만든 프로세스 (fork된 작업 프로세스는 부모의 풀을 쓰거나 종료하지 않음)
+_process_pool_pid: Optional[int] = None
+_process_pool_lock = threading.Lock()
+
+
+def resolve_image_profile(profile: Union[str, Dict, None]) -> Optional[Dict]:
+    """
+    이미지 프로필 이름 또는 dict를 설정 dict로 변환
+
+    Args:
+        profile: IMAGE_PROFILES의 이름, {'target_dpi', 'quality'} dict, 또는 None(비활성)
+
+    Returns:
+        {'target_dpi': int, 'quality': int} 또는 None
+    """
+    if profile is None:
+        return None
+    if isinstance(profile, str):
+        if profile not in IMAGE_PROFILES:
+            raise ValueError(f"알 수 없는 이미지 프로필: {profile} (사용 가능: {', '.join(IMAGE_PROFILES)})")
+        return dict(IMAGE_PROFILES[profile])
+    return {"target_dpi": int(profile["target_dpi"]), "quality": int(profile.get("quality", 85))}
+
+
+def _get_process_pool() -> Optional[ProcessPoolExecutor]:
+    """이미지 처리용 프로세스 풀 (CPU가 하나뿐이면 None - 현재 프로세스에서 처리)"""
+    global _process_pool, _process_pool_pid
+    workers = os.cpu_count() or 1
+    if workers < 2:
+        return None
+    with _process_pool_lock:
+        if _process_pool is None or _process_pool_pid != os.getpid():
+            _process_pool = ProcessPoolExecutor(max_workers=workers)
+            if _process_pool_pid is None:
+                atexit.register(_shutdown_process_pool)
+            _process_pool_pid = os.getpid()
+        return _process_pool
+
+
+def _shutdown_process_pool():
+    """종료 시 이미지 처리 프로세스 정리 (atexit)"""
+    global _process_pool
+    with _process_pool_lock:
+        pool = _process_pool if _process_pool_pid == os.getpid() else None
+        _process_pool = None
+    if pool is not None:
+        pool.shutdown(wait=True)
+
+
+def _resample_image(data: bytes, image_filter: Optional[str], width: int, height: int, mode: str,
+                    new_size: Tuple[int, int], quality: int) -> Optional[Tuple[bytes, str, int, int]]:
+    """
+    이미지 하나를 다운샘플링하고 원래 방식(JPEG 또는 무손실 Flate)으로 다시 인코딩 (프로세스 풀에서 실행)
+
+    Returns:
+        (데이터, 필터, 폭, 높이) - 원본보다 커지거나 디코딩할 수 없으면 None
+    """
+    try:
+        return _resample_image_unchecked(data, image_filter, width, height, mode, new_size, quality)
+    except (OSError, ValueError, zlib.error):
+        return None
+
+
+def _resample_image_unchecked(data, image_filter, width, height, mode, new_size, quality):
+    if image_filter == "/DCTDecode":
+        image = Image.open(io.BytesIO(data))
+        # JPEG는 디코딩 단계에서 미리 축소해 메모리/시간 절약
+        image.draft(mode, new_size)
+        if image.mode != mode:
+            return None
+    else:
+        raw = zlib.decompress(data) if image_filter == "/FlateDecode" else data
+        image = Image.frombytes(mode, (width, height), raw)
+
+    image = image.resize(new_size, Image.LANCZOS)
+    if image_filter == "/DCTDecode":
+        buffer = io.BytesIO()
+        image.save(buffer, "JPEG", quality=quality, optimize=True)
+        result = (buffer.getvalue(), "/DCTDecode", new_size[0], new_size[1])
+    else:
+        result = (zlib.compress(image.tobytes(), 6), "/FlateDecode", new_size[0], new_size[1])
+    return result if len(result[0]) < len(data) else None
+
+
+def _value(obj, key):
+    """간접 참조를 풀어서 값 반환 (dict.get은 참조를 풀지 않음)"""
+    return obj[key] if key in obj else None
+
+
+def _image_mode(image) -> Optional[str]:
+    """처리 가능한 이미지면 Pillow 모드 반환 (마스크, 인덱스 색상, CMYK 등은 None)"""
+    if _value(image, "/ImageMask") or "/Decode" in image or "/Mask" in image or "/SMask" in image:
+        return None
+    if _value(image, "/BitsPerComponent") != 8:
+        return None
+    color_space = _value(image, "/ColorSpace")
+    if isinstance(color_space, ArrayObject):
+        if len(color_space) == 2 and color_space[0] == "/ICCBased":
+            return _ICC_MODES.get(color_space[1].get_object().get("/N"))
+        return None
+    return _COLOR_MODES.get(color_space)
+
+
+def _image_filter(image) -> Tuple[bool, Optional[str]]:
+    """(처리 가능 여부, 필터 이름) - 예측자가 없는 Flate, JPEG, 비압축만 처리"""
+    image_filter = _value(image, "/Filter")
+    if isinstance(image_filter, ArrayObject):
+        if len(image_filter) != 1:
+            return False, None
+        image_filter = image_filter[0]
+    if image_filter is None:
+        return True, None
+    if image_filter == "/FlateDecode" and "/DecodeParms" not in image:
+        return True, "/FlateDecode"
+    if image_filter == "/DCTDecode":
+        return True, "/DCTDecode"
+    return False, None
+
+
+def _multiply(matrix: Tuple[float, ...], ctm: Tuple[float, ...]) -> Tuple[float, ...]:
+    """PDF 변환 행렬 곱 (matrix × ctm)"""
+    a, b, c, d, e, f = matrix
+    A, B, C, D, E, F = ctm
+    return (a * A + b * C, a * B + b * D, c * A + d * C, c * B + d * D,
+            e * A + f * C + E, e * B + f * D + F)
+
+
+def _xobjects(resources) -> Dict:
+    """리소스의 /XObject 이름 -> 참조 (없으면 빈 dict)"""
+    if resources is None:
+        return {}
+    xobjects = resources.get_object().get("/XObject")
+    return xobjects.get_object() if xobjects is not None else {}
+
+
+def _reachable_images(resources, seen=None) -> set:
+    """리소스에서 (폼 XObject 안까지) 도달하는 이미지 객체 번호"""
+    seen = set() if seen is None else seen
+    images = set()
+    for ref in _xobjects(resources).values():
+        if not hasattr(ref, "idnum") or ref.idnum in seen:
+            continue
+        seen.add(ref.idnum)
+        xobject = ref.get_object()
+        if xobject.get("/Subtype") == "/Image":
+            images.add(ref.idnum)
+        elif xobject.get("/Subtype") == "/Form":
+            images |= _reachable_images(xobject.get("/Resources"), seen)
+    return images
+
+
+class _PlacementWalker:
+    """
+    페이지와 폼 XObject의 내용 스트림에서 q/Q/cm/Do를 따라가며 이미지별 최대 표시 크기(포인트) 계산
+
+    폼 XObject는 /Matrix를 현재 CTM에 곱해 따라 들어가므로 폼 안에서 축소/확대된 이미지도 실제 표시 크기로 계산됨.
+    내용 스트림을 해석하지 못했거나 너무 깊이 중첩된 폼 안의 이미지는 표시 크기를 알 수 없으므로 unknown에 넣음
+    """
+
+    def __init__(self, writer):
+        self.writer = writer
+        # 객체 번호 -> (이미지, 최대 표시 폭, 최대 표시 높이)
+        self.sizes: Dict[int, Tuple[object, float, float]] = {}
+        self.unknown = set()
+        self._form_operations: Dict[int, Optional[list]] = {}
+
+    def walk_page(self, page):
+        resources = page.get("/Resources")
+        if not _xobjects(resources):
+            return
+        try:
+            contents = page.get_contents()
+            operations = contents.operations if contents is not None else []
+            self._walk(operations, resources, _IDENTITY, ())
+        except Exception as e:
+            logger.debug("내용 스트림 해석 실패, 이 페이지의 이미지는 건너뜀: %s", e)
+            self.unknown |= _reachable_images(resources)
+
+    def _operations(self, ref, form) -> Optional[list]:
+        if ref.idnum not in self._form_operations:
+            try:
+                self._form_operations[ref.idnum] = ContentStream(form, self.writer).operations
+            except Exception as e:
+                logger.debug("폼 XObject 내용 해석 실패, 안의 이미지는 건너뜀: %s", e)
+                self._form_operations[ref.idnum] = None
+        return self._form_operations[ref.idnum]
+
+    def _walk(self, operations, resources, ctm, forms: Tuple[int, ...]):
+        xobjects = _xobjects(resources)
+        saved = []
+        for operands, operator in operations:
+            if operator == b"q":
+                saved.append(ctm)
+            elif operator == b"Q":
+                ctm = saved.pop() if saved else ctm
+            elif operator == b"cm" and len(operands) == 6:
+                ctm = _multiply(tuple(float(value) for value in operands), ctm)
+            elif operator == b"Do" and operands:
+                ref = xobjects.get(operands[0])
+                if hasattr(ref, "idnum"):
+                    self._draw(ref, ctm, resources, forms)
+
+    def _draw(self, ref, ctm, resources, forms: Tuple[int, ...]):
+        xobject = ref.get_object()
+        subtype = xobject.get("/Subtype")
+        if subtype == "/Image":
+            # 이미지는 단위 정사각형을 CTM으로 변환한 영역에 그려짐
+            width = math.hypot(ctm[0], ctm[1])
+            height = math.hypot(ctm[2], ctm[3])
+            _, old_width, old_height = self.sizes.get(ref.idnum, (xobject, 0.0, 0.0))
+            self.sizes[ref.idnum] = (xobject, max(old_width, width), max(old_height, height))
+        elif subtype == "/Form":
+            # 폼에 /Resources가 없으면 부모 리소스를 씀
+            form_resources = xobject.get("/Resources") or resources
+            operations = None
+            if ref.idnum not in forms and len(forms) < MAX_FORM_DEPTH:
+                operations = self._operations(ref, xobject)
+            if operations is None:
+                self.unknown |= _reachable_images(form_resources)
+                return
+            matrix = _value(xobject, "/Matrix")
+            form_ctm = _multiply(tuple(float(value) for value in matrix), ctm) if matrix else ctm
+            self._walk(operations, form_resources, form_ctm, forms + (ref.idnum,))
+
+
+def _collect_page_images(writer) -> Dict[int, Tuple[object, float, float]]:
+    """
+    페이지에 (폼 XObject 안 포함) 표시되는 큰 이미지 XObject 수집
+
+    Returns:
+        객체 번호 -> (이미지, 최대 표시 폭(인치), 최대 표시 높이(인치)).
+        한 곳이라도 표시 크기를 알 수 없는 이미지는 제외 (페이지 크기는 확대된 이미지의 상한이 아니므로 추정하지 않음)
+    """
+    walker = _PlacementWalker(writer)
+    for page in writer.pages:
+        walker.walk_page(page)
+
+    images = {}
+    for idnum, (image, width, height) in walker.sizes.items():
+        if idnum in walker.unknown or width <= 0 or height <= 0:
+            continue
+        if int(_value(image, "/Width") or 0) * int(_value(image, "/Height") or 0) < MIN_IMAGE_PIXELS:
+            continue
+        images[idnum] = (image, width / 72, height / 72)
+    return images
+
+
+def _cache_get(key) -> Tuple[bool, Optional[Tuple[bytes, str, int, int]]]:
+    with _image_cache_lock:
+        if key in _image_cache:
+            _image_cache.move_to_end(key)
+            _image_cache_stats["hits"] += 1
+            return True, _image_cache[key]
+        _image_cache_stats["misses"] += 1
+        return False, None
+
+
+def _cache_put(key, value):
+    global _image_cache_bytes
+    size = len(value[0]) if value else 0
+    with _image_cache_lock:
+        if key in _image_cache:
+            return
+        _image_cache[key] = value
+        _image_cache_bytes += size
+        while _image_cache_bytes > IMAGE_CACHE_MAX_BYTES and len(_image_cache) > 1:
+            _, evicted = _image_cache.popitem(last=False)
+            _image_cache_bytes -= len(evicted[0]) if evicted else 0
+
+
+def image_cache_info() -> Dict[str, int]:
+    """이미지 캐시 통계 (hits, misses, size, bytes)"""
+    with _image_cache_lock:
+        info = dict(_image_cache_stats)
+        info["size"] = len(_image_cache)
+        info["bytes"] = _image_cache_bytes
+        return info
+
+
+def clear_image_cache():
+    """이미지 캐시 초기화"""
+    global _image_cache_bytes
+    with _image_cache_lock:
+        _image_cache.clear()
+        _image_cache_bytes = 0
+        for key in _image_cache_stats:
+            _image_cache_stats[key] = 0
+
+
+def optimize_images(writer, profile: Dict) -> Dict[str, int]:
+    """
+    목표 dpi보다 해상도가 높은 이미지를 다운샘플링 (writer.write() 직전에 호출)
+
+    이미지 해상도는 모든 사용 위치 중 가장 크게 표시되는 크기를 기준으로 계산하므로,
+    실제 표시 해상도가 목표 dpi 아래로 내려가지 않음
+
+    Args:
+        writer: 저장 직전의 PdfWriter
+        profile: resolve_image_profile()이 반환한 설정
+
+    Returns:
+        {'images': 다운샘플링한 이미지 수, 'bytes_saved': 줄어든 바이트 수, 'cache_hits': 캐시 적중 수}
+    """
+    stats = {"images": 0, "bytes_saved": 0, "cache_hits": 0}
+    if not PIL_AVAILABLE:
+        return stats
+
+    target_dpi = profile["target_dpi"]
+    quality = profile["quality"]
+    pending = []
+    for image, display_width, display_height in _collect_page_images(writer).values():
+        width, height = int(_value(image, "/Width")), int(_value(image, "/Height"))
+        mode = _image_mode(image)
+        supported, image_filter = _image_filter(image)
+        if mode is None or not supported:
+            continue
+        # 가로/세로 중 낮은 쪽 dpi 기준 (비율을 바꿔 늘려 그린 이미지도 목표 dpi 아래로 내려가지 않음)
+        effective_dpi = min(width / display_width, height / display_height)
+        if effective_dpi < target_dpi * DOWNSAMPLE_THRESHOLD:
+            continue
+        scale = target_dpi / effective_dpi
+        new_size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        data = image._data
+        key = (hashlib.sha256(data).digest(), image_filter, width, height, mode, new_size, quality)
+        pending.append((image, key, (data, image_filter, width, height, mode, new_size, quality)))
+
+    results = {}
+    misses = []
+    for image, key, args in pending:
+        if key in results:
+            continue
+        found, value = _cache_get(key)
+        if found:
+            results[key] = value
+            stats["cache_hits"] += 1
+        else:
+            results[key] = None
+            misses.append((key, args))
+
+    if misses:
+        pool = _get_process_pool()
+        if pool is not None:
+            try:
+                futures = [(key, pool.submit(_resample_image, *args)) for key, args in misses]
+                computed = [(key, future.result()) for key, future in futures]
+            except Exception as e:
+                logger.warning("이미지 프로세스 풀 사용 실패, 현재 프로세스에서 처리: %s", e)
+                pool = None
+        if pool is None:
+            computed = [(key, _resample_image(*args)) for key, args in misses]
+        for key, value in computed:
+            results[key] = value
+            _cache_put(key, value)
+
+    for image, key, args in pending:
+        value = results.get(key)
+        if value is None:
+            continue
+        data, image_filter, width, height = value
+        stats["bytes_saved"] += len(image._data) - len(data)
+        stats["images"] += 1
+        image._data = data
+        image[NameObject("/Filter")] = NameObject(image_filter)
+        image[NameObject("/Width")] = NumberObject(width)
+        image[NameObject("/Height")] = NumberObject(height)
+        if "/DecodeParms" in image:
+            del image["/DecodeParms"]
+
+    if stats["images"]:
+        logger.debug("이미지 %s개 다운샘플링 (%d bytes 절감, 캐시 적중 %s개)",
+                     stats['images'], stats['bytes_saved'], stats['cache_hits'])
+    return stats
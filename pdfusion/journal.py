@@ -0,0 +1,229 @@
+"""
+병합 체크포인트 모듈
+출력 파일을 임시 파일에 쓴 뒤 이름을 바꿔 원자적으로 저장하고,
+완료된 출력 파일과 입력 해시를 저널에 기록해 중단된 작업을 이어서 실행
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Dict, Iterator, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# 책별 출력 디렉토리에 기록하는 저널 파일명
+JOURNAL_NAME = ".merge_journal.json"
+
+# 저장 중인 임시 파일 접미사
+TEMP_SUFFIX = ".tmp"
+
+# 출력 파일 해시 계산 시 읽기 단위
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# 만든 프로세스가 살아 있거나 알 수 없어도 이보다 오래된 임시 파일은 중단된 것으로 보고 삭제 (초)
+STALE_TEMP_AGE = 6 * 3600
+
+
+def temp_path_for(path: Union[str, Path]) -> Path:
+    """
+    path를 만들 임시 파일 경로 ('<이름>.<pid>.<스레드 id>.tmp')
+    (프로세스/스레드마다 달라 동시에 같은 파일을 써도 겹치지 않고, 정리할 때 만든 프로세스를 알 수 있음)
+    """
+    path = Path(path)
+    return path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}{TEMP_SUFFIX}")
+
+
+def _temp_owner_pid(tmp_path: Path) -> Optional[int]:
+    """temp_path_for로 만든 임시 파일의 pid (형식이 다르면 None)"""
+    parts = tmp_path.name[:-len(TEMP_SUFFIX)].rsplit('.', 2)
+    if len(parts) == 3 and parts[1].isdigit() and parts[2].isdigit():
+        return int(parts[1])
+    return None
+
+
+def _pid_alive(pid: int) -> Optional[bool]:
+    """프로세스가 살아 있는지 (확인할 수 없으면 None)"""
+    if pid == os.getpid():
+        return True
+    if os.name == 'nt':
+        # Windows의 os.kill(pid, 0)은 신호 확인이 아니라 CTRL_C_EVENT 전송
+        return None
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return None
+    return True
+
+
+@contextmanager
+def atomic_write(path: Union[str, Path], mode: str = 'wb', **kwargs) -> Iterator[IO]:
+    """
+    같은 디렉토리의 임시 파일에 쓰고 성공하면 path로 이름 변경
+    (중간에 실패하면 임시 파일만 지우므로 path에는 이전 파일 또는 완성된 파일만 남음)
+
+    Args:
+        path: 최종 경로
+        mode: 파일 열기 모드 ('wb' 또는 'w')
+        **kwargs: open()에 넘길 추가 인자 (encoding 등)
+    """
+    path = Path(path)
+    tmp_path = temp_path_for(path)
+    try:
+        with open(tmp_path, mode, **kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        # 기존 파일이 출력 저장소와 하드 링크되어 있어도 링크만 교체되고 저장소 파일은 그대로 유지
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def remove_stale_temp_files(directory: Union[str, Path], max_age: float = STALE_TEMP_AGE) -> int:
+    """
+    중단된 이전 실행이 남긴 임시 파일 삭제
+    (만든 프로세스가 끝난 임시 파일만 지우므로 같은 출력 디렉토리에 쓰는 다른 작업의 임시 파일은 남김.
+    프로세스를 알 수 없거나 살아 있으면 max_age보다 오래된 것만 삭제)
+
+    Args:
+        directory: 출력 디렉토리
+        max_age: 만든 프로세스와 관계없이 삭제할 임시 파일의 나이 (초)
+
+    Returns:
+        삭제한 파일 수
+    """
+    removed = 0
+    now = time.time()
+    for tmp_path in Path(directory).glob(f"*{TEMP_SUFFIX}"):
+        pid = _temp_owner_pid(tmp_path)
+        try:
+            if pid is None or _pid_alive(pid) is not False:
+                if now - tmp_path.stat().st_mtime < max_age:
+                    continue
+            tmp_path.unlink()
+            removed += 1
+        except OSError as e:
+            logger.debug("임시 파일 삭제 실패 (%s): %s", tmp_path, e)
+    if removed:
+        logger.info("이전 실행의 임시 파일 %s개 삭제: %s", removed, directory)
+    return removed
+
+
+def file_digest(path: Union[str, Path]) -> str:
+    """파일 내용의 SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class MergeJournal:
+    """완료된 출력 파일 저널 (파일명 -> 입력 해시, 출력 크기/수정 시각(/해시), 완료 시각)"""
+
+    def __init__(self, path: Union[str, Path], resume: bool = False, hash_outputs: Optional[bool] = None):
+        """
+        Args:
+            path: 저널 파일 경로
+            resume: True면 기존 저널을 읽어 이어서 사용, False면 새 저널로 시작
+            hash_outputs: 출력 파일의 SHA-256도 기록 (None이면 resume일 때만, 파일 전체를 다시 읽으므로
+                이어하기가 아니면 크기와 수정 시각만 기록하고 확인)
+        """
+        self.path = Path(path)
+        self.hash_outputs = resume if hash_outputs is None else hash_outputs
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        if resume:
+            self._entries = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return dict(data.get("outputs", {}))
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning("병합 저널을 읽을 수 없어 처음부터 실행: %s (%s)", self.path, e)
+            return {}
+
+    def is_complete(self, name: str, input_key: str, output_path: Union[str, Path]) -> bool:
+        """
+        이전 실행에서 같은 입력으로 완성된 출력 파일이 그대로 남아 있는지 확인
+
+        Args:
+            name: 출력 파일명
+            input_key: 현재 입력의 병합 계획 해시
+            output_path: 출력 파일 경로
+
+        Returns:
+            다시 만들 필요가 없으면 True
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+        if not entry or entry.get("input_key") != input_key:
+            return False
+        output_path = Path(output_path)
+        try:
+            stat = output_path.stat()
+            if stat.st_size != entry.get("size"):
+                return False
+            if entry.get("sha256"):
+                return file_digest(output_path) == entry["sha256"]
+            # 해시 없이 기록된 항목: 원자적으로 저장했으므로 크기와 수정 시각이 같으면 그대로인 파일
+            return stat.st_mtime_ns == entry.get("mtime_ns")
+        except OSError:
+            return False
+
+    def record(self, name: str, input_key: str, output_path: Union[str, Path]):
+        """
+        완성된 출력 파일 기록 후 저널 저장
+
+        Args:
+            name: 출력 파일명
+            input_key: 병합 계획 해시
+            output_path: 출력 파일 경로
+        """
+        output_path = Path(output_path)
+        stat = output_path.stat()
+        entry = {
+            "input_key": input_key,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "completed_at": datetime.now().isoformat(timespec='seconds'),
+        }
+        if self.hash_outputs:
+            entry["sha256"] = file_digest(output_path)
+        with self._lock:
+            self._entries[name] = entry
+            self._save()
+
+    def forget(self, name: str):
+        """출력 파일 기록 삭제 (다시 만드는 중 실패한 경우)"""
+        with self._lock:
+            if self._entries.pop(name, None) is not None:
+                self._save()
+
+    def _save(self):
+        try:
+            with atomic_write(self.path, 'w', encoding='utf-8') as f:
+                json.dump({"outputs": self._entries}, f, ensure_ascii=False, indent=2, sort_keys=True)
+        except OSError as e:
+            logger.warning("병합 저널 저장 실패: %s", e)
+
+    def get(self, name: str) -> Optional[Dict]:
+        """출력 파일의 기록 (없으면 None)"""
+        with self._lock:
+            entry = self._entries.get(name)
+            return dict(entry) if entry else None
@@ -0,0 +1,161 @@
+"""
+로그 설정 모듈
+하위 시스템별 로그 수준과 조용한 모드(quiet)를 설정하고,
+파일/페이지마다 남기던 진행 로그 대신 개수를 모아 한 줄로 보고하는 ProgressLine 제공
+(예: '--log-levels merge=debug,discovery=warning', 조용한 모드는 경고 이상과 진행 줄만 출력)
+"""
+
+import logging
+import os
+import time
+from typing import Dict, Optional, Union
+
+# 하위 시스템 이름 -> 로거 이름
+SUBSYSTEMS = {
+    "config": ("pdfusion.config_v5", "pdfusion.config", "pdfusion.prefetch"),
+    "discovery": ("pdfusion.file_discovery", "pdfusion.level_config", "pdfusion.extractor"),
+    "detection": ("pdfusion.book_type_detector", "pdfusion.unit_detection", "pdfusion.page_count"),
+    "merge": ("pdfusion.merger", "pdfusion.fused_merge", "pdfusion.output_optimizer",
+              "pdfusion.image_optimizer", "pdfusion.output_store", "pdfusion.journal"),
+    "io": ("pdfusion.sources", "pdfusion.source_cache"),
+    "runtime": ("pdfusion.scheduler", "pdfusion.sandbox", "pdfusion.memory", "pdfusion.metrics",
+                "pdfusion.profiling", "pdfusion.service"),
+    "progress": ("pdfusion.progress",),
+}
+
+# 집계 진행 줄을 남기는 로거 (조용한 모드에서도 INFO 유지)
+PROGRESS_LOGGER_NAME = "pdfusion.progress"
+
+# 기본 로그 수준 (환경 변수 PDFUSION_LOG_LEVEL로 바꿀 수 있음)
+DEFAULT_LEVEL = "INFO"
+
+# 진행 줄 중간 보고 간격 (초, 반복이 이보다 오래 걸릴 때만 중간 줄을 남김)
+PROGRESS_INTERVAL = 2.0
+
+progress_logger = logging.getLogger(PROGRESS_LOGGER_NAME)
+
+
+def _parse_level(value: Union[str, int]) -> int:
+    if isinstance(value, int):
+        return value
+    level = logging.getLevelName(value.strip().upper())
+    if not isinstance(level, int):
+        raise ValueError(f"알 수 없는 로그 수준: {value}")
+    return level
+
+
+def parse_log_levels(spec: Optional[str]) -> Dict[str, int]:
+    """
+    하위 시스템별 로그 수준 문자열 해석
+
+    Args:
+        spec: 'merge=debug,discovery=warning' 형식 (하위 시스템 이름 대신 로거 이름도 사용 가능)
+
+    Returns:
+        {하위 시스템 또는 로거 이름: 로그 수준}
+    """
+    levels = {}
+    for item in (spec or "").split(","):
+        if not item.strip():
+            continue
+        name, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"'이름=수준' 형식이 아님: {item}")
+        levels[name.strip()] = _parse_level(value)
+    return levels
+
+
+LOG_LEVEL = os.environ.get("PDFUSION_LOG_LEVEL", DEFAULT_LEVEL)
+LOG_LEVELS = os.environ.get("PDFUSION_LOG_LEVELS", "")
+LOG_QUIET = os.environ.get("PDFUSION_LOG_QUIET", "0") == "1"
+
+
+def configure_logging(level: Optional[str] = None, levels: Optional[str] = None,
+                      quiet: Optional[bool] = None):
+    """
+    로그 수준 설정 (인자를 생략하면 현재 값, 처음에는 환경 변수 값 사용)
+
+    Args:
+        level: 기본 로그 수준 (예: 'INFO', 'DEBUG')
+        levels: 하위 시스템별 로그 수준 ('merge=debug,discovery=warning')
+        quiet: 조용한 모드 (기본 수준을 WARNING으로 올리고 진행 줄만 INFO로 남김)
+    """
+    global LOG_LEVEL, LOG_LEVELS, LOG_QUIET
+    if level is not None:
+        LOG_LEVEL = level
+    if levels is not None:
+        LOG_LEVELS = levels
+    if quiet is not None:
+        LOG_QUIET = quiet
+    subsystem_levels = parse_log_levels(LOG_LEVELS)
+    base_level = logging.WARNING if LOG_QUIET else _parse_level(LOG_LEVEL)
+
+    logging.basicConfig(level=base_level)
+    logging.getLogger().setLevel(base_level)
+    # 조용한 모드에서도 진행 줄은 보이도록 함 (levels에 progress가 있으면 그 값 우선)
+    progress_logger.setLevel(logging.INFO if LOG_QUIET else logging.NOTSET)
+    for name, subsystem_level in subsystem_levels.items():
+        for logger_name in SUBSYSTEMS.get(name, (name,)):
+            logging.getLogger(logger_name).setLevel(subsystem_level)
+
+
+def logging_settings() -> Dict:
+    """현재 설정 (configure_logging 인자 형태, 병렬 작업 프로세스에 전달)"""
+    return {"level": str(LOG_LEVEL), "levels": LOG_LEVELS, "quiet": LOG_QUIET}
+
+
+class ProgressLine:
+    """
+    반복마다 로그를 남기는 대신 처리 개수를 모아 한 줄로 보고
+    (오래 걸리면 PROGRESS_INTERVAL마다 중간 줄, 끝나면 요약 줄 하나)
+
+    사용 예:
+        progress = ProgressLine("파일 분류", total=len(files))
+        for f in files:
+            progress.add(category)
+        progress.finish()
+    """
+
+    def __init__(self, label: str, total: Optional[int] = None, interval: float = PROGRESS_INTERVAL):
+        """
+        Args:
+            label: 진행 줄 앞에 붙일 작업 이름
+            total: 전체 개수 (모르면 None)
+            interval: 중간 보고 간격 (초)
+        """
+        self.label = label
+        self.total = total
+        self.interval = interval
+        self.done = 0
+        self.counts: Dict[str, int] = {}
+        self.started = time.perf_counter()
+        self._next_report = self.started + interval
+        self._enabled = progress_logger.isEnabledFor(logging.INFO)
+
+    def add(self, key: Optional[str] = None, count: int = 1):
+        """
+        처리 개수 증가
+
+        Args:
+            key: 요약에 따로 셀 항목 이름 (예: 카테고리)
+            count: 증가량
+        """
+        self.done += count
+        if key is not None:
+            self.counts[key] = self.counts.get(key, 0) + count
+        if self._enabled and self.interval and time.perf_counter() >= self._next_report:
+            self._next_report = time.perf_counter() + self.interval
+            self._emit("진행 중")
+
+    def finish(self) -> str:
+        """요약 줄을 남기고 그 내용을 반환"""
+        return self._emit("완료")
+
+    def _emit(self, state: str) -> str:
+        done = f"{self.done}/{self.total}" if self.total is not None else str(self.done)
+        details = ", ".join(f"{key} {count}" for key, count in self.counts.items())
+        elapsed = time.perf_counter() - self.started
+        line = f"{self.label} {state}: {done}개 ({elapsed:.2f}s)" + (f" - {details}" if details else "")
+        if self._enabled:
+            progress_logger.info(line)
+        return line
@@ -0,0 +1,234 @@
+"""
+메모리 추적 모듈
+병합 중 프로세스 RSS(와 --track-heap이면 Python 힙)의 최대값을 유닛/책 단위로 기록하고,
+메모리 예산을 넘으면 병합 코드가 안전한 지점에서 메모리를 줄이는 조치를 하도록 알려 줌
+"""
+
+import gc
+import logging
+import os
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import psutil
+except ImportError:  # /proc 또는 getrusage로 대체
+    psutil = None
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# RSS 측정 간격 (초)
+DEFAULT_SAMPLE_INTERVAL = 0.05
+
+# 메모리 예산 (MB, 0이면 사용 안 함)과 힙 추적 기본값
+MEMORY_BUDGET_MB = int(os.environ.get("PDFUSION_MEMORY_BUDGET_MB", 0))
+TRACK_HEAP = os.environ.get("PDFUSION_TRACK_HEAP", "0") == "1"
+
+_process = psutil.Process() if psutil is not None else None
+
+
+def rss_bytes(include_children: bool = False) -> Optional[int]:
+    """
+    현재 프로세스의 RSS (측정할 수 없으면 None)
+
+    Args:
+        include_children: 자식 프로세스(병렬 작업 프로세스 등)의 RSS 포함 (psutil 필요)
+    """
+    if _process is not None:
+        try:
+            total = _process.memory_info().rss
+            if include_children:
+                for child in _process.children(recursive=True):
+                    try:
+                        total += child.memory_info().rss
+                    except psutil.Error:
+                        continue
+            return total
+        except psutil.Error:
+            return None
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError, IndexError):
+        return None
+
+
+def process_peak_rss_bytes() -> Optional[int]:
+    """프로세스 시작 이후 최대 RSS (getrusage, 지원하지 않으면 None)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class MemoryWindow:
+    """구간 하나(유닛, 합본 등)의 메모리 최대값"""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.start_rss: Optional[int] = None
+        self.peak_rss = 0
+        self.peak_heap: Optional[int] = None
+
+    def update(self, rss: Optional[int], heap: Optional[int]):
+        if rss is not None:
+            if self.start_rss is None:
+                self.start_rss = rss
+            self.peak_rss = max(self.peak_rss, rss)
+        if heap is not None:
+            self.peak_heap = max(self.peak_heap or 0, heap)
+
+    def to_dict(self) -> Dict:
+        return {"label": self.label, "start_rss_bytes": self.start_rss,
+                "peak_rss_bytes": self.peak_rss or None, "peak_heap_bytes": self.peak_heap}
+
+
+class MemoryMonitor:
+    """
+    백그라운드 스레드로 RSS를 주기적으로 측정해 열려 있는 구간들의 최대값을 갱신
+    (RSS는 프로세스 단위이므로 같은 프로세스에서 여러 책을 스레드로 병합하면 서로의 사용량이 포함됨)
+    """
+
+    def __init__(self, budget: Optional[int] = None, interval: float = DEFAULT_SAMPLE_INTERVAL,
+                 track_heap: bool = False):
+        """
+        Args:
+            budget: 메모리 예산 (바이트, None이면 사용 안 함)
+            interval: 측정 간격 (초)
+            track_heap: tracemalloc으로 Python 힙도 추적 (느려지므로 필요할 때만)
+        """
+        self.budget = budget
+        self.interval = interval
+        self.track_heap = track_heap
+        self._lock = threading.Lock()
+        self._windows: List[MemoryWindow] = []
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.last_rss: Optional[int] = None
+        self.peak_rss = 0
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            if self.track_heap and not tracemalloc.is_tracing():
+                tracemalloc.start()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="pdfusion-memory", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def stop(self):
+        """측정 스레드 종료"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+
+    def sample(self) -> Optional[int]:
+        """지금 RSS(와 힙)를 측정해 열려 있는 구간에 반영하고 RSS 반환"""
+        rss = rss_bytes()
+        heap = tracemalloc.get_traced_memory()[0] if self.track_heap and tracemalloc.is_tracing() else None
+        with self._lock:
+            self.last_rss = rss
+            if rss is not None:
+                self.peak_rss = max(self.peak_rss, rss)
+            for window in self._windows:
+                window.update(rss, heap)
+        return rss
+
+    @contextmanager
+    def window(self, label: str) -> Iterator[MemoryWindow]:
+        """
+        with 블록 동안의 메모리 최대값 측정
+
+        Args:
+            label: 구간 이름 (예: 'Unit01')
+        """
+        self._ensure_started()
+        window = MemoryWindow(label)
+        with self._lock:
+            self._windows.append(window)
+        self.sample()
+        try:
+            yield window
+        finally:
+            self.sample()
+            with self._lock:
+                self._windows.remove(window)
+
+    def over_budget(self) -> bool:
+        """예산이 설정되어 있고 현재 RSS가 예산을 넘었는지 (호출 시점에 다시 측정)"""
+        if not self.budget:
+            return False
+        rss = self.sample()
+        return rss is not None and rss > self.budget
+
+    def headroom(self, include_children: bool = False) -> Optional[int]:
+        """예산까지 남은 바이트 (예산이 없거나 측정할 수 없으면 None)"""
+        if not self.budget:
+            return None
+        rss = rss_bytes(include_children=include_children)
+        return None if rss is None else self.budget - rss
+
+
+def release_memory(source_cache=None) -> Dict[str, int]:
+    """
+    다시 만들 수 있는 캐시를 비워 메모리 확보 (대기 중인 원본 reader, 이미지 캐시, 순환 참조)
+
+    Args:
+        source_cache: 비울 원본 reader 캐시 (None이면 공유 캐시)
+
+    Returns:
+        {'readers_bytes': 제거한 reader 추정 메모리, 'rss_before', 'rss_after'}
+    """
+    # 순환 import를 피하기 위해 호출할 때 가져옴
+    from .image_optimizer import clear_image_cache
+    from .source_cache import get_source_cache
+
+    rss_before = rss_bytes()
+    cache = source_cache if source_cache is not None else get_source_cache()
+    readers_bytes = cache.trim(0)
+    clear_image_cache()
+    gc.collect()
+    return {"readers_bytes": readers_bytes, "rss_before": rss_before, "rss_after": rss_bytes()}
+
+
+_monitor = MemoryMonitor(budget=MEMORY_BUDGET_MB * 1024 * 1024 or None, track_heap=TRACK_HEAP)
+
+
+def get_memory_monitor() -> MemoryMonitor:
+    """프로세스 전체 공유 메모리 측정기"""
+    return _monitor
+
+
+def configure_memory(budget_mb: Optional[int] = None, track_heap: Optional[bool] = None):
+    """
+    메모리 예산과 힙 추적 설정
+
+    Args:
+        budget_mb: 메모리 예산 (MB, 0이면 사용 안 함)
+        track_heap: tracemalloc으로 Python 힙 최대값도 기록
+    """
+    if budget_mb is not None:
+        _monitor.budget = budget_mb * 1024 * 1024 or None
+    if track_heap is not None:
+        _monitor.track_heap = track_heap
+
+
+def memory_settings() -> Dict:
+    """현재 설정 (configure_memory 인자 형태, 병렬 작업 프로세스에 전달)"""
+    return {"budget_mb": (_monitor.budget or 0) // (1024 * 1024), "track_heap": _monitor.track_heap}
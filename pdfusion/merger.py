@@ -2,11 +2,14 @@
 PDF 병합 핵심 기능을 담당하는 모듈
 """
 
+import gc
 import os
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 import logging
 import traceback
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 
 # PyPDF2 버전 호환성 처리
@@ -18,25 +21,99 @@ except ImportError:
     except ImportError:
         raise ImportError("pypdf 또는 PyPDF2 라이브러리가 설치되어 있지 않습니다. pip install pypdf")
 
+from .events import CACHE_STATS, UNIT_DONE, emit, get_event_bus
+from .image_optimizer import PIL_AVAILABLE, optimize_images, resolve_image_profile
+from .output_optimizer import (DEFAULT_OUTPUT_PROFILE, OUTPUT_PROFILES, deduplicate_resources,
+                               recompress_streams, write_with_object_streams)
+from .journal import JOURNAL_NAME, MergeJournal, atomic_write, remove_stale_temp_files
+from .memory import get_memory_monitor, process_peak_rss_bytes, release_memory
+from .metrics import cache_snapshot, get_metrics, write_metrics_report
+from .output_store import OutputStore, write_manifest
+from .profiling import profile_results
+from .sandbox import get_quarantine
+from .source_cache import SourceCache, get_source_cache
+from .sources import open_reader
+
 logger = logging.getLogger(__name__)
 
+# 파일 검증 시 페이지 수를 동시에 계산할 스레드 수 (파일 읽기/해시 계산은 GIL을 놓으므로 CPU 수보다 많게)
+VALIDATION_WORKERS = min(16, (os.cpu_count() or 1) * 4)
+
+# 텍스트 보고서에 표시할 프로파일별 상위 함수 수 (전체 목록은 JSON 보고서에)
+PROFILE_REPORT_ROWS = 5
+
 
 class PDFMerger:
     """PDF 병합 클래스"""
     
-    def __init__(self, output_dir: str = "output"):
+    def __init__(self, output_dir: str = "output", dedupe_resources: bool = True,
+                 output_profile: str = DEFAULT_OUTPUT_PROFILE, image_profile=None,
+                 source_cache: Optional[SourceCache] = None,
+                 output_store: Optional[OutputStore] = None, resume: bool = False,
+                 config_metrics: Optional[Dict] = None):
+        """
+        Args:
+            output_dir: 출력 디렉토리
+            dedupe_resources: 동일한 폰트/이미지 등 리소스 중복 제거 여부
+            output_profile: 저장 방식 (OUTPUT_PROFILES의 이름)
+            image_profile: 이미지 다운샘플링 프로필 (IMAGE_PROFILES의 이름 또는
+                {'target_dpi', 'quality'} dict, None이면 사용 안 함)
+            source_cache: 원본 reader/페이지 수 캐시 (None이면 프로세스 전체 공유 캐시)
+            output_store: 같은 병합 계획의 결과를 재사용할 출력 저장소 (None이면 사용 안 함)
+            resume: 이전 실행의 저널을 읽어 입력이 같고 출력이 온전한 파일은 다시 만들지 않음
+            config_metrics: 설정 단계 계측 결과 (JSON 보고서에 함께 기록, 다른 프로세스에서 병합할 때 필요)
+        """
+        if output_profile not in OUTPUT_PROFILES:
+            raise ValueError(f"알 수 없는 출력 프로필: {output_profile} "
+                             f"(사용 가능: {', '.join(OUTPUT_PROFILES)})")
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        remove_stale_temp_files(self.output_dir)
+        self.resume = resume
+        self.journal = MergeJournal(self.output_dir / JOURNAL_NAME, resume=resume)
+        self.dedupe_resources = dedupe_resources
+        self.output_profile = output_profile
+        self.source_cache = source_cache if source_cache is not None else get_source_cache()
+        self.output_store = output_store
+        # 출력 파일명 -> 저장소 키 (매니페스트용)
+        self._manifest = {}
+        self.image_profile = resolve_image_profile(image_profile)
+        if self.image_profile and not PIL_AVAILABLE:
+            logger.warning("Pillow가 설치되어 있지 않아 이미지 최적화를 건너뜀 (pip install Pillow)")
+            self.image_profile = None
         self.merge_log = []
         self.stats = {
             "total_files_processed": 0,
             "total_pages_merged": 0,
             "errors": 0,
-            "warnings": 0
+            "warnings": 0,
+            "dedup_objects_removed": 0,
+            "dedup_bytes_saved": 0,
+            "recompressed_streams": 0,
+            "recompress_bytes_saved": 0,
+            "images_downsampled": 0,
+            "image_bytes_saved": 0,
+            "store_reused": 0,
+            "store_bytes_reused": 0,
+            "resumed_files": 0,
+            "peak_rss_bytes": 0,
+            "peak_heap_bytes": 0,
+            "memory_relief_count": 0
         }
-        
-        logger.info(f"PDFMerger 초기화 완료")
-        logger.debug(f"출력 디렉토리: {self.output_dir.absolute()}")
+        # 출력 파일별 최적화 결과 (보고서용)
+        self.optimization_log = []
+        self._report_path = None
+        # 단계별 계측 (책 출력 디렉토리 이름을 범위로 사용)
+        self.metrics = get_metrics()
+        self.metrics_scope = self.output_dir.name
+        self.config_metrics = config_metrics or {}
+        self._bytes_written = 0
+        # 출력 파일별 메모리 최대값 (보고서용)
+        self.memory = get_memory_monitor()
+        self.memory_log = []
+        
+        logger.info("PDFMerger 초기화 완료")
+        logger.debug("출력 디렉토리: %s", self.output_dir.absolute())
         
     def validate_pdf_files(self, config: Dict) -> bool:
         """PDF 파일들의 존재 여부 및 페이지 수 검증"""
@@ -44,77 +121,67 @@ class PDFMerger:
         validation_errors = []
         validation_warnings = []
 
-        # 카테고리 PDF 파일 확인
+        # 검사 항목 수집: (메시지 접두어, PDF 경로, 기대 페이지 수 계산 함수, 유닛별 파일 여부)
+        # 페이지 수는 병렬로 세고 오류/경고는 수집 순서대로 보고
+        checks = []
         for category, info in config["categories"].items():
+            if info.get("detect_units"):
+                # 융합 병합: 유닛 경계를 병합하면서 감지하므로 파일만 확인
+                for pdf_path in info.get("pdf_paths") or [info["pdf_path"]]:
+                    checks.append((f"카테고리 '{category}'", pdf_path, lambda: None, False))
             # 유닛별 파일(예: pdf_paths) 지원
-            if "pdf_paths" in info:
+            elif "pdf_paths" in info:
                 for idx, pdf_path in enumerate(info["pdf_paths"]):
-                    logger.debug(f"카테고리 '{category}' 유닛{idx+1} 파일 확인: {pdf_path}")
-                    if not os.path.exists(pdf_path):
-                        validation_errors.append(f"카테고리 '{category}' 유닛{idx+1}: 파일을 찾을 수 없음 - {pdf_path}")
-                        logger.warning(f"파일 없음: {pdf_path}")
-                    else:
-                        try:
-                            reader = PdfReader(pdf_path)
-                            total_pages = len(reader.pages)
-                            expected_pages = info["unit_page_lengths"][idx]
-                            if total_pages != expected_pages:
-                                warning_msg = f"카테고리 '{category}' 유닛{idx+1}: 파일 페이지 수({total_pages})와 unit_page_lengths({expected_pages}) 불일치"
-                                validation_warnings.append(warning_msg)
-                                logger.warning(f"  - 경고: {warning_msg}")
-                        except Exception as e:
-                            error_msg = f"카테고리 '{category}' 유닛{idx+1}: PDF 읽기 오류 - {str(e)}"
-                            validation_errors.append(error_msg)
-                            logger.error(f"파일 읽기 오류 ({pdf_path}): {e}")
+                    checks.append((f"카테고리 '{category}' 유닛{idx+1}", pdf_path,
+                                   lambda info=info, idx=idx: info["unit_page_lengths"][idx], True))
             else:
-                pdf_path = info["pdf_path"]
-                logger.debug(f"카테고리 '{category}' 파일 확인: {pdf_path}")
-                if not os.path.exists(pdf_path):
-                    validation_errors.append(f"카테고리 '{category}': 파일을 찾을 수 없음 - {pdf_path}")
-                    logger.warning(f"파일 없음: {pdf_path}")
-                else:
-                    try:
-                        reader = PdfReader(pdf_path)
-                        total_pages = len(reader.pages)
-                        expected_total = sum(info["unit_page_lengths"])
-                        if total_pages != expected_total:
-                            warning_msg = f"카테고리 '{category}': PDF 총 페이지({total_pages})와 unit_page_lengths 합({expected_total}) 불일치"
-                            validation_warnings.append(warning_msg)
-                            logger.warning(f"  - 경고: {warning_msg}")
-                    except Exception as e:
-                        error_msg = f"카테고리 '{category}': PDF 읽기 오류 - {str(e)}"
-                        validation_errors.append(error_msg)
-                        logger.error(f"파일 읽기 오류 ({pdf_path}): {e}")
+                checks.append((f"카테고리 '{category}'", info["pdf_path"],
+                               lambda info=info: sum(info["unit_page_lengths"]), False))
         
         # Review Test PDF 파일 확인 (리스트 구조)
         for review in config.get("review_tests", []):
-            review_path = review["pdf_path"]
-            logger.debug(f"Review Test 파일 확인: {review_path}")
-            if not review_path:
-                validation_errors.append("Review Test: 파일 경로가 지정되지 않음")
-            elif not os.path.exists(review_path):
-                validation_errors.append(f"Review Test: 파일을 찾을 수 없음 - {review_path}")
-                logger.warning(f"Review Test 파일 없음: {review_path}")
-            else:
-                try:
-                    reader = PdfReader(review_path)
-                    total_pages = len(reader.pages)
-                    expected_total = sum(review["unit_page_lengths"])
-                    if total_pages != expected_total:
-                        warning_msg = f"Review Test: PDF 총 페이지({total_pages})와 unit_page_lengths 합({expected_total}) 불일치"
-                        validation_warnings.append(warning_msg)
-                        logger.warning(warning_msg)
-                except Exception as e:
-                    error_msg = f"Review Test: PDF 읽기 오류 - {str(e)}"
-                    validation_errors.append(error_msg)
-                    logger.error(f"Review Test 파일 읽기 오류: {e}")
+            checks.append(("Review Test", review["pdf_path"],
+                           lambda review=review: sum(review["unit_page_lengths"]), False))
+        
+        with self.stage("validation") as sample:
+            page_counts = self._count_pages_parallel([pdf_path for _, pdf_path, _, _ in checks])
+            for pdf_path in dict.fromkeys(pdf_path for _, pdf_path, _, _ in checks if pdf_path):
+                if os.path.exists(pdf_path):
+                    sample.add(bytes_read=os.path.getsize(pdf_path))
+            sample.add(pages=sum(count for count in page_counts if isinstance(count, int)))
+        
+        for (label, pdf_path, expected_pages, per_unit_file), result in zip(checks, page_counts):
+            logger.debug("%s 파일 확인: %s", label, pdf_path)
+            if not pdf_path:
+                validation_errors.append(f"{label}: 파일 경로가 지정되지 않음")
+                continue
+            if result is None:
+                validation_errors.append(f"{label}: 파일을 찾을 수 없음 - {pdf_path}")
+                logger.warning("파일 없음: %s", pdf_path)
+                continue
+            try:
+                if isinstance(result, Exception):
+                    raise result
+                total_pages = result
+                expected = expected_pages()
+                if expected is not None and total_pages != expected:
+                    if per_unit_file:
+                        warning_msg = f"{label}: 파일 페이지 수({total_pages})와 unit_page_lengths({expected}) 불일치"
+                    else:
+                        warning_msg = f"{label}: PDF 총 페이지({total_pages})와 unit_page_lengths 합({expected}) 불일치"
+                    validation_warnings.append(warning_msg)
+                    logger.warning("  - 경고: %s", warning_msg)
+            except Exception as e:
+                error_msg = f"{label}: PDF 읽기 오류 - {str(e)}"
+                validation_errors.append(error_msg)
+                logger.error("파일 읽기 오류 (%s): %s", pdf_path, e)
         
         # 검증 결과 출력
         if validation_errors:
             logger.error("PDF 파일 검증 실패:")
             print("\n[오류] 다음 문제들을 해결해주세요:")
             for error in validation_errors:
-                logger.error(f"  - {error}")
+                logger.error("  - %s", error)
                 print(f"  ❌ {error}")
             self.stats["errors"] += len(validation_errors)
         
@@ -122,7 +189,7 @@ class PDFMerger:
             logger.warning("PDF 파일 검증 경고:")
             print("\n[경고] 다음 사항들을 확인해주세요:")
             for warning in validation_warnings:
-                logger.warning(f"  - {warning}")
+                logger.warning("  - %s", warning)
                 print(f"  ⚠️  {warning}")
             self.stats["warnings"] += len(validation_warnings)
         
@@ -134,6 +201,33 @@ class PDFMerger:
         
         return False
     
+    def _count_pages_parallel(self, pdf_paths: List) -> List:
+        """
+        여러 PDF의 페이지 수를 스레드 풀로 동시에 계산 (같은 파일은 한 번만)
+        Args:
+            pdf_paths: PDF 경로 목록 (빈 값 허용)
+        Returns:
+            입력 순서대로 페이지 수, 파일이 없으면 None, 읽기 실패 시 예외 객체
+        """
+        unique_paths = list(dict.fromkeys(pdf_path for pdf_path in pdf_paths if pdf_path))
+        
+        def count(pdf_path):
+            if not os.path.exists(pdf_path):
+                return None
+            try:
+                # 파일 끝부분만 읽어 페이지 수 계산, 설정 단계에서 센 결과는 재사용
+                return self.source_cache.page_count(pdf_path)
+            except Exception as e:
+                return e
+        
+        workers = min(VALIDATION_WORKERS, len(unique_paths))
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pdfusion-validate") as executor:
+                counts = dict(zip(unique_paths, executor.map(count, unique_paths)))
+        else:
+            counts = {pdf_path: count(pdf_path) for pdf_path in unique_paths}
+        return [counts.get(pdf_path) if pdf_path else None for pdf_path in pdf_paths]
+    
     def calculate_page_range(self, unit_number: int, pages_per_unit: int) -> Tuple[int, int]:
         """
         특정 유닛의 페이지 범위 계산
@@ -149,20 +243,19 @@ class PDFMerger:
         start_index = (unit_number - 1) * pages_per_unit
         end_index = start_index + pages_per_unit
         
-        logger.debug(f"Unit{unit_number} 페이지 범위 계산: "
-                    f"사람기준 {start_index + 1}~{end_index}페이지 → "
-                    f"인덱스 [{start_index}:{end_index})")
+        logger.debug("Unit%s 페이지 범위 계산: 사람기준 %s~%s페이지 → 인덱스 [%s:%s)",
+                     unit_number, start_index + 1, end_index, start_index, end_index)
         
         return start_index, end_index
     
-    def extract_unit_pages(self, info: Dict, unit_number: int) -> Optional[List]:
+    def extract_unit_range(self, info: Dict, unit_number: int) -> Optional[Tuple[str, int, int]]:
         """
-        PDF에서 특정 유닛의 페이지들 추출 (unit_page_lengths 기반)
+        PDF에서 특정 유닛이 차지하는 연속 페이지 구간 계산 (unit_page_lengths 기반)
         Args:
             info: 카테고리 정보 dict
             unit_number: 유닛 번호 (1-based)
         Returns:
-            추출된 페이지 객체 리스트 (실패시 None)
+            (PDF 경로, 시작 인덱스, 끝 인덱스) - 끝 인덱스는 포함하지 않음 (실패시 None)
         """
         try:
             # 여러 파일을 합친 경우 (is_multi_file_combined 플래그 확인)
@@ -183,45 +276,129 @@ class PDFMerger:
                         unit_page_lengths = file_info["unit_page_lengths"]
                         unit_index_in_file = unit_index - start_idx  # 파일 내 유닛 인덱스
                         
-                        reader = PdfReader(pdf_path)
                         start = sum(unit_page_lengths[:unit_index_in_file])
                         end = start + unit_page_lengths[unit_index_in_file]
-                        return [reader.pages[i] for i in range(start, end)]
-                
-                # 유닛을 찾지 못함
-                logger.error(f"유닛 {unit_number}을 찾을 수 없음 (인덱스: {unit_index})")
-                return None
+                        break
+                else:
+                    # 유닛을 찾지 못함
+                    logger.error("유닛 %s을 찾을 수 없음 (인덱스: %s)", unit_number, unit_index)
+                    return None
             elif "pdf_paths" in info:
                 # 유닛별 파일 (각 파일이 하나의 유닛)
                 pdf_path = info["pdf_paths"][unit_number-1]
-                reader = PdfReader(pdf_path)
-                return list(reader.pages)
+                start, end = 0, self.source_cache.page_count(pdf_path)
             else:
                 # 단일 통합 파일
                 pdf_path = info["pdf_path"]
                 unit_page_lengths = info["unit_page_lengths"]
-                reader = PdfReader(pdf_path)
                 start = sum(unit_page_lengths[:unit_number-1])
                 end = start + unit_page_lengths[unit_number-1]
-                return [reader.pages[i] for i in range(start, end)]
+            
+            total_pages = self.source_cache.page_count(pdf_path)
+            if end > total_pages:
+                raise IndexError(f"페이지 범위 [{start}:{end})가 전체 {total_pages}페이지를 벗어남")
+            return str(pdf_path), start, end
         except Exception as e:
-            logger.error(f"extract_unit_pages 오류: {e}")
+            logger.error("extract_unit_range 오류: %s", e)
             return None
     
+    def extract_unit_pages(self, info: Dict, unit_number: int) -> Optional[List]:
+        """
+        PDF에서 특정 유닛의 페이지들 추출 (unit_page_lengths 기반)
+        Args:
+            info: 카테고리 정보 dict
+            unit_number: 유닛 번호 (1-based)
+        Returns:
+            추출된 페이지 객체 리스트 (실패시 None)
+        """
+        unit_range = self.extract_unit_range(info, unit_number)
+        if unit_range is None:
+            return None
+        pdf_path, start, end = unit_range
+        reader = open_reader(pdf_path)
+        return [reader.pages[i] for i in range(start, end)]
+    
+    @staticmethod
+    def append_page_range(writer, reader, start: int, end: int):
+        """
+        reader의 연속 페이지 구간 [start:end)를 한 번에 writer에 추가
+        (링크 주석은 함께 복사된 페이지를 가리키도록 재연결되고, 구간 밖을 가리키는 링크는 제외됨)
+        """
+        if hasattr(writer, "append"):
+            writer.append(reader, pages=(start, end), import_outline=False)
+        else:
+            # append가 없는 구버전 PyPDF2
+            for i in range(start, end):
+                writer.add_page(reader.pages[i])
+    
+    def stage(self, name: str, label: Optional[str] = None):
+        """이 책 범위의 계측 구간 (MetricsRecorder.stage)"""
+        return self.metrics.stage(name, scope=self.metrics_scope, label=label)
+    
+    @contextmanager
+    def measure_output(self, name: str, label: Optional[str] = None):
+        """
+        출력 파일을 만드는 계측 구간 (구간 안에서 병합된 페이지 수와 쓴 바이트를 자동으로 기록)
+        Args:
+            name: 단계 이름
+            label: 항목 이름 (예: 'Unit01')
+        """
+        pages_before = self.stats["total_pages_merged"]
+        written_before = self._bytes_written
+        with self.stage(name, label) as sample, self.memory.window(label or name) as window:
+            try:
+                yield sample
+            finally:
+                sample.add(bytes_written=self._bytes_written - written_before,
+                           pages=self.stats["total_pages_merged"] - pages_before)
+        self.memory_log.append(window.to_dict())
+        self.stats["peak_rss_bytes"] = max(self.stats["peak_rss_bytes"], window.peak_rss)
+        if window.peak_heap is not None:
+            self.stats["peak_heap_bytes"] = max(self.stats["peak_heap_bytes"], window.peak_heap)
+    
+    def check_memory_budget(self, where: str) -> bool:
+        """
+        메모리 예산을 넘었으면 다시 만들 수 있는 캐시를 비워 메모리 확보
+        Args:
+            where: 보고서에 남길 위치 (예: 'Unit03')
+        Returns:
+            정리 후에도 예산을 넘으면 True (호출한 쪽에서 writer 내보내기 등 추가 조치)
+        """
+        if not self.memory.over_budget():
+            return False
+        result = release_memory(self.source_cache)
+        self.stats["memory_relief_count"] += 1
+        still_over = self.memory.over_budget()
+        mb = 1024 * 1024
+        message = (f"{where}: 메모리 예산({self.memory.budget / mb:,.0f}MB) 초과 - 캐시 정리 "
+                   f"({(result['rss_before'] or 0) / mb:,.0f}MB -> {(result['rss_after'] or 0) / mb:,.0f}MB)")
+        logger.warning(message)
+        self.merge_log.append(f"메모리: {message}")
+        return still_over
+    
     def merge_unit_pdf(self, unit_number: int, config: Dict) -> bool:
         """특정 유닛의 PDF 병합 (unit_page_lengths 기반)"""
+        unit_name = f"Unit{unit_number:02d}"
+        # 앞 유닛의 reader/이미지 캐시가 예산을 넘겼으면 다음 유닛을 시작하기 전에 정리
+        self.check_memory_budget(unit_name)
+        with self.measure_output("unit_merge", unit_name):
+            return self._merge_unit_pdf(unit_number, config)
+    
+    def _merge_unit_pdf(self, unit_number: int, config: Dict) -> bool:
         writer = PdfWriter()
         unit_name = f"Unit{unit_number:02d}"
+        output_path = self.output_dir / f"{unit_name}.pdf"
         
-        logger.info(f"\n=== {unit_name} 병합 시작 ===")
-        logger.debug(f"병합 순서: {config['merge_order']}")
+        logger.info("\n=== %s 병합 시작 ===", unit_name)
+        logger.debug("병합 순서: %s", config['merge_order'])
         
-        total_pages_added = 0
         unit_success = True
+        # 추가할 구간 목록: (표시 이름, PDF 경로, 시작 인덱스, 끝 인덱스)
+        parts = []
         
-        # 병합 순서에 따라 각 카테고리의 페이지 추가
+        # 병합 순서에 따라 각 카테고리의 페이지 구간 계산
         for i, category in enumerate(config["merge_order"], 1):
-            logger.debug(f"[{i}/{len(config['merge_order'])}] 카테고리 '{category}' 처리 중...")
+            logger.debug("[%s/%s] 카테고리 '%s' 처리 중...", i, len(config['merge_order']), category)
             
             if category not in config["categories"]:
                 warning_msg = f"카테고리 '{category}'를 찾을 수 없음"
@@ -231,14 +408,9 @@ class PDFMerger:
                 continue
             
             category_info = config["categories"][category]
-            pages = self.extract_unit_pages(category_info, unit_number)
-            if pages:
-                for j, page in enumerate(pages, 1):
-                    writer.add_page(page)
-                    logger.debug(f"    페이지 {j}/{len(pages)} 추가됨")
-                
-                total_pages_added += len(pages)
-                logger.info(f"  - {category}: {len(pages)}페이지 추가 (누적: {total_pages_added}페이지)")
+            unit_range = self.extract_unit_range(category_info, unit_number)
+            if unit_range and unit_range[2] > unit_range[1]:
+                parts.append((category, *unit_range))
             else:
                 warning_msg = f"{unit_name}에서 {category} 추출 실패"
                 logger.warning(warning_msg)
@@ -249,20 +421,57 @@ class PDFMerger:
         for review in config.get("review_tests", []):
             # end_unit 기준으로 병합 위치 결정
             if unit_number == review.get("end_unit", 1):
-                logger.debug(f"Review Test 전체 추가 - Unit{unit_number}")
+                logger.debug("Review Test 전체 추가 - Unit%s", unit_number)
                 try:
-                    reader = PdfReader(review["pdf_path"])
-                    for j, page in enumerate(reader.pages, 1):
-                        writer.add_page(page)
-                        logger.debug(f"    Review Test 페이지 {j}/{len(reader.pages)} 추가됨")
-                    total_pages_added += len(reader.pages)
-                    logger.info(f"  - Review Test: {len(reader.pages)}페이지 전체 추가 (누적: {total_pages_added}페이지)")
+                    review_pages = self.source_cache.page_count(review["pdf_path"])
+                    parts.append(("Review Test", str(review["pdf_path"]), 0, review_pages))
                 except Exception as e:
                     warning_msg = f"{unit_name}에서 Review Test 전체 추가 실패: {e}"
                     logger.warning(warning_msg)
                     self.merge_log.append(f"경고: {warning_msg}")
                     unit_success = False
         
+        # 이전 실행에서 완성됐거나 저장소에 같은 병합 계획의 결과가 있으면 병합하지 않음
+        plan_key = None
+        if unit_success and parts:
+            plan_key = OutputStore.plan_key(self._merge_plan(parts))
+            if self._reuse_existing_output(plan_key, output_path):
+                total_pages = sum(end - start for _, _, start, end in parts)
+                logger.info("♻️ %s.pdf 기존 결과 재사용 (%s페이지)", unit_name, total_pages)
+                self.stats["total_pages_merged"] += total_pages
+                self.stats["total_files_processed"] += 1
+                return True
+        
+        total_pages_added = 0
+        for label, pdf_path, start, end in parts:
+            if label == "Review Test":
+                try:
+                    with self.source_cache.reader(pdf_path) as reader:
+                        self.append_page_range(writer, reader, start, end)
+                except Exception as e:
+                    warning_msg = f"{unit_name}에서 Review Test 전체 추가 실패: {e}"
+                    logger.warning(warning_msg)
+                    self.merge_log.append(f"경고: {warning_msg}")
+                    unit_success = False
+                    plan_key = None
+                    continue
+                total_pages_added += end - start
+                logger.info("  - Review Test: %s페이지 전체 추가 (누적: %s페이지)", end - start, total_pages_added)
+            else:
+                # 손상되거나 잘린 카테고리 PDF는 이 유닛만 실패로 처리하고 책 전체를 중단하지 않음
+                try:
+                    with self.source_cache.reader(pdf_path) as reader:
+                        self.append_page_range(writer, reader, start, end)
+                except Exception as e:
+                    warning_msg = f"{unit_name}에서 {label} 추가 실패: {e}"
+                    logger.warning(warning_msg)
+                    self.merge_log.append(f"경고: {warning_msg}")
+                    unit_success = False
+                    plan_key = None
+                    continue
+                total_pages_added += end - start
+                logger.info("  - %s: %s페이지 추가 (누적: %s페이지)", label, end - start, total_pages_added)
+        
         # 페이지가 추가되지 않은 경우 처리
         if total_pages_added == 0:
             error_msg = f"{unit_name}: 추가된 페이지가 없음"
@@ -272,18 +481,18 @@ class PDFMerger:
             return False
         
         # 병합된 PDF 저장
-        output_path = self.output_dir / f"{unit_name}.pdf"
-        logger.debug(f"최종 저장 경로: {output_path.absolute()}")
-        logger.debug(f"최종 페이지 수: {total_pages_added}")
+        logger.debug("최종 저장 경로: %s", output_path.absolute())
+        logger.debug("최종 페이지 수: %s", total_pages_added)
         
         try:
-            with open(output_path, 'wb') as output_file:
-                writer.write(output_file)
+            self.write_output(writer, output_path)
+            if plan_key is not None:
+                self._record_output(plan_key, output_path)
             
             # 저장된 파일 크기 확인
             file_size = output_path.stat().st_size
-            logger.debug(f"저장된 파일 크기: {file_size:,} bytes ({file_size/1024:.1f} KB)")
-            logger.info(f"✅ {unit_name}.pdf 저장 완료 ({total_pages_added}페이지)")
+            logger.debug("저장된 파일 크기: %d bytes (%.1f KB)", file_size, file_size / 1024)
+            logger.info("✅ %s.pdf 저장 완료 (%s페이지)", unit_name, total_pages_added)
             
             self.stats["total_pages_merged"] += total_pages_added
             self.stats["total_files_processed"] += 1
@@ -293,21 +502,71 @@ class PDFMerger:
         except Exception as e:
             error_msg = f"{unit_name}.pdf 저장 실패: {str(e)}"
             logger.error(error_msg)
-            logger.debug(f"상세 오류: {traceback.format_exc()}")
+            logger.debug("상세 오류: %s", traceback.format_exc())
             self.merge_log.append(f"오류: {error_msg}")
             self.stats["errors"] += 1
             return False
     
+    def _merge_plan(self, parts: List[Tuple[str, str, int, int]]) -> Dict:
+        """
+        출력 내용을 결정하는 병합 계획 (원본 내용 해시 + 페이지 구간 + 출력 옵션)
+        Args:
+            parts: (표시 이름, PDF 경로, 시작 인덱스, 끝 인덱스) 목록
+        """
+        return {
+            "parts": [[self.source_cache.content_key(pdf_path), start, end] for _, pdf_path, start, end in parts],
+            "dedupe_resources": self.dedupe_resources,
+            "output_profile": self.output_profile,
+            "image_profile": self.image_profile,
+        }
+    
+    def _reuse_existing_output(self, plan_key: str, output_path: Path) -> bool:
+        """
+        output_path를 다시 만들 필요가 없으면 True 반환
+        (이어하기: 저널에 같은 입력으로 기록된 파일이 온전히 남아 있음 / 저장소: 같은 계획의 결과를 연결)
+        """
+        if self.resume and self.journal.is_complete(output_path.name, plan_key, output_path):
+            logger.debug("%s: 이전 실행에서 완료됨", output_path.name)
+            if self.output_store is not None:
+                self._manifest[output_path.name] = plan_key
+            self.stats["resumed_files"] += 1
+            return True
+        
+        if self.output_store is None:
+            return False
+        try:
+            if not self.output_store.fetch(plan_key, output_path):
+                return False
+        except OSError as e:
+            logger.warning("저장소 결과 연결 실패, 다시 병합: %s", e)
+            return False
+        self._manifest[output_path.name] = plan_key
+        self.stats["store_reused"] += 1
+        self.stats["store_bytes_reused"] += output_path.stat().st_size
+        self.journal.record(output_path.name, plan_key, output_path)
+        return True
+    
+    def _record_output(self, plan_key: str, output_path: Path):
+        """새로 만든 결과를 저널과 저장소에 등록 (저장소 등록 실패는 병합 결과에 영향 없음)"""
+        self.journal.record(output_path.name, plan_key, output_path)
+        if self.output_store is None:
+            return
+        try:
+            self.output_store.put(plan_key, output_path)
+            self._manifest[output_path.name] = plan_key
+        except OSError as e:
+            logger.warning("저장소 등록 실패 (%s): %s", output_path.name, e)
+    
     def merge_all_units(self, config: Dict) -> bool:
         """모든 유닛 병합 실행"""
         logger.info("="*60)
         logger.info("PDF 병합 작업 시작")
         logger.info("="*60)
         
-        logger.debug(f"총 유닛 수: {config['total_units']}")
-        logger.debug(f"카테고리 수: {len(config['categories'])}")
+        logger.debug("총 유닛 수: %s", config['total_units'])
+        logger.debug("카테고리 수: %s", len(config['categories']))
         # Review Test 활성화 로그 부분 수정
-        logger.debug(f"Review Test 구간 수: {len(config.get('review_tests', []))}")
+        logger.debug("Review Test 구간 수: %s", len(config.get('review_tests', [])))
         
         if not self.validate_pdf_files(config):
             logger.error("PDF 파일 검증 실패 - 병합 작업 중단")
@@ -318,24 +577,28 @@ class PDFMerger:
         total_units = config["total_units"]
         
         print(f"\n총 {total_units}개 유닛 병합을 시작합니다...")
-        logger.info(f"총 {total_units}개 유닛 병합 시작...")
+        logger.info("총 %s개 유닛 병합 시작...", total_units)
         
-        for unit_number in range(1, total_units + 1):
-            progress = unit_number / total_units * 100
-            print(f"\r진행 중: {unit_number}/{total_units} ({progress:.1f}%)", end='', flush=True)
-            logger.debug(f"\n진행상황: {unit_number}/{total_units} ({progress:.1f}%)")
-            
-            if self.merge_unit_pdf(unit_number, config):
-                success_count += 1
-                logger.debug(f"Unit{unit_number:02d} 성공 (성공률: {success_count}/{unit_number})")
-            else:
-                logger.error(f"Unit{unit_number:02d} 실패")
+        with self.stage("merge"):
+            for unit_number in range(1, total_units + 1):
+                progress = unit_number / total_units * 100
+                print(f"\r진행 중: {unit_number}/{total_units} ({progress:.1f}%)", end='', flush=True)
+                logger.debug("\n진행상황: %s/%s (%.1f%%)", unit_number, total_units, progress)
+                
+                unit_ok = self.merge_unit_pdf(unit_number, config)
+                if unit_ok:
+                    success_count += 1
+                    logger.debug("Unit%02d 성공 (성공률: %s/%s)", unit_number, success_count, unit_number)
+                else:
+                    logger.error("Unit%02d 실패", unit_number)
+                emit(UNIT_DONE, scope=self.metrics_scope, unit=unit_number, success=unit_ok,
+                     done=unit_number, total=total_units, succeeded=success_count)
         
         print()  # 진행률 표시 후 줄바꿈
         
         # 최종 통계
         logger.info("="*60)
-        logger.info(f"병합 작업 완료: {success_count}/{total_units} 유닛 성공")
+        logger.info("병합 작업 완료: %s/%s 유닛 성공", success_count, total_units)
         
         print(f"\n{'='*60}")
         print(f"병합 작업 완료!")
@@ -346,7 +609,7 @@ class PDFMerger:
         
         if success_count < total_units:
             failed_count = total_units - success_count
-            logger.warning(f"실패한 유닛: {failed_count}개")
+            logger.warning("실패한 유닛: %s개", failed_count)
             print(f"❌ 실패: {failed_count}개")
         
         if self.stats["warnings"] > 0:
@@ -358,6 +621,7 @@ class PDFMerger:
         print(f"{'='*60}")
         
         # 로그 파일 저장
+        self._save_manifest()
         self.save_merge_log()
         
         return success_count == total_units
@@ -365,26 +629,159 @@ class PDFMerger:
     def merge_all_units_to_one(self, total_units: int, output_filename: str = "AllUnits.pdf"):
         """output_dir 내 UnitXX.pdf를 순서대로 하나로 합쳐 output_filename으로 저장"""
         from pypdf import PdfReader, PdfWriter
-        writer = PdfWriter()
         unit_files = [self.output_dir / f"Unit{num:02d}.pdf" for num in range(1, total_units+1)]
+        existing_files = []
         for unit_file in unit_files:
             if not unit_file.exists():
-                logger.warning(f"{unit_file} 파일이 존재하지 않아 건너뜀")
+                logger.warning("%s 파일이 존재하지 않아 건너뜀", unit_file)
                 continue
-            reader = PdfReader(str(unit_file))
-            for page in reader.pages:
-                writer.add_page(page)
+            existing_files.append(unit_file)
         output_path = self.output_dir / output_filename
-        with open(output_path, 'wb') as f:
-            writer.write(f)
-        logger.info(f"✅ 전체 합본 PDF 저장 완료: {output_path}")
+        
+        # 유닛 결과가 모두 같으면 합본도 같으므로 유닛 파일 내용으로 키를 만듦
+        plan_key = None
+        if existing_files:
+            plan_key = OutputStore.plan_key({
+                "all_units": [self.source_cache.content_key(unit_file) for unit_file in existing_files],
+                "dedupe_resources": self.dedupe_resources,
+                "output_profile": self.output_profile,
+                "image_profile": self.image_profile,
+            })
+        
+        # 합본은 모든 유닛의 페이지를 한 writer에 올리므로, 원본 reader 캐시는 먼저 비움
+        self.check_memory_budget(output_filename)
+        with self.measure_output("all_units", output_filename) as sample:
+            if plan_key is not None and self._reuse_existing_output(plan_key, output_path):
+                logger.info("♻️ 전체 합본 PDF 기존 결과 재사용: %s", output_path)
+            else:
+                # 한 writer는 나눠 내보낼 수 없으므로, 예산을 넘을 것 같으면 만들지 않고 건너뜀 (유닛 파일은 그대로 남음)
+                over_budget = self._all_units_over_budget(existing_files, output_filename)
+                writer = PdfWriter()
+                for unit_file in existing_files:
+                    if over_budget:
+                        break
+                    reader = PdfReader(str(unit_file))
+                    self.append_page_range(writer, reader, 0, len(reader.pages))
+                    sample.add(bytes_read=unit_file.stat().st_size, pages=len(reader.pages))
+                    over_budget = self.check_memory_budget(f"{output_filename} ({unit_file.name})")
+                if over_budget:
+                    del writer
+                    gc.collect()
+                    error_msg = (f"메모리 예산({self.memory.budget / (1024 * 1024):,.0f}MB) 안에서 "
+                                 f"{output_filename}를 만들 수 없어 건너뜀 (유닛 파일은 저장됨, --memory-budget 조정 필요)")
+                    logger.error(error_msg)
+                    self.merge_log.append(f"오류: {error_msg}")
+                    self.stats["errors"] += 1
+                    self._save_manifest()
+                    print(f"\n[오류] {error_msg}")
+                    if self._report_path is not None:
+                        self.save_merge_log()
+                    return
+                self.write_output(writer, output_path)
+                if plan_key is not None:
+                    self._record_output(plan_key, output_path)
+                logger.info("✅ 전체 합본 PDF 저장 완료: %s", output_path)
+        self._save_manifest()
         print(f"\n[완료] 전체 합본 PDF가 저장되었습니다: {output_path}")
+        
+        # 합본의 최적화 결과까지 보고서에 반영
+        if self._report_path is not None:
+            self.save_merge_log()
+    
+    def _all_units_over_budget(self, unit_files: List[Path], where: str) -> bool:
+        """
+        합본 writer가 메모리 예산을 넘을지 미리 판단
+        (writer는 유닛 파일의 객체를 모두 메모리에 올리므로 유닛 파일 크기 합을 최소 필요량으로 봄)
+        Returns:
+            예산이 설정되어 있고 남은 메모리가 유닛 파일 크기 합보다 작으면 True
+        """
+        headroom = self.memory.headroom()
+        if headroom is None:
+            return False
+        needed = sum(unit_file.stat().st_size for unit_file in unit_files)
+        if needed <= headroom:
+            return False
+        mb = 1024 * 1024
+        message = f"{where}: 유닛 파일 {needed / mb:,.0f}MB > 남은 메모리 예산 {max(headroom, 0) / mb:,.0f}MB"
+        logger.warning(message)
+        self.merge_log.append(f"메모리: {message}")
+        return True
+    
+    def write_output(self, writer, output_path: Path):
+        """
+        출력 최적화(중복 리소스 제거, 출력 프로필) 후 PDF 저장
+        Args:
+            writer: 페이지 추가가 끝난 PdfWriter
+            output_path: 저장 경로
+        """
+        with self.stage("optimize"):
+            self._optimize_output(writer, output_path)
+        
+        # 임시 파일에 쓴 뒤 교체하므로 중단되어도 반쯤 쓰인 출력이 남지 않음
+        profile = OUTPUT_PROFILES[self.output_profile]
+        with self.stage("write") as sample:
+            with atomic_write(output_path) as output_file:
+                if profile["object_streams"]:
+                    write_with_object_streams(writer, output_file, profile["compression_level"])
+                else:
+                    writer.write(output_file)
+            written = output_path.stat().st_size
+            sample.add(bytes_written=written, pages=len(writer.pages))
+        self._bytes_written += written
+    
+    def _optimize_output(self, writer, output_path: Path):
+        """중복 리소스 제거, 이미지 다운샘플링, 스트림 압축 (출력 프로필에 따라)"""
+        profile = OUTPUT_PROFILES[self.output_profile]
+        entry = {"file": output_path.name, "objects_removed": 0, "bytes_saved": 0,
+                 "image_bytes_saved": 0, "recompress_bytes_saved": 0}
+        
+        if self.dedupe_resources:
+            result = deduplicate_resources(writer)
+            entry["objects_removed"] = result["objects_removed"]
+            entry["bytes_saved"] = result["bytes_saved"]
+            self.stats["dedup_objects_removed"] += result["objects_removed"]
+            self.stats["dedup_bytes_saved"] += result["bytes_saved"]
+            if result["objects_removed"]:
+                logger.debug("%s: 중복 리소스 %s개 제거 (%.1f KB 절감)",
+                             output_path.name, result['objects_removed'], result['bytes_saved'] / 1024)
+        
+        if self.image_profile:
+            result = optimize_images(writer, self.image_profile)
+            entry["image_bytes_saved"] = result["bytes_saved"]
+            self.stats["images_downsampled"] += result["images"]
+            self.stats["image_bytes_saved"] += result["bytes_saved"]
+        
+        if profile["recompress"]:
+            result = recompress_streams(writer, profile["compression_level"])
+            entry["recompress_bytes_saved"] = result["bytes_saved"]
+            self.stats["recompressed_streams"] += result["streams"]
+            self.stats["recompress_bytes_saved"] += result["bytes_saved"]
+        
+        if self.dedupe_resources or self.image_profile or profile["recompress"]:
+            self.optimization_log.append(entry)
+    
+    def _save_manifest(self):
+        """출력 파일과 저장소 파일의 대응 관계 기록"""
+        if self.output_store is None or not self._manifest:
+            return
+        try:
+            write_manifest(self.output_dir, self._manifest, self.output_store)
+        except OSError as e:
+            logger.warning("저장소 매니페스트 기록 실패: %s", e)
     
     def save_merge_log(self):
         """병합 로그를 파일로 저장"""
-        log_path = self.output_dir / f"merge_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+        # 같은 작업에서 다시 저장하면 기존 보고서를 갱신
+        first_save = self._report_path is None
+        if first_save:
+            self._report_path = self.output_dir / f"merge_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+        log_path = self._report_path
         
-        logger.info(f"병합 보고서 저장 중: {log_path}")
+        # 보고서를 저장할 때마다(유닛 병합 후, 전체 합본 후) 캐시 적중 통계 이벤트 발행
+        if get_event_bus().enabled:
+            emit(CACHE_STATS, scope=self.metrics_scope, caches=cache_snapshot(self.output_store))
+        
+        logger.info("병합 보고서 저장 중: %s", log_path)
         
         try:
             with open(log_path, 'w', encoding='utf-8') as f:
@@ -400,6 +797,69 @@ class PDFMerger:
                 f.write(f"- 오류: {self.stats['errors']}개\n")
                 f.write("\n")
                 
+                if self.optimization_log:
+                    f.write("[출력 최적화]\n")
+                    f.write(f"- 출력 프로필: {self.output_profile}\n")
+                    if self.dedupe_resources:
+                        f.write(f"- 중복 리소스 제거: {self.stats['dedup_objects_removed']:,}개 객체, "
+                                f"{self.stats['dedup_bytes_saved']/1024:,.1f} KB 절감\n")
+                    if self.image_profile:
+                        f.write(f"- 이미지 다운샘플링({self.image_profile['target_dpi']}dpi, "
+                                f"품질 {self.image_profile['quality']}): "
+                                f"{self.stats['images_downsampled']:,}개, "
+                                f"{self.stats['image_bytes_saved']/1024:,.1f} KB 절감\n")
+                    if OUTPUT_PROFILES[self.output_profile]["recompress"]:
+                        f.write(f"- 비압축 스트림 압축: {self.stats['recompressed_streams']:,}개, "
+                                f"{self.stats['recompress_bytes_saved']/1024:,.1f} KB 절감\n")
+                    for entry in self.optimization_log:
+                        if entry["objects_removed"] or entry["image_bytes_saved"] or entry["recompress_bytes_saved"]:
+                            f.write(f"  - {entry['file']}: 중복 {entry['objects_removed']:,}개 "
+                                    f"{entry['bytes_saved']/1024:,.1f} KB, "
+                                    f"이미지 {entry['image_bytes_saved']/1024:,.1f} KB, "
+                                    f"압축 {entry['recompress_bytes_saved']/1024:,.1f} KB\n")
+                    f.write("\n")
+                
+                if self.stats["store_reused"] or self.stats["resumed_files"]:
+                    f.write("[출력 재사용]\n")
+                    if self.stats["resumed_files"]:
+                        f.write(f"- 이전 실행에서 완료된 파일: {self.stats['resumed_files']}개\n")
+                    if self.stats["store_reused"]:
+                        f.write(f"- 저장소의 같은 병합 계획 결과: {self.stats['store_reused']}개 파일, "
+                                f"{self.stats['store_bytes_reused']/1024:,.1f} KB\n")
+                    f.write("\n")
+                
+                quarantined = get_quarantine().entries()
+                if quarantined:
+                    f.write("[격리된 파일]\n")
+                    for pdf_path, reason in sorted(quarantined.items()):
+                        f.write(f"- {pdf_path}: {reason}\n")
+                    f.write("\n")
+                
+                if self.memory_log:
+                    mb = 1024 * 1024
+                    f.write("[메모리]\n")
+                    f.write(f"- 최대 RSS: {self.stats['peak_rss_bytes'] / mb:,.1f} MB\n")
+                    if self.stats["peak_heap_bytes"]:
+                        f.write(f"- 최대 Python 힙: {self.stats['peak_heap_bytes'] / mb:,.1f} MB\n")
+                    if self.memory.budget:
+                        f.write(f"- 메모리 예산: {self.memory.budget / mb:,.0f} MB "
+                                f"(캐시 정리 {self.stats['memory_relief_count']}회)\n")
+                    largest = max(self.memory_log, key=lambda entry: entry["peak_rss_bytes"] or 0)
+                    f.write(f"- 가장 큰 구간: {largest['label']} ({(largest['peak_rss_bytes'] or 0) / mb:,.1f} MB)\n")
+                    f.write("\n")
+                
+                profiles = profile_results(scope=self.metrics_scope)
+                if profiles:
+                    f.write("[프로파일]\n")
+                    for profile in profiles:
+                        stage_name = profile["stage"] if profile["label"] is None else f"{profile['stage']} ({profile['label']})"
+                        f.write(f"- {stage_name}: {os.path.basename(profile['profile'])}, "
+                                f"추적된 최대 메모리 {profile['traced_peak_bytes']/1024:,.1f} KB\n")
+                        for row in profile["hottest"][:PROFILE_REPORT_ROWS]:
+                            f.write(f"    {row['tottime']:8.3f}초 (누적 {row['cumtime']:.3f}초, "
+                                    f"{row['calls']:,}회)  {row['function']}\n")
+                    f.write("\n")
+                
                 if self.merge_log:
                     f.write("[상세 로그]\n")
                     f.write("-" * 40 + "\n")
@@ -410,9 +870,38 @@ class PDFMerger:
                 
                 f.write("\n" + "="*60 + "\n")
             
-            logger.info(f"병합 보고서 저장 완료")
-            print(f"\n📋 상세 보고서가 저장되었습니다: {log_path.name}")
+            self._save_metrics_report(log_path.with_suffix('.json'))
+            logger.info("병합 보고서 저장 완료")
+            if first_save:
+                print(f"\n📋 상세 보고서가 저장되었습니다: {log_path.name}")
             
         except Exception as e:
-            logger.error(f"병합 보고서 저장 실패: {e}")
-            logger.debug(f"상세 오류: {traceback.format_exc()}")
\ No newline at end of file
+            logger.error("병합 보고서 저장 실패: %s", e)
+            logger.debug("상세 오류: %s", traceback.format_exc())
+    
+    def _save_metrics_report(self, json_path: Path):
+        """단계별 계측 결과를 텍스트 보고서 옆에 JSON으로 저장"""
+        # 설정 단계 계측은 같은 프로세스면 계측 저장소에, 병렬 작업 프로세스면 config에만 있음
+        stages = dict(self.config_metrics)
+        stages.update(self.metrics.snapshot(scope=self.metrics_scope))
+        report = {
+            "book": self.metrics_scope,
+            "output_dir": str(self.output_dir.absolute()),
+            "output_profile": self.output_profile,
+            "stats": dict(self.stats),
+            "stages": stages,
+            "caches": cache_snapshot(self.output_store),
+            "quarantined": get_quarantine().entries(),
+            "profiles": profile_results(scope=self.metrics_scope),
+            "memory": {
+                "budget_bytes": self.memory.budget,
+                "peak_rss_bytes": self.stats["peak_rss_bytes"],
+                "peak_heap_bytes": self.stats["peak_heap_bytes"] or None,
+                "process_peak_rss_bytes": process_peak_rss_bytes(),
+                "windows": self.memory_log,
+            },
+        }
+        try:
+            write_metrics_report(json_path, report)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("계측 보고서 저장 실패: %s", e)
@@ -0,0 +1,207 @@
+"""
+파이프라인 계측 모듈
+단계별 경과 시간, CPU 시간, 읽은/쓴 바이트, 처리 페이지 수와 캐시 적중률을 모아 JSON 보고서로 저장
+"""
+
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+from .events import STAGE_END, STAGE_START, get_event_bus, rate
+from .profiling import profile_stage
+
+logger = logging.getLogger(__name__)
+
+# 누적 카운터 이름
+COUNTERS = ("bytes_read", "bytes_written", "pages")
+
+
+class StageSample:
+    """단계 한 번의 측정값 (with 블록 안에서 add()로 카운터 누적)"""
+
+    def __init__(self, name: str, scope: Optional[str], label: Optional[str]):
+        self.name = name
+        self.scope = scope
+        self.label = label
+        self.wall_s = 0.0
+        self.cpu_s = 0.0
+        self.counters = {key: 0 for key in COUNTERS}
+        self.failed = False
+
+    def add(self, bytes_read: int = 0, bytes_written: int = 0, pages: int = 0):
+        """처리량 누적"""
+        self.counters["bytes_read"] += bytes_read
+        self.counters["bytes_written"] += bytes_written
+        self.counters["pages"] += pages
+
+    def event_fields(self) -> Dict:
+        """stage_end 이벤트 내용 (처리량 포함)"""
+        data = {"stage": self.name, "scope": self.scope, "label": self.label, "failed": self.failed,
+                "wall_s": round(self.wall_s, 6), "cpu_s": round(self.cpu_s, 6)}
+        data.update(self.counters)
+        data["pages_per_s"] = rate(self.counters["pages"], self.wall_s)
+        data["read_bytes_per_s"] = rate(self.counters["bytes_read"], self.wall_s)
+        data["write_bytes_per_s"] = rate(self.counters["bytes_written"], self.wall_s)
+        return data
+
+    def to_dict(self) -> Dict:
+        data = {"wall_s": round(self.wall_s, 6), "cpu_s": round(self.cpu_s, 6)}
+        data.update(self.counters)
+        if self.label is not None:
+            data["label"] = self.label
+        if self.failed:
+            data["failed"] = True
+        return data
+
+
+class MetricsRecorder:
+    """
+    단계별 측정값 저장소 (스레드 안전)
+
+    scope로 책 단위 구분 (None은 책과 무관한 단계, 예: 압축 해제),
+    label이 있는 측정값(예: 유닛별 병합)은 합계와 함께 개별 값도 보관
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples: List[StageSample] = []
+
+    @contextmanager
+    def stage(self, name: str, scope: Optional[str] = None, label: Optional[str] = None) -> Iterator[StageSample]:
+        """
+        with 블록의 경과 시간과 CPU 시간(현재 스레드) 측정
+        (프로파일링하도록 설정된 단계면 cProfile/tracemalloc 결과도 저장,
+        이벤트 구독자가 있으면 stage_start/stage_end 이벤트 발행)
+
+        Args:
+            name: 단계 이름 (예: 'validation', 'unit_merge')
+            scope: 책 제목 등 구분 단위
+            label: 개별 항목 이름 (예: 'Unit01')
+        """
+        sample = StageSample(name, scope, label)
+        events = get_event_bus()
+        if events.enabled:
+            events.emit(STAGE_START, stage=name, scope=scope, label=label)
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            with profile_stage(name, scope, label):
+                yield sample
+        except BaseException:
+            sample.failed = True
+            raise
+        finally:
+            sample.wall_s = time.perf_counter() - wall_start
+            sample.cpu_s = time.thread_time() - cpu_start
+            with self._lock:
+                self._samples.append(sample)
+            if events.enabled:
+                events.emit(STAGE_END, **sample.event_fields())
+
+    def snapshot(self, scope: Optional[str] = None, include_unscoped: bool = False) -> Dict[str, Dict]:
+        """
+        단계별 합계
+
+        Args:
+            scope: 이 범위의 측정값만 (None이면 전체)
+            include_unscoped: scope를 지정했을 때 범위 없는 측정값도 포함
+
+        Returns:
+            단계 이름 -> {count, wall_s, cpu_s, max_wall_s, bytes_read, bytes_written, pages,
+            failed, items(label이 있는 측정값 목록)}
+        """
+        with self._lock:
+            samples = [s for s in self._samples
+                       if scope is None or s.scope == scope or (include_unscoped and s.scope is None)]
+        stages: Dict[str, Dict] = {}
+        for sample in samples:
+            stage = stages.get(sample.name)
+            if stage is None:
+                stage = {"count": 0, "wall_s": 0.0, "cpu_s": 0.0, "max_wall_s": 0.0, "failed": 0}
+                stage.update({key: 0 for key in COUNTERS})
+                stages[sample.name] = stage
+            stage["count"] += 1
+            stage["wall_s"] += sample.wall_s
+            stage["cpu_s"] += sample.cpu_s
+            stage["max_wall_s"] = max(stage["max_wall_s"], sample.wall_s)
+            stage["failed"] += int(sample.failed)
+            for key in COUNTERS:
+                stage[key] += sample.counters[key]
+            if sample.label is not None:
+                stage.setdefault("items", []).append(sample.to_dict())
+        for stage in stages.values():
+            for key in ("wall_s", "cpu_s", "max_wall_s"):
+                stage[key] = round(stage[key], 6)
+        return stages
+
+    def clear(self, scope: Optional[str] = None):
+        """측정값 비우기 (scope를 주면 그 범위의 측정값만)"""
+        with self._lock:
+            if scope is None:
+                self._samples.clear()
+            else:
+                self._samples = [s for s in self._samples if s.scope != scope]
+
+
+_metrics = MetricsRecorder()
+
+
+def get_metrics() -> MetricsRecorder:
+    """프로세스 전체 공유 계측 저장소"""
+    return _metrics
+
+
+def _hit_rate(hits: int, misses: int) -> Optional[float]:
+    total = hits + misses
+    return round(hits / total, 4) if total else None
+
+
+def cache_snapshot(output_store=None) -> Dict[str, Dict]:
+    """
+    캐시별 적중 통계
+
+    Args:
+        output_store: 출력 저장소 (None이면 제외)
+
+    Returns:
+        캐시 이름 -> 통계 dict (hit_rate 포함)
+    """
+    # 순환 import를 피하기 위해 보고서를 만들 때 가져옴
+    from .image_optimizer import image_cache_info
+    from .page_count import page_count_cache_info
+    from .source_cache import get_source_cache
+    from .unit_detection import unit_scan_cache_info
+
+    caches = {
+        "source_readers": get_source_cache().info(),
+        "page_count": page_count_cache_info(),
+        "images": image_cache_info(),
+        "unit_scan": unit_scan_cache_info(),
+    }
+    if output_store is not None:
+        caches["output_store"] = output_store.info()
+    for info in caches.values():
+        info["hit_rate"] = _hit_rate(info.get("hits", 0), info.get("misses", 0))
+    return caches
+
+
+def write_metrics_report(path: Union[str, Path], report: Dict):
+    """
+    계측 보고서를 JSON으로 저장
+
+    Args:
+        path: 저장 경로
+        report: 보고서 내용 (generated_at이 없으면 추가)
+    """
+    from .journal import atomic_write
+
+    report = dict(report)
+    report.setdefault("generated_at", datetime.now().isoformat(timespec='seconds'))
+    with atomic_write(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2, default=str)
+    logger.debug("계측 보고서 저장: %s", path)
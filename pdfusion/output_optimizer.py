@@ -0,0 +1,325 @@
+"""
+출력 최적화 모듈
+병합 결과 PDF에서 내용이 같은 리소스 객체(폰트, 이미지, 폼 XObject 등)를 하나만 남기고,
+출력 프로필에 따라 비압축 스트림 압축과 객체 스트림/xref 스트림 저장을 수행
+"""
+
+import hashlib
+import io
+import logging
+import os
+import re
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+# PyPDF2 버전 호환성 처리 (merger.py와 동일)
+try:
+    from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject, NameObject, StreamObject
+except ImportError:
+    from PyPDF2.generic import ArrayObject, DictionaryObject, IndirectObject, NameObject, StreamObject
+
+# 출력 프로필은 CLI가 pypdf 없이 쓸 수 있도록 output_profiles에 정의 (기존 import 경로 유지)
+from .output_profiles import DEFAULT_OUTPUT_PROFILE, OUTPUT_PROFILES
+
+logger = logging.getLogger(__name__)
+
+# 폰트 → FontDescriptor → FontFile처럼 참조가 이어진 객체는 한 단계씩 합쳐지므로 반복 횟수 상한
+MAX_DEDUP_PASSES = 8
+
+# 객체 스트림 하나에 넣을 객체 수
+OBJECT_STREAM_SIZE = 100
+# 이보다 작은 비압축 스트림은 압축 이득이 거의 없으므로 그대로 둠
+MIN_RECOMPRESS_BYTES = 64
+
+_compress_executor: Optional[ThreadPoolExecutor] = None
+_compress_executor_lock = threading.Lock()
+
+
+def _get_compress_executor() -> ThreadPoolExecutor:
+    """프로세스 전체에서 공유하는 압축 스레드 풀 (zlib은 압축 중 GIL을 놓으므로 스레드로 병렬 처리됨)"""
+    global _compress_executor
+    with _compress_executor_lock:
+        if _compress_executor is None:
+            _compress_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1,
+                                                    thread_name_prefix="pdfusion-compress")
+        return _compress_executor
+
+
+def _collect_resource_ids(writer) -> Set[int]:
+    """페이지의 /Resources에서 도달할 수 있는 모든 간접 객체 번호 수집 (페이지 트리, 주석 등은 제외)"""
+    objects = writer._objects
+    resource_ids = set()
+    stack = []
+    for page in writer.pages:
+        resources = page.get("/Resources")
+        if resources is not None:
+            stack.append(resources)
+
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, IndirectObject):
+            if obj.idnum in resource_ids or not 0 < obj.idnum <= len(objects):
+                continue
+            resource_ids.add(obj.idnum)
+            target = objects[obj.idnum - 1]
+            if target is not None:
+                stack.append(target)
+        elif isinstance(obj, DictionaryObject):
+            stack.extend(obj.values())
+        elif isinstance(obj, ArrayObject):
+            stack.extend(obj)
+    return resource_ids
+
+
+def _serialize(obj) -> bytes:
+    buffer = io.BytesIO()
+    obj.write_to_stream(buffer, None)
+    return buffer.getvalue()
+
+
+def _replace_references(obj, remap: Dict[int, IndirectObject]):
+    """직접 포함된 dict/array를 따라가며 remap에 있는 참조를 대표 객체 참조로 교체"""
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, DictionaryObject):
+            items = list(current.items())
+        elif isinstance(current, ArrayObject):
+            items = list(enumerate(current))
+        else:
+            continue
+        for key, value in items:
+            if isinstance(value, IndirectObject):
+                replacement = remap.get(value.idnum)
+                if replacement is not None:
+                    current[key] = replacement
+            elif isinstance(value, (DictionaryObject, ArrayObject)):
+                stack.append(value)
+
+
+def deduplicate_resources(writer) -> Dict[str, int]:
+    """
+    writer 안의 동일한 객체를 하나로 합침 (writer.write() 직전에 호출)
+
+    pypdf의 PdfWriter.compress_identical_objects를 사용하고 (참조하는 쪽 객체는 참조 대상이 합쳐진 뒤에야
+    같아지므로 더 합쳐지지 않을 때까지 반복, 어디서도 참조하지 않는 객체도 함께 제거),
+    이 메서드가 없는 PyPDF2/구버전 pypdf에서는 리소스만 직접 비교하는 방식으로 대신함.
+    합친 뒤에는 writer에 페이지를 더 추가하지 않아야 함 (pypdf의 복제 캐시가 제거된 객체를 가리킬 수 있음)
+
+    Args:
+        writer: 저장 직전의 PdfWriter
+
+    Returns:
+        {'objects_removed': 제거된 객체 수, 'bytes_saved': 제거된 객체의 직렬화 크기 합(바이트)}
+    """
+    if not hasattr(writer, "compress_identical_objects"):
+        return _deduplicate_resources_fallback(writer)
+
+    objects = writer._objects
+    objects_removed = 0
+    bytes_saved = 0
+    for _ in range(MAX_DEDUP_PASSES):
+        before = [(idx, obj) for idx, obj in enumerate(objects) if obj is not None]
+        writer.compress_identical_objects()
+        removed = [obj for idx, obj in before if objects[idx] is None]
+        if not removed:
+            break
+        objects_removed += len(removed)
+        bytes_saved += sum(len(_serialize(obj)) for obj in removed)
+
+    if objects_removed:
+        logger.debug("중복/미참조 객체 %s개 제거 (%d bytes)", objects_removed, bytes_saved)
+    return {"objects_removed": objects_removed, "bytes_saved": bytes_saved}
+
+
+def _deduplicate_resources_fallback(writer) -> Dict[str, int]:
+    """
+    compress_identical_objects가 없을 때 쓰는 리소스 중복 제거
+    (페이지 /Resources에서 도달하는 객체만 대상이며, 직렬화한 바이트의 SHA-256이 같으면 동일 객체로 봄)
+    """
+    objects = writer._objects
+    resource_ids = _collect_resource_ids(writer)
+    objects_removed = 0
+    bytes_saved = 0
+
+    for _ in range(MAX_DEDUP_PASSES):
+        canonical = {}
+        remap = {}
+        for idnum in sorted(resource_ids):
+            obj = objects[idnum - 1]
+            if obj is None:
+                continue
+            data = _serialize(obj)
+            digest = hashlib.sha256(data).digest()
+            first = canonical.get(digest)
+            if first is None:
+                canonical[digest] = idnum
+                continue
+            remap[idnum] = IndirectObject(first, 0, writer)
+            objects[idnum - 1] = None
+            objects_removed += 1
+            bytes_saved += len(data)
+
+        if not remap:
+            break
+        for obj in objects:
+            if obj is not None:
+                _replace_references(obj, remap)
+        resource_ids.difference_update(remap)
+
+    if objects_removed:
+        logger.debug("중복 리소스 %s개 제거 (%d bytes)", objects_removed, bytes_saved)
+    return {"objects_removed": objects_removed, "bytes_saved": bytes_saved}
+
+
+def recompress_streams(writer, compression_level: int = 6) -> Dict[str, int]:
+    """
+    필터가 없는 스트림을 Flate로 압축 (writer.write() 직전에 호출)
+
+    XMP 메타데이터 스트림은 다른 도구가 읽을 수 있도록 비압축으로 둠.
+    스트림들은 공유 스레드 풀에서 병렬로 압축되고, 작아지는 경우에만 교체됨
+
+    Args:
+        writer: 저장 직전의 PdfWriter
+        compression_level: zlib 압축 레벨 (1~9)
+
+    Returns:
+        {'streams': 압축한 스트림 수, 'bytes_saved': 줄어든 바이트 수}
+    """
+    targets = []
+    for obj in writer._objects:
+        if not isinstance(obj, StreamObject) or "/Filter" in obj or obj.get("/Type") == "/Metadata":
+            continue
+        if len(obj._data) >= MIN_RECOMPRESS_BYTES:
+            targets.append(obj)
+
+    streams = 0
+    bytes_saved = 0
+    if not targets:
+        return {"streams": streams, "bytes_saved": bytes_saved}
+
+    compressed_data = _get_compress_executor().map(
+        lambda data: zlib.compress(data, compression_level), [obj._data for obj in targets])
+    for obj, compressed in zip(targets, compressed_data):
+        if len(compressed) < len(obj._data):
+            bytes_saved += len(obj._data) - len(compressed)
+            obj._data = compressed
+            obj[NameObject("/Filter")] = NameObject("/FlateDecode")
+            streams += 1
+
+    logger.debug("비압축 스트림 %s개 압축 (%d bytes 절감)", streams, bytes_saved)
+    return {"streams": streams, "bytes_saved": bytes_saved}
+
+
+def _pdf_header(writer) -> bytes:
+    """객체 스트림은 PDF 1.5부터 지원되므로 헤더 버전을 1.5 이상으로 맞춤"""
+    header = getattr(writer, "pdf_header", "%PDF-1.3")
+    if isinstance(header, bytes):
+        header = header.decode("latin-1")
+    found = re.match(r"%PDF-(\d+)\.(\d+)", header)
+    if found and (int(found.group(1)), int(found.group(2))) >= (1, 5):
+        return header.encode("latin-1")
+    return b"%PDF-1.5"
+
+
+def _encode_xref_rows(rows: List[Tuple[int, int, int]], widths: Tuple[int, int, int]) -> bytes:
+    """xref 스트림 행을 PNG Up 예측자(/Predictor 12)로 인코딩"""
+    row_size = sum(widths)
+    previous = bytes(row_size)
+    encoded = bytearray()
+    for row in rows:
+        current = b"".join(value.to_bytes(width, "big") for value, width in zip(row, widths))
+        encoded.append(2)
+        encoded.extend((c - p) & 0xFF for c, p in zip(current, previous))
+        previous = current
+    return bytes(encoded)
+
+
+def write_with_object_streams(writer, stream, compression_level: int = 6):
+    """
+    스트림이 아닌 객체를 객체 스트림에 묶고 xref 스트림으로 저장
+
+    암호화된 문서나 필요한 내부 속성이 없는 구버전 PyPDF2 writer는 기본 저장 방식을 사용
+
+    Args:
+        writer: 저장 직전의 PdfWriter
+        stream: 바이너리 출력 스트림
+        compression_level: 객체 스트림/xref 스트림 zlib 압축 레벨
+    """
+    if getattr(writer, "_encryption", None) or not hasattr(writer, "root_object"):
+        writer.write(stream)
+        return
+    if hasattr(writer, "_resolve_links"):
+        writer._resolve_links()
+
+    objects = writer._objects
+    base = stream.tell()
+    # 객체 번호 -> (타입, 필드2, 필드3): 1=(오프셋, 세대), 2=(객체 스트림 번호, 스트림 내 순번)
+    entries: Dict[int, Tuple[int, int, int]] = {}
+
+    stream.write(_pdf_header(writer) + b"\n%\xE2\xE3\xCF\xD3\n")
+
+    # 스트림 객체는 객체 스트림에 넣을 수 없으므로 일반 객체로 기록
+    packable = []
+    for idnum, obj in enumerate(objects, start=1):
+        if obj is None:
+            continue
+        if isinstance(obj, StreamObject):
+            entries[idnum] = (1, stream.tell() - base, 0)
+            stream.write(f"{idnum} 0 obj\n".encode())
+            obj.write_to_stream(stream, None)
+            stream.write(b"\nendobj\n")
+        else:
+            packable.append(idnum)
+
+    next_id = len(objects) + 1
+    for chunk_start in range(0, len(packable), OBJECT_STREAM_SIZE):
+        chunk = packable[chunk_start:chunk_start + OBJECT_STREAM_SIZE]
+        objstm_id = next_id
+        next_id += 1
+        offsets = []
+        body = bytearray()
+        for index, idnum in enumerate(chunk):
+            offsets.append(f"{idnum} {len(body)}")
+            body += _serialize(objects[idnum - 1]) + b"\n"
+            entries[idnum] = (2, objstm_id, index)
+        header = " ".join(offsets).encode() + b"\n"
+        data = zlib.compress(bytes(header + body), compression_level)
+        entries[objstm_id] = (1, stream.tell() - base, 0)
+        stream.write(f"{objstm_id} 0 obj\n<< /Type /ObjStm /N {len(chunk)} /First {len(header)} "
+                     f"/Filter /FlateDecode /Length {len(data)} >>\nstream\n".encode())
+        stream.write(data)
+        stream.write(b"\nendstream\nendobj\n")
+
+    # xref 스트림 (자기 자신도 포함)
+    xref_id = next_id
+    size = xref_id + 1
+    xref_offset = stream.tell() - base
+    entries[xref_id] = (1, xref_offset, 0)
+
+    free_ids = [idnum for idnum in range(1, size) if idnum not in entries]
+    rows = [(0, free_ids[0] if free_ids else 0, 65535)]
+    next_free = dict(zip(free_ids, free_ids[1:] + [0]))
+    for idnum in range(1, size):
+        rows.append(entries[idnum] if idnum in entries else (0, next_free[idnum], 1))
+
+    widths = (1,
+              max(1, (max(row[1] for row in rows).bit_length() + 7) // 8),
+              max(1, (max(row[2] for row in rows).bit_length() + 7) // 8))
+    data = zlib.compress(_encode_xref_rows(rows, widths), compression_level)
+
+    trailer = (f"<< /Type /XRef /Size {size} /W [{widths[0]} {widths[1]} {widths[2]}] "
+               f"/Root {writer.root_object.indirect_reference.idnum} 0 R ").encode()
+    info = getattr(writer, "_info", None)
+    if info is not None and getattr(info, "indirect_reference", None) is not None:
+        trailer += f"/Info {info.indirect_reference.idnum} 0 R ".encode()
+    if getattr(writer, "_ID", None) is not None:
+        trailer += b"/ID " + _serialize(writer._ID) + b" "
+    trailer += (f"/Filter /FlateDecode /DecodeParms << /Columns {sum(widths)} /Predictor 12 >> "
+                f"/Length {len(data)} >>").encode()
+
+    stream.write(f"{xref_id} 0 obj\n".encode() + trailer + b"\nstream\n")
+    stream.write(data)
+    stream.write(f"\nendstream\nendobj\nstartxref\n{xref_offset}\n%%EOF\n".encode())
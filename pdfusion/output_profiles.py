@@ -0,0 +1,23 @@
+"""
+출력 프로필 정의
+저장 방식과 이미지 다운샘플링 프로필 (pypdf/Pillow를 가져오지 않으므로 CLI 인자 처리에서 바로 사용)
+"""
+
+# 출력 프로필별 저장 방식
+OUTPUT_PROFILES = {
+    # 기본 PdfWriter 저장 (가장 빠름)
+    "fast": {"recompress": False, "compression_level": None, "object_streams": False},
+    # 비압축 스트림 Flate 압축 + 객체 스트림 + xref 스트림 (가장 작음, PDF 1.5 이상 뷰어 필요)
+    "compact": {"recompress": True, "compression_level": 6, "object_streams": True},
+    # 비압축 스트림만 최대 압축하고 고전 xref 테이블 유지 (PDF/A-1처럼 객체 스트림을 허용하지 않는 환경용)
+    "archival": {"recompress": True, "compression_level": 9, "object_streams": False},
+}
+DEFAULT_OUTPUT_PROFILE = "fast"
+
+# 출력별 이미지 프로필 (target_dpi: 목표 해상도, quality: JPEG 품질)
+IMAGE_PROFILES = {
+    # 인쇄용 워크시트
+    "print": {"target_dpi": 300, "quality": 85},
+    # 태블릿 화면용
+    "tablet": {"target_dpi": 150, "quality": 75},
+}
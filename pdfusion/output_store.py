@@ -0,0 +1,288 @@
+"""
+출력 저장소 모듈
+병합 계획(원본 내용 해시 + 페이지 구간 + 출력 옵션)의 해시를 키로 결과 PDF를 한 번만 저장하고,
+책별 출력 경로는 저장소 파일에 하드 링크로 연결 (링크를 만들 수 없으면 복사)
+저장소 크기가 상한을 넘으면 가장 오래 쓰이지 않은 결과부터 지움
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from .journal import atomic_write, temp_path_for
+
+logger = logging.getLogger(__name__)
+
+# 저장 형식이나 병합/최적화 동작이 바뀌면 올려서 이전 결과를 재사용하지 않도록 함
+STORE_FORMAT_VERSION = 1
+
+# 출력 디렉토리 아래 저장소 디렉토리 이름
+STORE_DIR_NAME = ".store"
+
+# 저장소 파일 옆에 두는 사용 표시 파일 접미사 (수정 시각 = 마지막 사용 시각)
+USED_MARKER_SUFFIX = ".used"
+
+# 책별 출력 디렉토리에 기록하는 파일명 -> 저장소 키 목록
+MANIFEST_NAME = ".store_manifest.json"
+
+# 저장소 크기 기본 상한 (MB, 0이면 제한 없음)
+DEFAULT_MAX_STORE_MB = 2048
+
+_max_store_mb = DEFAULT_MAX_STORE_MB
+
+_pdf_library_version = None
+
+
+def pdf_library_version() -> str:
+    """PDF 라이브러리 버전 (저장소 키에 포함, pypdf는 처음 필요할 때 가져옴)"""
+    global _pdf_library_version
+    if _pdf_library_version is None:
+        try:
+            from pypdf import __version__ as version
+        except ImportError:
+            try:
+                from PyPDF2 import __version__ as version
+            except ImportError:
+                version = "unknown"
+        _pdf_library_version = version
+    return _pdf_library_version
+
+
+class OutputStore:
+    """내용 주소 기반 출력 PDF 저장소"""
+
+    def __init__(self, root: Union[str, Path], max_mb: Optional[int] = None):
+        """
+        Args:
+            root: 저장소 디렉토리 (없으면 생성)
+            max_mb: 저장소 크기 상한 (MB, 0이면 제한 없음, None이면 configure_output_store 설정)
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        if max_mb is None:
+            max_mb = _max_store_mb
+        self.max_bytes = max_mb * 1024 * 1024
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stored": 0, "pruned": 0}
+        # 마지막으로 확인한 저장소 크기 (None이면 아직 훑지 않음) - 등록할 때마다 전체를 훑지 않도록 더해 감
+        self._size_estimate = None
+
+    @staticmethod
+    def plan_key(plan: Dict) -> str:
+        """
+        병합 계획의 저장소 키
+
+        Args:
+            plan: JSON으로 직렬화할 수 있는 병합 계획
+
+        Returns:
+            SHA-256 16진 문자열
+        """
+        payload = {
+            "format": STORE_FORMAT_VERSION,
+            "library": pdf_library_version(),
+            "plan": plan,
+        }
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        """키에 해당하는 저장소 파일 경로"""
+        return self.root / key[:2] / f"{key}.pdf"
+
+    def fetch(self, key: str, dest: Union[str, Path]) -> bool:
+        """
+        저장된 결과를 dest에 연결
+
+        Args:
+            key: 저장소 키
+            dest: 출력 경로 (기존 파일은 교체)
+
+        Returns:
+            저장된 결과가 있어 연결했으면 True
+        """
+        stored = self.path_for(key)
+        if not stored.is_file():
+            with self._lock:
+                self._stats["misses"] += 1
+            return False
+        dest = Path(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        self._link(stored, dest)
+        self._touch(stored)
+        with self._lock:
+            self._stats["hits"] += 1
+        logger.debug("저장소 적중: %s -> %s", dest.name, stored)
+        return True
+
+    def put(self, key: str, produced: Union[str, Path]):
+        """
+        새로 만든 결과 파일을 저장소에 등록 (이미 있으면 그대로 둠)
+
+        Args:
+            key: 저장소 키
+            produced: 병합 결과 파일 경로
+        """
+        stored = self.path_for(key)
+        if stored.is_file():
+            self._touch(stored)
+            return
+        stored.parent.mkdir(parents=True, exist_ok=True)
+        self._link(Path(produced), stored)
+        self._touch(stored)
+        with self._lock:
+            self._stats["stored"] += 1
+            over_limit = False
+            if self.max_bytes and self._size_estimate is not None:
+                self._size_estimate += stored.stat().st_size
+                over_limit = self._size_estimate > self.max_bytes
+        logger.debug("저장소 등록: %s", stored)
+        if self.max_bytes and (self._size_estimate is None or over_limit):
+            self.prune(keep=key)
+
+    def prune(self, max_bytes: Optional[int] = None, keep: Optional[str] = None) -> Tuple[int, int]:
+        """
+        저장소 크기가 상한 이하가 되도록 가장 오래 쓰이지 않은 결과부터 삭제
+
+        책별 출력 파일은 하드 링크(또는 복사본)이므로 저장소 파일을 지워도 남아 있음
+
+        Args:
+            max_bytes: 크기 상한 (바이트, None이면 저장소 상한, 0이면 모두 삭제)
+            keep: 지우지 않을 키 (방금 등록한 결과)
+
+        Returns:
+            (삭제한 파일 수, 삭제 후 저장소 크기)
+        """
+        if max_bytes is None:
+            max_bytes = self.max_bytes
+        entries = self._entries()
+        total = sum(size for _, _, size in entries)
+        removed = 0
+        for _, path, size in entries:
+            if total <= max_bytes:
+                break
+            if keep is not None and path.stem == keep:
+                continue
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                # 다른 프로세스가 먼저 지움
+                pass
+            except OSError as e:
+                logger.warning("저장소 파일 삭제 실패: %s (%s)", path, e)
+                continue
+            total -= size
+            removed += 1
+            try:
+                self._marker_for(path).unlink()
+            except OSError:
+                pass
+            try:
+                path.parent.rmdir()
+            except OSError:
+                # 같은 접두어의 다른 결과가 남아 있음
+                pass
+        with self._lock:
+            self._size_estimate = total
+            self._stats["pruned"] += removed
+        if removed:
+            logger.info("저장소 정리: 오래된 결과 %d개 삭제 (남은 크기 %.1fMB)", removed, total / (1024 * 1024))
+        return removed, total
+
+    def _entries(self) -> List[Tuple[float, Path, int]]:
+        """저장소 파일 목록 [(마지막 사용 시각, 경로, 크기)], 오래된 순"""
+        entries = []
+        for bucket in self.root.iterdir():
+            if not bucket.is_dir():
+                continue
+            for path in bucket.glob("*.pdf"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                try:
+                    last_used = self._marker_for(path).stat().st_mtime
+                except OSError:
+                    # 사용 표시가 없으면 (이전 버전 저장소 등) 등록 시각 기준
+                    last_used = stat.st_mtime
+                entries.append((last_used, path, stat.st_size))
+        entries.sort(key=lambda entry: entry[0])
+        return entries
+
+    @staticmethod
+    def _marker_for(stored: Path) -> Path:
+        """저장소 파일의 사용 표시 파일 경로"""
+        return stored.with_name(stored.name + USED_MARKER_SUFFIX)
+
+    @classmethod
+    def _touch(cls, stored: Path):
+        """
+        저장소 파일의 마지막 사용 시각 갱신
+        (저장소 파일은 책별 출력과 같은 inode이므로 직접 건드리면 저널에 기록한 출력의 수정 시각이 바뀜 -
+        별도의 사용 표시 파일만 갱신)
+        """
+        marker = cls._marker_for(stored)
+        try:
+            marker.touch()
+        except OSError:
+            pass
+
+    @staticmethod
+    def _link(src: Path, dest: Path):
+        """dest를 src의 하드 링크로 교체 (같은 파일 시스템이 아니면 복사)"""
+        # 임시 이름으로 만든 뒤 교체하므로 dest에 반쯤 만들어진 파일이 보이지 않음
+        tmp_path = temp_path_for(dest)
+        try:
+            try:
+                os.link(src, tmp_path)
+            except OSError:
+                shutil.copy2(src, tmp_path)
+            os.replace(tmp_path, dest)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    def info(self) -> Dict[str, int]:
+        """저장소 통계 (hits, misses, stored, pruned)"""
+        with self._lock:
+            return dict(self._stats)
+
+
+def configure_output_store(max_mb: int = DEFAULT_MAX_STORE_MB):
+    """
+    출력 저장소 크기 상한 설정 (이후 만드는 OutputStore에 적용)
+
+    Args:
+        max_mb: 저장소 크기 상한 (MB, 0이면 제한 없음)
+    """
+    global _max_store_mb
+    if max_mb < 0:
+        raise ValueError(f"저장소 크기 상한은 0 이상이어야 합니다: {max_mb}")
+    _max_store_mb = max_mb
+
+
+def output_store_settings() -> Dict:
+    """현재 출력 저장소 설정 (configure_output_store 인자, 작업 프로세스에 전달)"""
+    return {"max_mb": _max_store_mb}
+
+
+def write_manifest(output_dir: Union[str, Path], entries: Dict[str, str], store: OutputStore):
+    """
+    책별 출력 디렉토리에 파일명 -> 저장소 키/경로 목록 기록
+
+    Args:
+        output_dir: 책별 출력 디렉토리
+        entries: 파일명 -> 저장소 키
+        store: 출력 저장소
+    """
+    manifest = {
+        name: {"key": key, "path": os.path.relpath(store.path_for(key), str(output_dir))}
+        for name, key in sorted(entries.items())
+    }
+    with atomic_write(Path(output_dir) / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,403 @@
+"""
+빠른 페이지 수 조회 모듈
+PdfReader 전체 파싱 없이 trailer, xref, 루트 /Pages의 /Count만 읽어 페이지 수 반환
+(손상된 파일은 전체 파싱으로 대체, 결과는 (경로, 크기, 수정 시각) 기준으로 프로세스 전체에 캐시)
+"""
+
+import os
+import re
+import zlib
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+from .sandbox import run_guarded
+from .sources import open_reader
+
+logger = logging.getLogger(__name__)
+
+# 파일 끝에서 startxref를 찾을 범위
+TAIL_SIZE = 2048
+# 객체 하나를 읽을 때의 최대 크기
+MAX_OBJECT_SIZE = 1024 * 1024
+
+_STARTXREF_RE = re.compile(rb'startxref\s+(\d+)')
+_OBJ_HEADER_RE = re.compile(rb'\s*(\d+)\s+(\d+)\s+obj')
+# 객체 본문의 끝 (스트림 객체는 딕셔너리 뒤의 stream 키워드, 'endstream'은 앞에 글자가 붙어 있어 제외됨)
+_OBJ_END_RE = re.compile(rb'\bendobj\b|\bstream\b')
+_REF_RE = r'%s\s+(\d+)\s+(\d+)\s+R'
+_INT_RE = r'%s\s+(\d+)\b(?!\s+\d+\s+R)'
+
+_cache: Dict[Tuple[str, int, int], int] = {}
+_cache_lock = threading.Lock()
+_cache_stats = {"hits": 0, "misses": 0, "fast": 0, "fallback": 0}
+
+
+class _FastPathUnavailable(Exception):
+    """빠른 경로로 읽을 수 없는 구조 (전체 파싱으로 대체)"""
+
+
+def _search_ref(key: bytes, data: bytes) -> Optional[int]:
+    match = re.search((_REF_RE % re.escape(key.decode())).encode(), data)
+    return int(match.group(1)) if match else None
+
+
+def _search_int(key: bytes, data: bytes) -> Optional[int]:
+    match = re.search((_INT_RE % re.escape(key.decode())).encode(), data)
+    return int(match.group(1)) if match else None
+
+
+def _png_unpredict(data: bytes, columns: int) -> bytes:
+    """PNG 예측자(/Predictor 10~15) 복원 (xref 스트림용, 1바이트 단위)"""
+    row_size = columns + 1
+    if len(data) % row_size:
+        raise _FastPathUnavailable("PNG 예측자 행 크기 불일치")
+    output = bytearray()
+    prev = bytearray(columns)
+    for start in range(0, len(data), row_size):
+        filter_type = data[start]
+        row = bytearray(data[start + 1:start + row_size])
+        if filter_type == 1:
+            for i in range(1, columns):
+                row[i] = (row[i] + row[i - 1]) & 0xFF
+        elif filter_type == 2:
+            for i in range(columns):
+                row[i] = (row[i] + prev[i]) & 0xFF
+        elif filter_type == 3:
+            for i in range(columns):
+                left = row[i - 1] if i else 0
+                row[i] = (row[i] + ((left + prev[i]) >> 1)) & 0xFF
+        elif filter_type == 4:
+            for i in range(columns):
+                a = row[i - 1] if i else 0
+                b = prev[i]
+                c = prev[i - 1] if i else 0
+                p = a + b - c
+                pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+                predictor = a if pa <= pb and pa <= pc else (b if pb <= pc else c)
+                row[i] = (row[i] + predictor) & 0xFF
+        elif filter_type != 0:
+            raise _FastPathUnavailable(f"알 수 없는 PNG 필터: {filter_type}")
+        output.extend(row)
+        prev = row
+    return bytes(output)
+
+
+class _XrefIndex:
+    """xref 테이블/스트림을 따라가며 객체 위치를 찾는 최소 파서"""
+
+    def __init__(self, f, file_size: int):
+        self.f = f
+        self.file_size = file_size
+        # 객체 번호 -> ('n', 오프셋) 또는 ('c', 객체 스트림 번호, 인덱스)
+        self.entries: Dict[int, Tuple] = {}
+        self.root: Optional[int] = None
+        self.encrypted = False
+
+    def _read_at(self, offset: int, size: int) -> bytes:
+        if offset < 0 or offset >= self.file_size:
+            raise _FastPathUnavailable(f"잘못된 오프셋: {offset}")
+        self.f.seek(offset)
+        return self.f.read(size)
+
+    def load(self, startxref: int):
+        visited = set()
+        offset = startxref
+        while offset is not None:
+            if offset in visited:
+                raise _FastPathUnavailable("xref /Prev 순환")
+            visited.add(offset)
+            head = self._read_at(offset, 16)
+            if head.lstrip().startswith(b'xref'):
+                offset = self._load_table(offset)
+            else:
+                offset = self._load_stream(offset)
+
+    def _load_table(self, offset: int) -> Optional[int]:
+        """고전 xref 테이블 + trailer 파싱, /Prev 오프셋 반환"""
+        self.f.seek(offset)
+        line = self.f.readline()
+        if line.strip() != b'xref':
+            raise _FastPathUnavailable("xref 키워드 없음")
+        while True:
+            line = self.f.readline()
+            if not line:
+                raise _FastPathUnavailable("trailer 없음")
+            stripped = line.strip()
+            if not stripped:
+                continue
+            if stripped.startswith(b'trailer'):
+                break
+            parts = stripped.split()
+            if len(parts) != 2:
+                raise _FastPathUnavailable("xref 섹션 헤더 오류")
+            first, count = int(parts[0]), int(parts[1])
+            raw = self.f.read(20 * count)
+            rows = raw.split()
+            if len(rows) != 3 * count:
+                # 행 끝이 한 바이트인 비표준 파일
+                raise _FastPathUnavailable("xref 행 형식 오류")
+            for i in range(count):
+                entry_offset, _gen, kind = rows[3 * i:3 * i + 3]
+                if kind == b'n':
+                    self.entries.setdefault(first + i, ('n', int(entry_offset)))
+                else:
+                    self.entries.setdefault(first + i, ('f',))
+
+        trailer = stripped[len(b'trailer'):] + self.f.read(4096)
+        end = trailer.find(b'startxref')
+        if end != -1:
+            trailer = trailer[:end]
+        self._apply_trailer(trailer)
+
+        xref_stm = _search_int(b'/XRefStm', trailer)
+        if xref_stm is not None:
+            # 하이브리드 파일: 압축 객체 위치는 xref 스트림에 있음
+            self._load_stream(xref_stm)
+        return _search_int(b'/Prev', trailer)
+
+    def _apply_trailer(self, trailer: bytes):
+        if b'/Encrypt' in trailer:
+            self.encrypted = True
+        if self.root is None:
+            self.root = _search_ref(b'/Root', trailer)
+
+    def _read_stream_object(self, offset: int) -> Tuple[bytes, bytes]:
+        """오프셋 위치의 스트림 객체에서 (딕셔너리, 디코딩된 데이터) 반환"""
+        data = self._read_at(offset, 4096)
+        if not _OBJ_HEADER_RE.match(data):
+            raise _FastPathUnavailable("객체 헤더 없음")
+        stream_pos = data.find(b'stream')
+        if stream_pos == -1:
+            raise _FastPathUnavailable("stream 키워드 없음")
+        dictionary = data[:stream_pos]
+        length = _search_int(b'/Length', dictionary)
+        if length is None:
+            raise _FastPathUnavailable("/Length가 간접 참조")
+        data_start = offset + stream_pos + len(b'stream')
+        self.f.seek(data_start)
+        eol = self.f.read(2)
+        if eol.startswith(b'\r\n'):
+            data_start += 2
+        elif eol[:1] in (b'\n', b'\r'):
+            data_start += 1
+        raw = self._read_at(data_start, length)
+
+        filter_match = re.search(rb'/Filter\s*(\[[^\]]*\]|/\w+)', dictionary)
+        filters = re.findall(rb'/(\w+)', filter_match.group(1)) if filter_match else []
+        if filters and filters != [b'FlateDecode']:
+            raise _FastPathUnavailable(f"지원하지 않는 필터: {filters}")
+        decoded = zlib.decompress(raw) if filters else raw
+
+        predictor = _search_int(b'/Predictor', dictionary)
+        if predictor is not None and predictor >= 10:
+            columns = _search_int(b'/Columns', dictionary) or 1
+            decoded = _png_unpredict(decoded, columns)
+        elif predictor not in (None, 1):
+            raise _FastPathUnavailable(f"지원하지 않는 예측자: {predictor}")
+        return dictionary, decoded
+
+    def _load_stream(self, offset: int) -> Optional[int]:
+        """xref 스트림 파싱, /Prev 오프셋 반환"""
+        dictionary, data = self._read_stream_object(offset)
+        if b'/XRef' not in dictionary:
+            raise _FastPathUnavailable("xref 스트림이 아님")
+        self._apply_trailer(dictionary)
+
+        w_match = re.search(rb'/W\s*\[\s*(\d+)\s+(\d+)\s+(\d+)\s*\]', dictionary)
+        size = _search_int(b'/Size', dictionary)
+        if not w_match or size is None:
+            raise _FastPathUnavailable("/W 또는 /Size 없음")
+        widths = [int(w) for w in w_match.groups()]
+        index_match = re.search(rb'/Index\s*\[([\d\s]+)\]', dictionary)
+        if index_match:
+            numbers = [int(n) for n in index_match.group(1).split()]
+            sections = list(zip(numbers[0::2], numbers[1::2]))
+        else:
+            sections = [(0, size)]
+
+        row_size = sum(widths)
+        pos = 0
+        for first, count in sections:
+            for i in range(count):
+                row = data[pos:pos + row_size]
+                pos += row_size
+                if len(row) < row_size:
+                    raise _FastPathUnavailable("xref 스트림 데이터 부족")
+                fields = []
+                cursor = 0
+                for width in widths:
+                    fields.append(int.from_bytes(row[cursor:cursor + width], 'big') if width else None)
+                    cursor += width
+                kind = 1 if fields[0] is None else fields[0]
+                if kind == 1:
+                    self.entries.setdefault(first + i, ('n', fields[1]))
+                elif kind == 2:
+                    self.entries.setdefault(first + i, ('c', fields[1], fields[2]))
+                else:
+                    self.entries.setdefault(first + i, ('f',))
+        return _search_int(b'/Prev', dictionary)
+
+    def object_body(self, objnum: int) -> bytes:
+        """
+        객체 본문(딕셔너리 부분) 반환
+        (endobj 또는 stream 키워드에서 자름 - 뒤따르는 객체의 키를 이 객체의 값으로 읽지 않도록)
+        """
+        entry = self.entries.get(objnum)
+        if entry is None or entry[0] == 'f':
+            raise _FastPathUnavailable(f"객체 {objnum} 위치 없음")
+        if entry[0] == 'n':
+            data = self._read_at(entry[1], 4096)
+            header = _OBJ_HEADER_RE.match(data)
+            if not header or int(header.group(1)) != objnum:
+                raise _FastPathUnavailable(f"객체 {objnum} 헤더 불일치")
+            size = 4096
+            end = _OBJ_END_RE.search(data, header.end())
+            while end is None and size < MAX_OBJECT_SIZE and len(data) == size:
+                size *= 4
+                data = self._read_at(entry[1], size)
+                end = _OBJ_END_RE.search(data, header.end())
+            if end is None:
+                raise _FastPathUnavailable(f"객체 {objnum}의 끝(endobj) 없음")
+            return data[header.end():end.start()]
+
+        # 객체 스트림 안의 객체
+        stream_entry = self.entries.get(entry[1])
+        if stream_entry is None or stream_entry[0] != 'n':
+            raise _FastPathUnavailable("객체 스트림 위치 없음")
+        dictionary, data = self._read_stream_object(stream_entry[1])
+        first = _search_int(b'/First', dictionary)
+        count = _search_int(b'/N', dictionary)
+        if first is None or count is None:
+            raise _FastPathUnavailable("객체 스트림 헤더 오류")
+        pairs = [int(n) for n in data[:first].split()]
+        for i in range(count):
+            if pairs[2 * i] == objnum:
+                start = first + pairs[2 * i + 1]
+                end = first + pairs[2 * i + 3] if i + 1 < count else len(data)
+                return data[start:end]
+        raise _FastPathUnavailable(f"객체 스트림에 객체 {objnum} 없음")
+
+
+def read_page_count_fast(pdf_path: Union[str, Path]) -> int:
+    """
+    trailer → xref → /Root → /Pages → /Count 순서로만 읽어 페이지 수 반환
+
+    Args:
+        pdf_path: PDF 파일 경로
+
+    Returns:
+        루트 /Pages 노드의 /Count 값
+
+    Raises:
+        _FastPathUnavailable: 빠른 경로로 읽을 수 없는 구조 (암호화, 손상 등)
+    """
+    with open(pdf_path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        file_size = f.tell()
+        f.seek(max(0, file_size - TAIL_SIZE))
+        tail = f.read()
+        matches = _STARTXREF_RE.findall(tail)
+        if not matches:
+            raise _FastPathUnavailable("startxref 없음")
+
+        index = _XrefIndex(f, file_size)
+        index.load(int(matches[-1]))
+        if index.encrypted:
+            raise _FastPathUnavailable("암호화된 파일")
+        if index.root is None:
+            raise _FastPathUnavailable("/Root 없음")
+
+        pages_ref = _search_ref(b'/Pages', index.object_body(index.root))
+        if pages_ref is None:
+            raise _FastPathUnavailable("/Pages 없음")
+        count = _search_int(b'/Count', index.object_body(pages_ref))
+        if count is None or count <= 0:
+            raise _FastPathUnavailable("/Count 없음")
+        return count
+
+
+def _count_pages_full(pdf_path: Union[str, Path]) -> int:
+    """PdfReader 전체 파싱으로 페이지 수 계산"""
+    return len(open_reader(pdf_path).pages)
+
+
+def get_page_count(pdf_path: Union[str, Path]) -> int:
+    """
+    PDF 페이지 수 반환 (빠른 경로 → 실패 시 전체 파싱, 결과 캐시)
+
+    Args:
+        pdf_path: PDF 파일 경로
+
+    Returns:
+        페이지 수
+
+    Raises:
+        OSError: 파일을 찾을 수 없음
+        Exception: 전체 파싱으로도 읽을 수 없는 PDF
+    """
+    key = _cache_key(pdf_path)
+    path = key[0]
+    with _cache_lock:
+        if key in _cache:
+            _cache_stats["hits"] += 1
+            return _cache[key]
+        _cache_stats["misses"] += 1
+
+    try:
+        count = read_page_count_fast(path)
+        method = "fast"
+    except Exception as e:
+        logger.debug("빠른 페이지 수 조회 실패, 전체 파싱으로 대체 (%s): %s", path, e)
+        count = _count_pages_full(path)
+        method = "fallback"
+
+    with _cache_lock:
+        _cache[key] = count
+        _cache_stats[method] += 1
+    return count
+
+
+def _cache_key(pdf_path: Union[str, Path]) -> Tuple[str, int, int]:
+    path = os.path.abspath(str(pdf_path))
+    stat = os.stat(path)
+    return (path, stat.st_size, stat.st_mtime_ns)
+
+
+def get_page_count_guarded(pdf_path: Union[str, Path]) -> int:
+    """
+    격리 실행 설정을 따르는 get_page_count
+    (캐시에 있으면 자식 프로세스를 띄우지 않고, 자식 프로세스에서 센 결과도 현재 프로세스 캐시에 기록)
+
+    Args:
+        pdf_path: PDF 파일 경로
+
+    Returns:
+        페이지 수
+    """
+    key = _cache_key(pdf_path)
+    with _cache_lock:
+        if key in _cache:
+            _cache_stats["hits"] += 1
+            return _cache[key]
+    count = run_guarded(get_page_count, pdf_path)
+    with _cache_lock:
+        _cache[key] = count
+    return count
+
+
+def page_count_cache_info() -> Dict[str, int]:
+    """캐시 통계 (hits, misses, fast, fallback, size)"""
+    with _cache_lock:
+        info = dict(_cache_stats)
+        info["size"] = len(_cache)
+    return info
+
+
+def clear_page_count_cache():
+    """페이지 수 캐시 비우기"""
+    with _cache_lock:
+        _cache.clear()
+        for key in _cache_stats:
+            _cache_stats[key] = 0
@@ -0,0 +1,82 @@
+"""
+백그라운드 사전 계산 모듈
+사용자 입력을 기다리는 동안 답변과 무관한 작업(페이지 수, 텍스트 스캔, 타입 감지)을 미리 실행
+"""
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class Prefetcher:
+    """종류(kind)와 키(key)로 구분되는 백그라운드 작업 저장소"""
+
+    def __init__(self, max_workers: Optional[int] = None, enabled: bool = True):
+        """
+        Args:
+            max_workers: 백그라운드 스레드 수 (None이면 ThreadPoolExecutor 기본값)
+            enabled: False면 submit을 무시하고 result에서 바로 계산
+        """
+        self.enabled = enabled
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._futures: Dict[Tuple[str, Hashable], Future] = {}
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix="pdfusion-prefetch")
+        return self._executor
+
+    def submit(self, kind: str, key: Hashable, func: Callable, *args) -> Optional[Future]:
+        """
+        백그라운드 작업 제출 (같은 kind/key가 이미 제출되었으면 기존 Future 반환)
+
+        Args:
+            kind: 작업 종류 (예: 'page_count', 'unit_scan')
+            key: 작업 키 (보통 파일 경로 문자열)
+            func: 실행할 함수
+            *args: 함수 인자
+
+        Returns:
+            Future (비활성화 상태면 None)
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            future = self._futures.get((kind, key))
+            if future is None:
+                future = self._get_executor().submit(func, *args)
+                self._futures[(kind, key)] = future
+                logger.debug("[사전 계산] 제출: %s - %s", kind, key)
+            return future
+
+    def result(self, kind: str, key: Hashable, func: Callable, *args) -> Any:
+        """
+        사전 계산 결과 반환 (제출되지 않았거나 취소된 작업은 현재 스레드에서 계산)
+
+        작업에서 발생한 예외는 호출한 쪽으로 그대로 전달됨
+        """
+        with self._lock:
+            future = self._futures.get((kind, key))
+        if future is not None and not future.cancelled():
+            if future.done():
+                logger.debug("[사전 계산] 적중: %s - %s", kind, key)
+            return future.result()
+        return func(*args)
+
+    def shutdown(self):
+        """아직 시작되지 않은 작업은 취소하고 스레드 풀 종료 (실행 중인 작업은 기다리지 않음)"""
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+            futures = list(self._futures.values())
+            self._futures.clear()
+        for future in futures:
+            future.cancel()
+        if executor is not None:
+            executor.shutdown(wait=False)
@@ -0,0 +1,220 @@
+"""
+프로파일링 모듈
+선택한 단계를 cProfile과 tracemalloc으로 감싸 책별 .prof 파일과 메모리 할당 상위 목록을 저장
+(계측 단계 이름으로 지정: 예: 'merge,unit_detection,discovery,zip_extraction' 또는 'all')
+"""
+
+import logging
+import os
+import re
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Union
+
+if TYPE_CHECKING:
+    import cProfile
+    import pstats
+
+logger = logging.getLogger(__name__)
+
+# 기본 설정 (환경 변수 PDFUSION_PROFILE, PDFUSION_PROFILE_TOP, PDFUSION_PROFILE_DIR로 바꿀 수 있음)
+DEFAULT_TOP_N = 20
+DEFAULT_OUTPUT_ROOT = "output"
+
+# 결과 파일을 저장할 책별 하위 디렉토리 이름
+PROFILE_DIR_NAME = "profiles"
+
+# tracemalloc이 할당 위치마다 보관할 호출 스택 깊이
+TRACEMALLOC_FRAMES = 1
+
+_settings_lock = threading.Lock()
+# tracemalloc은 프로세스에 하나뿐이므로 한 번에 한 단계만 측정 (다른 스레드의 측정을 멈추거나 최대값을 섞지 않도록)
+_profile_lock = threading.Lock()
+_local = threading.local()
+_results: List[Dict] = []
+
+
+def _parse_stages(value: str) -> frozenset:
+    return frozenset(name.strip() for name in value.split(",") if name.strip())
+
+
+PROFILE_STAGES = _parse_stages(os.environ.get("PDFUSION_PROFILE", ""))
+PROFILE_TOP_N = int(os.environ.get("PDFUSION_PROFILE_TOP", DEFAULT_TOP_N))
+PROFILE_OUTPUT_ROOT = os.environ.get("PDFUSION_PROFILE_DIR", DEFAULT_OUTPUT_ROOT)
+
+
+def configure_profiling(stages: Union[str, List[str], None], top_n: Optional[int] = None,
+                        output_root: Optional[str] = None):
+    """
+    프로파일링할 단계 설정
+
+    Args:
+        stages: 단계 이름 목록 또는 쉼표로 구분한 문자열 ('all'이면 모든 단계, 빈 값이면 사용 안 함)
+        top_n: 보고서와 할당 목록에 남길 상위 항목 수
+        output_root: 결과 저장 위치 (책별 결과는 output_root/<책 제목>/profiles)
+    """
+    global PROFILE_STAGES, PROFILE_TOP_N, PROFILE_OUTPUT_ROOT
+    if stages is None:
+        stages = ""
+    if not isinstance(stages, str):
+        stages = ",".join(stages)
+    with _settings_lock:
+        PROFILE_STAGES = _parse_stages(stages)
+        if top_n is not None:
+            PROFILE_TOP_N = top_n
+        if output_root is not None:
+            PROFILE_OUTPUT_ROOT = output_root
+
+
+def profiling_settings() -> Dict:
+    """현재 설정 (configure_profiling 인자 형태, 병렬 작업 프로세스에 전달)"""
+    with _settings_lock:
+        return {"stages": ",".join(sorted(PROFILE_STAGES)), "top_n": PROFILE_TOP_N,
+                "output_root": PROFILE_OUTPUT_ROOT}
+
+
+def is_profiled(stage: str) -> bool:
+    """이 단계를 프로파일링하는지 여부"""
+    stages = PROFILE_STAGES
+    return bool(stages) and ("all" in stages or stage in stages)
+
+
+def _profile_path(stage: str, scope: Optional[str], label: Optional[str]) -> Path:
+    """결과 파일 경로 (확장자 제외)"""
+    directory = Path(PROFILE_OUTPUT_ROOT)
+    if scope:
+        directory = directory / scope
+    directory = directory / PROFILE_DIR_NAME
+    directory.mkdir(parents=True, exist_ok=True)
+    name = stage if label is None else f"{stage}_{label}"
+    name = re.sub(r'[^\w.-]+', '_', name)
+    # 같은 단계가 여러 번 실행되어도 덮어쓰지 않도록 시각과 스레드 번호를 붙임
+    return directory / f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{threading.get_ident()}"
+
+
+def hottest_functions(stats: "pstats.Stats", top_n: int) -> List[Dict]:
+    """
+    자체 실행 시간(tottime) 기준 상위 함수
+
+    Args:
+        stats: pstats.Stats
+        top_n: 항목 수
+
+    Returns:
+        [{'function', 'calls', 'tottime', 'cumtime'}] (tottime 내림차순)
+    """
+    rows = []
+    for (filename, line, func), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+        rows.append({
+            "function": f"{os.path.basename(filename)}:{line}({func})",
+            "calls": ncalls,
+            "tottime": round(tottime, 6),
+            "cumtime": round(cumtime, 6),
+        })
+    rows.sort(key=lambda row: row["tottime"], reverse=True)
+    return rows[:top_n]
+
+
+def _write_allocations(snapshot: tracemalloc.Snapshot, path: Path, top_n: int) -> List[Dict]:
+    """할당 위치별 상위 목록을 텍스트로 저장하고 반환"""
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    ))
+    top = []
+    with open(path, 'w', encoding='utf-8') as f:
+        for stat in snapshot.statistics('lineno')[:top_n]:
+            frame = stat.traceback[0]
+            top.append({"location": f"{os.path.basename(frame.filename)}:{frame.lineno}",
+                        "size": stat.size, "count": stat.count})
+            f.write(f"{stat.size / 1024:10.1f} KB {stat.count:8d}개  {frame.filename}:{frame.lineno}\n")
+    return top
+
+
+@contextmanager
+def profile_stage(stage: str, scope: Optional[str] = None, label: Optional[str] = None) -> Iterator[None]:
+    """
+    설정된 단계면 with 블록을 cProfile(현재 스레드)과 tracemalloc으로 측정해 저장
+    (이미 프로파일링 중인 단계 안의 단계는 바깥 결과에 포함되므로 따로 측정하지 않음.
+    tracemalloc은 프로세스 전체에서 공유되므로 다른 스레드가 측정 중이면 기다리지 않고 측정 없이 실행)
+
+    Args:
+        stage: 단계 이름
+        scope: 책 제목 (결과 저장 위치)
+        label: 항목 이름 (예: 'Unit01')
+    """
+    if not is_profiled(stage) or getattr(_local, "active", False):
+        yield
+        return
+    # 측정 중인 단계가 다른 스레드의 작업을 기다릴 수 있으므로 잠금을 기다리지 않음 (교착 방지)
+    if not _profile_lock.acquire(blocking=False):
+        logger.debug("다른 스레드에서 프로파일링 중이라 측정하지 않음: %s", stage)
+        yield
+        return
+
+    # cProfile/pstats는 프로파일링할 때만 import (CLI 시작 시간 단축)
+    import cProfile
+
+    _local.active = True
+    # 힙 추적(--track-heap)이 이미 켜 두었으면 그대로 두고 최대값만 이 단계 기준으로 초기화
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    elif hasattr(tracemalloc, "reset_peak"):
+        tracemalloc.reset_peak()
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        _local.active = False
+        try:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            if started_tracing:
+                tracemalloc.stop()
+            _save_profile(stage, scope, label, profiler, snapshot, peak)
+        except Exception as e:
+            # 프로파일 저장 실패가 병합 결과에 영향을 주지 않도록 함
+            logger.warning("프로파일 저장 실패 (%s): %s", stage, e)
+        finally:
+            _profile_lock.release()
+
+
+def _save_profile(stage: str, scope: Optional[str], label: Optional[str],
+                  profiler: "cProfile.Profile", snapshot: tracemalloc.Snapshot, peak: int):
+    import pstats
+
+    top_n = PROFILE_TOP_N
+    base_path = _profile_path(stage, scope, label)
+    prof_path = base_path.with_name(base_path.name + ".prof")
+    alloc_path = base_path.with_name(base_path.name + ".alloc.txt")
+    profiler.dump_stats(str(prof_path))
+    result = {
+        "stage": stage,
+        "scope": scope,
+        "label": label,
+        "profile": str(prof_path),
+        "allocations": str(alloc_path),
+        "traced_peak_bytes": peak,
+        "hottest": hottest_functions(pstats.Stats(profiler), top_n),
+        "top_allocations": _write_allocations(snapshot, alloc_path, top_n),
+    }
+    with _settings_lock:
+        _results.append(result)
+    logger.info("프로파일 저장: %s", prof_path)
+
+
+def profile_results(scope: Optional[str] = None) -> List[Dict]:
+    """
+    저장된 프로파일 요약
+
+    Args:
+        scope: 이 책의 결과만 (None이면 전체)
+    """
+    with _settings_lock:
+        return [dict(result) for result in _results if scope is None or result["scope"] == scope]
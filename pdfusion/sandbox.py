@@ -0,0 +1,238 @@
+"""
+PDF 격리 실행 모듈
+손상된 xref 등으로 pypdf가 멈추거나 메모리를 과도하게 쓰는 파일이 전체 작업을 막지 않도록
+위험한 PDF 작업(페이지 수, 텍스트 스캔)을 CPU 시간/메모리 제한이 걸린 자식 프로세스에서 실행하고,
+제한을 넘긴 파일은 격리 목록에 올려 이후 작업에서 건너뜀
+"""
+
+import importlib.util
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+try:
+    import resource
+except ImportError:  # Windows: 자원 제한 없이 시간 제한만 적용
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# 기본 제한값 (환경 변수 PDFUSION_SANDBOX*로 바꿀 수 있음, 격리 자식 프로세스에는 인자로 전달)
+DEFAULT_TIMEOUT = 120
+DEFAULT_CPU_SECONDS = 60
+DEFAULT_MEMORY_MB = 2048
+
+SANDBOX_ENABLED = os.environ.get("PDFUSION_SANDBOX", "0") == "1"
+SANDBOX_TIMEOUT = float(os.environ.get("PDFUSION_SANDBOX_TIMEOUT", DEFAULT_TIMEOUT))
+SANDBOX_CPU_SECONDS = int(os.environ.get("PDFUSION_SANDBOX_CPU", DEFAULT_CPU_SECONDS))
+SANDBOX_MEMORY_MB = int(os.environ.get("PDFUSION_SANDBOX_MEMORY_MB", DEFAULT_MEMORY_MB))
+
+# 자식 프로세스가 강제 종료된 뒤 정리를 기다리는 시간
+JOIN_TIMEOUT = 5
+
+
+class SandboxError(Exception):
+    """격리 실행이 제한을 넘기거나 비정상 종료된 경우"""
+
+    def __init__(self, pdf_path: Union[str, Path], reason: str):
+        super().__init__(f"격리됨 ({reason}): {pdf_path}")
+        self.pdf_path = str(pdf_path)
+        self.reason = reason
+
+
+class Quarantine:
+    """제한을 넘긴 파일 목록 (절대 경로 -> 사유)"""
+
+    def __init__(self):
+        self._entries: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def add(self, pdf_path: Union[str, Path], reason: str):
+        with self._lock:
+            self._entries[os.path.abspath(str(pdf_path))] = reason
+        logger.warning("PDF 격리: %s (%s)", pdf_path, reason)
+
+    def reason(self, pdf_path: Union[str, Path]) -> Optional[str]:
+        """격리된 파일이면 사유, 아니면 None"""
+        with self._lock:
+            return self._entries.get(os.path.abspath(str(pdf_path)))
+
+    def entries(self) -> Dict[str, str]:
+        with self._lock:
+            return dict(self._entries)
+
+
+_quarantine = Quarantine()
+
+
+def get_quarantine() -> Quarantine:
+    """프로세스 전체 격리 목록"""
+    return _quarantine
+
+
+def configure_sandbox(enabled: bool, timeout: Optional[float] = None,
+                      cpu_seconds: Optional[int] = None, memory_mb: Optional[int] = None):
+    """
+    격리 실행 설정
+
+    Args:
+        enabled: 격리 실행 사용 여부
+        timeout: 작업 하나의 실제 경과 시간 제한 (초)
+        cpu_seconds: 작업 하나의 CPU 시간 제한 (초)
+        memory_mb: 작업 하나의 주소 공간 제한 (MB)
+    """
+    global SANDBOX_ENABLED, SANDBOX_TIMEOUT, SANDBOX_CPU_SECONDS, SANDBOX_MEMORY_MB
+    SANDBOX_ENABLED = enabled
+    if timeout is not None:
+        SANDBOX_TIMEOUT = timeout
+    if cpu_seconds is not None:
+        SANDBOX_CPU_SECONDS = cpu_seconds
+    if memory_mb is not None:
+        SANDBOX_MEMORY_MB = memory_mb
+
+
+def sandbox_settings() -> Dict:
+    """현재 설정 (configure_sandbox 인자 형태, 병렬 작업 프로세스에 전달)"""
+    return {"enabled": SANDBOX_ENABLED, "timeout": SANDBOX_TIMEOUT,
+            "cpu_seconds": SANDBOX_CPU_SECONDS, "memory_mb": SANDBOX_MEMORY_MB}
+
+
+_context = None
+_context_lock = threading.Lock()
+
+
+def _get_context():
+    """자식 프로세스 생성 방식 (스레드가 있는 부모를 fork하지 않도록 forkserver 우선)"""
+    global _context
+    with _context_lock:
+        if _context is not None:
+            return _context
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            _context = multiprocessing.get_context("forkserver")
+            # 작업마다 pypdf를 다시 import하지 않도록 서버에서 미리 로드
+            # (Python 3.11의 forkserver는 부모의 sys.path를 적용하지 않아 설치되지 않은 pdfusion은 로드에 실패할 수 있음,
+            #  실패한 모듈은 무시되므로 가장 무거운 PDF 라이브러리는 site-packages 이름으로 따로 지정)
+            pdf_library = "pypdf" if importlib.util.find_spec("pypdf") is not None else "PyPDF2"
+            _context.set_forkserver_preload([pdf_library, "pdfusion.page_count", "pdfusion.unit_detection"])
+        else:
+            _context = multiprocessing.get_context("spawn")
+        return _context
+
+
+def _apply_limits(cpu_seconds: int, memory_mb: int):
+    """자식 프로세스 자원 제한 (RLIMIT_RSS는 Linux에서 무시되므로 주소 공간으로 제한)"""
+    if resource is None:
+        return
+    if cpu_seconds:
+        # 소프트 제한을 넘으면 SIGXCPU로 종료됨
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+    if memory_mb:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _sandbox_main(conn, func: Callable, args: tuple, cpu_seconds: int, memory_mb: int):
+    """자식 프로세스 진입점: 제한 적용 후 실행하고 결과 또는 예외를 부모에게 전달"""
+    try:
+        _apply_limits(cpu_seconds, memory_mb)
+        result = func(*args)
+        conn.send(("ok", result))
+    except MemoryError:
+        conn.send(("memory", None))
+    except Exception as e:
+        try:
+            conn.send(("error", e))
+        except Exception:
+            # 피클할 수 없는 예외는 메시지만 전달
+            conn.send(("error", RuntimeError(str(e))))
+    finally:
+        conn.close()
+
+
+def _exit_reason(exitcode: Optional[int]) -> str:
+    """결과 없이 끝난 자식 프로세스의 종료 사유"""
+    sigxcpu = getattr(signal, "SIGXCPU", None)
+    if sigxcpu is not None and exitcode == -sigxcpu:
+        return "CPU 시간 초과"
+    sigkill = getattr(signal, "SIGKILL", None)
+    if sigkill is not None and exitcode == -sigkill:
+        return "강제 종료 (메모리 부족 추정)"
+    return f"비정상 종료 (코드 {exitcode})"
+
+
+def run_sandboxed(func: Callable, pdf_path: Union[str, Path], *args,
+                  timeout: Optional[float] = None, cpu_seconds: Optional[int] = None,
+                  memory_mb: Optional[int] = None) -> Any:
+    """
+    func(pdf_path, *args)를 제한이 걸린 자식 프로세스에서 실행
+
+    Args:
+        func: 모듈 수준 함수 (자식 프로세스로 전달할 수 있어야 함)
+        pdf_path: 작업 대상 PDF (격리 목록의 키)
+        *args: 추가 인자
+        timeout: 실제 경과 시간 제한 (초, None이면 설정값)
+        cpu_seconds: CPU 시간 제한 (초, None이면 설정값)
+        memory_mb: 주소 공간 제한 (MB, None이면 설정값)
+
+    Returns:
+        func의 반환값 (func에서 난 예외는 그대로 다시 발생)
+
+    Raises:
+        SandboxError: 제한 초과/비정상 종료 또는 이미 격리된 파일
+    """
+    reason = _quarantine.reason(pdf_path)
+    if reason is not None:
+        raise SandboxError(pdf_path, reason)
+
+    timeout = SANDBOX_TIMEOUT if timeout is None else timeout
+    cpu_seconds = SANDBOX_CPU_SECONDS if cpu_seconds is None else cpu_seconds
+    memory_mb = SANDBOX_MEMORY_MB if memory_mb is None else memory_mb
+
+    context = _get_context()
+    parent_conn, child_conn = context.Pipe(duplex=False)
+    process = context.Process(target=_sandbox_main,
+                              args=(child_conn, func, (pdf_path,) + args, cpu_seconds, memory_mb),
+                              daemon=True)
+    process.start()
+    child_conn.close()
+
+    message = None
+    try:
+        if parent_conn.poll(timeout):
+            try:
+                message = parent_conn.recv()
+            except EOFError:
+                message = None
+        else:
+            reason = f"시간 초과 ({timeout:g}초)"
+    finally:
+        parent_conn.close()
+        if message is None and process.is_alive():
+            process.kill()
+        process.join(JOIN_TIMEOUT)
+
+    if message is None:
+        if reason is None:
+            reason = _exit_reason(process.exitcode)
+        _quarantine.add(pdf_path, reason)
+        raise SandboxError(pdf_path, reason)
+
+    status, payload = message
+    if status == "ok":
+        return payload
+    if status == "memory":
+        reason = f"메모리 제한 초과 ({memory_mb}MB)"
+        _quarantine.add(pdf_path, reason)
+        raise SandboxError(pdf_path, reason)
+    raise payload
+
+
+def run_guarded(func: Callable, pdf_path: Union[str, Path], *args) -> Any:
+    """격리 실행이 켜져 있으면 run_sandboxed, 아니면 현재 프로세스에서 바로 실행"""
+    if SANDBOX_ENABLED:
+        return run_sandboxed(func, pdf_path, *args)
+    return func(pdf_path, *args)
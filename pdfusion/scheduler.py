@@ -0,0 +1,426 @@
+"""
+배치 스케줄러 모듈
+작업(책) 비용을 미리 추정하여 큰 작업부터(LPT) 워커 풀에 배분하고,
+실제 소요 시간/메모리로 페이지 비용과 파싱 비용 계수, 메모리 추정치를 보정
+"""
+
+import os
+import json
+import time
+import logging
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from .events import configure_events, events_settings
+from .log_config import configure_logging, logging_settings
+from .memory import configure_memory, get_memory_monitor, memory_settings
+from .output_store import configure_output_store, output_store_settings
+from .profiling import configure_profiling, profiling_settings
+from .sandbox import configure_sandbox, sandbox_settings
+from .source_cache import configure_source_cache, source_cache_settings
+
+logger = logging.getLogger(__name__)
+
+# 비용 모델 기본 계수 (보정 전)
+SECONDS_PER_PAGE = 0.01          # 페이지 1장 복제/기록 비용
+SECONDS_PER_MB = 0.05            # 원본 1MB 파싱 비용
+PAGE_TREE_BYTES_PER_PAGE = 32 * 1024  # 페이지 객체 트리 1장당 추정 메모리
+
+# 보정 계수 범위 (측정이 튀어도 추정치가 극단으로 가지 않도록)
+MIN_CALIBRATION = 0.05
+MAX_CALIBRATION = 20.0
+MIN_MEMORY_CALIBRATION = 0.25
+MAX_MEMORY_CALIBRATION = 10.0
+
+
+def collect_source_files(config: Dict) -> List[str]:
+    """
+    병합 config에서 참조하는 원본 PDF 경로 목록 추출 (중복 제거, 순서 유지)
+
+    Args:
+        config: 병합 config dict (categories, review_tests 포함)
+
+    Returns:
+        원본 PDF 경로 리스트
+    """
+    paths = []
+    for info in config.get("categories", {}).values():
+        if not isinstance(info, dict):
+            continue
+        if info.get("is_multi_file_combined", False):
+            paths.extend(f["pdf_path"] for f in info.get("file_unit_info", []))
+        elif "pdf_paths" in info:
+            paths.extend(info["pdf_paths"])
+        elif info.get("pdf_path"):
+            paths.append(info["pdf_path"])
+    for review in config.get("review_tests", []):
+        if review.get("pdf_path"):
+            paths.append(review["pdf_path"])
+    return list(dict.fromkeys(str(p) for p in paths))
+
+
+def count_config_pages(config: Dict) -> int:
+    """config의 unit_page_lengths 기준 병합될 총 페이지 수"""
+    total = 0
+    for info in config.get("categories", {}).values():
+        if isinstance(info, dict):
+            total += sum(info.get("unit_page_lengths") or [])
+    for review in config.get("review_tests", []):
+        total += sum(review.get("unit_page_lengths") or [])
+    return total
+
+
+def estimate_book_cost(config: Dict) -> Dict[str, float]:
+    """
+    책 하나의 병합 비용 추정 (보정 전)
+
+    유닛 병합과 AllUnits 합본에서 모든 페이지가 두 번 기록되고,
+    원본 파일은 유닛마다 다시 파싱되므로 유닛 수만큼 바이트 비용이 늘어남
+
+    Args:
+        config: 병합 config dict
+
+    Returns:
+        {'pages', 'bytes', 'page_cost', 'parse_cost', 'cost', 'memory'}
+        (비용은 초, memory는 바이트 단위 추정치, cost = page_cost + parse_cost)
+    """
+    pages = count_config_pages(config)
+    source_bytes = 0
+    for path in collect_source_files(config):
+        try:
+            source_bytes += os.path.getsize(path)
+        except OSError:
+            continue
+    total_units = max(int(config.get("total_units") or 1), 1)
+
+    page_cost = pages * 2 * SECONDS_PER_PAGE
+    parse_cost = source_bytes / (1024 * 1024) * SECONDS_PER_MB * total_units
+    # AllUnits 합본 시 모든 페이지 트리가 한 writer에 올라감
+    memory = pages * PAGE_TREE_BYTES_PER_PAGE + source_bytes
+    return {
+        "pages": pages,
+        "bytes": source_bytes,
+        "page_cost": page_cost,
+        "parse_cost": parse_cost,
+        "cost": page_cost + parse_cost,
+        "memory": memory,
+    }
+
+
+class ScheduledJob:
+    """스케줄러에 제출되는 작업 하나"""
+
+    def __init__(self, name: str, func: Callable, args: Tuple = (),
+                 estimated_cost: float = 0.0, estimated_memory: int = 0,
+                 page_cost: Optional[float] = None, parse_cost: Optional[float] = None):
+        """
+        Args:
+            name: 작업 이름 (책 제목 등)
+            func: 실행할 함수 (프로세스 풀 사용 시 모듈 최상위 함수여야 함)
+            args: 함수 인자
+            estimated_cost: 보정 전 추정 비용 (초)
+            estimated_memory: 보정 전 추정 메모리 (바이트)
+            page_cost: estimated_cost 중 페이지 복제/기록 비용 (초, None이면 estimated_cost 전체)
+            parse_cost: estimated_cost 중 원본 파싱 비용 (초, None이면 0)
+        """
+        self.name = name
+        self.func = func
+        self.args = args
+        self.estimated_cost = estimated_cost
+        self.estimated_memory = estimated_memory
+        self.page_cost = estimated_cost if page_cost is None else page_cost
+        self.parse_cost = parse_cost or 0.0
+        self.actual_cost: Optional[float] = None
+        # 실행 중 RSS 증가량 최대값 (바이트, 측정할 수 없거나 다른 작업과 섞이면 None)
+        self.actual_memory: Optional[int] = None
+        self.result = None
+        self.error: Optional[str] = None
+
+
+def worker_settings() -> Dict[str, Dict]:
+    """작업 프로세스에 넘길 현재 프로세스의 설정 (모듈별 configure_* 인자)"""
+    return {
+        "logging": logging_settings(),
+        "sandbox": sandbox_settings(),
+        "memory": memory_settings(),
+        "profiling": profiling_settings(),
+        "events": events_settings(),
+        "output_store": output_store_settings(),
+        "source_cache": source_cache_settings(),
+    }
+
+
+def _init_worker(settings: Dict[str, Dict]):
+    """
+    프로세스 풀 작업 프로세스 초기화 (spawn/forkserver로 시작한 프로세스는 부모 설정을 물려받지 않으므로 한 번 적용)
+
+    Args:
+        settings: worker_settings()의 결과
+    """
+    configure_logging(**settings["logging"])
+    configure_sandbox(**settings["sandbox"])
+    configure_memory(**settings["memory"])
+    configure_profiling(**settings["profiling"])
+    configure_events(**settings["events"])
+    configure_output_store(**settings["output_store"])
+    configure_source_cache(**settings["source_cache"])
+
+
+def _timed_call(func: Callable, args: Tuple) -> Tuple[object, float, Optional[int]]:
+    """워커에서 함수를 실행하고 실제 소요 시간(초)과 RSS 증가량 최대값(바이트)을 함께 반환"""
+    started = time.perf_counter()
+    with get_memory_monitor().window(getattr(func, "__name__", "job")) as window:
+        result = func(*args)
+    elapsed = time.perf_counter() - started
+    memory = None
+    if window.start_rss is not None:
+        memory = max(window.peak_rss - window.start_rss, 0)
+    return result, elapsed, memory
+
+
+class CostCalibration:
+    """
+    추정 비용 보정 (페이지 비용과 파싱 비용 계수를 따로, 메모리 추정치는 배율 하나로)
+
+    실제 소요 시간 = page × 페이지 비용 + parse × 파싱 비용 을 최근 작업에 가중치를 둔 최소 제곱으로 맞춤.
+    작업 수가 적어 두 계수를 구분할 수 없으면 두 계수에 같은 배율을 쓰는 쪽으로 당겨짐
+    """
+
+    # 새 기록을 더할 때 이전 기록의 가중치 (지수 감쇠)
+    DECAY = 0.8
+    # 두 계수를 같은 배율로 당기는 세기 (기록 전체 대비 비율)
+    PRIOR_WEIGHT = 0.05
+    # 메모리 배율 지수 이동 평균 가중치
+    MEMORY_ALPHA = 0.3
+
+    def __init__(self):
+        self.page = 1.0
+        self.parse = 1.0
+        self.memory = 1.0
+        # 가중 합: x = 페이지 비용, y = 파싱 비용, t = 실제 시간
+        self._sums = {"xx": 0.0, "xy": 0.0, "yy": 0.0, "xt": 0.0, "yt": 0.0}
+
+    def cost(self, job: ScheduledJob) -> float:
+        """보정한 예상 소요 시간 (초)"""
+        return self.page * job.page_cost + self.parse * job.parse_cost
+
+    def memory_estimate(self, job: ScheduledJob) -> int:
+        """보정한 예상 메모리 (바이트)"""
+        return int(job.estimated_memory * self.memory)
+
+    def update(self, job: ScheduledJob):
+        """실행을 마친 작업의 실제 시간/메모리로 계수 갱신"""
+        x, y = job.page_cost, job.parse_cost
+        if job.actual_cost is not None and x + y > 0:
+            t = job.actual_cost
+            for key in self._sums:
+                self._sums[key] *= self.DECAY
+            sums = self._sums
+            sums["xx"] += x * x
+            sums["xy"] += x * y
+            sums["yy"] += y * y
+            sums["xt"] += x * t
+            sums["yt"] += y * t
+            self._solve()
+        if job.actual_memory is not None and job.estimated_memory > 0:
+            ratio = job.actual_memory / job.estimated_memory
+            memory = (1 - self.MEMORY_ALPHA) * self.memory + self.MEMORY_ALPHA * ratio
+            self.memory = min(max(memory, MIN_MEMORY_CALIBRATION), MAX_MEMORY_CALIBRATION)
+
+    def _solve(self):
+        """가중 최소 제곱 (두 계수를 같은 배율로 당기는 릿지 항 포함)"""
+        s = self._sums
+        total = s["xx"] + 2 * s["xy"] + s["yy"]
+        if total <= 0:
+            return
+        # 두 비용을 합친 추정치 하나에 대한 배율 (당기는 목표)
+        uniform = (s["xt"] + s["yt"]) / total
+        ridge = self.PRIOR_WEIGHT * (s["xx"] + s["yy"]) / 2
+        a, b, d = s["xx"] + ridge, s["xy"], s["yy"] + ridge
+        det = a * d - b * b
+        if det <= 0:
+            page = parse = uniform
+        else:
+            rhs_x = s["xt"] + ridge * uniform
+            rhs_y = s["yt"] + ridge * uniform
+            page = (d * rhs_x - b * rhs_y) / det
+            parse = (a * rhs_y - b * rhs_x) / det
+        self.page = min(max(page, MIN_CALIBRATION), MAX_CALIBRATION)
+        self.parse = min(max(parse, MIN_CALIBRATION), MAX_CALIBRATION)
+
+    def to_dict(self) -> Dict:
+        return {"page": self.page, "parse": self.parse, "memory": self.memory, "sums": dict(self._sums)}
+
+    def load(self, data: Dict):
+        """to_dict 결과 (또는 배율 하나만 저장하던 이전 형식) 적용"""
+        if "calibration" in data and "page" not in data:
+            self.page = self.parse = float(data["calibration"]) or 1.0
+            return
+        self.page = float(data.get("page", 1.0))
+        self.parse = float(data.get("parse", 1.0))
+        self.memory = float(data.get("memory", 1.0))
+        sums = data.get("sums") or {}
+        for key in self._sums:
+            self._sums[key] = float(sums.get(key, 0.0))
+
+
+class BatchScheduler:
+    """비용 추정 기반 배치 스케줄러 (보정한 비용 기준 LPT + 보정한 메모리 기준 상한)"""
+
+    def __init__(self, max_workers: int = 1, memory_limit: Optional[int] = None,
+                 use_processes: bool = True, calibration_path: Optional[str] = None):
+        """
+        Args:
+            max_workers: 동시 실행 작업 수 (1이면 현재 프로세스에서 순서대로 실행)
+            memory_limit: 동시 실행 중인 작업들의 추정 메모리 합 상한 (바이트, None이면 제한 없음)
+            use_processes: True면 프로세스 풀, False면 스레드 풀 사용
+            calibration_path: 보정 계수를 저장/로드할 JSON 파일 경로
+        """
+        self.max_workers = max(1, max_workers)
+        self.memory_limit = memory_limit
+        self.use_processes = use_processes
+        self.calibration_path = Path(calibration_path) if calibration_path else None
+        self.calibration = CostCalibration()
+        self.history: List[Dict] = []
+        self._load_calibration()
+
+    def _load_calibration(self):
+        """저장된 보정 계수 로드"""
+        if not self.calibration_path or not self.calibration_path.exists():
+            return
+        try:
+            with open(self.calibration_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.calibration.load(data)
+            self.history = list(data.get("history", []))
+            logger.debug("스케줄러 보정 계수 로드: 페이지 %.3f, 파싱 %.3f, 메모리 %.3f",
+                         self.calibration.page, self.calibration.parse, self.calibration.memory)
+        except Exception as e:
+            logger.warning("스케줄러 보정 계수 로드 실패 (%s): %s", self.calibration_path, e)
+
+    def _save_calibration(self):
+        """보정 계수와 최근 기록 저장"""
+        if not self.calibration_path:
+            return
+        try:
+            self.calibration_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.calibration_path, 'w', encoding='utf-8') as f:
+                json.dump(dict(self.calibration.to_dict(), history=self.history[-100:]),
+                          f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            logger.warning("스케줄러 보정 계수 저장 실패 (%s): %s", self.calibration_path, e)
+
+    def calibrated_cost(self, job: ScheduledJob) -> float:
+        """보정 계수를 적용한 예상 소요 시간 (초)"""
+        return self.calibration.cost(job)
+
+    def calibrated_memory(self, job: ScheduledJob) -> int:
+        """보정 계수를 적용한 예상 메모리 (바이트)"""
+        return self.calibration.memory_estimate(job)
+
+    def dispatch_order(self, jobs: List[ScheduledJob]) -> List[ScheduledJob]:
+        """보정한 예상 소요 시간이 큰 작업부터 (LPT)"""
+        return sorted(jobs, key=self.calibrated_cost, reverse=True)
+
+    def _record(self, job: ScheduledJob):
+        """추정치와 실제 비용을 기록하고 보정 계수 갱신"""
+        entry = {
+            "name": job.name,
+            "estimated": round(self.calibrated_cost(job), 3),
+            "actual": round(job.actual_cost, 3) if job.actual_cost is not None else None,
+            "estimated_memory": self.calibrated_memory(job),
+            "actual_memory": job.actual_memory,
+            "error": job.error,
+        }
+        self.history.append(entry)
+        if job.error is None:
+            self.calibration.update(job)
+        logger.info("[스케줄러] %s: 예상 %s초 / 실제 %s초", job.name, entry['estimated'], entry['actual'])
+
+    def _fits(self, job: ScheduledJob, in_flight_memory: int, running: int) -> bool:
+        """메모리 상한 안에서 작업을 추가로 시작할 수 있는지 확인"""
+        if running == 0:
+            # 실행 중인 작업이 없으면 상한을 넘는 작업도 단독으로 실행
+            return True
+        # 메모리 예산이 있으면 실제 사용량(작업 프로세스 포함) 기준으로도 확인해 동시 실행 수를 줄임
+        memory = self.calibrated_memory(job)
+        headroom = get_memory_monitor().headroom(include_children=self.use_processes)
+        if headroom is not None and headroom < memory:
+            logger.debug("[스케줄러] 메모리 예산 부족 - %s 시작 대기 (실행 중 %s개, 여유 %.0fMB)",
+                         job.name, running, headroom / (1024 * 1024))
+            return False
+        if self.memory_limit is None:
+            return True
+        return in_flight_memory + memory <= self.memory_limit
+
+    def run(self, jobs: List[ScheduledJob]) -> List[ScheduledJob]:
+        """
+        작업 실행 (큰 작업부터 배분)
+
+        Args:
+            jobs: 실행할 작업 리스트
+
+        Returns:
+            실행 결과가 채워진 작업 리스트 (입력 순서 유지)
+        """
+        if self.max_workers == 1 or len(jobs) <= 1:
+            for job in jobs:
+                self._run_inline(job)
+            self._save_calibration()
+            return jobs
+
+        pending = self.dispatch_order(jobs)
+        logger.info("[스케줄러] %s개 작업을 %s개 워커로 실행 (LPT 순서)", len(jobs), self.max_workers)
+        for job in pending:
+            logger.debug("[스케줄러]   %s: 예상 %.1f초, 메모리 %.0fMB",
+                         job.name, self.calibrated_cost(job), self.calibrated_memory(job) / (1024 * 1024))
+
+        if self.use_processes:
+            executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                           initargs=(worker_settings(),))
+        else:
+            executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        # future -> (작업, 시작할 때 잡아 둔 예상 메모리)
+        running = {}
+        in_flight_memory = 0
+        with executor:
+            while pending or running:
+                # 메모리 상한 안에서 가장 큰 작업부터 시작
+                idx = 0
+                while idx < len(pending) and len(running) < self.max_workers:
+                    job = pending[idx]
+                    if not self._fits(job, in_flight_memory, len(running)):
+                        idx += 1
+                        continue
+                    pending.pop(idx)
+                    future = executor.submit(_timed_call, job.func, job.args)
+                    reserved = self.calibrated_memory(job)
+                    running[future] = (job, reserved)
+                    in_flight_memory += reserved
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    job, reserved = running.pop(future)
+                    in_flight_memory -= reserved
+                    try:
+                        job.result, job.actual_cost, memory = future.result()
+                        # 스레드 풀은 RSS를 다른 작업과 공유하므로 메모리 보정에 쓰지 않음
+                        if self.use_processes:
+                            job.actual_memory = memory
+                    except Exception as e:
+                        job.error = str(e)
+                        logger.error("[스케줄러] %s 실행 실패: %s", job.name, e)
+                    self._record(job)
+
+        self._save_calibration()
+        return jobs
+
+    def _run_inline(self, job: ScheduledJob):
+        """현재 프로세스에서 작업 실행"""
+        try:
+            job.result, job.actual_cost, job.actual_memory = _timed_call(job.func, job.args)
+        except Exception as e:
+            job.error = str(e)
+            logger.error("[스케줄러] %s 실행 실패: %s", job.name, e)
+        self._record(job)
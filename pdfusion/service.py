@@ -0,0 +1,448 @@
+"""
+상주 병합 서비스 모듈
+요청마다 main_v5.py를 새 프로세스로 띄우면 인터프리터 시작, import, 빈 캐시 비용을 매번 치르므로
+한 프로세스에 상주하면서 병합 작업을 받아 처리 (원본 PdfReader, 페이지 수, 유닛 스캔 결과가 작업 사이에 유지됨)
+
+작업은 로컬 HTTP(TCP 또는 Unix 소켓)로 받음:
+    POST /jobs          작업 제출 (202, 대기열이 가득 차면 503)
+    GET  /jobs          작업 목록
+    GET  /jobs/<id>     작업 상태와 결과
+    GET  /health        대기/실행 중 작업 수와 캐시 적중 통계
+
+작업 요청 형식 (answers는 ConfigManagerV5의 질문 키 -> 답, 없는 키는 Enter와 같은 기본값):
+    {"book_path": "/books/Bricks Reading 60.zip",
+     "answers": {"level": "Level 2", "toc_exclude": {"Word List.pdf": "y"}},
+     "options": {"fused": true, "output_profile": "compact"}}
+"""
+
+import http.server
+import json
+import logging
+import os
+import queue
+import signal
+import socketserver
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .events import JOB_DONE, JOB_QUEUED, JOB_STARTED, emit
+from .output_profiles import DEFAULT_OUTPUT_PROFILE, IMAGE_PROFILES, OUTPUT_PROFILES
+
+logger = logging.getLogger(__name__)
+
+# 기본 설정
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_QUEUE_SIZE = 16
+
+# 끝난 작업을 목록에 남겨 두는 최대 개수 (넘으면 오래된 것부터 삭제)
+MAX_FINISHED_JOBS = 200
+
+# 작업 상태
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+# 작업별로 바꿀 수 있는 병합 옵션과 기본값 (main_v5의 명령행 옵션과 같은 의미)
+JOB_OPTIONS = {
+    "fused": False,
+    "skip_toc": False,
+    "output_profile": DEFAULT_OUTPUT_PROFILE,
+    "image_profile": None,
+    "use_store": True,
+    "resume": False,
+}
+
+
+class QueueFullError(Exception):
+    """대기열이 가득 차서 작업을 받을 수 없음"""
+
+
+class MergeService:
+    """
+    병합 작업 대기열과 작업 스레드
+
+    작업은 스레드로 실행하므로 프로세스 전체 캐시(source_cache, 페이지 수, 유닛 스캔, 출력 저장소)를
+    모든 작업이 공유함. 같은 최상위 폴더의 작업은 압축 해제/출력 폴더가 겹치므로 차례로 실행
+    """
+
+    def __init__(self, run_book: Callable[..., bool], workers: int = 1, queue_size: int = DEFAULT_QUEUE_SIZE,
+                 output_root: str = "output", defaults: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            run_book: 책 하나를 병합하는 함수 (main_v5.process_book과 같은 인자)
+            workers: 동시에 실행할 작업 수
+            queue_size: 대기열 크기 (가득 차면 submit이 QueueFullError)
+            output_root: 결과를 저장할 폴더 (책별 하위 폴더, 출력 저장소 공유)
+            defaults: 작업 옵션 기본값 (JOB_OPTIONS의 키)
+        """
+        self.run_book = run_book
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        self.output_root = output_root
+        self.defaults = dict(JOB_OPTIONS)
+        self.defaults.update(defaults or {})
+        self._queue: "queue.Queue[Dict]" = queue.Queue(maxsize=self.queue_size)
+        self._jobs: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._root_locks: Dict[str, threading.Lock] = {}
+        # 책별 출력 폴더 -> 잠금 (다른 원본 폴더의 같은 제목 책이 같은 출력 폴더/저널/계측 범위에 동시에 쓰지 않도록)
+        self._output_locks: Dict[str, threading.Lock] = {}
+        self._threads: List[threading.Thread] = []
+        self._stopping = threading.Event()
+        self._running = 0
+        self.started_at = time.time()
+
+    def start(self):
+        """작업 스레드 시작"""
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"pdfusion-job-{index + 1}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info("병합 서비스 시작: 작업 스레드 %s개, 대기열 %s개", self.workers, self.queue_size)
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        서비스 종료 (실행 중인 작업은 끝날 때까지 기다리고, 대기 중인 작업은 취소)
+
+        Args:
+            timeout: 작업 스레드 하나를 기다릴 최대 시간 (초, None이면 끝날 때까지)
+        """
+        self._stopping.set()
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self._finish(job, CANCELLED, error="서비스 종료로 취소됨")
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, request: Dict[str, Any]) -> Dict:
+        """
+        작업 제출
+
+        Args:
+            request: {'book_path' 또는 'root', 'answers', 'options'}
+
+        Returns:
+            작업 상태 (id 포함)
+
+        Raises:
+            ValueError: 요청 형식 오류
+            QueueFullError: 대기열이 가득 참
+        """
+        if self._stopping.is_set():
+            raise QueueFullError("서비스가 종료 중입니다")
+        root, answers = self._resolve_request(request)
+        options = dict(self.defaults)
+        unknown = set(request.get("options") or {}) - set(JOB_OPTIONS)
+        if unknown:
+            raise ValueError(f"알 수 없는 옵션: {', '.join(sorted(unknown))}")
+        options.update(request.get("options") or {})
+        if options["output_profile"] not in OUTPUT_PROFILES:
+            raise ValueError(f"알 수 없는 출력 프로필: {options['output_profile']}")
+        if isinstance(options["image_profile"], str) and options["image_profile"] not in IMAGE_PROFILES:
+            raise ValueError(f"알 수 없는 이미지 프로필: {options['image_profile']}")
+
+        job = {
+            "id": uuid.uuid4().hex[:12],
+            "status": QUEUED,
+            "root": root,
+            "answers": answers,
+            "options": options,
+            "submitted_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "books": {},
+            "decisions": [],
+            "error": None,
+        }
+        with self._lock:
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                raise QueueFullError(f"대기열이 가득 찼습니다 ({self.queue_size}개)") from None
+            self._jobs[job["id"]] = job
+        logger.info("작업 접수: %s (%s)", job["id"], root)
+        emit(JOB_QUEUED, job_id=job["id"], root=root, queued=self._queue.qsize())
+        return self._view(job)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """작업 상태 (없으면 None)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return self._view(job) if job is not None else None
+
+    def list_jobs(self) -> List[Dict]:
+        """전체 작업 요약 (제출 순서)"""
+        with self._lock:
+            return [{key: job[key] for key in ("id", "status", "root", "submitted_at", "finished_at", "error")}
+                    for job in self._jobs.values()]
+
+    def health(self) -> Dict:
+        """서비스 상태와 캐시 적중 통계"""
+        from .metrics import cache_snapshot
+
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job["status"]] = counts.get(job["status"], 0) + 1
+        return {
+            "status": "stopping" if self._stopping.is_set() else "ok",
+            "pid": os.getpid(),
+            "uptime_s": round(time.time() - self.started_at, 3),
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "jobs": counts,
+            "caches": cache_snapshot(),
+        }
+
+    def _resolve_request(self, request: Dict[str, Any]):
+        """요청에서 최상위 폴더와 질문 답 결정 (book_path는 해당 zip/책 폴더만 고른 것과 같음)"""
+        if not isinstance(request, dict):
+            raise ValueError("요청은 JSON 객체여야 합니다")
+        answers = request.get("answers") or {}
+        if not isinstance(answers, dict):
+            raise ValueError("answers는 JSON 객체여야 합니다")
+        answers = dict(answers)
+        if request.get("book_path"):
+            book_path = Path(request["book_path"])
+            name = book_path.stem.strip() if book_path.suffix.lower() == ".zip" else book_path.name
+            answers.setdefault("root_dir", str(book_path.parent))
+            answers.setdefault("extract", f"{name}.zip")
+            answers.setdefault("books", name)
+        elif request.get("root"):
+            answers.setdefault("root_dir", str(request["root"]))
+        if not answers.get("root_dir"):
+            raise ValueError("book_path 또는 root가 필요합니다")
+        root = os.path.abspath(str(answers["root_dir"]))
+        if not os.path.isdir(root):
+            raise ValueError(f"폴더를 찾을 수 없습니다: {root}")
+        answers["root_dir"] = root
+        return root, answers
+
+    def _view(self, job: Dict) -> Dict:
+        view = dict(job)
+        if job["started_at"] is not None:
+            view["wall_s"] = round((job["finished_at"] or time.time()) - job["started_at"], 3)
+        return json.loads(json.dumps(view, default=str))
+
+    def _root_lock(self, root: str) -> threading.Lock:
+        with self._lock:
+            return self._root_locks.setdefault(root, threading.Lock())
+
+    def _output_lock(self, output_dir: Path) -> threading.Lock:
+        with self._lock:
+            return self._output_locks.setdefault(str(output_dir.resolve()), threading.Lock())
+
+    def _worker(self):
+        while not self._stopping.is_set():
+            try:
+                job = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            with self._lock:
+                self._running += 1
+            try:
+                with self._root_lock(job["root"]):
+                    self._run_job(job)
+            except Exception as e:
+                logger.exception("작업 실패: %s", job["id"])
+                self._finish(job, FAILED, error=str(e))
+            finally:
+                from .metrics import get_metrics
+                with self._lock:
+                    self._running -= 1
+                    if self._running == 0 and self._queue.empty():
+                        # 상주 프로세스에 측정값이 계속 쌓이지 않도록 유휴 상태가 되면 비움
+                        get_metrics().clear()
+
+    def _run_job(self, job: Dict):
+        from .config_v5 import ConfigManagerV5
+        from .metrics import get_metrics
+
+        with self._lock:
+            job["status"] = RUNNING
+            job["started_at"] = time.time()
+        emit(JOB_STARTED, job_id=job["id"], root=job["root"])
+        options = job["options"]
+        config_manager = ConfigManagerV5(fused=options["fused"], answers=job["answers"], reuse_extracted=True)
+        try:
+            configs = config_manager.get_user_input()
+        finally:
+            config_manager.prefetcher.shutdown()
+            with self._lock:
+                job["decisions"] = config_manager.decisions
+        if not configs:
+            self._finish(job, FAILED, error="병합할 책이 없습니다 (설정 단계에서 중단됨, decisions 참고)")
+            return
+
+        metrics = get_metrics()
+        failed = []
+        for book_title, book_config in configs.items():
+            output_dir = Path(self.output_root) / book_title
+            # 계측 범위도 책 제목 기준이므로 결과를 읽고 비울 때까지 잠금 유지
+            with self._output_lock(output_dir):
+                started = time.perf_counter()
+                try:
+                    success = bool(self.run_book(
+                        book_title, book_config, output_profile=options["output_profile"],
+                        image_profile=options["image_profile"], use_store=options["use_store"],
+                        resume=options["resume"], skip_toc=options["skip_toc"], output_root=self.output_root))
+                    error = None
+                except Exception as e:
+                    logger.exception("책 병합 실패: %s", book_title)
+                    success, error = False, str(e)
+                result = {
+                    "success": success,
+                    "error": error,
+                    "wall_s": round(time.perf_counter() - started, 3),
+                    "output_dir": str(output_dir.resolve()),
+                    "outputs": sorted(str(p.relative_to(output_dir)) for p in output_dir.glob("*.pdf")),
+                    "stages": metrics.snapshot(scope=book_title),
+                }
+                metrics.clear(scope=book_title)
+            with self._lock:
+                job["books"][book_title] = result
+            if not success:
+                failed.append(book_title)
+        if failed:
+            self._finish(job, FAILED, error=f"병합 실패: {', '.join(failed)}")
+        else:
+            self._finish(job, SUCCEEDED)
+
+    def _finish(self, job: Dict, status: str, error: Optional[str] = None):
+        with self._lock:
+            job["status"] = status
+            job["error"] = error
+            job["finished_at"] = time.time()
+            # 끝난 작업이 너무 많으면 오래된 것부터 삭제
+            finished = [job_id for job_id, item in self._jobs.items() if item["finished_at"] is not None]
+            for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+                del self._jobs[job_id]
+        wall_s = job["finished_at"] - job["started_at"] if job["started_at"] else 0.0
+        logger.info("작업 종료: %s (%s, %.2fs)", job["id"], status, wall_s)
+        emit(JOB_DONE, job_id=job["id"], status=status, error=error, wall_s=round(wall_s, 6),
+             books={title: book["success"] for title, book in job["books"].items()})
+
+
+class _JobRequestHandler(http.server.BaseHTTPRequestHandler):
+    """작업 API 요청 처리 (server.service에 MergeService)"""
+
+    server_version = "PDFusion"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        service = self.server.service
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path == "/health":
+            self._send_json(200, service.health())
+        elif path == "/jobs":
+            self._send_json(200, {"jobs": service.list_jobs()})
+        elif path.startswith("/jobs/"):
+            job = service.get(path[len("/jobs/"):])
+            if job is None:
+                self._send_json(404, {"error": "작업을 찾을 수 없습니다"})
+            else:
+                self._send_json(200, job)
+        else:
+            self._send_json(404, {"error": f"알 수 없는 경로: {self.path}"})
+
+    def do_POST(self):
+        if self.path.split("?", 1)[0].rstrip("/") != "/jobs":
+            self._send_json(404, {"error": f"알 수 없는 경로: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            request = json.loads(self.rfile.read(length) or b"{}")
+            job = self.server.service.submit(request)
+        except QueueFullError as e:
+            self._send_json(503, {"error": str(e)}, headers={"Retry-After": "5"})
+        except ValueError as e:
+            # json.JSONDecodeError도 ValueError
+            self._send_json(400, {"error": str(e)})
+        else:
+            self._send_json(202, job, headers={"Location": f"/jobs/{job['id']}"})
+
+    def _send_json(self, status: int, body: Dict, headers: Optional[Dict[str, str]] = None):
+        data = json.dumps(body, ensure_ascii=False, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # Unix 소켓에는 클라이언트 주소가 없으므로 address_string()을 쓰지 않음
+        logger.debug("HTTP %s", format % args)
+
+
+class _ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix 소켓으로 받는 HTTP 서버"""
+
+    daemon_threads = True
+
+
+def create_server(service: MergeService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                  socket_path: Optional[str] = None) -> socketserver.BaseServer:
+    """
+    작업 API 서버 생성 (socket_path를 주면 TCP 대신 Unix 소켓)
+
+    Args:
+        service: 작업을 처리할 서비스
+        host: TCP 주소 (기본값: 127.0.0.1, 로컬에서만 접속)
+        port: TCP 포트 (0이면 빈 포트)
+        socket_path: Unix 소켓 경로 (소유자만 접속 가능하도록 권한 0600)
+
+    Returns:
+        serve_forever()로 실행할 서버 (server.service에 서비스)
+    """
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        # bind할 때부터 소유자만 접속할 수 있도록 umask를 좁힘
+        # (umask는 프로세스 전체 설정이므로 작업 스레드를 시작하기 전인 서버 생성 시점에만 바꿈)
+        old_umask = os.umask(0o177)
+        try:
+            server = _ThreadingUnixHTTPServer(socket_path, _JobRequestHandler)
+        finally:
+            os.umask(old_umask)
+        os.chmod(socket_path, 0o600)
+    else:
+        server = http.server.ThreadingHTTPServer((host, port), _JobRequestHandler)
+    server.service = service
+    return server
+
+
+def _interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def serve(service: MergeService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+          socket_path: Optional[str] = None):
+    """작업 API를 Ctrl+C(또는 SIGTERM)까지 실행하고 종료 시 실행 중인 작업을 기다림"""
+    server = create_server(service, host=host, port=port, socket_path=socket_path)
+    signal.signal(signal.SIGTERM, _interrupt)
+    service.start()
+    address = socket_path or "http://%s:%s" % server.server_address[:2]
+    print(f"[서비스] 작업 API 대기 중: {address} (작업 {service.workers}개 동시 실행, 대기열 {service.queue_size}개)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print("[서비스] 종료 중 (실행 중인 작업을 기다림)")
+        service.stop()
+        if socket_path and os.path.exists(socket_path):
+            os.unlink(socket_path)
@@ -0,0 +1,234 @@
+"""
+원본 PDF 공유 캐시 모듈
+파일 내용(SHA-256) 기준으로 파싱된 PdfReader를 프로세스 전체에서 공유
+(시리즈의 여러 책이 같은 Review Test/Word List 파일을 서로 다른 zip으로 가지고 있어도 한 번만 파싱)
+페이지 수는 (경로, 크기, 수정 시각) 기준으로 세므로 내용 해시는 reader나 병합 계획 키가 필요할 때만 계산
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple, Union
+
+from .page_count import get_page_count_guarded
+from .sources import get_source_registry, open_reader
+
+logger = logging.getLogger(__name__)
+
+# 기본 메모리 예산 (파싱된 reader 추정 메모리 합)
+DEFAULT_MEMORY_BUDGET = 512 * 1024 * 1024
+# reader 하나의 추정 메모리 = 파일 크기 × 계수 (파싱된 객체 캐시 포함)
+READER_MEMORY_FACTOR = 2
+# 파일 해시 계산 시 읽기 단위
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class SourceCache:
+    """
+    내용 주소 기반 reader 풀
+
+    PdfReader는 스트림 위치를 공유하므로 동시에 여러 스레드가 쓸 수 없음.
+    reader()로 빌려 쓰고 반납하면 같은 내용의 파일을 여는 다음 사용자가 재사용하며,
+    동시에 빌린 경우에는 각각 별도의 reader가 만들어짐
+    """
+
+    def __init__(self, memory_budget: int = DEFAULT_MEMORY_BUDGET):
+        """
+        Args:
+            memory_budget: 대기 중인 reader들의 추정 메모리 합 상한 (바이트, 초과 시 오래된 것부터 제거)
+        """
+        self.memory_budget = memory_budget
+        self._lock = threading.Lock()
+        # (절대 경로, 크기, 수정 시각) -> 내용 해시
+        self._content_keys: Dict[Tuple[str, int, int], str] = {}
+        # 내용 해시 -> 대기 중인 (reader, 원본 경로, 추정 메모리, 파싱할 때의 (경로, 크기, 수정 시각)) 목록 (LRU 순서)
+        self._idle: "OrderedDict[str, List[Tuple[object, str, int, Tuple[str, int, int]]]]" = OrderedDict()
+        self._idle_bytes = 0
+        # 내용 해시 -> 페이지 수 (이미 내용 해시를 계산한 파일만)
+        self._page_counts: Dict[str, int] = {}
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "page_count_hits": 0}
+
+    def _stat_key(self, pdf_path: Union[str, Path]) -> Tuple[str, int, int]:
+        path = os.path.abspath(str(pdf_path))
+        stat = os.stat(path)
+        return (path, stat.st_size, stat.st_mtime_ns)
+
+    def content_key(self, pdf_path: Union[str, Path]) -> str:
+        """파일 내용의 SHA-256 (경로/크기/수정 시각이 같으면 다시 계산하지 않음)"""
+        stat_key = self._stat_key(pdf_path)
+        path = stat_key[0]
+        with self._lock:
+            key = self._content_keys.get(stat_key)
+        if key is not None:
+            return key
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        key = digest.hexdigest()
+        with self._lock:
+            self._content_keys[stat_key] = key
+        return key
+
+    @contextmanager
+    def reader(self, pdf_path: Union[str, Path]) -> Iterator:
+        """
+        같은 내용의 파일에 대해 파싱된 reader를 빌려 씀 (with 블록이 끝나면 반납)
+
+        Args:
+            pdf_path: PDF 파일 경로
+        """
+        path = os.path.abspath(str(pdf_path))
+        key = self.content_key(path)
+        entry = None
+        while entry is None:
+            with self._lock:
+                idle = self._idle.get(key)
+                if not idle:
+                    self._stats["misses"] += 1
+                    break
+                entry = idle.pop()
+                self._idle_bytes -= entry[2]
+                if not idle:
+                    del self._idle[key]
+            # reader가 매핑한 원본이 그 뒤 바뀌었거나 지워졌으면 (잘린 매핑을 읽으면 SIGBUS) 버리고 다른 reader 확인
+            if not self._source_unchanged(entry[3]):
+                logger.debug("원본 캐시: 원본이 바뀌어 reader 폐기: %s", entry[1])
+                entry = None
+                continue
+            with self._lock:
+                self._stats["hits"] += 1
+
+        if entry is None:
+            stat_key = self._stat_key(path)
+            reader = open_reader(path)
+            entry = (reader, path, stat_key[1] * READER_MEMORY_FACTOR, stat_key)
+            logger.debug("원본 캐시 미스 - 파싱: %s", path)
+        else:
+            logger.debug("원본 캐시 적중: %s (원본: %s)", path, entry[1])
+
+        try:
+            yield entry[0]
+        finally:
+            self._check_in(key, entry)
+
+    def _source_unchanged(self, stat_key: Tuple[str, int, int]) -> bool:
+        """reader를 파싱할 때의 원본 파일이 크기/수정 시각 그대로 남아 있는지"""
+        try:
+            return self._stat_key(stat_key[0]) == stat_key
+        except OSError:
+            return False
+
+    def _check_in(self, key: str, entry: Tuple[object, str, int, Tuple[str, int, int]]):
+        """reader 반납 후 예산을 넘으면 오래 쓰지 않은 reader부터 제거"""
+        with self._lock:
+            self._idle.setdefault(key, []).append(entry)
+            self._idle.move_to_end(key)
+            self._idle_bytes += entry[2]
+            self._evict_to(self.memory_budget)
+
+    def _evict_to(self, limit: int) -> int:
+        """대기 중인 reader의 추정 메모리 합이 limit 이하가 될 때까지 오래된 것부터 제거 (잠금 상태에서 호출)"""
+        evicted = 0
+        while self._idle_bytes > limit and self._idle:
+            oldest_key, idle = next(iter(self._idle.items()))
+            size = idle.pop(0)[2]
+            self._idle_bytes -= size
+            evicted += size
+            self._stats["evictions"] += 1
+            if not idle:
+                del self._idle[oldest_key]
+        return evicted
+
+    def trim(self, target_bytes: int = 0) -> int:
+        """
+        메모리가 부족할 때 대기 중인 reader 제거 (빌려 간 reader는 그대로)
+
+        Args:
+            target_bytes: 남겨 둘 추정 메모리 합 (0이면 모두 제거)
+
+        Returns:
+            제거한 reader들의 추정 메모리 합 (바이트)
+        """
+        with self._lock:
+            return self._evict_to(target_bytes)
+
+    def page_count(self, pdf_path: Union[str, Path]) -> int:
+        """
+        페이지 수 (파일 전체를 해시하지 않고 끝부분만 읽는 get_page_count의 (경로, 크기, 수정 시각) 캐시 사용,
+        이미 내용 해시를 계산한 파일이면 다른 경로의 같은 내용 결과도 재사용)
+        """
+        stat_key = self._stat_key(pdf_path)
+        with self._lock:
+            key = self._content_keys.get(stat_key)
+            count = self._page_counts.get(key) if key is not None else None
+            if count is not None:
+                self._stats["page_count_hits"] += 1
+                return count
+        # 설정 단계에서 센 결과가 있으면 재사용, 격리 실행이 켜져 있으면 자식 프로세스에서 셈
+        count = get_page_count_guarded(pdf_path)
+        if key is not None:
+            with self._lock:
+                self._page_counts[key] = count
+        return count
+
+    def release_under(self, directory: Union[str, Path]):
+        """디렉토리 아래 파일을 원본으로 하는 reader 제거 (디렉토리 삭제 전에 호출)"""
+        prefix = os.path.join(os.path.abspath(str(directory)), '')
+        with self._lock:
+            for key in list(self._idle):
+                kept = [entry for entry in self._idle[key] if not entry[1].startswith(prefix)]
+                self._idle_bytes -= sum(entry[2] for entry in self._idle[key] if entry[1].startswith(prefix))
+                if kept:
+                    self._idle[key] = kept
+                else:
+                    del self._idle[key]
+            self._content_keys = {stat_key: key for stat_key, key in self._content_keys.items()
+                                  if not stat_key[0].startswith(prefix)}
+
+    def clear(self):
+        """캐시 전체 초기화"""
+        with self._lock:
+            self._content_keys.clear()
+            self._idle.clear()
+            self._idle_bytes = 0
+            self._page_counts.clear()
+            for key in self._stats:
+                self._stats[key] = 0
+
+    def info(self) -> Dict[str, int]:
+        """캐시 통계 (hits, misses, evictions, page_count_hits, idle_readers, idle_bytes)"""
+        with self._lock:
+            info = dict(self._stats)
+            info["idle_readers"] = sum(len(idle) for idle in self._idle.values())
+            info["idle_bytes"] = self._idle_bytes
+            return info
+
+
+_source_cache = SourceCache()
+
+
+def get_source_cache() -> SourceCache:
+    """프로세스 전체 공유 원본 캐시"""
+    return _source_cache
+
+
+def configure_source_cache(memory_budget: int):
+    """공유 원본 캐시의 메모리 예산 변경 (바이트)"""
+    _source_cache.memory_budget = memory_budget
+
+
+def source_cache_settings() -> Dict:
+    """현재 공유 원본 캐시 설정 (configure_source_cache 인자, 작업 프로세스에 전달)"""
+    return {"memory_budget": _source_cache.memory_budget}
+
+
+def release_sources_under(directory: Union[str, Path]):
+    """디렉토리 아래 원본의 캐시된 reader와 메모리 매핑 해제 (Windows에서 삭제 전에 필요)"""
+    _source_cache.release_under(directory)
+    get_source_registry().release_under(directory)
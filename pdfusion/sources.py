@@ -0,0 +1,210 @@
+"""
+PDF 입력 소스 모듈
+입력 PDF를 읽기 전용으로 메모리 매핑하고, 같은 파일의 모든 reader가 하나의 매핑을 공유
+(pypdf는 경로를 받으면 파일 전체를 BytesIO로 미리 복사하므로, 매핑 뷰를 넘겨 실제로 읽는 부분만 복사하게 함)
+"""
+
+import io
+import os
+import mmap
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Dict, Tuple, Union
+
+if TYPE_CHECKING:
+    from pypdf import PdfReader
+
+logger = logging.getLogger(__name__)
+
+# PDFUSION_MMAP=0 이면 메모리 매핑 대신 일반 파일 읽기 사용
+MMAP_ENABLED = os.environ.get("PDFUSION_MMAP", "1") != "0"
+
+# 매핑 뷰 앞단 읽기 버퍼 크기
+BUFFER_SIZE = 64 * 1024
+# 레지스트리가 유지하는 매핑 수 상한 (상주 서비스에서 처리한 파일의 매핑이 계속 쌓이지 않도록)
+MAX_MAPPINGS = 256
+
+
+class MappedView(io.RawIOBase):
+    """
+    공유 매핑 위의 reader별 읽기 커서 (매핑 자체는 닫지 않음)
+
+    read/readinto는 요청한 구간을 매핑에서 복사해 돌려줌 (파일 전체를 미리 읽지 않을 뿐 복사가 없는 것은 아님).
+    매핑한 파일이 사용 중에 잘리면 잘린 구간을 읽을 때 SIGBUS가 날 수 있으므로, 입력 파일은 제자리에서 덮어쓰지 않고
+    삭제 후 새로 만들어야 함 (압축 해제는 기존 디렉토리를 지우고 다시 풂)
+    """
+
+    def __init__(self, mapping: mmap.mmap, name: str):
+        super().__init__()
+        self._mapping = mapping
+        self._size = len(mapping)
+        self._pos = 0
+        self.name = name
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self._size + offset
+        else:
+            raise ValueError(f"잘못된 whence 값: {whence}")
+        if pos < 0:
+            raise ValueError(f"음수 위치로 이동할 수 없음: {pos}")
+        self._pos = pos
+        return pos
+
+    def read(self, size: int = -1) -> bytes:
+        start = min(self._pos, self._size)
+        end = self._size if size is None or size < 0 else min(self._size, start + size)
+        self._pos = end
+        return self._mapping[start:end]
+
+    def readinto(self, buffer) -> int:
+        start = min(self._pos, self._size)
+        end = min(self._size, start + len(buffer))
+        memoryview(buffer)[:end - start] = self._mapping[start:end]
+        self._pos = end
+        return end - start
+
+    def readline(self, size: int = -1) -> bytes:
+        start = min(self._pos, self._size)
+        newline = self._mapping.find(b'\n', start)
+        end = self._size if newline == -1 else newline + 1
+        if size is not None and size >= 0:
+            end = min(end, start + size)
+        self._pos = end
+        return self._mapping[start:end]
+
+    def close(self):
+        # 매핑은 레지스트리가 소유하므로 여기서는 참조만 해제
+        self._mapping = b''
+        self._size = 0
+        super().close()
+
+
+class MappedSourceRegistry:
+    """
+    프로세스 전체에서 파일별 매핑 하나를 공유하는 레지스트리
+
+    최근에 연 max_mappings개 파일의 매핑만 유지 (LRU). 밀려난 매핑은 닫지 않고 레지스트리에서만 빼므로
+    아직 그 매핑을 읽는 reader가 있으면 계속 쓸 수 있고, 참조가 모두 사라지면 정리됨
+    """
+
+    def __init__(self, max_mappings: int = MAX_MAPPINGS):
+        self.max_mappings = max_mappings
+        # 절대 경로 -> ((크기, 수정 시각), 매핑) (LRU 순서)
+        self._mappings: "OrderedDict[str, Tuple[Tuple[int, int], mmap.mmap]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def open(self, pdf_path: Union[str, Path]) -> IO[bytes]:
+        """
+        읽기 전용 소스 열기
+
+        Args:
+            pdf_path: PDF 파일 경로
+
+        Returns:
+            공유 매핑 위의 버퍼 스트림 (매핑할 수 없는 파일은 일반 파일 객체)
+        """
+        path = os.path.abspath(str(pdf_path))
+        stat = os.stat(path)
+        stat_key = (stat.st_size, stat.st_mtime_ns)
+        if not MMAP_ENABLED or stat.st_size == 0:
+            return open(path, 'rb')
+
+        with self._lock:
+            entry = self._mappings.get(path)
+            if entry is None or entry[0] != stat_key:
+                # 파일이 바뀐 경우(크기/수정 시각) 이전 매핑은 참조하는 reader가 모두 사라지면 정리됨
+                try:
+                    with open(path, 'rb') as f:
+                        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except (OSError, ValueError) as e:
+                    logger.debug("메모리 매핑 실패, 일반 파일로 읽음 (%s): %s", path, e)
+                    return open(path, 'rb')
+                entry = (stat_key, mapping)
+                self._mappings[path] = entry
+                logger.debug("메모리 매핑 생성: %s (%d bytes)", path, stat.st_size)
+                while len(self._mappings) > self.max_mappings:
+                    self._mappings.popitem(last=False)
+            self._mappings.move_to_end(path)
+            # pypdf는 1바이트 단위 read/seek가 많으므로 C 버퍼 계층을 씌움
+            return io.BufferedReader(MappedView(entry[1], path), buffer_size=BUFFER_SIZE)
+
+    def release(self, pdf_path: Union[str, Path]):
+        """
+        파일의 매핑 해제 (Windows에서 파일 삭제/덮어쓰기 전에 필요)
+        이 파일을 읽던 reader는 이후 읽기에 실패하므로 사용이 끝난 뒤 호출
+        """
+        path = os.path.abspath(str(pdf_path))
+        with self._lock:
+            entry = self._mappings.pop(path, None)
+        if entry is not None:
+            self._close_mapping(entry[1])
+
+    def release_under(self, directory: Union[str, Path]):
+        """디렉토리 아래 모든 파일의 매핑 해제"""
+        prefix = os.path.join(os.path.abspath(str(directory)), '')
+        with self._lock:
+            paths = [p for p in self._mappings if p.startswith(prefix)]
+            entries = [self._mappings.pop(p) for p in paths]
+        for _, mapping in entries:
+            self._close_mapping(mapping)
+
+    def close_all(self):
+        """모든 매핑 해제"""
+        with self._lock:
+            entries = list(self._mappings.values())
+            self._mappings.clear()
+        for _, mapping in entries:
+            self._close_mapping(mapping)
+
+    @staticmethod
+    def _close_mapping(mapping: mmap.mmap):
+        try:
+            mapping.close()
+        except BufferError:
+            # 내보낸 버퍼가 남아 있으면 참조가 모두 사라질 때 정리됨
+            pass
+
+    def mapped_bytes(self) -> int:
+        """현재 매핑된 총 바이트 수"""
+        with self._lock:
+            return sum(stat_key[0] for stat_key, _ in self._mappings.values())
+
+
+_registry = MappedSourceRegistry()
+
+
+def get_source_registry() -> MappedSourceRegistry:
+    """프로세스 전체 공유 레지스트리"""
+    return _registry
+
+
+def open_source(pdf_path: Union[str, Path]) -> IO[bytes]:
+    """입력 PDF를 읽기 전용 소스로 열기 (공유 매핑 사용)"""
+    return _registry.open(pdf_path)
+
+
+def open_reader(pdf_path: Union[str, Path]) -> "PdfReader":
+    """공유 매핑 위에 PdfReader 생성"""
+    # pypdf는 처음 PDF를 열 때 가져옴 (--help나 설정만 하는 실행의 시작 시간 단축)
+    # PyPDF2 버전 호환성 처리 (merger.py와 동일)
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        from PyPDF2 import PdfReader
+    return PdfReader(open_source(pdf_path))
@@ -0,0 +1,181 @@
+"""
+유닛 감지 모듈
+PDF 페이지 텍스트에서 "Unit N" 헤더를 찾아 유닛 경계를 계산
+(사용자 입력과 무관한 텍스트 스캔과, 목차 제외 여부에 따른 경계 계산을 분리)
+"""
+
+import os
+import re
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from .sandbox import run_guarded
+from .source_cache import get_source_cache
+
+logger = logging.getLogger(__name__)
+
+UNIT_PATTERN = re.compile(r'u\s*n\s*i\s*t\s*[\.:∙-]?\s*(\d{1,2})', re.IGNORECASE)
+TOC_KEYWORDS = ['목차', 'contents', 'table of contents', 'index']
+
+# 스캔 결과 캐시 (절대 경로 -> ((크기, 수정 시각), scan_page_units 결과), 최근 사용 순)
+# 상주 서비스에서는 같은 책을 다시 병합할 때 텍스트 추출을 건너뜀.
+# 경로당 항목 하나만 두므로 파일이 바뀌면 이전 결과는 덮어쓰고, 최대 개수를 넘으면 오래 안 쓴 것부터 삭제
+SCAN_CACHE_MAX_ENTRIES = 512
+_scan_cache: "OrderedDict[str, Tuple[Tuple[int, int], Dict]]" = OrderedDict()
+_scan_cache_lock = threading.Lock()
+_scan_cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def normalize_text(text: str) -> str:
+    """PDF 텍스트 정규화"""
+    text = text.replace('\n', ' ')
+    text = re.sub(r'\s+', ' ', text)
+    text = text.strip()
+    text = re.sub(r'U\s+n\s*i\s+t', 'Unit', text, flags=re.IGNORECASE)
+    text = re.sub(r'U\s+nit', 'Unit', text, flags=re.IGNORECASE)
+    text = re.sub(r'Un\s+it', 'Unit', text, flags=re.IGNORECASE)
+    text = re.sub(r'Uni\s+t', 'Unit', text, flags=re.IGNORECASE)
+    return text
+
+
+def is_toc_page(text: str) -> bool:
+    """목차 페이지인지 확인"""
+    text_lower = text.lower()
+    if any(keyword in text_lower for keyword in TOC_KEYWORDS):
+        return True
+    unit_matches = re.findall(r'unit\s*\d{1,2}', text_lower)
+    if len(set(unit_matches)) >= 3:
+        return True
+    return False
+
+
+def page_unit_number(raw_text: str) -> Optional[int]:
+    """
+    페이지 텍스트에서 유닛 번호 추출
+
+    Args:
+        raw_text: 페이지에서 추출한 원본 텍스트
+
+    Returns:
+        유닛 번호 (텍스트가 없거나 유닛 헤더가 없으면 None)
+    """
+    if not raw_text.strip():
+        return None
+    found = UNIT_PATTERN.search(normalize_text(raw_text))
+    if found:
+        return int(found.group(1))
+    return None
+
+
+def scan_page_units(pdf_path: Path) -> Dict:
+    """
+    PDF 전체 페이지를 한 번 스캔하여 페이지별 유닛 번호 수집 (사용자 입력과 무관)
+
+    Args:
+        pdf_path: PDF 파일 경로
+
+    Returns:
+        {'page_count': int, 'first_page_is_toc': bool, 'page_units': [유닛 번호 또는 None, ...]}
+    """
+    page_units = []
+    first_page_is_toc = False
+    # 스캔한 reader는 이후 병합 단계에서 같은 파일을 열 때 재사용됨
+    with get_source_cache().reader(pdf_path) as reader:
+        for i, page in enumerate(reader.pages):
+            raw_text = page.extract_text() or ""
+            if i == 0:
+                first_page_is_toc = is_toc_page(raw_text)
+            page_units.append(page_unit_number(raw_text))
+    return {
+        "page_count": len(page_units),
+        "first_page_is_toc": first_page_is_toc,
+        "page_units": page_units,
+    }
+
+
+def _scan_cache_key(pdf_path: Union[str, Path]) -> Tuple[str, Tuple[int, int]]:
+    path = os.path.abspath(str(pdf_path))
+    stat = os.stat(path)
+    return path, (stat.st_size, stat.st_mtime_ns)
+
+
+def scan_page_units_guarded(pdf_path: Path) -> Dict:
+    """
+    격리 실행 설정을 따르는 scan_page_units (결과 캐시, 파일 크기나 수정 시각이 바뀌면 다시 스캔)
+
+    Args:
+        pdf_path: PDF 파일 경로
+
+    Returns:
+        scan_page_units()와 같은 형식 (page_units는 호출마다 새 리스트)
+    """
+    path, version = _scan_cache_key(pdf_path)
+    with _scan_cache_lock:
+        entry = _scan_cache.get(path)
+        scan = entry[1] if entry is not None and entry[0] == version else None
+        if scan is not None:
+            _scan_cache.move_to_end(path)
+        _scan_cache_stats["hits" if scan is not None else "misses"] += 1
+    if scan is None:
+        scan = run_guarded(scan_page_units, pdf_path)
+        with _scan_cache_lock:
+            _scan_cache[path] = (version, scan)
+            _scan_cache.move_to_end(path)
+            while len(_scan_cache) > SCAN_CACHE_MAX_ENTRIES:
+                _scan_cache.popitem(last=False)
+                _scan_cache_stats["evictions"] += 1
+    return dict(scan, page_units=list(scan["page_units"]))
+
+
+def unit_scan_cache_info() -> Dict[str, int]:
+    """캐시 통계 (hits, misses, evictions, size)"""
+    with _scan_cache_lock:
+        info = dict(_scan_cache_stats)
+        info["size"] = len(_scan_cache)
+    return info
+
+
+def clear_unit_scan_cache():
+    """스캔 결과 캐시 비우기"""
+    with _scan_cache_lock:
+        _scan_cache.clear()
+        for key in _scan_cache_stats:
+            _scan_cache_stats[key] = 0
+
+
+def unit_page_lengths_from_scan(page_units: List[Optional[int]], start_page: int = 0) -> List[int]:
+    """
+    페이지별 유닛 번호로부터 유닛별 페이지 길이 계산
+
+    Args:
+        page_units: scan_page_units()의 page_units
+        start_page: 스캔 시작 페이지 (목차 제외 시 1)
+
+    Returns:
+        유닛별 페이지 길이 리스트 (유닛이 감지되지 않으면 빈 리스트)
+    """
+    unit_indices = []
+    last_unit_num = None
+    first_unit_found = False
+
+    for i in range(start_page, len(page_units)):
+        unit_num = page_units[i]
+        if unit_num is None:
+            continue
+        if not first_unit_found and i == start_page + 1 and len(unit_indices) == 0:
+            # 첫 페이지(표지 등)에 유닛 헤더가 없으면 첫 유닛에 포함
+            unit_indices.append(start_page)
+            last_unit_num = unit_num
+            first_unit_found = True
+        elif unit_num != last_unit_num:
+            unit_indices.append(i)
+            last_unit_num = unit_num
+
+    if not unit_indices:
+        return []
+
+    unit_indices.append(len(page_units))
+    return [unit_indices[i + 1] - unit_indices[i] for i in range(len(unit_indices) - 1)]
@@ -0,0 +1,100 @@
+"""
+이미지 다운샘플링의 표시 크기 계산 확인 (폼 XObject 안에서 확대된 이미지, 표시 위치를 알 수 없는 이미지)
+"""
+
+import random
+import zlib
+
+import pytest
+
+pytest.importorskip("PIL")
+pypdf = pytest.importorskip("pypdf")
+
+from pypdf.generic import ArrayObject, DecodedStreamObject, DictionaryObject, NameObject, NumberObject
+
+from pdfusion.image_optimizer import optimize_images, resolve_image_profile
+
+IMAGE_SIZE = 1000
+
+
+def make_image(writer):
+    """압축이 잘 안 되는 1000x1000 회색조 이미지 (다운샘플링하면 항상 작아짐)"""
+    image = DecodedStreamObject()
+    image.set_data(zlib.compress(random.Random(0).randbytes(IMAGE_SIZE * IMAGE_SIZE)))
+    image.update({
+        NameObject("/Type"): NameObject("/XObject"),
+        NameObject("/Subtype"): NameObject("/Image"),
+        NameObject("/Width"): NumberObject(IMAGE_SIZE),
+        NameObject("/Height"): NumberObject(IMAGE_SIZE),
+        NameObject("/ColorSpace"): NameObject("/DeviceGray"),
+        NameObject("/BitsPerComponent"): NumberObject(8),
+        NameObject("/Filter"): NameObject("/FlateDecode"),
+    })
+    return writer._add_object(image)
+
+
+def xobject_resources(**xobjects):
+    return DictionaryObject({NameObject("/XObject"): DictionaryObject(
+        {NameObject(f"/{name}"): ref for name, ref in xobjects.items()})})
+
+
+def add_page(writer, content: bytes, resources):
+    page = writer.add_blank_page(612, 792)
+    stream = DecodedStreamObject()
+    stream.set_data(content)
+    page[NameObject("/Contents")] = writer._add_object(stream)
+    page[NameObject("/Resources")] = resources
+    return page
+
+
+def make_form(writer, content: bytes, resources, matrix=(2, 0, 0, 2, 0, 0)):
+    form = DecodedStreamObject()
+    form.set_data(content)
+    form.update({
+        NameObject("/Type"): NameObject("/XObject"),
+        NameObject("/Subtype"): NameObject("/Form"),
+        NameObject("/BBox"): ArrayObject([NumberObject(0), NumberObject(0), NumberObject(1), NumberObject(1)]),
+        NameObject("/Matrix"): ArrayObject([NumberObject(value) for value in matrix]),
+        NameObject("/Resources"): resources,
+    })
+    return writer._add_object(form)
+
+
+def downsampled(writer):
+    return optimize_images(writer, resolve_image_profile("tablet"))["images"]
+
+
+def test_image_drawn_on_page_is_downsampled():
+    # 300pt(약 4.2인치)에 1000px -> 240dpi, tablet(150dpi) 기준으로 다운샘플링
+    writer = pypdf.PdfWriter()
+    image = make_image(writer)
+    add_page(writer, b"q 300 0 0 300 0 0 cm /Im0 Do Q", xobject_resources(Im0=image))
+    assert downsampled(writer) == 1
+    assert image.get_object()["/Width"] < IMAGE_SIZE
+
+
+def test_form_matrix_enlarges_image():
+    # 페이지에 직접 300pt로도 그려지지만 폼 /Matrix로 2배 확대되어 600pt에도 표시 -> 120dpi, 다운샘플링하지 않음
+    writer = pypdf.PdfWriter()
+    image = make_image(writer)
+    form = make_form(writer, b"/Im0 Do", xobject_resources(Im0=image))
+    add_page(writer, b"q 300 0 0 300 0 0 cm /Im0 Do /Fm0 Do Q", xobject_resources(Im0=image, Fm0=form))
+    assert downsampled(writer) == 0
+    assert image.get_object()["/Width"] == IMAGE_SIZE
+
+
+def test_image_with_unknown_placement_is_skipped():
+    # 한 페이지에서는 작게 그려지지만 다른 페이지의 폼은 해석할 수 없으므로 표시 크기를 알 수 없음
+    writer = pypdf.PdfWriter()
+    image = make_image(writer)
+    add_page(writer, b"q 300 0 0 300 0 0 cm /Im0 Do Q", xobject_resources(Im0=image))
+    form = make_form(writer, b"/Im0 Do", xobject_resources(Im0=image), matrix=(2, 0, 0))
+    add_page(writer, b"q 300 0 0 300 0 0 cm /Fm0 Do Q", xobject_resources(Fm0=form))
+    assert downsampled(writer) == 0
+
+
+def test_image_not_drawn_is_skipped():
+    writer = pypdf.PdfWriter()
+    image = make_image(writer)
+    add_page(writer, b"", xobject_resources(Im0=image))
+    assert downsampled(writer) == 0
@@ -0,0 +1,47 @@
+"""
+유닛 병합 중 원본 오류 처리 (읽을 수 없는 카테고리 PDF는 해당 유닛만 실패)
+"""
+
+import pytest
+
+pytest.importorskip("pypdf")
+
+from benchmarks.corpus import make_pdf
+from pdfusion.merger import PDFMerger
+from pdfusion.source_cache import SourceCache
+
+
+class BrokenSourceCache(SourceCache):
+    """페이지 수는 읽히지만 본문을 파싱하면 실패하는 원본 흉내 (잘린 파일 등)"""
+
+    def __init__(self, broken):
+        super().__init__()
+        self.broken = str(broken)
+
+    def reader(self, pdf_path):
+        if str(pdf_path) == self.broken:
+            raise ValueError("손상된 PDF")
+        return super().reader(pdf_path)
+
+
+def test_broken_category_fails_only_its_unit(tmp_path):
+    books = tmp_path / "book"
+    books.mkdir()
+    words = [books / f"words{unit}.pdf" for unit in (1, 2)]
+    stories = [books / f"story{unit}.pdf" for unit in (1, 2)]
+    for path in words + stories:
+        make_pdf(path, [[path.stem]])
+    config = {
+        "total_units": 2,
+        "merge_order": ["Words", "Story"],
+        "categories": {
+            "Words": {"pdf_paths": [str(path) for path in words]},
+            "Story": {"pdf_paths": [str(path) for path in stories]},
+        },
+    }
+    merger = PDFMerger(output_dir=str(tmp_path / "out"), source_cache=BrokenSourceCache(stories[0]))
+
+    assert merger.merge_unit_pdf(1, config) is False
+    assert merger.merge_unit_pdf(2, config) is True
+    assert any("Unit01에서 Story 추가 실패" in line for line in merger.merge_log)
+    assert (tmp_path / "out" / "Unit02.pdf").is_file()
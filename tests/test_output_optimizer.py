@@ -0,0 +1,67 @@
+"""
+객체 스트림 저장(write_with_object_streams) 왕복 확인: 저장한 파일을 pypdf로 다시 읽어 페이지 수와 내용 비교
+"""
+
+import io
+
+import pytest
+
+pypdf = pytest.importorskip("pypdf")
+
+from benchmarks.corpus import make_pdf
+from pdfusion.output_optimizer import OBJECT_STREAM_SIZE, deduplicate_resources, write_with_object_streams
+from pdfusion.page_count import get_page_count
+
+
+def page_texts(reader):
+    return [page.extract_text() for page in reader.pages]
+
+
+def build_writer(tmp_path, files, pages_per_file):
+    """make_pdf로 만든 파일들을 이어 붙인 writer와 원본 페이지 텍스트"""
+    writer = pypdf.PdfWriter()
+    expected = []
+    for number in range(files):
+        path = tmp_path / f"part{number}.pdf"
+        make_pdf(path, [[f"File {number} Page {page}", "Unit 1 Lesson"] for page in range(pages_per_file)])
+        reader = pypdf.PdfReader(str(path))
+        expected += page_texts(reader)
+        writer.append(reader)
+    return writer, expected
+
+
+def round_trip(writer):
+    buffer = io.BytesIO()
+    write_with_object_streams(writer, buffer)
+    data = buffer.getvalue()
+    return data, pypdf.PdfReader(io.BytesIO(data), strict=True)
+
+
+def test_round_trip_preserves_pages(tmp_path):
+    writer, expected = build_writer(tmp_path, files=2, pages_per_file=3)
+    data, reader = round_trip(writer)
+
+    assert b"/Type /ObjStm" in data and b"/Type /XRef" in data
+    assert len(reader.pages) == len(expected)
+    assert page_texts(reader) == expected
+
+
+def test_round_trip_with_several_object_streams(tmp_path):
+    # 페이지 객체만으로 객체 스트림 하나의 크기를 넘도록 구성
+    writer, expected = build_writer(tmp_path, files=3, pages_per_file=OBJECT_STREAM_SIZE // 2)
+    data, reader = round_trip(writer)
+
+    assert data.count(b"/Type /ObjStm") > 1
+    assert page_texts(reader) == expected
+
+
+def test_round_trip_after_deduplication(tmp_path):
+    # 중복 제거로 비워진 객체 번호는 xref 스트림의 빈 항목으로 기록됨
+    writer, expected = build_writer(tmp_path, files=3, pages_per_file=2)
+    assert deduplicate_resources(writer)["objects_removed"] > 0
+    data, reader = round_trip(writer)
+
+    assert page_texts(reader) == expected
+    output_path = tmp_path / "out.pdf"
+    output_path.write_bytes(data)
+    assert get_page_count(output_path) == len(expected)
@@ -0,0 +1,83 @@
+"""
+출력 저장소 크기 상한 (가장 오래 쓰이지 않은 결과부터 삭제, 연결된 출력 파일은 유지)
+"""
+
+import os
+
+import pytest
+
+from pdfusion.journal import MergeJournal
+from pdfusion.output_store import OutputStore, configure_output_store, output_store_settings
+
+MB = 1024 * 1024
+
+
+def produce(tmp_path, name, size=MB):
+    path = tmp_path / name
+    path.write_bytes(os.urandom(size))
+    return path
+
+
+def age(store, key, seconds):
+    """저장소 파일의 마지막 사용 시각을 과거로 돌림"""
+    path = store._marker_for(store.path_for(key))
+    stat = path.stat()
+    os.utime(path, (stat.st_atime - seconds, stat.st_mtime - seconds))
+
+
+def test_put_prunes_least_recently_used(tmp_path):
+    store = OutputStore(tmp_path / ".store", max_mb=2)
+    store.put("a" * 64, produce(tmp_path, "a.pdf"))
+    store.put("b" * 64, produce(tmp_path, "b.pdf"))
+    age(store, "a" * 64, 200)
+    age(store, "b" * 64, 100)
+    # a를 다시 쓰면 b가 가장 오래 쓰이지 않은 결과가 됨
+    assert store.fetch("a" * 64, tmp_path / "out" / "Unit01.pdf")
+
+    store.put("c" * 64, produce(tmp_path, "c.pdf"))
+    assert store.path_for("a" * 64).is_file()
+    assert not store.path_for("b" * 64).exists()
+    assert store.path_for("c" * 64).is_file()
+    assert store.info()["pruned"] == 1
+    # 저장소에서 지워져도 책별 출력 파일은 남음
+    assert (tmp_path / "b.pdf").stat().st_size == MB
+
+
+def test_entry_larger_than_limit_is_kept(tmp_path):
+    store = OutputStore(tmp_path / ".store", max_mb=1)
+    store.put("a" * 64, produce(tmp_path, "a.pdf", 2 * MB))
+    assert store.path_for("a" * 64).is_file()
+
+
+def test_prune_to_zero_empties_store(tmp_path):
+    store = OutputStore(tmp_path / ".store", max_mb=0)
+    for name in ("a", "b"):
+        store.put(name * 64, produce(tmp_path, f"{name}.pdf"))
+    assert store.info()["pruned"] == 0
+
+    assert store.prune(max_bytes=0) == (2, 0)
+    assert not any((tmp_path / ".store").iterdir())
+
+
+def test_configure_sets_default_limit(tmp_path):
+    before = output_store_settings()
+    configure_output_store(5)
+    try:
+        assert OutputStore(tmp_path / ".store").max_bytes == 5 * MB
+        with pytest.raises(ValueError):
+            configure_output_store(-1)
+    finally:
+        configure_output_store(**before)
+
+
+def test_use_tracking_keeps_output_unchanged(tmp_path):
+    # 저장소 파일과 책별 출력은 같은 inode - 사용 시각을 갱신해도 저널에 기록한 출력은 그대로여야 함
+    store = OutputStore(tmp_path / ".store")
+    output = produce(tmp_path, "Unit01.pdf")
+    journal = MergeJournal(tmp_path / ".merge_journal.json")
+    journal.record(output.name, "a" * 64, output)
+    store.put("a" * 64, output)
+    assert store.fetch("a" * 64, tmp_path / "other" / "Unit01.pdf")
+
+    resumed = MergeJournal(tmp_path / ".merge_journal.json", resume=True)
+    assert resumed.is_complete(output.name, "a" * 64, output)
@@ -0,0 +1,118 @@
+"""
+빠른 페이지 수 조회(read_page_count_fast)의 파일 구조별 확인
+(공백 없이 붙여 쓴 출력, 증분 업데이트, 객체 스트림, 뒤따르는 객체에 같은 키가 있는 경우)
+"""
+
+import io
+
+import pytest
+
+pypdf = pytest.importorskip("pypdf")
+
+from benchmarks.corpus import make_pdf
+from pdfusion.output_optimizer import write_with_object_streams
+from pdfusion.page_count import (_FastPathUnavailable, clear_page_count_cache, get_page_count,
+                                 page_count_cache_info, read_page_count_fast)
+
+PAGE = b"<</Type/Page/Parent 2 0 R/MediaBox[0 0 612 792]>>"
+
+
+def assemble(objects, root, base=b"%PDF-1.4\n", prev=None, size=None):
+    """
+    객체들을 공백 없이 붙여 쓰고 고전 xref 테이블과 trailer를 덧붙임
+
+    Args:
+        objects: [(객체 번호, 본문)]
+        root: /Root 객체 번호
+        base: 앞에 둘 내용 (증분 업데이트면 원래 파일 전체)
+        prev: 이전 xref 오프셋 (증분 업데이트)
+        size: trailer /Size
+    """
+    out = bytearray(base)
+    offsets = []
+    for number, body in objects:
+        offsets.append((number, len(out)))
+        out += b"%d 0 obj" % number + body + b"endobj\n"
+    xref = len(out)
+    out += b"xref\n"
+    if prev is None:
+        out += b"0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+        out += b"".join(b"%010d 00000 n \n" % offset for _, offset in offsets)
+    else:
+        for number, offset in offsets:
+            out += b"%d 1\n%010d 00000 n \n" % (number, offset)
+    trailer = b"/Size %d/Root %d 0 R" % (size or len(objects) + 1, root)
+    if prev is not None:
+        trailer += b"/Prev %d" % prev
+    out += b"trailer\n<<" + trailer + b">>\nstartxref\n%d\n%%%%EOF\n" % xref
+    return bytes(out), xref
+
+
+def write(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return path
+
+
+def test_plain_file(tmp_path):
+    path = tmp_path / "plain.pdf"
+    make_pdf(path, [["one"], ["two"], ["three"]])
+    assert read_page_count_fast(path) == 3
+
+
+def test_compact_writer_output(tmp_path):
+    data, _ = assemble([
+        (1, b"<</Type/Catalog/Pages 2 0 R>>"),
+        (2, b"<</Type/Pages/Kids[3 0 R 4 0 R]/Count 2>>"),
+        (3, PAGE),
+        (4, PAGE),
+    ], root=1)
+    path = write(tmp_path, "compact.pdf", data)
+    assert read_page_count_fast(path) == 2
+    assert len(pypdf.PdfReader(str(path)).pages) == 2
+
+
+def test_following_object_is_not_read_as_value(tmp_path):
+    # 루트 /Pages의 /Count가 간접 참조면 빠른 경로로 읽을 수 없음 -
+    # 바로 뒤 개요 객체의 /Count 7을 페이지 수로 읽지 않고 전체 파싱으로 대체해야 함
+    data, _ = assemble([
+        (1, b"<</Type/Catalog/Pages 2 0 R/Outlines 5 0 R>>"),
+        (2, b"<</Type/Pages/Kids[3 0 R 4 0 R]/Count 6 0 R>>"),
+        (5, b"<</Type/Outlines/Count 7>>"),
+        (3, PAGE),
+        (4, PAGE),
+        (6, b"2"),
+    ], root=1)
+    path = write(tmp_path, "indirect_count.pdf", data)
+    with pytest.raises(_FastPathUnavailable):
+        read_page_count_fast(path)
+    clear_page_count_cache()
+    assert get_page_count(path) == 2
+    assert page_count_cache_info()["fallback"] == 1
+
+
+def test_incremental_update(tmp_path):
+    base, xref = assemble([
+        (1, b"<</Type/Catalog/Pages 2 0 R>>"),
+        (2, b"<</Type/Pages/Kids[3 0 R]/Count 1>>"),
+        (3, PAGE),
+    ], root=1)
+    # 페이지 하나를 추가한 증분 업데이트: /Pages는 새 위치의 객체가 우선
+    data, _ = assemble([
+        (2, b"<</Type/Pages/Kids[3 0 R 4 0 R]/Count 2>>"),
+        (4, PAGE),
+    ], root=1, base=base, prev=xref, size=5)
+    path = write(tmp_path, "incremental.pdf", data)
+    assert read_page_count_fast(path) == 2
+    assert len(pypdf.PdfReader(str(path)).pages) == 2
+
+
+def test_object_stream_output(tmp_path):
+    source = tmp_path / "source.pdf"
+    make_pdf(source, [["one"], ["two"]])
+    writer = pypdf.PdfWriter()
+    writer.append(pypdf.PdfReader(str(source)))
+    buffer = io.BytesIO()
+    write_with_object_streams(writer, buffer)
+    path = write(tmp_path, "objstm.pdf", buffer.getvalue())
+    assert read_page_count_fast(path) == 2
@@ -0,0 +1,51 @@
+"""
+프로파일링 단계의 tracemalloc 공유 처리 (다른 곳에서 켠 추적 유지, 동시에 측정하지 않음)
+"""
+
+import threading
+import tracemalloc
+
+import pytest
+
+from pdfusion import profiling
+
+
+@pytest.fixture
+def profile_all(tmp_path):
+    profiling.configure_profiling("all", output_root=str(tmp_path))
+    yield tmp_path
+    profiling.configure_profiling(None, output_root=profiling.DEFAULT_OUTPUT_ROOT)
+
+
+def test_keeps_tracing_started_elsewhere(profile_all):
+    tracemalloc.start()
+    try:
+        with profiling.profile_stage("merge", scope="keep"):
+            bytearray(1024)
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+    assert len(profiling.profile_results("keep")) == 1
+
+
+def test_concurrent_stages_do_not_wait_or_overlap(profile_all):
+    entered = threading.Event()
+    release = threading.Event()
+
+    def outer():
+        with profiling.profile_stage("merge", scope="concurrent", label="outer"):
+            entered.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=outer)
+    thread.start()
+    assert entered.wait(5)
+    # 다른 스레드가 측정 중이면 기다리지 않고 측정 없이 실행
+    with profiling.profile_stage("merge", scope="concurrent", label="inner"):
+        pass
+    release.set()
+    thread.join(5)
+
+    results = profiling.profile_results("concurrent")
+    assert [result["label"] for result in results] == ["outer"]
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,129 @@
+"""
+배치 스케줄러: 작업 프로세스 설정 전달 (환경 변수 대신 프로세스 풀 initializer로 한 번 적용),
+보정한 비용 기준 LPT 순서와 메모리 상한
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from pdfusion import profiling, sandbox, source_cache
+from pdfusion.scheduler import BatchScheduler, CostCalibration, ScheduledJob, _init_worker, worker_settings
+
+
+def _child_settings():
+    return sandbox.sandbox_settings(), profiling.profiling_settings(), source_cache.source_cache_settings()
+
+
+@pytest.fixture
+def configured(tmp_path):
+    before_sandbox = sandbox.sandbox_settings()
+    before_profiling = profiling.profiling_settings()
+    before_source_cache = source_cache.source_cache_settings()
+    sandbox.configure_sandbox(True, timeout=30, cpu_seconds=10, memory_mb=512)
+    profiling.configure_profiling("merge,discovery", top_n=5, output_root=str(tmp_path))
+    source_cache.configure_source_cache(64 * 1024 * 1024)
+    yield
+    sandbox.configure_sandbox(**before_sandbox)
+    profiling.configure_profiling(**before_profiling)
+    source_cache.configure_source_cache(**before_source_cache)
+
+
+def test_configure_does_not_touch_environment(configured):
+    assert "PDFUSION_SANDBOX" not in os.environ
+    assert "PDFUSION_PROFILE" not in os.environ
+
+
+def test_spawned_worker_receives_settings(configured):
+    # spawn으로 시작한 프로세스는 부모의 모듈 상태를 물려받지 않으므로 initializer로만 설정을 받음
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context, initializer=_init_worker,
+                             initargs=(worker_settings(),)) as executor:
+        child_sandbox, child_profiling, child_source_cache = executor.submit(_child_settings).result(timeout=60)
+    assert child_sandbox == sandbox.sandbox_settings()
+    assert child_profiling == profiling.profiling_settings()
+    assert child_source_cache == {"memory_budget": 64 * 1024 * 1024}
+
+
+def job(name, page_cost=0.0, parse_cost=0.0, memory=0, func=None):
+    return ScheduledJob(name, func or (lambda: name), estimated_cost=page_cost + parse_cost,
+                        estimated_memory=memory, page_cost=page_cost, parse_cost=parse_cost)
+
+
+def test_dispatch_order_is_longest_first():
+    scheduler = BatchScheduler(max_workers=2, use_processes=False)
+    jobs = [job("a", 1), job("b", 5), job("c", 3), job("d", 4)]
+    assert [j.name for j in scheduler.dispatch_order(jobs)] == ["b", "d", "c", "a"]
+
+
+def test_calibration_separates_page_and_parse_costs():
+    # 실제로는 파싱이 추정보다 4배 느린 환경
+    calibration = CostCalibration()
+    for page_cost, parse_cost in [(2, 1), (1, 2), (3, 0.5), (0.5, 3), (2, 2)]:
+        done = job("done", page_cost, parse_cost)
+        done.actual_cost = page_cost + 4 * parse_cost
+        calibration.update(done)
+    assert calibration.page == pytest.approx(1, abs=0.3)
+    assert calibration.parse == pytest.approx(4, abs=0.3)
+
+    # 보정 전에는 페이지가 많은 책이 크지만 보정 후에는 원본이 큰 책부터 시작
+    scheduler = BatchScheduler(max_workers=2, use_processes=False)
+    scheduler.calibration = calibration
+    jobs = [job("pages", page_cost=5), job("sources", parse_cost=2)]
+    assert [j.name for j in scheduler.dispatch_order(jobs)] == ["sources", "pages"]
+
+
+def test_calibration_round_trip(tmp_path):
+    path = tmp_path / "calibration.json"
+    scheduler = BatchScheduler(max_workers=1, calibration_path=str(path))
+    done = job("done", 1, 1, memory=100, func=lambda: True)
+    scheduler.run([done])
+    assert scheduler.history[-1]["actual"] is not None
+
+    loaded = BatchScheduler(max_workers=1, calibration_path=str(path))
+    assert loaded.calibration.to_dict() == scheduler.calibration.to_dict()
+    assert len(loaded.history) == 1
+
+
+def test_memory_limit_keeps_large_jobs_apart():
+    # 상한 100: 큰 작업 둘(60)은 함께 실행되지 않고, 작은 작업(30)은 큰 작업 옆에서 실행
+    lock = threading.Lock()
+    running = set()
+    overlaps = []
+
+    def work(name):
+        def run():
+            with lock:
+                overlaps.extend((name, other) for other in running)
+                running.add(name)
+            time.sleep(0.1)
+            with lock:
+                running.discard(name)
+            return True
+        return run
+
+    scheduler = BatchScheduler(max_workers=3, memory_limit=100, use_processes=False)
+    jobs = [job(name, page_cost=cost, memory=memory, func=work(name))
+            for name, cost, memory in [("big1", 3, 60), ("big2", 2, 60), ("small", 1, 30)]]
+    scheduler.run(jobs)
+
+    pairs = {frozenset(pair) for pair in overlaps}
+    assert frozenset(("big1", "big2")) not in pairs
+    assert frozenset(("big1", "small")) in pairs
+    assert all(j.result for j in jobs)
+
+
+def test_calibrated_memory_limits_dispatch():
+    # 메모리 추정치가 실제의 절반이었다면 보정 후에는 두 작업이 상한 안에 함께 들어가지 않음
+    scheduler = BatchScheduler(max_workers=2, memory_limit=100, use_processes=False)
+    first = job("first", 1, memory=40)
+    assert scheduler._fits(job("second", 1, memory=40), 40, running=1)
+    first.actual_memory = 80
+    for _ in range(10):
+        scheduler.calibration.update(first)
+    assert scheduler.calibrated_memory(first) > 60
+    assert not scheduler._fits(job("second", 1, memory=40), scheduler.calibrated_memory(first), running=1)
@@ -0,0 +1,32 @@
+"""
+상주 서비스: 같은 출력 폴더에 쓰는 작업의 잠금과 Unix 소켓 권한
+"""
+
+import os
+import stat
+import sys
+
+import pytest
+
+from pdfusion.service import MergeService, create_server
+
+
+def test_output_lock_is_shared_per_output_dir(tmp_path):
+    service = MergeService(lambda *args, **kwargs: True, workers=2, output_root=str(tmp_path))
+    lock = service._output_lock(tmp_path / "Bricks Reading 60")
+    assert service._output_lock(tmp_path / "." / "Bricks Reading 60") is lock
+    assert service._output_lock(tmp_path / "Bricks Reading 80") is not lock
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Unix 소켓")
+def test_socket_is_owner_only(tmp_path):
+    socket_path = str(tmp_path / "pdfusion.sock")
+    before = os.umask(0o022)
+    try:
+        server = create_server(MergeService(lambda *args, **kwargs: True), socket_path=socket_path)
+        server.server_close()
+        # 서버 생성 후 프로세스 umask는 원래대로
+        assert os.umask(0o022) == 0o022
+    finally:
+        os.umask(before)
+    assert stat.S_IMODE(os.stat(socket_path).st_mode) & 0o077 == 0
@@ -0,0 +1,67 @@
+"""
+공유 매핑 레지스트리(LRU 상한)와 원본 캐시의 reader 재사용 전 원본 확인
+"""
+
+import shutil
+
+import pytest
+
+pytest.importorskip("pypdf")
+
+from benchmarks.corpus import make_pdf
+from pdfusion.source_cache import SourceCache
+from pdfusion.sources import MappedSourceRegistry
+
+
+def make_files(tmp_path, count):
+    paths = []
+    for number in range(count):
+        path = tmp_path / f"source{number}.pdf"
+        make_pdf(path, [[f"Source {number}"]])
+        paths.append(path)
+    return paths
+
+
+def test_registry_keeps_recent_mappings_only(tmp_path):
+    registry = MappedSourceRegistry(max_mappings=2)
+    paths = make_files(tmp_path, 3)
+    first = registry.open(paths[0])
+    for path in paths[1:]:
+        registry.open(path).close()
+
+    assert registry.mapped_bytes() == sum(path.stat().st_size for path in paths[1:])
+    # 밀려난 매핑도 이미 연 스트림은 계속 읽을 수 있음
+    assert first.read(5) == b"%PDF-"
+    first.close()
+
+
+def test_registry_remaps_changed_file(tmp_path):
+    registry = MappedSourceRegistry()
+    path = make_files(tmp_path, 1)[0]
+    registry.open(path).close()
+    make_pdf(path, [["Changed"], ["Second page"]])
+
+    with registry.open(path) as source:
+        assert len(source.read()) == path.stat().st_size
+
+
+def test_source_cache_discards_reader_of_removed_source(tmp_path):
+    cache = SourceCache()
+    original = make_files(tmp_path, 1)[0]
+    copy = tmp_path / "copy.pdf"
+    shutil.copyfile(original, copy)
+
+    with cache.reader(original) as reader:
+        assert len(reader.pages) == 1
+    # 같은 내용의 다른 경로: 원본이 남아 있으면 파싱된 reader 재사용
+    with cache.reader(copy) as reader:
+        assert len(reader.pages) == 1
+    assert cache.info()["hits"] == 1
+
+    # reader가 매핑한 파일이 지워지고 다른 내용으로 다시 만들어지면 재사용하지 않고 다시 파싱
+    original.unlink()
+    make_pdf(original, [["Other content"], ["Longer file"]])
+    with cache.reader(copy) as reader:
+        assert reader.pages[0].extract_text().strip() == "Source 0"
+    info = cache.info()
+    assert info["hits"] == 1 and info["misses"] == 2
@@ -0,0 +1,56 @@
+"""
+UnitRouter(융합 병합)와 unit_page_lengths_from_scan(2단계 병합)의 유닛 분할 규칙 일치 확인
+"""
+
+import pytest
+
+from pdfusion.fused_merge import UnitRouter
+from pdfusion.unit_detection import unit_page_lengths_from_scan
+
+
+def route_lengths(page_units, start_page=0):
+    """FusedMergeEngine._route_pages와 같은 방식으로 페이지를 분배했을 때 유닛별 페이지 수"""
+    router = UnitRouter()
+    lengths = {}
+    for header in page_units[start_page:]:
+        unit_number = router.route(header)
+        if unit_number is not None:
+            lengths[unit_number] = lengths.get(unit_number, 0) + 1
+    if router.segments == 0:
+        return [len(page_units) - start_page]
+    if router.includes_leading:
+        lengths[router.first_unit] += router.leading_pages
+    return [lengths[unit] for unit in sorted(lengths)]
+
+
+@pytest.mark.parametrize("page_units, start_page", [
+    ([1, None, None, 2, None, 3], 0),
+    ([None, 1, None, 2, 2, 3], 0),            # 표지 한 장은 첫 유닛에 포함
+    ([None, None, 1, None, 2, None], 0),      # 첫 헤더 앞 두 페이지 이상은 제외
+    ([None, None, None, 1, 2], 0),
+    ([1, 1, 1, 2, 2, 1], 0),                  # 번호가 되돌아가도 바뀔 때마다 다음 유닛
+    ([5, None, 6, None], 0),                  # 첫 헤더 번호와 관계없이 순서대로 유닛 번호 부여
+    ([None, 1, None, 2], 1),                  # 목차 페이지 제외
+    ([None, None, 1, None, 2], 1),            # 목차 제외 후 표지 한 장
+    ([None, None, None, 1, 2], 1),
+    ([1], 0),
+])
+def test_router_matches_scan(page_units, start_page):
+    assert route_lengths(page_units, start_page) == unit_page_lengths_from_scan(page_units, start_page)
+
+
+@pytest.mark.parametrize("page_units, start_page", [
+    ([None, None, None], 0),
+    ([None, None, None], 1),
+])
+def test_router_without_headers_uses_whole_file(page_units, start_page):
+    # 2단계 병합은 감지 실패(빈 리스트) 후 유닛 수 입력 질문의 기본값으로 파일 전체를 한 유닛으로 처리
+    assert unit_page_lengths_from_scan(page_units, start_page) == []
+    assert route_lengths(page_units, start_page) == [len(page_units) - start_page]
+
+
+def test_router_unit_numbers_continue_from_first_unit():
+    router = UnitRouter(first_unit=4)
+    assert [router.route(h) for h in [None, 1, None, 2]] == [None, 4, 4, 5]
+    assert router.includes_leading
+    assert router.unit_count == 2